@@ -168,7 +168,8 @@ class Task(object):
         benchmark_engine.validate()
 
     @classmethod
-    def start(cls, deployment, config, task=None, abort_on_sla_failure=False):
+    def start(cls, deployment, config, task=None, abort_on_sla_failure=False,
+              parallel=1):
         """Start a task.
 
         Task is a list of benchmarks that will be called one by one, results of
@@ -180,6 +181,9 @@ class Task(object):
         :param abort_on_sla_failure: if True, the execution of a benchmark
                                      scenario will stop when any SLA check
                                      for it fails
+        :param parallel: max number of independent benchmarks (or groups of
+                         benchmarks) to be run at the same time, it doesn't
+                         limit their total concurrency
         """
         deployment = objects.Deployment.get(deployment)
         task = task or objects.Task(deployment_uuid=deployment["uuid"])
@@ -187,7 +191,7 @@ class Task(object):
                                                          deployment["uuid"]))
         benchmark_engine = engine.BenchmarkEngine(
             config, task, admin=deployment["admin"], users=deployment["users"],
-            abort_on_sla_failure=abort_on_sla_failure)
+            abort_on_sla_failure=abort_on_sla_failure, parallel=parallel)
 
         try:
             benchmark_engine.validate()
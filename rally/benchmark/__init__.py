@@ -13,9 +13,5 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from rally.common import utils as rutils
-
-
-rutils.import_modules_from_package("rally.benchmark.context")
-rutils.import_modules_from_package("rally.benchmark.runners")
-rutils.import_modules_from_package("rally.benchmark.scenarios")
+# Plugins (contexts, runners and scenarios) are loaded on demand, see
+# rally.common.discover
@@ -16,14 +16,37 @@
 import abc
 
 import jsonschema
+from oslo_config import cfg
 import six
 
+from rally.common import broker
+from rally.common import discover
+from rally.common.i18n import _
 from rally.common import log as logging
-from rally.common import utils
 from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
+CONTEXT_BENCHMARK_OPTS = [
+    cfg.IntOpt("per_tenant_context_workers",
+               default=20,
+               help="Default number of concurrent threads used by contexts "
+                    "to set up and clean up resources of different tenants "
+                    "(could be overridden by resource_management_workers "
+                    "in context config)")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(CONTEXT_BENCHMARK_OPTS, group=benchmark_group)
+
+# Property of CONFIG_SCHEMA of contexts that use _setup_for_each() and
+# _cleanup_for_each()
+WORKERS_SCHEMA = {
+    "type": "integer",
+    "minimum": 1
+}
+
 
 def context(name, order, hidden=False):
     """Context class wrapper.
@@ -99,9 +122,10 @@ class Context(object):
     @staticmethod
     def get_by_name(name):
         """Return Context class by name."""
-        for context in utils.itersubclasses(Context):
-            if name == context.get_name():
-                return context
+        context = discover.get_plugin(Context, name,
+                                      key=lambda cls: cls.get_name())
+        if context:
+            return context
         raise exceptions.NoSuchContext(name=name)
 
     @abc.abstractmethod
@@ -118,6 +142,49 @@ class Context(object):
     def __exit__(self, exc_type, exc_value, exc_traceback):
         self.cleanup()
 
+    def _get_workers(self):
+        return (self.config.get("resource_management_workers") or
+                CONF.benchmark.per_tenant_context_workers)
+
+    def _setup_for_each(self, func, items, store):
+        """Call func for each item in parallel and store the results.
+
+        store() is called from the current thread only, so it may modify
+        the context without locks. Results of successful calls are stored
+        even if some calls have failed, so cleanup() is able to delete
+        everything that was created.
+
+        :param func: function that creates resources for a single item
+        :param items: iterable of items, e.g. (user, tenant_id) pairs
+        :param store: function that puts (item, result) to the context
+        :raises ContextSetupFailure: if func has failed for any item
+        """
+        items = list(items)
+        results, errors = broker.run_for_each(func, items, self._get_workers())
+        for item, result in results:
+            store(item, result)
+        for item, e in errors:
+            LOG.error(_("Context %(ctx)s failed to set up resources: "
+                        "%(error)s") % {"ctx": self.get_name(), "error": e})
+            if logging.is_debug():
+                LOG.exception(e)
+        if errors:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg=_("%(failed)d of %(total)d failed, first error: "
+                      "%(error)s") % {"failed": len(errors),
+                                      "total": len(items),
+                                      "error": errors[0][1]})
+
+    def _cleanup_for_each(self, func, items):
+        """Call func for each item in parallel and log failures."""
+        results, errors = broker.run_for_each(func, items, self._get_workers())
+        for item, e in errors:
+            LOG.warning(_("Context %(ctx)s failed to clean up resources: "
+                          "%(error)s") % {"ctx": self.get_name(), "error": e})
+            if logging.is_debug():
+                LOG.exception(e)
+
 
 class ContextManager(object):
     """Create context environment and run method inside it."""
@@ -13,10 +13,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
+import threading
 import time
 
+import six
+
 from rally.benchmark.context.cleanup import base
+from rally.benchmark import utils
 from rally.common import broker
+from rally.common import discover
 from rally.common.i18n import _
 from rally.common import log as logging
 from rally.common import utils as rutils
@@ -41,6 +47,10 @@ class SeekAndDestroy(object):
         self.manager_cls = manager_cls
         self.admin = admin
         self.users = users or []
+        # Resource managers of deleted resources grouped by users, filled
+        # by consumers
+        self._deleted = {}
+        self._deleted_lock = threading.Lock()
 
     @staticmethod
     def _get_cached_client(user, cache=None):
@@ -59,59 +69,141 @@ class SeekAndDestroy(object):
         return cache[key]
 
     def _delete_single_resource(self, resource):
-        """Safe resource deletion with retries and timeouts.
+        """Safe resource deletion with retries.
 
         Send request to delete resource, in case of failures repeat it few
-        times. After that pull status of resource until it's deleted.
+        times. Deletion is confirmed later by _wait_for_deletion(), so
+        consumers don't wait for each resource.
 
         Writes in LOG warning with UUID of resource that wasn't deleted
 
         :param resource: instance of resource manager initiated with resource
                          that should be deleted.
+        :returns: True if the request to delete resource was sent
         """
 
-        msg_kw = {
-            "uuid": resource.id(),
-            "service": resource._service,
-            "resource": resource._resource
-        }
-
         try:
             rutils.retry(resource._max_attempts, resource.delete)
         except Exception as e:
-            msg_kw["reason"] = e
             LOG.warning(
                 _("Resource deletion failed, max retries exceeded for "
                   "%(service)s.%(resource)s: %(uuid)s. Reason: %(reason)s")
-                % msg_kw)
+                % {"uuid": resource.id(), "service": resource._service,
+                   "resource": resource._resource, "reason": e})
             if logging.is_debug():
                 LOG.exception(e)
-        else:
-            started = time.time()
-            failures_count = 0
-            while time.time() - started < resource._timeout:
-                try:
-                    if resource.is_deleted():
-                        return
-                except Exception as e:
-                    LOG.warning(
-                        _("Seems like %s.%s.is_deleted(self) method is broken "
-                          "It shouldn't raise any exceptions.")
-                        % (resource.__module__, type(resource).__name__))
-                    LOG.exception(e)
+            return False
+        return True
+
+    def _is_bulk_check_supported(self):
+        """Whether deletion could be checked by a single list() call.
+
+        Resource managers that have own is_deleted() are checked for each
+        resource with is_deleted().
+        """
+        return (six.get_unbound_function(self.manager_cls.is_deleted) is
+                six.get_unbound_function(base.ResourceManager.is_deleted))
+
+    def _check_failed(self, resources, failures):
+        """Returns resources that are still worth checking after a failure.
 
-                    # NOTE(boris-42): Avoid LOG spaming in case of bad
-                    #                 is_deleted() method
-                    failures_count += 1
-                    if failures_count > resource._max_attempts:
-                        break
+        Avoids LOG spamming in case of bad list() or is_deleted() methods.
+        """
+        remaining = []
+        for resource in resources:
+            failures[resource] = failures.get(resource, 0) + 1
+            if failures[resource] <= resource._max_attempts:
+                remaining.append(resource)
+        return remaining
+
+    def _filter_not_deleted(self, resources, failures):
+        """Returns resources from the list that are not deleted yet.
+
+        If possible, all the resources are checked with a single list() call
+        instead of calling is_deleted() for each of them. Resources that are
+        not listed or have DELETED or DELETE_COMPLETE status are deleted.
+
+        :param resources: resource managers initiated with resources that
+                          belong to the same user (tenant)
+        :param failures: dict with numbers of failed checks of resources
+        """
+        if self._is_bulk_check_supported():
+            try:
+                # Any of resources could be used to list all the resources
+                # of the user, because they are initiated with the user's
+                # clients
+                remaining = set()
+                for raw_resource in resources[0].list():
+                    if utils.get_status(raw_resource) not in (
+                            "DELETED", "DELETE_COMPLETE"):
+                        remaining.add(
+                            self.manager_cls(resource=raw_resource).id())
+                return [resource for resource in resources
+                        if resource.id() in remaining]
+            except Exception as e:
+                LOG.warning(
+                    _("Seems like %s.%s.list(self) method is broken. "
+                      "It shouldn't raise any exceptions.")
+                    % (self.manager_cls.__module__,
+                       self.manager_cls.__name__))
+                LOG.exception(e)
+                return self._check_failed(resources, failures)
+
+        not_deleted = []
+        for resource in resources:
+            try:
+                if not resource.is_deleted():
+                    not_deleted.append(resource)
+            except Exception as e:
+                LOG.warning(
+                    _("Seems like %s.%s.is_deleted(self) method is broken "
+                      "It shouldn't raise any exceptions.")
+                    % (resource.__module__, type(resource).__name__))
+                LOG.exception(e)
+                not_deleted.extend(self._check_failed([resource], failures))
+        return not_deleted
+
+    def _wait_for_deletion(self, deleted):
+        """Wait until deleted resources disappear.
+
+        Resources are checked in groups of resources of the same user (or
+        tenant), one list() call per group per polling interval. Groups are
+        checked in parallel.
 
-                finally:
-                    time.sleep(resource._interval)
+        Writes in LOG warning with UUID of every resource that wasn't deleted
+        before timeout.
 
-            LOG.warning(_("Resource deletion failed, timeout occurred for "
-                          "%(service)s.%(resource)s: %(uuid)s.")
-                        % msg_kw)
+        :param deleted: dict with lists of resource managers initiated with
+                        deleted resources, grouped by user
+        """
+        groups = [resources for resources in deleted.values() if resources]
+        all_resources = [resource for resources in groups
+                         for resource in resources]
+        failures = {}
+        started = time.time()
+        while groups:
+            results, errors = broker.run_for_each(
+                lambda resources: self._filter_not_deleted(resources,
+                                                           failures),
+                groups, consumers_count=self.manager_cls._threads)
+            groups = [not_deleted for resources, not_deleted in results
+                      if not_deleted]
+            groups.extend(resources for resources, e in errors)
+            if not groups or (time.time() - started >=
+                              self.manager_cls._timeout):
+                break
+            time.sleep(self.manager_cls._interval)
+
+        not_deleted = set(resource for resources in groups
+                          for resource in resources)
+        for resource in all_resources:
+            if resource in not_deleted or (
+                    failures.get(resource, 0) > resource._max_attempts):
+                LOG.warning(_("Resource deletion failed, timeout occurred "
+                              "for %(service)s.%(resource)s: %(uuid)s.")
+                            % {"uuid": resource.id(),
+                               "service": resource._service,
+                               "resource": resource._resource})
 
     def _gen_publisher(self):
         """Returns publisher for deletion jobs.
@@ -139,11 +231,18 @@ class SeekAndDestroy(object):
                         % (manager.__module__, type(manager).__name__))
                     LOG.exception(e)
 
+            # Clients are released after listing, so consumers reuse them
+            # without re-authentication
+            def _release(clients):
+                if clients is not None:
+                    clients.release()
+
             if self.admin and (not self.users
                                or self.manager_cls._perform_for_admin_only):
-                manager = self.manager_cls(
-                    admin=self._get_cached_client(self.admin))
+                admin_client = self._get_cached_client(self.admin)
+                manager = self.manager_cls(admin=admin_client)
                 _publish(self.admin, None, manager)
+                _release(admin_client)
 
             else:
                 visited_tenants = set()
@@ -154,12 +253,15 @@ class SeekAndDestroy(object):
                         continue
 
                     visited_tenants.add(user["tenant_id"])
+                    user_client = self._get_cached_client(user)
                     manager = self.manager_cls(
                             admin=admin_client,
-                            user=self._get_cached_client(user),
+                            user=user_client,
                             tenant_uuid=user["tenant_id"])
 
                     _publish(self.admin, user, manager)
+                    _release(user_client)
+                _release(admin_client)
 
         return publisher
 
@@ -176,15 +278,23 @@ class SeekAndDestroy(object):
                     user=self._get_cached_client(user, cache=cache),
                     tenant_uuid=user and user["tenant_id"])
 
-            self._delete_single_resource(manager)
+            if self._delete_single_resource(manager):
+                with self._deleted_lock:
+                    self._deleted.setdefault(
+                        user and user["id"], []).append(manager)
 
         return consumer
 
     def exterminate(self):
-        """Delete all resources for passed users, admin and resource_mgr."""
+        """Delete all resources for passed users, admin and resource_mgr.
 
+        Requests to delete resources are sent first, then deletion of all the
+        resources is confirmed by _wait_for_deletion().
+        """
+        self._deleted = {}
         broker.run(self._gen_publisher(), self._gen_consumer(),
                    consumers_count=self.manager_cls._threads)
+        self._wait_for_deletion(self._deleted)
 
 
 def list_resource_names(admin_required=None):
@@ -196,6 +306,7 @@ def list_resource_names(admin_required=None):
                            True -> returns only admin ResourceManagers
                            False -> returns only non admin ResourceManagers
     """
+    discover.load_all()
     res_mgrs = rutils.itersubclasses(base.ResourceManager)
     if admin_required is not None:
         res_mgrs = filter(lambda cls: cls._admin_required == admin_required,
@@ -220,6 +331,7 @@ def find_resource_managers(names=None, admin_required=None):
     """
     names = set(names or [])
 
+    discover.load_all()
     resource_managers = []
     for manager in rutils.itersubclasses(base.ResourceManager):
         if admin_required is not None:
@@ -270,5 +382,18 @@ def cleanup(names=None, admin_required=None, admin=None, users=None):
 
                   }
     """
-    for manager in find_resource_managers(names, admin_required):
+    def exterminate(manager):
         SeekAndDestroy(manager, admin, users).exterminate()
+
+    # Resource managers with the same order don't depend on each other
+    for order, managers in itertools.groupby(
+            find_resource_managers(names, admin_required),
+            key=lambda manager: manager._order):
+        managers = list(managers)
+        if len(managers) == 1:
+            exterminate(managers[0])
+        else:
+            results, errors = broker.run_for_each(
+                exterminate, managers, consumers_count=len(managers))
+            if errors:
+                raise errors[0][1]
@@ -58,6 +58,7 @@ class ImageGenerator(base.Context):
                 "type": "integer",
                 "minimum": 1
             },
+            "resource_management_workers": base.WORKERS_SCHEMA,
         },
         "required": ["image_url", "image_type", "image_container",
                      "images_per_tenant"],
@@ -75,29 +76,40 @@ class ImageGenerator(base.Context):
         images_per_tenant = self.config["images_per_tenant"]
         image_name = self.config.get("image_name")
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
+        def create_images(args):
+            user, tenant_id = args
             current_images = []
             clients = osclients.Clients(user["endpoint"])
-            glance_scenario = glance_utils.GlanceScenario(
-                clients=clients)
-            for i in range(images_per_tenant):
-                if image_name and i > 0:
-                    cur_name = image_name + str(i)
-                elif image_name:
-                    cur_name = image_name
-                else:
-                    cur_name = glance_scenario._generate_random_name(
-                        prefix="rally_ctx_image_")
+            try:
+                glance_scenario = glance_utils.GlanceScenario(
+                    clients=clients)
+                for i in range(images_per_tenant):
+                    if image_name and i > 0:
+                        cur_name = image_name + str(i)
+                    elif image_name:
+                        cur_name = image_name
+                    else:
+                        cur_name = glance_scenario._generate_random_name(
+                            prefix="rally_ctx_image_")
 
-                image = glance_scenario._create_image(
-                    cur_name, image_container, image_url, image_type,
-                    min_ram=self.config.get("min_ram", 0),
-                    min_disk=self.config.get("min_disk", 0))
-                current_images.append(image.id)
+                    image = glance_scenario._create_image(
+                        cur_name, image_container, image_url, image_type,
+                        min_ram=self.config.get("min_ram", 0),
+                        min_disk=self.config.get("min_disk", 0))
+                    current_images.append(image.id)
+            finally:
+                clients.release()
+            return current_images
 
+        def store(args, current_images):
+            user, tenant_id = args
             self.context["tenants"][tenant_id]["images"] = current_images
 
+        self._setup_for_each(
+            create_images,
+            rutils.iterate_per_tenants(self.context["users"]),
+            store)
+
     @rutils.log_task_wrapper(LOG.info, _("Exit context: `Images`"))
     def cleanup(self):
         # TODO(boris-42): Delete only resources created by this context
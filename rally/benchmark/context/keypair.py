@@ -20,6 +20,7 @@ from rally.benchmark.context.cleanup import manager as resource_manager
 from rally.common.i18n import _
 from rally.common import log as logging
 from rally.common import utils
+from rally import consts
 from rally import osclients
 
 
@@ -30,20 +31,33 @@ LOG = logging.getLogger(__name__)
 class Keypair(base.Context):
     KEYPAIR_NAME = "rally_ssh_key"
 
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "resource_management_workers": base.WORKERS_SCHEMA
+        },
+        "additionalProperties": False
+    }
+
     def _generate_keypair(self, endpoint):
         keypair_name = "%s_%s" % (
             self.KEYPAIR_NAME, self.context["task"]["uuid"])
 
-        nova_client = osclients.Clients(endpoint).nova()
-
-        # NOTE(hughsaunders): If keypair exists, it must be deleted as we can't
-        # retrieve the private key
+        clients = osclients.Clients(endpoint)
         try:
-            nova_client.keypairs.delete(keypair_name)
-        except novaclient.exceptions.NotFound:
-            pass
+            nova_client = clients.nova()
 
-        keypair = nova_client.keypairs.create(keypair_name)
+            # NOTE(hughsaunders): If keypair exists, it must be deleted as we
+            # can't retrieve the private key
+            try:
+                nova_client.keypairs.delete(keypair_name)
+            except novaclient.exceptions.NotFound:
+                pass
+
+            keypair = nova_client.keypairs.create(keypair_name)
+        finally:
+            clients.release()
         return {"private": keypair.private_key,
                 "public": keypair.public_key,
                 "name": keypair_name,
@@ -51,8 +65,12 @@ class Keypair(base.Context):
 
     @utils.log_task_wrapper(LOG.info, _("Enter context: `keypair`"))
     def setup(self):
-        for user in self.context["users"]:
-            user["keypair"] = self._generate_keypair(user["endpoint"])
+        def store(user, keypair):
+            user["keypair"] = keypair
+
+        self._setup_for_each(
+            lambda user: self._generate_keypair(user["endpoint"]),
+            self.context["users"], store)
 
     @utils.log_task_wrapper(LOG.info, _("Exit context: `keypair`"))
     def cleanup(self):
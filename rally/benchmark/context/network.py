@@ -39,7 +39,8 @@ class Network(base.Context):
             "networks_per_tenant": {
                 "type": "integer",
                 "minimum": 1
-            }
+            },
+            "resource_management_workers": base.WORKERS_SCHEMA
         },
         "additionalProperties": False
     }
@@ -49,32 +50,46 @@ class Network(base.Context):
         "networks_per_tenant": 1
     }
 
-    def __init__(self, context):
-        super(Network, self).__init__(context)
-        self.net_wrapper = network_wrapper.wrap(
-            osclients.Clients(context["admin"]["endpoint"]),
-            self.config)
-
     @utils.log_task_wrapper(LOG.info, _("Enter context: `network`"))
     def setup(self):
-        for user, tenant_id in (utils.iterate_per_tenants(
-                self.context.get("users", []))):
-            self.context["tenants"][tenant_id]["networks"] = []
-            for i in range(self.config["networks_per_tenant"]):
+        # Networks are created by concurrent workers, so each call uses its
+        # own clients, because they are not thread safe.
+        def create_network(tenant_id):
+            clients = osclients.Clients(self.context["admin"]["endpoint"])
+            try:
+                net_wrapper = network_wrapper.wrap(clients, self.config)
                 # NOTE(amaretskiy): add_router and subnets_num take effect
                 #                   for Neutron only.
                 # NOTE(amaretskiy): Do we need neutron subnets_num > 1 ?
-                network = self.net_wrapper.create_network(tenant_id,
-                                                          add_router=True,
-                                                          subnets_num=1)
-                self.context["tenants"][tenant_id]["networks"].append(network)
+                return net_wrapper.create_network(tenant_id, add_router=True,
+                                                  subnets_num=1)
+            finally:
+                clients.release()
+
+        def store(tenant_id, network):
+            self.context["tenants"][tenant_id]["networks"].append(network)
+
+        # Each network is created separately, so networks that were created
+        # before a failure are stored in the context and deleted on cleanup.
+        tenants = []
+        for user, tenant_id in (utils.iterate_per_tenants(
+                self.context.get("users", []))):
+            self.context["tenants"][tenant_id]["networks"] = []
+            tenants.extend([tenant_id] * self.config["networks_per_tenant"])
+        self._setup_for_each(create_network, tenants, store)
 
     @utils.log_task_wrapper(LOG.info, _("Exit context: `network`"))
     def cleanup(self):
+        networks = []
         for tenant_id, tenant_ctx in six.iteritems(self.context["tenants"]):
-            for network in tenant_ctx.get("networks", []):
-                with logging.ExceptionLogger(
-                        LOG,
-                        _("Failed to delete network for tenant %s")
-                        % tenant_id):
-                    self.net_wrapper.delete_network(network)
+            networks.extend(tenant_ctx.get("networks", []))
+
+        def delete_network(network):
+            clients = osclients.Clients(self.context["admin"]["endpoint"])
+            try:
+                net_wrapper = network_wrapper.wrap(clients, self.config)
+                net_wrapper.delete_network(network)
+            finally:
+                clients.release()
+
+        self._cleanup_for_each(delete_network, networks)
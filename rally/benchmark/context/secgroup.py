@@ -20,6 +20,7 @@ from rally.benchmark.wrappers import network
 from rally.common.i18n import _
 from rally.common import log as logging
 from rally.common import utils
+from rally import consts
 from rally import osclients
 
 
@@ -39,7 +40,8 @@ def _prepare_open_secgroup(endpoint, secgroup_name):
 
     :returns: dict with security group details
     """
-    nova = osclients.Clients(endpoint).nova()
+    clients = osclients.Clients(endpoint)
+    nova = clients.nova()
 
     if secgroup_name not in [sg.name for sg in nova.security_groups.list()]:
         descr = "Allow ssh access to VMs created by Rally for benchmarking"
@@ -81,12 +83,21 @@ def _prepare_open_secgroup(endpoint, secgroup_name):
                         to_port=new_rule["to_port"],
                         ip_protocol=new_rule["ip_protocol"],
                         cidr=new_rule["ip_range"]["cidr"])
+    clients.release()
 
     return rally_open.to_dict()
 
 
 @base.context(name="allow_ssh", order=320)
 class AllowSSH(base.Context):
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "resource_management_workers": base.WORKERS_SCHEMA
+        },
+        "additionalProperties": False
+    }
 
     def __init__(self, context):
         super(AllowSSH, self).__init__(context)
@@ -108,17 +119,34 @@ class AllowSSH(base.Context):
         secgroup_name = "%s_%s" % (SSH_GROUP_NAME,
                                    self.context["task"]["uuid"])
 
-        for user in self.context["users"]:
-            user["secgroup"] = _prepare_open_secgroup(user["endpoint"],
-                                                      secgroup_name)
+        # Security groups are shared by users of the same tenant, so they
+        # are prepared once per tenant to avoid creation of duplicates.
+        def prepare_secgroup(args):
+            user, tenant_id = args
+            return _prepare_open_secgroup(user["endpoint"], secgroup_name)
+
+        def store(args, secgroup):
+            user, tenant_id = args
+            for tenant_user in self.context["users"]:
+                if tenant_user["tenant_id"] == tenant_id:
+                    tenant_user["secgroup"] = secgroup
+
+        self._setup_for_each(
+            prepare_secgroup,
+            utils.iterate_per_tenants(self.context["users"]),
+            store)
 
     @utils.log_task_wrapper(LOG.info, _("Exit context: `allow_ssh`"))
     def cleanup(self):
-        for user, tenant_id in utils.iterate_per_tenants(
-                self.context["users"]):
+        def delete_secgroup(args):
+            user, tenant_id = args
             with logging.ExceptionLogger(
                     LOG, _("Unable to delete secgroup: %s.") %
                     user["secgroup"]["name"]):
                 clients = osclients.Clients(user["endpoint"])
                 clients.nova().security_groups.get(
                      user["secgroup"]["id"]).delete()
+
+        self._cleanup_for_each(
+            delete_secgroup,
+            utils.iterate_per_tenants(self.context["users"]))
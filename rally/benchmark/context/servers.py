@@ -30,7 +30,9 @@ LOG = logging.getLogger(__name__)
 class ServerGenerator(base.Context):
     """Context class for adding temporary servers for benchmarks.
 
-        Servers are added for each tenant.
+        Servers are added for each tenant. Each boot request creates up to
+        "servers_per_request" servers (min_count/max_count of Nova API),
+        then all the servers of the tenant are waited for at once.
     """
 
     CONFIG_SCHEMA = {
@@ -57,13 +59,19 @@ class ServerGenerator(base.Context):
                 "type": "integer",
                 "minimum": 1
             },
+            "servers_per_request": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "resource_management_workers": base.WORKERS_SCHEMA,
         },
         "required": ["image", "flavor"],
         "additionalProperties": False
     }
 
     DEFAULT_CONFIG = {
-        "servers_per_tenant": 5
+        "servers_per_tenant": 5,
+        "servers_per_request": 1
     }
 
     @rutils.log_task_wrapper(LOG.info, _("Enter context: `Servers`"))
@@ -71,6 +79,7 @@ class ServerGenerator(base.Context):
         image = self.config["image"]
         flavor = self.config["flavor"]
         servers_per_tenant = self.config["servers_per_tenant"]
+        servers_per_request = self.config["servers_per_request"]
 
         clients = osclients.Clients(self.context["users"][0]["endpoint"])
         image_id = types.ImageResourceType.transform(clients=clients,
@@ -78,32 +87,51 @@ class ServerGenerator(base.Context):
         flavor_id = types.FlavorResourceType.transform(clients=clients,
                                                        resource_config=flavor)
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
+        def boot_servers(args):
+            user, tenant_id = args
             LOG.debug("Booting servers for user tenant %s "
                       % (user["tenant_id"]))
             clients = osclients.Clients(user["endpoint"])
-            nova_scenario = nova_utils.NovaScenario(clients=clients)
-            server_name_prefix = nova_scenario._generate_random_name(
-                                                prefix="ctx_rally_server_")
-
-            LOG.debug("Calling _boot_servers with server_name_prefix=%s "
-                      "image_id=%s flavor_id=%s servers_per_tenant=%s"
-                      % (server_name_prefix, image_id,
-                         flavor_id, flavor_id))
-
-            servers = nova_scenario._boot_servers(
-                server_name_prefix, image_id, flavor_id,
-                servers_per_tenant)
-
-            current_servers = [server.id for server in servers]
-
+            try:
+                nova_scenario = nova_utils.NovaScenario(clients=clients)
+                server_name_prefix = nova_scenario._generate_random_name(
+                                                    prefix="ctx_rally_server_")
+
+                requests, remainder = divmod(servers_per_tenant,
+                                             servers_per_request)
+                LOG.debug("Calling _boot_servers with server_name_prefix=%s "
+                          "image_id=%s flavor_id=%s servers_per_tenant=%s "
+                          "servers_per_request=%s"
+                          % (server_name_prefix, image_id, flavor_id,
+                             servers_per_tenant, servers_per_request))
+
+                servers = []
+                if requests:
+                    servers.extend(nova_scenario._boot_servers(
+                        server_name_prefix, image_id, flavor_id,
+                        requests, instances_amount=servers_per_request))
+                if remainder:
+                    servers.extend(nova_scenario._boot_servers(
+                        server_name_prefix + "_last", image_id, flavor_id,
+                        1, instances_amount=remainder))
+            finally:
+                clients.release()
+
+            return [server.id for server in servers]
+
+        def store(args, current_servers):
+            user, tenant_id = args
             LOG.debug("Adding booted servers %s to context"
                       % current_servers)
 
             self.context["tenants"][tenant_id][
                 "servers"] = current_servers
 
+        self._setup_for_each(
+            boot_servers,
+            rutils.iterate_per_tenants(self.context["users"]),
+            store)
+
     @rutils.log_task_wrapper(LOG.info, _("Exit context: `Servers`"))
     def cleanup(self):
         resource_manager.cleanup(names=["nova.servers"],
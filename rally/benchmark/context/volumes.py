@@ -14,7 +14,6 @@
 
 from rally.benchmark.context import base
 from rally.benchmark.context.cleanup import manager as resource_manager
-from rally.benchmark.scenarios import base as scenario_base
 from rally.benchmark.scenarios.cinder import utils as cinder_utils
 from rally.common.i18n import _
 from rally.common import log as logging
@@ -28,7 +27,11 @@ LOG = logging.getLogger(__name__)
 
 @base.context(name="volumes", order=420)
 class VolumeGenerator(base.Context):
-    """Context class for adding volumes to each user for benchmarks."""
+    """Context class for adding volumes to each user for benchmarks.
+
+    Volumes of a tenant are created by "parallel_requests" concurrent
+    requests, then all of them are waited for at once.
+    """
 
     CONFIG_SCHEMA = {
         "type": "object",
@@ -41,14 +44,20 @@ class VolumeGenerator(base.Context):
             "volumes_per_tenant": {
                 "type": "integer",
                 "minimum": 1
-            }
+            },
+            "parallel_requests": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "resource_management_workers": base.WORKERS_SCHEMA
         },
         "required": ["size"],
         "additionalProperties": False
     }
 
     DEFAULT_CONFIG = {
-        "volumes_per_tenant": 1
+        "volumes_per_tenant": 1,
+        "parallel_requests": 1
     }
 
     @rutils.log_task_wrapper(LOG.info, _("Enter context: `Volumes`"))
@@ -56,16 +65,28 @@ class VolumeGenerator(base.Context):
         size = self.config["size"]
         volumes_per_tenant = self.config["volumes_per_tenant"]
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
-            self.context["tenants"][tenant_id].setdefault("volumes", list())
+        def create_volumes(args):
+            user, tenant_id = args
             clients = osclients.Clients(user["endpoint"])
-            cinder_util = cinder_utils.CinderScenario(clients=clients)
-            for i in range(volumes_per_tenant):
-                rnd_name = scenario_base.Scenario._generate_random_name(
-                                                    prefix="ctx_rally_volume_")
-                vol = cinder_util._create_volume(size, display_name=rnd_name)
-                self.context["tenants"][tenant_id]["volumes"].append(vol._info)
+            try:
+                cinder_util = cinder_utils.CinderScenario(clients=clients)
+                volumes = cinder_util._create_volumes(
+                    size, volumes_per_tenant,
+                    workers=self.config["parallel_requests"],
+                    name_prefix="ctx_rally_volume_")
+            finally:
+                clients.release()
+            return [vol._info for vol in volumes]
+
+        def store(args, volumes):
+            user, tenant_id = args
+            self.context["tenants"][tenant_id].setdefault(
+                "volumes", list()).extend(volumes)
+
+        self._setup_for_each(
+            create_volumes,
+            rutils.iterate_per_tenants(self.context["users"]),
+            store)
 
     @rutils.log_task_wrapper(LOG.info, _("Exit context: `Volumes`"))
     def cleanup(self):
@@ -13,19 +13,25 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import json
 import threading
 import time
 import traceback
 
 import jsonschema
+from oslo_config import cfg
 import six
 
 from rally.benchmark.context import base as base_ctx
 from rally.benchmark.context import users as users_ctx
+from rally.benchmark.processing import sketch
+from rally.benchmark.processing import table
 from rally.benchmark.runners import base as base_runner
 from rally.benchmark.scenarios import base as base_scenario
 from rally.benchmark.sla import base as base_sla
+from rally.common import broker
+from rally.common import costilius
 from rally.common.i18n import _
 from rally.common import log as logging
 from rally.common import utils as rutils
@@ -37,6 +43,22 @@ from rally import osclients
 
 LOG = logging.getLogger(__name__)
 
+ENGINE_BENCHMARK_OPTS = [
+    cfg.IntOpt("semantic_validation_workers",
+               default=10,
+               help="Number of concurrent threads used to run semantic "
+                    "validation of benchmarks of a task")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(ENGINE_BENCHMARK_OPTS, group=benchmark_group)
+
+# Iterations are stored to DB by chunks of this size, or after this number of
+# seconds, so they are not kept in memory during the run
+RESULTS_CHUNK_SIZE = 1000
+RESULTS_FLUSH_INTERVAL = 10.0
+
 
 CONFIG_SCHEMA = {
     "type": "object",
@@ -63,6 +85,9 @@ CONFIG_SCHEMA = {
                     "sla": {
                         "type": "object"
                     },
+                    "group": {
+                        "type": "string"
+                    },
                 },
                 "additionalProperties": False
             }
@@ -71,6 +96,19 @@ CONFIG_SCHEMA = {
 }
 
 
+def _per_second_series(counts):
+    """Turn {timestamp_second: count} into a gapless list of counts.
+
+    :param counts: dict with numbers of events per second of unix time
+    :returns: list of [second since the first event, count] pairs
+    """
+    if not counts:
+        return []
+    first = min(counts)
+    return [[sec, counts.get(first + sec, 0)]
+            for sec in range(max(counts) - first + 1)]
+
+
 class BenchmarkEngine(object):
     """The Benchmark engine class is used to execute benchmark scenarios.
 
@@ -94,7 +132,7 @@ class BenchmarkEngine(object):
     """
 
     def __init__(self, config, task, admin=None, users=None,
-                 abort_on_sla_failure=False):
+                 abort_on_sla_failure=False, parallel=1):
         """BenchmarkEngine constructor.
 
         :param config: The configuration with specified benchmark scenarios
@@ -103,17 +141,23 @@ class BenchmarkEngine(object):
         :param users: List of dicts with user credentials
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param parallel: Max number of benchmarks that are run at the same
+                         time, see run()
         """
         self.config = config
         self.task = task
         self.admin = admin and objects.Endpoint(**admin) or None
         self.users = map(lambda u: objects.Endpoint(**u), users or [])
         self.abort_on_sla_failure = abort_on_sla_failure
+        self.parallel = parallel
 
     @rutils.log_task_wrapper(LOG.info, _("Task validation check cloud."))
     def _check_cloud(self):
         clients = osclients.Clients(self.admin)
-        clients.verified_keystone()
+        try:
+            clients.verified_keystone()
+        finally:
+            clients.release()
 
     @rutils.log_task_wrapper(LOG.info,
                              _("Task validation of scenarios names."))
@@ -164,14 +208,52 @@ class BenchmarkEngine(object):
 
         with users_ctx.UserGenerator(context) as ctx:
             ctx.setup()
-            admin = osclients.Clients(self.admin)
-            user = osclients.Clients(context["users"][0]["endpoint"])
-
-            for name, values in six.iteritems(config):
-                for pos, kwargs in enumerate(values):
-                    self._validate_config_semantic_helper(admin, user, name,
-                                                          pos, deployment,
-                                                          kwargs)
+            user_endpoint = context["users"][0]["endpoint"]
+            worker_clients = []
+
+            # Benchmarks are validated concurrently, each worker uses clients
+            # of its own, because they are not thread safe. Clients of all the
+            # workers have the same endpoints, so cloud lookups of validators
+            # are shared anyway, see validation._cached(). Handles of the
+            # temporary user are useless after validation, so they are not
+            # put to the pool.
+            def validate(cache, benchmark):
+                if not cache:
+                    cache["admin"] = osclients.Clients(self.admin)
+                    cache["user"] = osclients.Clients(user_endpoint,
+                                                      pooled=False)
+                    # list.extend() is atomic, so no lock is required here
+                    worker_clients.extend([cache["admin"], cache["user"]])
+                name, pos, kwargs = benchmark
+                self._validate_config_semantic_helper(
+                    cache["admin"], cache["user"], name, pos, deployment,
+                    kwargs)
+
+            benchmarks = [(name, pos, kwargs)
+                          for name, values in six.iteritems(config)
+                          for pos, kwargs in enumerate(values)]
+            try:
+                results, errors = broker.run_for_each(
+                    validate, benchmarks,
+                    CONF.benchmark.semantic_validation_workers,
+                    with_cache=True)
+            finally:
+                for clients in worker_clients:
+                    clients.release()
+
+        failures = [e for benchmark, e in errors
+                    if isinstance(e, exceptions.InvalidBenchmarkConfig)]
+        for benchmark, e in errors:
+            if not isinstance(e, exceptions.InvalidBenchmarkConfig):
+                raise e
+        if len(failures) == 1:
+            raise failures[0]
+        elif failures:
+            raise exceptions.InvalidBenchmarksConfig(
+                count=len(failures),
+                reasons="\n".join(
+                    "%(name)s[%(pos)s]: %(reason)s" % e.kwargs
+                    for e in failures))
 
     @rutils.log_task_wrapper(LOG.info, _("Task validation."))
     def validate(self):
@@ -206,71 +288,157 @@ class BenchmarkEngine(object):
 
         return context_obj
 
+    def _get_benchmark_groups(self):
+        """Split benchmarks of the task config into independent groups.
+
+        Benchmarks with the same "group" option are run one after another in
+        the order of the task config, each other benchmark makes a group.
+
+        :returns: list of lists of benchmark keys
+        """
+        groups = costilius.OrderedDict()
+        for name in self.config:
+            for n, kw in enumerate(self.config[name]):
+                key = {"name": name, "pos": n, "kw": kw}
+                groups.setdefault(kw.get("group", (name, n)), []).append(key)
+        return list(groups.values())
+
+    def _run_benchmark(self, key):
+        """Run one benchmark and store its results.
+
+        :param key: Scenario identifier
+        :returns: False if the benchmark was aborted, True otherwise
+        """
+        LOG.info("Running benchmark with key: \n%s"
+                 % json.dumps(key, indent=2))
+        kw = key["kw"]
+        runner = self._get_runner(kw)
+        durations = {"load_duration": 0, "full_duration": 0}
+        consumer = threading.Thread(
+            target=self.consume_results,
+            args=(key, self.task, runner, durations))
+        consumer.start()
+        context_obj = self._prepare_context(kw.get("context", {}),
+                                            key["name"], self.admin)
+        try:
+            with rutils.Timer() as timer:
+                with base_ctx.ContextManager(context_obj):
+                    durations["load_duration"] = runner.run(
+                        key["name"], context_obj, kw.get("args", {}))
+        except Exception as e:
+            LOG.exception(e)
+        finally:
+            durations["full_duration"] = timer.duration()
+            runner.finish_results()
+            consumer.join()
+        LOG.debug("OpenStack clients pool of rally process: %(hits)d hits, "
+                  "%(misses)d misses, %(auth_calls)d keystone "
+                  "authentications" % osclients.get_cache_stats())
+        return not runner.aborted.is_set()
+
+    def _run_group(self, keys):
+        for i, key in enumerate(keys):
+            if not self._run_benchmark(key) and self.abort_on_sla_failure:
+                if keys[i + 1:]:
+                    LOG.info("Benchmark %(name)s (%(pos)s) was aborted, "
+                             "skipping the rest of its group \"%(group)s\""
+                             % {"name": key["name"], "pos": key["pos"],
+                                "group": key["kw"]["group"]})
+                break
+
     @rutils.log_task_wrapper(LOG.info, _("Benchmarking."))
     def run(self):
         """Run the benchmark according to the test configuration.
 
         Test configuration is specified on engine initialization.
 
-        :returns: List of dicts, each dict containing the results of all the
-                  corresponding benchmark test launches
+        By default benchmarks are run one after another. If parallel is
+        greater than 1, up to parallel independent groups of benchmarks (see
+        _get_benchmark_groups()) are run at the same time. Benchmarks of a
+        group are run one by one, and if one of them is aborted because of
+        SLA failure, the rest of the group is skipped.
+
+        Note that parallel limits only the number of benchmarks that are run
+        at the same time, not the load: each benchmark runs iterations with
+        the concurrency of its own runner, so the load of benchmarks that are
+        run at the same time is summed up. Abort because of SLA failure
+        doesn't affect other groups, as it doesn't affect the next benchmarks
+        in the sequential mode.
         """
         self.task.update_status(consts.TaskStatus.RUNNING)
-        for name in self.config:
-            for n, kw in enumerate(self.config[name]):
-                key = {"name": name, "pos": n, "kw": kw}
-                LOG.info("Running benchmark with key: \n%s"
-                         % json.dumps(key, indent=2))
-                runner = self._get_runner(kw)
-                is_done = threading.Event()
-                consumer = threading.Thread(
-                    target=self.consume_results,
-                    args=(key, self.task, is_done, runner))
-                consumer.start()
-                context_obj = self._prepare_context(kw.get("context", {}),
-                                                    name, self.admin)
-                self.duration = 0
-                self.full_duration = 0
-                try:
-                    with rutils.Timer() as timer:
-                        with base_ctx.ContextManager(context_obj):
-                            self.duration = runner.run(name, context_obj,
-                                                       kw.get("args", {}))
-                except Exception as e:
-                    LOG.exception(e)
-                finally:
-                    self.full_duration = timer.duration()
-                    is_done.set()
-                    consumer.join()
+        if self.parallel > 1:
+            groups = self._get_benchmark_groups()
+
+            def publish(queue):
+                for group in groups:
+                    queue.append(group)
+
+            def consume(cache, group):
+                self._run_group(group)
+
+            broker.run(publish, consume, min(self.parallel, len(groups)))
+        else:
+            for name in self.config:
+                for n, kw in enumerate(self.config[name]):
+                    self._run_benchmark({"name": name, "pos": n, "kw": kw})
         self.task.update_status(consts.TaskStatus.FINISHED)
 
-    def consume_results(self, key, task, is_done, runner):
+    def consume_results(self, key, task, runner, durations):
         """Consume scenario runner results from queue and send them to db.
 
         Has to be run from different thread simultaneously with the runner.run
-        method.
+        method. Blocks until the runner sends new results, and returns after
+        runner.finish_results() is called.
 
         :param key: Scenario identifier
         :param task: Running task
-        :param is_done: Event which is set from the runner thread after the
-                        runner finishes it's work.
         :param runner: ScenarioRunner object that was used to run a task
+        :param durations: dict with "load_duration" and "full_duration" of the
+                          benchmark, they are filled before
+                          runner.finish_results() is called
         """
-        results = []
+        task_result = task.append_results(key, {"chunks": 0, "sla": [],
+                                                "load_duration": 0,
+                                                "full_duration": 0})
+        chunk = table.IterationsTable()
+        chunks = 0
+        flushed_at = time.time()
+        started_per_second = collections.defaultdict(int)
+        iterations_sketch = sketch.IterationsSketch()
         sla_checker = base_sla.SLAChecker(key["kw"])
         while True:
-            if runner.result_queue:
-                result = runner.result_queue.popleft()
-                results.append(result)
+            batch = runner.get_results()
+            if batch is None:
+                break
+            for result in batch:
+                chunk.append(result)
+                if len(chunk) >= RESULTS_CHUNK_SIZE:
+                    task.append_results_chunk(task_result["id"], chunks,
+                                              chunk.to_dict())
+                    chunk, chunks = table.IterationsTable(), chunks + 1
+                    flushed_at = time.time()
+                if "timestamp" in result:
+                    started_per_second[int(result["timestamp"])] += 1
+                iterations_sketch.add_iteration(result)
                 success = sla_checker.add_iteration(result)
                 if self.abort_on_sla_failure and not success:
                     runner.abort()
-            elif is_done.isSet():
-                break
-            else:
-                time.sleep(0.1)
-
-        task.append_results(key, {"raw": results,
-                                  "load_duration": self.duration,
-                                  "full_duration": self.full_duration,
-                                  "sla": sla_checker.results()})
+            if chunk and time.time() - flushed_at >= RESULTS_FLUSH_INTERVAL:
+                task.append_results_chunk(task_result["id"], chunks,
+                                          chunk.to_dict())
+                chunk, chunks = table.IterationsTable(), chunks + 1
+                flushed_at = time.time()
+
+        if chunk:
+            task.append_results_chunk(task_result["id"], chunks,
+                                      chunk.to_dict())
+            chunks += 1
+        task.update_results(task_result["id"],
+                            {"chunks": chunks,
+                             "load_duration": durations["load_duration"],
+                             "full_duration": durations["full_duration"],
+                             "achieved_rps": _per_second_series(
+                                 started_per_second),
+                             "runner_summary": runner.summary(),
+                             "sketch": iterations_sketch.to_dict(),
+                             "sla": sla_checker.results()})
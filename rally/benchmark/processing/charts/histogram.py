@@ -15,6 +15,8 @@
 
 import math
 
+from rally.benchmark.processing import utils
+
 
 class Histogram:
     """Represents a Histogram chart."""
@@ -50,14 +52,12 @@ class Histogram:
                 for i in range(1, self.number_of_bins + 1)]
 
     def _calculate_y_axis(self):
-        """Return a list with the values of the y axis."""
-        y_axis = [0] * len(self.x_axis)
-        for data_point in self.data:
-            for i, bin in enumerate(self.x_axis):
-                if data_point <= bin:
-                    y_axis[i] += 1
-                    break
-        return y_axis
+        """Return a list with the values of the y axis.
+
+        A data point is counted in the first bin whose right edge is not
+        less than the point.
+        """
+        return utils.bin_counts(self.data, self.x_axis)
 
 
 def calculate_number_of_bins_sqrt(data):
@@ -0,0 +1,134 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Downsampling of time series shown by reports.
+
+Reports show a point per iteration, which is too much for long runs, so
+series are reduced to a limited number of points. Points are selected from
+the series (not averaged), so spikes are kept. Methods:
+
+* "lttb" - Largest-Triangle-Three-Buckets: series are split into buckets
+  and the point of a bucket that forms the largest triangle with the point
+  selected in the previous bucket and the average of the next bucket is
+  selected; the first and the last points are always kept;
+* "minmax" - the lowest and the highest points of every bucket (envelope).
+
+Both take linear time.
+"""
+
+from rally.common import costilius
+
+
+DEFAULT_LIMIT = 1000
+
+
+def _lttb(values, limit):
+    n = len(values)
+
+    def bound(i):
+        # Bucket i is values[bound(i):bound(i + 1)], the first and the last
+        # points are buckets of their own
+        return min(1 + i * (n - 2) // (limit - 2), n)
+
+    selected = [0]
+    a = 0
+    for i in range(limit - 2):
+        start, end, next_end = bound(i), bound(i + 1), bound(i + 2)
+        avg_x = (end + next_end - 1) / 2.0
+        avg_y = sum(values[end:next_end]) / float(next_end - end)
+
+        ay = values[a]
+        max_area = -1
+        for j in range(start, end):
+            area = abs((a - avg_x) * (values[j] - ay) -
+                       (a - j) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                point = j
+        selected.append(point)
+        a = point
+    selected.append(n - 1)
+    return selected
+
+
+def _minmax(values, limit):
+    n = len(values)
+    buckets = limit // 2
+    selected = []
+    start = 0
+    for i in range(1, buckets + 1):
+        end = i * n // buckets
+        bucket = values[start:end]
+        low = start + bucket.index(min(bucket))
+        high = start + bucket.index(max(bucket))
+        selected.extend(sorted(set([low, high])))
+        start = end
+    return selected
+
+
+METHODS = {"lttb": _lttb, "minmax": _minmax}
+
+
+def select(values, limit=DEFAULT_LIMIT, method="lttb"):
+    """Select points of series to be shown.
+
+    :param values: list of numbers
+    :param limit: int, max number of points to be selected, at least 3
+    :param method: "lttb" or "minmax", see the module docstring
+    :returns: sorted list of indexes of selected points
+    """
+    if limit < 3:
+        raise ValueError("At least 3 points should be selected, not %s"
+                         % limit)
+    if method not in METHODS:
+        raise ValueError("Unknown downsampling method %s" % method)
+    if len(values) <= limit:
+        return list(range(len(values)))
+    return METHODS[method](values, limit)
+
+
+def _normalize(value):
+    return value and round(float(value), 2) or 0.0
+
+
+def downsample(series, limit=DEFAULT_LIMIT, method="lttb"):
+    """Reduce series of a stacked chart to a limited number of points.
+
+    Points are selected by sums of the series, so all the series have the
+    same points, as stacked area charts require, and peaks of the whole
+    stack are kept.
+
+    :param series: dict name -> list of values, lists have equal length
+    :param limit: int, max number of points, at least 3
+    :param method: "lttb" or "minmax", see the module docstring
+    :returns: OrderedDict name -> items list [(idx1, value1), ...] where
+              indexes of points in the series start from 1
+    """
+    names = list(series)
+    normalized = [[_normalize(value) for value in series[name]]
+                  for name in names]
+    if not normalized:
+        return costilius.OrderedDict()
+
+    if len(normalized) == 1:
+        totals = normalized[0]
+    else:
+        totals = [sum(point) for point in zip(*normalized)]
+    indexes = select(totals, limit, method)
+
+    return costilius.OrderedDict(
+        (name, [(idx + 1, values[idx]) for idx in indexes])
+        for name, values in zip(names, normalized))
@@ -13,53 +13,75 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import copy
 import json
 
 import six
 
 from rally.benchmark.processing.charts import histogram as histo
+from rally.benchmark.processing import downsampling
+from rally.benchmark.processing import sketch
 from rally.benchmark.processing import utils
+from rally.common import costilius
 from rally.ui import utils as ui_utils
 
 
-def _prepare_data(data):
+def _append(series, key, idx, value):
+    """Put value of series[key] for idx-th item, missing ones are zeros."""
+    values = series.get(key)
+    if values is None:
+        values = series[key] = []
+    if len(values) < idx:
+        values.extend([0] * (idx - len(values)))
+    values.append(value)
+
+
+def _pad(series, length):
+    for values in series.values():
+        if len(values) < length:
+            values.extend([0] * (length - len(values)))
+
+
+def _prepare_data(data, points=downsampling.DEFAULT_LIMIT,
+                  downsampling_method="lttb"):
+    """Collect everything the report needs in one pass over iterations.
+
+    Iterations are not modified. Atomic actions and output values that are
+    missing in some iterations are counted as zeros.
+
+    :param data: task result, "result" may be any iterable over iterations
+    :param points: max number of points of series of stacked area charts
+    :param downsampling_method: method of selecting the points, see
+                                downsampling.METHODS
+    """
     durations = []
     idle_durations = []
-    atomic_durations = {}
-    output = {}
+    success_durations = []
+    atomic_durations = costilius.OrderedDict()
+    success_atomic_durations = costilius.OrderedDict()
+    output = costilius.OrderedDict()
     output_errors = []
-    output_stacked = []
     errors = []
 
-    # NOTE(maretskiy): We need this extra iteration
-    # to determine something that we should know about the data
-    # before starting its processing.
-    atomic_names = set()
-    output_names = set()
-    for r in data["result"]:
-        atomic_names.update(r["atomic_actions"].keys())
-        output_names.update(r["scenario_output"]["data"].keys())
+    # Results stored before sketches were introduced don't have them
+    if data.get("sketch"):
+        iterations_sketch = sketch.IterationsSketch.from_dict(data["sketch"])
+        add_to_sketch = None
+    else:
+        iterations_sketch = sketch.IterationsSketch()
+        add_to_sketch = iterations_sketch.add_iteration
 
     for idx, r in enumerate(data["result"]):
-        # NOTE(maretskiy): Sometimes we miss iteration data.
-        # So we care about data integrity by setting zero values
-        if len(r["atomic_actions"]) < len(atomic_names):
-            for atomic_name in atomic_names:
-                r["atomic_actions"].setdefault(atomic_name, 0)
-
-        if len(r["scenario_output"]["data"]) < len(output_names):
-            for output_name in output_names:
-                r["scenario_output"]["data"].setdefault(output_name, 0)
+        if add_to_sketch:
+            add_to_sketch(r)
 
         if r["scenario_output"]["errors"]:
             output_errors.append((idx, r["scenario_output"]["errors"]))
 
-        for param, value in r["scenario_output"]["data"].items():
-            try:
-                output[param].append(value)
-            except KeyError:
-                output[param] = [value]
+        for param, value in six.iteritems(r["scenario_output"]["data"]):
+            _append(output, param, idx, value)
+
+        for met, duration in six.iteritems(r["atomic_actions"]):
+            _append(atomic_durations, met, idx, duration)
 
         if r["error"]:
             type_, message, traceback = r["error"]
@@ -69,48 +91,53 @@ def _prepare_data(data):
                            "traceback": traceback})
 
             # NOTE(maretskiy): Reset failed durations (no sense to display)
-            r["duration"] = 0
-            r["idle_duration"] = 0
-
-        durations.append(r["duration"])
-        idle_durations.append(r["idle_duration"])
-
-        for met, duration in r["atomic_actions"].items():
-            try:
-                atomic_durations[met].append(duration)
-            except KeyError:
-                atomic_durations[met] = [duration]
+            durations.append(0)
+            idle_durations.append(0)
+        else:
+            for met, duration in six.iteritems(r["atomic_actions"]):
+                # in case any single atomic action failed, put 0
+                _append(success_atomic_durations, met,
+                        len(success_durations), duration or 0.0)
+            success_durations.append(r["duration"])
+            durations.append(r["duration"])
+            idle_durations.append(r["idle_duration"])
 
-    for k, v in six.iteritems(output):
-        output_stacked.append({"key": k, "values": utils.compress(v)})
+    _pad(output, len(durations))
+    _pad(atomic_durations, len(durations))
+    _pad(success_atomic_durations, len(success_durations))
 
-    for k, v in six.iteritems(atomic_durations):
-        atomic_durations[k] = utils.compress(v)
+    def downsample(series):
+        return downsampling.downsample(series, points, downsampling_method)
 
     return {
-        "total_durations": {
-            "duration": utils.compress(durations),
-            "idle_duration": utils.compress(idle_durations)},
-        "atomic_durations": atomic_durations,
-        "output": output_stacked,
+        "total_durations": downsample(
+            costilius.OrderedDict([("duration", durations),
+                                   ("idle_duration", idle_durations)])),
+        "atomic_durations": downsample(atomic_durations),
+        "success_durations": success_durations,
+        "success_atomic_durations": success_atomic_durations,
+        "iterations_sketch": iterations_sketch,
+        "output": [{"key": k, "values": v}
+                   for k, v in six.iteritems(downsample(output))],
         "output_errors": output_errors,
         "errors": errors,
         "sla": data["sla"],
         "load_duration": data["load_duration"],
         "full_duration": data["full_duration"],
+        "iterations_num": len(durations),
     }
 
 
-def _process_main_duration(result, data):
-    histogram_data = [r["duration"] for r in result["result"]
-                      if not r["error"]]
-    histograms = []
-    if histogram_data:
-        hvariety = histo.hvariety(histogram_data)
-        for i in range(len(hvariety)):
-            histograms.append(histo.Histogram(histogram_data,
-                                              hvariety[i]["number_of_bins"],
-                                              hvariety[i]["method"]))
+def _histograms(data, key=None):
+    """Return histograms of data with bins calculated by all the methods."""
+    return [histo.Histogram(data, hvariety["number_of_bins"],
+                            hvariety["method"], key)
+            for hvariety in histo.hvariety(data)]
+
+
+def _process_main_duration(data):
+    histogram_data = data["success_durations"]
+    histograms = _histograms(histogram_data) if histogram_data else []
 
     stacked_area = []
     for key in "duration", "idle_duration":
@@ -137,70 +164,14 @@ def _process_main_duration(result, data):
     }
 
 
-def _process_atomic(result, data):
-
-    def avg(lst, key=None):
-        lst = lst if not key else map(lambda x: x[key], lst)
-        return utils.mean(lst)
-
-    # NOTE(boris-42): In our result["result"] we have next structure:
-    #                 {"error": NoneOrDict,
-    #                  "atomic_actions": {
-    #                       "action1": <duration>,
-    #                       "action2": <duration>
-    #                   }
-    #                 }
-    #                 Our goal is to get next structure:
-    #                 [{"key": $atomic_actions.action,
-    #                   "values": [[order, $atomic_actions.duration
-    #                              if not $error else 0], ...}]
-    #
-    #                 Order of actions in "atomic_action" is similar for
-    #                 all iteration. So we should take first non "error"
-    #                 iteration. And get in atomitc_iter list:
-    #                 [{"key": "action", "values":[]}]
-    stacked_area = []
-    for row in result["result"]:
-        if not row["error"] and "atomic_actions" in row:
-            stacked_area = [{"key": a, "values": []}
-                            for a in row["atomic_actions"]]
-            break
-
-    # NOTE(boris-42): pie is similar to stacked_area, only difference is in
-    #                 structure of values. In case of $error we shouldn't put
-    #                 anything in pie. In case of non error we should put just
-    #                 $atomic_actions.duration (without order)
-    pie = []
-    histogram_data = []
-    if stacked_area:
-        pie = copy.deepcopy(stacked_area)
-        histogram_data = copy.deepcopy(stacked_area)
-        for i, res in enumerate(result["result"]):
-            # in case of error put (order, 0.0) to all actions of stacked area
-            if res["error"]:
-                for k in range(len(stacked_area)):
-                    stacked_area[k]["values"].append([i + 1, 0.0])
-                continue
-
-            # in case of non error put real durations to pie and stacked area
-            for j, action in enumerate(res["atomic_actions"].keys()):
-                # in case any single atomic action failed, put 0
-                action_duration = res["atomic_actions"][action] or 0.0
-                pie[j]["values"].append(action_duration)
-                histogram_data[j]["values"].append(action_duration)
-
-    # filter out empty action lists in pie / histogram to avoid errors
-    pie = filter(lambda x: x["values"], pie)
-    histogram_data = [x for x in histogram_data if x["values"]]
-
-    histograms = [[] for atomic_action in range(len(histogram_data))]
-    for i, atomic_action in enumerate(histogram_data):
-        hvariety = histo.hvariety(atomic_action["values"])
-        for v in range(len(hvariety)):
-            histograms[i].append(histo.Histogram(atomic_action["values"],
-                                                 hvariety[v]["number_of_bins"],
-                                                 hvariety[v]["method"],
-                                                 atomic_action["key"]))
+def _process_atomic(data):
+    # NOTE(boris-42): pie and histograms are built of durations of atomic
+    #                 actions of iterations without errors, stacked area
+    #                 shows all the iterations (0 in case of error)
+    success_durations = data["success_atomic_durations"]
+    histograms = [_histograms(durations, action)
+                  for action, durations in six.iteritems(success_durations)]
+
     stacked_area = []
     for name, durations in six.iteritems(data["atomic_durations"]):
         stacked_area.append({
@@ -220,42 +191,32 @@ def _process_atomic(result, data):
             for i, atomic_action_list in enumerate(histograms)
         ],
         "iter": stacked_area,
-        "pie": [{"key": x["key"], "value": avg(x["values"])} for x in pie]
+        "pie": [{"key": action, "value": utils.mean(durations)}
+                for action, durations in six.iteritems(success_durations)]
     }
 
 
-def _get_atomic_action_durations(result):
-    raw = result.get("result", [])
-    actions_data = utils.get_atomic_actions_data(raw)
+def _get_atomic_action_durations(iterations_sketch, iterations_num):
     table = []
-    total = []
-    for action in actions_data:
-        durations = actions_data[action]
-        if durations:
+    for action, durations in iterations_sketch.items():
+        if durations.count:
             data = [action,
-                    round(min(durations), 3),
-                    round(utils.mean(durations), 3),
-                    round(max(durations), 3),
-                    round(utils.percentile(durations, 0.90), 3),
-                    round(utils.percentile(durations, 0.95), 3),
-                    "%.1f%%" % (len(durations) * 100.0 / len(raw)),
-                    len(raw)]
+                    round(durations.min, 3),
+                    round(durations.mean(), 3),
+                    round(durations.max, 3),
+                    round(durations.quantile(0.90), 3),
+                    round(durations.quantile(0.95), 3),
+                    "%.1f%%" % (durations.count * 100.0 / iterations_num),
+                    iterations_num]
         else:
-            data = [action, None, None, None, None, None, 0, len(raw)]
-
-        # Save 'total' - it must be appended last
-        if action == "total":
-            total = data
-            continue
+            data = [action, None, None, None, None, None, 0, iterations_num]
         table.append(data)
 
-    if total:
-        table.append(total)
-
     return table
 
 
-def _process_results(results):
+def _process_results(results, points=downsampling.DEFAULT_LIMIT,
+                     downsampling_method="lttb"):
     output = []
     source_dict = {}
     for result in results:
@@ -267,10 +228,11 @@ def _process_results(results):
                       "95 percentile",
                       "Success",
                       "Count"]
-        table_rows = _get_atomic_action_durations(result)
         scenario_name, kw, pos = (result["key"]["name"],
                                   result["key"]["kw"], result["key"]["pos"])
-        data = _prepare_data(result)
+        data = _prepare_data(result, points, downsampling_method)
+        table_rows = _get_atomic_action_durations(data["iterations_sketch"],
+                                                  data["iterations_num"])
         cls = scenario_name.split(".")[0]
         met = scenario_name.split(".")[1]
         name = "%s%s" % (met, (pos and " [%d]" % (int(pos) + 1) or ""))
@@ -286,8 +248,8 @@ def _process_results(results):
             "name": name,
             "runner": kw["runner"]["type"],
             "config": json.dumps({scenario_name: [kw]}, indent=2),
-            "iterations": _process_main_duration(result, data),
-            "atomic": _process_atomic(result, data),
+            "iterations": _process_main_duration(data),
+            "atomic": _process_atomic(data),
             "table_cols": table_cols,
             "table_rows": table_rows,
             "output": data["output"],
@@ -297,15 +259,25 @@ def _process_results(results):
             "full_duration": data["full_duration"],
             "sla": data["sla"],
             "sla_success": all([sla["success"] for sla in data["sla"]]),
-            "iterations_num": len(result["result"]),
+            "iterations_num": data["iterations_num"],
         })
     source = json.dumps(source_dict, indent=2, sort_keys=True)
     scenarios = sorted(output, key=lambda r: "%s%s" % (r["cls"], r["name"]))
     return source, scenarios
 
 
-def plot(results):
+def plot(results, points=downsampling.DEFAULT_LIMIT,
+         downsampling_method="lttb"):
+    """Render HTML report of task results.
+
+    :param results: list of task results
+    :param points: max number of points of series of stacked area charts,
+                   long series are downsampled
+    :param downsampling_method: method of selecting the points, see
+                                downsampling.METHODS
+    """
     template = ui_utils.get_template("task/report.mako")
-    source, scenarios = _process_results(results)
+    source, scenarios = _process_results(results, points,
+                                         downsampling_method)
     return template.render(data=json.dumps(scenarios),
                            source=json.dumps(source))
@@ -0,0 +1,245 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Streaming statistics of iteration durations.
+
+Sketches are updated while results arrive, take bounded memory regardless
+of the number of iterations, can be merged and are stored together with the
+task results, so percentiles don't require sorting all the durations again.
+"""
+
+import math
+
+import six
+
+from rally.benchmark.processing import utils
+from rally.common import costilius
+
+
+# Values below this one are counted as zeros by QuantileSketch
+MIN_VALUE = 1e-9
+
+
+class QuantileSketch(object):
+    """Mergeable streaming quantile estimator.
+
+    The first exact_limit values are stored as is, so quantiles of small
+    data sets are exact. After that values are counted in logarithmic
+    buckets (like in HDR histogram): each bucket covers values that differ
+    by no more than accuracy (relative), so the memory depends only on the
+    range of values, not on their number.
+    """
+
+    def __init__(self, accuracy=0.01, exact_limit=1000):
+        """Create an empty sketch.
+
+        :param accuracy: float, max relative error of quantiles
+        :param exact_limit: int, max number of values to be stored as is
+        """
+        self.accuracy = accuracy
+        self.exact_limit = exact_limit
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._gamma = (1.0 + accuracy) / (1.0 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._values = []
+        self._zeros = 0
+        self._buckets = {}
+
+    def _add_to_buckets(self, value, count=1):
+        if value < MIN_VALUE:
+            self._zeros += count
+        else:
+            idx = int(math.ceil(math.log(value) / self._log_gamma))
+            self._buckets[idx] = self._buckets.get(idx, 0) + count
+
+    def _collapse(self):
+        values, self._values = self._values, None
+        for value in values:
+            self._add_to_buckets(value)
+
+    def add(self, value):
+        """Add a single value to the sketch."""
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+        if self._values is None:
+            self._add_to_buckets(value)
+        else:
+            self._values.append(value)
+            if len(self._values) > self.exact_limit:
+                self._collapse()
+
+    def merge(self, other):
+        """Add all values counted by other sketch to this one."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+        if (self._values is not None and other._values is not None and
+                len(self._values) + len(other._values) <= self.exact_limit):
+            self._values.extend(other._values)
+            return
+        if self._values is not None:
+            self._collapse()
+        if other._values is not None:
+            for value in other._values:
+                self._add_to_buckets(value)
+        else:
+            self._zeros += other._zeros
+            for idx, count in six.iteritems(other._buckets):
+                self._buckets[idx] = self._buckets.get(idx, 0) + count
+
+    def mean(self):
+        if not self.count:
+            return None
+        return self.sum / self.count
+
+    def quantile(self, percent):
+        """Find the percentile of added values.
+
+        :param percent: float value from 0.0 to 1.0
+        :returns: the percentile (see utils.percentile), exact if the sketch
+                  holds no more than exact_limit values, otherwise with
+                  relative error not bigger than accuracy
+        """
+        if not self.count:
+            return None
+        if self._values is not None:
+            return utils.percentile(self._values, percent)
+
+        rank = percent * (self.count - 1)
+        if rank >= self.count - 1:
+            return self.max
+        seen = self._zeros
+        if rank < seen:
+            return self.min
+        for idx in sorted(self._buckets):
+            seen += self._buckets[idx]
+            if rank < seen:
+                value = 2 * self._gamma ** idx / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "accuracy": self.accuracy,
+            "exact_limit": self.exact_limit,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "values": self._values,
+            "zeros": self._zeros,
+            # JSON objects can have only string keys
+            "buckets": dict((str(idx), count)
+                            for idx, count in six.iteritems(self._buckets))
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["accuracy"], data["exact_limit"])
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch._values = data["values"]
+        sketch._zeros = data["zeros"]
+        sketch._buckets = dict((int(idx), count)
+                               for idx, count in data["buckets"].items())
+        return sketch
+
+
+class IterationsSketch(object):
+    """Sketches of atomic actions and total durations of iterations.
+
+    Atomic actions durations are counted if they are not None, total
+    durations are counted only for iterations without errors.
+    """
+
+    def __init__(self):
+        self.iterations = 0
+        self.actions = costilius.OrderedDict()
+        self.total = QuantileSketch()
+
+    def add_iteration(self, iteration):
+        self.iterations += 1
+        for name, duration in six.iteritems(iteration["atomic_actions"]):
+            if name not in self.actions:
+                self.actions[name] = QuantileSketch()
+            if duration is not None:
+                self.actions[name].add(duration)
+        if not iteration["error"]:
+            self.total.add(iteration["duration"])
+
+    def merge(self, other):
+        self.iterations += other.iterations
+        for name, sketch in six.iteritems(other.actions):
+            self.actions.setdefault(name, QuantileSketch()).merge(sketch)
+        self.total.merge(other.total)
+
+    def items(self):
+        """Return (name, sketch) pairs of all atomic actions and "total"."""
+        return list(self.actions.items()) + [("total", self.total)]
+
+    def to_dict(self):
+        return {
+            "iterations": self.iterations,
+            "actions": [[name, sketch.to_dict()]
+                        for name, sketch in six.iteritems(self.actions)],
+            "total": self.total.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls()
+        sketch.iterations = data["iterations"]
+        for name, action in data["actions"]:
+            sketch.actions[name] = QuantileSketch.from_dict(action)
+        sketch.total = QuantileSketch.from_dict(data["total"])
+        return sketch
+
+    @classmethod
+    def from_results(cls, raw):
+        sketch = cls()
+        for iteration in raw:
+            sketch.add_iteration(iteration)
+        return sketch
+
+
+def get_iterations_sketch(result, raw=None):
+    """Return IterationsSketch of stored task result.
+
+    Results of tasks that were run before sketches were introduced don't
+    have them, so the sketch is calculated from raw iterations.
+
+    :param result: dict with optional "raw" iterations and "sketch"
+    :param raw: iterable over iterations, used instead of "raw" of result
+    """
+    if result.get("sketch"):
+        return IterationsSketch.from_dict(result["sketch"])
+    if raw is None:
+        raw = result["raw"]
+    return IterationsSketch.from_results(raw)
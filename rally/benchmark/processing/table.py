@@ -0,0 +1,175 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Columnar container of iteration results.
+
+A list of iteration dicts spends most of its memory on dict overhead and
+repeated error tracebacks. IterationsTable keeps every field in a typed
+array, one per atomic action, errors are interned, and scenario output is
+stored only for iterations that have it. Iteration dicts are still available
+by iterating over the table.
+"""
+
+import array
+import math
+
+import six
+
+from rally.common import costilius
+
+
+# Marks atomic actions that are not present in iteration (durations can't be
+# negative), NaN marks atomic actions with None duration.
+MISSING = -1.0
+NONE = float("nan")
+
+NO_ERROR = -1
+
+# Only scenario outputs that differ from this one are stored
+EMPTY_OUTPUT = {"data": {}, "errors": ""}
+
+
+def _column(values=()):
+    return array.array("d", values)
+
+
+def _to_float(value):
+    return NONE if value is None else float(value)
+
+
+def _from_float(value):
+    return None if math.isnan(value) else value
+
+
+class IterationsTable(object):
+    """Iteration results stored by columns."""
+
+    def __init__(self):
+        self.duration = _column()
+        self.idle_duration = _column()
+        self.timestamp = _column()
+        self.scheduled_timestamp = _column()
+        self.atomic_actions = costilius.OrderedDict()
+        self.error = array.array("i")
+        self.errors = []
+        self._errors_index = {}
+        self.scenario_output = {}
+
+    def __len__(self):
+        return len(self.duration)
+
+    def __iter__(self):
+        for i in six.moves.range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i):
+        """Return i-th iteration as a dict."""
+        if i < 0:
+            i += len(self)
+        iteration = {
+            "duration": self.duration[i],
+            "idle_duration": self.idle_duration[i],
+            "error": (list(self.errors[self.error[i]])
+                      if self.error[i] != NO_ERROR else []),
+            "scenario_output": self.scenario_output.get(
+                i, {"data": {}, "errors": ""}),
+            "atomic_actions": dict(
+                (name, _from_float(column[i]))
+                for name, column in six.iteritems(self.atomic_actions)
+                if column[i] != MISSING)
+        }
+        for name in ("timestamp", "scheduled_timestamp"):
+            value = getattr(self, name)[i]
+            if not math.isnan(value):
+                iteration[name] = value
+        return iteration
+
+    def _intern_error(self, error):
+        error = tuple(error)
+        if error not in self._errors_index:
+            self._errors_index[error] = len(self.errors)
+            self.errors.append(error)
+        return self._errors_index[error]
+
+    def append(self, iteration):
+        """Add iteration dict (ScenarioRunnerResult) to the table."""
+        i = len(self)
+        self.duration.append(iteration["duration"])
+        self.idle_duration.append(iteration["idle_duration"])
+        self.timestamp.append(_to_float(iteration.get("timestamp")))
+        self.scheduled_timestamp.append(
+            _to_float(iteration.get("scheduled_timestamp")))
+
+        for name, duration in six.iteritems(iteration["atomic_actions"]):
+            if name not in self.atomic_actions:
+                self.atomic_actions[name] = _column([MISSING]) * i
+            self.atomic_actions[name].append(_to_float(duration))
+        for column in six.itervalues(self.atomic_actions):
+            if len(column) == i:
+                column.append(MISSING)
+
+        if iteration["error"]:
+            self.error.append(self._intern_error(iteration["error"]))
+        else:
+            self.error.append(NO_ERROR)
+
+        if iteration["scenario_output"] != EMPTY_OUTPUT:
+            self.scenario_output[i] = iteration["scenario_output"]
+
+    def extend(self, iterations):
+        for iteration in iterations:
+            self.append(iteration)
+
+    def to_dict(self):
+        """Return JSON serializable dict, see from_dict()."""
+        def values(column):
+            return [_from_float(value) for value in column]
+
+        return {
+            "duration": self.duration.tolist(),
+            "idle_duration": self.idle_duration.tolist(),
+            "timestamp": values(self.timestamp),
+            "scheduled_timestamp": values(self.scheduled_timestamp),
+            "atomic_actions": [[name, values(column)] for name, column
+                               in six.iteritems(self.atomic_actions)],
+            "error": self.error.tolist(),
+            "errors": [list(error) for error in self.errors],
+            # JSON objects can have only string keys
+            "scenario_output": sorted(six.iteritems(self.scenario_output))
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        table = cls()
+        table.duration = _column(data["duration"])
+        table.idle_duration = _column(data["idle_duration"])
+        table.timestamp = _column(map(_to_float, data["timestamp"]))
+        table.scheduled_timestamp = _column(
+            map(_to_float, data["scheduled_timestamp"]))
+        for name, column in data["atomic_actions"]:
+            table.atomic_actions[name] = _column(map(_to_float, column))
+        table.error = array.array("i", data["error"])
+        for error in data["errors"]:
+            table._intern_error(error)
+        table.scenario_output = dict((i, output) for i, output
+                                     in data["scenario_output"])
+        return table
+
+    @classmethod
+    def from_results(cls, raw):
+        table = cls()
+        table.extend(raw)
+        return table
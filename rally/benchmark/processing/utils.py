@@ -13,11 +13,27 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import bisect
 import math
 
+try:
+    import numpy
+except ImportError:
+    # NumPy is optional, pure Python implementations are used without it
+    numpy = None
+
 from rally import exceptions
 
 
+# Lists shorter than this are processed in pure Python even if NumPy is
+# available, conversion to array costs more than it saves for them
+NUMPY_MIN_SIZE = 1000
+
+
+def _use_numpy(values):
+    return numpy is not None and len(values) >= NUMPY_MIN_SIZE
+
+
 def mean(values):
     """Find the simple average of a list of values.
 
@@ -28,20 +44,12 @@ def mean(values):
     if not values:
         raise exceptions.InvalidArgumentsException(
                                         "the list should be non-empty")
+    if _use_numpy(values):
+        return float(numpy.mean(values))
     return math.fsum(values) / len(values)
 
 
-def percentile(values, percent):
-    """Find the percentile of a list of values.
-
-    :parameter values: list of numbers
-    :parameter percent: float value from 0.0 to 1.0
-
-    :returns: the percentile of values
-    """
-    if not values:
-        return None
-    values.sort()
+def _sorted_percentile(values, percent):
     k = (len(values) - 1) * percent
     f = math.floor(k)
     c = math.ceil(k)
@@ -52,72 +60,62 @@ def percentile(values, percent):
     return (d0 + d1)
 
 
-def get_atomic_actions_data(raw_data):
-    """Retrieve detailed (by atomic actions & total runtime) benchmark data.
+def percentile(values, percent):
+    """Find the percentile of a list of values.
 
-    :parameter raw_data: list of raw records (scenario runner output)
+    :parameter values: list of numbers
+    :parameter percent: float value from 0.0 to 1.0
 
-    :returns: dictionary containing atomic action + total duration lists
-              for all atomic action keys
-    """
-    atomic_actions = []
-    for row in raw_data:
-        # find first non-error result to get atomic actions names
-        if not row["error"] and "atomic_actions" in row:
-            atomic_actions = row["atomic_actions"].keys()
-    actions_data = {}
-    for atomic_action in atomic_actions:
-        actions_data[atomic_action] = [
-            r["atomic_actions"][atomic_action]
-            for r in raw_data
-            if r["atomic_actions"].get(atomic_action) is not None]
-    actions_data["total"] = [r["duration"] for r in raw_data if not r["error"]]
-    return actions_data
-
-
-def compress(data, limit=1000, merge=None, normalize=None):
-    """Enumerate and reduce list of values.
-
-    :param data: data list
-    :param limit: int, max length of result list
-    :param merge: function that merges two values
-    :param normalize: function that guarantees sanity of value
-    :returns: items list [(idx1, value1), (idx2, value2) ...]
+    :returns: the percentile of values
     """
+    if not values:
+        return None
+    if _use_numpy(values):
+        return float(numpy.percentile(values, percent * 100))
+    values.sort()
+    return _sorted_percentile(values, percent)
 
-    if not normalize:
-        normalize = lambda i: i and round(float(i), 2) or 0.0
 
-    if not merge:
-        merge = lambda a, b: normalize((a + normalize(b)) / 2)
+def describe(values, percents=()):
+    """Find min, mean, max and percentiles of a list of values at once.
 
-    if len(data) <= limit:
-        return [(idx, normalize(v)) for idx, v in enumerate(data, start=1)]
+    With NumPy the list is converted to array once, otherwise it is sorted
+    once for all the percentiles.
 
-    # For determining which rows should be merged we are using `factor'
-    # e.g. if we have 100 rows and should reduce it to 75 then we have
-    # factor of 0.25 and delete (merge with previous) each 4th row.
-    factor = float(limit) / len(data)
-    store = 0.0
+    :parameter values: non-empty list of numbers
+    :parameter percents: float values from 0.0 to 1.0
 
-    result = []
-    first = True
+    :returns: tuple (min, mean, max, list of percentiles)
+    """
+    if not values:
+        raise exceptions.InvalidArgumentsException(
+            "the list should be non-empty")
+    if _use_numpy(values):
+        array = numpy.asarray(values, dtype=float)
+        return (float(array.min()), float(array.mean()), float(array.max()),
+                [float(p) for p in
+                 numpy.percentile(array, [p * 100 for p in percents])])
+    values = sorted(values)
+    return (values[0], math.fsum(values) / len(values), values[-1],
+            [_sorted_percentile(values, p) for p in percents])
 
-    for idx, value in enumerate(data, start=1):
-        store += factor
 
-        if first:
-            cur_value = normalize(value)
-            first = False
-        else:
-            cur_value = merge(cur_value, value)
+def bin_counts(data, edges):
+    """Count data points in bins.
 
-        if store > 1:
-            store -= 1
-            first = True
-            result.append((idx, cur_value))
+    A data point is counted in the first bin whose right edge is not less
+    than the point, points bigger than the last edge are not counted.
 
-    if not first:
-        result.append((len(data), cur_value))
+    :parameter data: list of numbers
+    :parameter edges: sorted list of right edges of bins
 
-    return result
+    :returns: list of counts, one per bin
+    """
+    if _use_numpy(data):
+        idx = numpy.searchsorted(edges, data, side="left")
+        return numpy.bincount(idx, minlength=len(edges) + 1)[
+            :len(edges)].tolist()
+    counts = [0] * (len(edges) + 1)
+    for data_point in data:
+        counts[bisect.bisect_left(edges, data_point)] += 1
+    return counts[:len(edges)]
@@ -0,0 +1,319 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import functools
+import time
+
+try:
+    import asyncio
+    from concurrent import futures
+except ImportError:
+    # asyncio is available only in Python 3.4+
+    asyncio = None
+
+from rally.benchmark.runners import base
+from rally.benchmark.runners import rps as rps_runner
+from rally.benchmark import utils
+from rally.common import log as logging
+from rally import consts
+from rally import exceptions
+from rally import osclients
+
+
+LOG = logging.getLogger(__name__)
+
+
+def _is_coroutine_scenario(cls, method_name):
+    return asyncio.iscoroutinefunction(getattr(cls, method_name))
+
+
+def _timeout_result(timeout):
+    try:
+        raise asyncio.TimeoutError()
+    except asyncio.TimeoutError as e:
+        return base.format_result_on_timeout(e, timeout)
+
+
+class _Load(object):
+    """Iterations of one benchmark run by an event loop.
+
+    Iterations are started from callbacks of the loop, so no thread (and no
+    stack of a coroutine) is spent on iterations that are not started yet.
+    Coroutine scenarios run in the loop itself, other scenarios run in the
+    default executor of the loop (one thread per running iteration).
+    """
+
+    def __init__(self, runner, loop, cls, method_name, context, args):
+        self.runner = runner
+        self.loop = loop
+        self.cls = cls
+        self.method_name = method_name
+        self.context = context
+        self.args = args
+        self.is_coroutine = _is_coroutine_scenario(cls, method_name)
+
+        config = runner.config
+        self.times = config.get("times", 1)
+        self.rps = config.get("rps")
+        # Like max_concurrency of the rps runner, concurrency doesn't limit
+        # the rate by default
+        self.concurrency = config.get("concurrency",
+                                      self.times if self.rps else 1)
+        self.timeout = config.get("timeout", 0)  # 0 means no timeout
+        self.arrival = config.get("arrival", "constant")
+
+        self.next_iteration = 0
+        self.running = 0
+        # Iterations that arrived when all the slots were busy, see _arrive()
+        self.waiting = collections.deque()
+        self.scheduling_done = False
+        # Exception raised by processing of results, it stops the load
+        self.error = None
+
+    def start(self):
+        if self.rps:
+            self.schedule = rps_runner._schedule(self.rps, self.arrival,
+                                                 self.times)
+            self.start_time = self.loop.time()
+            self.start_timestamp = time.time()
+            self._schedule_next()
+        else:
+            self.scheduling_done = True
+            for i in range(min(self.concurrency, self.times)):
+                self._start(self._next_iteration(), None)
+        self._stop_if_done()
+
+    def _next_iteration(self):
+        iteration = self.next_iteration
+        self.next_iteration += 1
+        return iteration
+
+    def _schedule_next(self):
+        offset = next(self.schedule, None)
+        if offset is None or self.runner.aborted.is_set():
+            self.scheduling_done = True
+            self._stop_if_done()
+            return
+        self.loop.call_at(self.start_time + offset, self._arrive,
+                          self.start_timestamp + offset)
+
+    def _arrive(self, scheduled_timestamp):
+        iteration = self._next_iteration()
+        if self.running < self.concurrency:
+            self._start(iteration, scheduled_timestamp)
+        else:
+            self.waiting.append((iteration, scheduled_timestamp))
+        self._schedule_next()
+
+    def _start(self, iteration, scheduled_timestamp):
+        if self.runner.aborted.is_set():
+            return
+        scenario_context = base._get_scenario_context(self.context)
+        try:
+            if self.is_coroutine:
+                future, finish = self._start_coroutine(iteration,
+                                                       scenario_context)
+            else:
+                future = self.loop.run_in_executor(
+                    None, base._run_scenario_once,
+                    (iteration, self.cls, self.method_name, scenario_context,
+                     self.args))
+                finish = None
+        except Exception as e:
+            self._fail(e)
+            return
+        self.running += 1
+        timer = None
+        if self.timeout:
+            timer = self.loop.call_later(self.timeout, future.cancel)
+        future.add_done_callback(functools.partial(
+            self._done, scheduled_timestamp, finish, timer))
+
+    def _start_coroutine(self, iteration, context):
+        """Start coroutine scenario, the same as base._run_scenario_once().
+
+        :returns: (future, finish) where finish(future) returns the result
+                  of iteration when the future is done
+        """
+        LOG.info("Task %(task)s | ITER: %(iteration)s START" %
+                 {"task": context["task"]["uuid"], "iteration": iteration})
+
+        context["iteration"] = iteration
+        admin_clients = osclients.Clients(context["admin"]["endpoint"])
+        clients = osclients.Clients(context["user"]["endpoint"])
+        scenario = self.cls(context=context, admin_clients=admin_clients,
+                            clients=clients)
+        started_at = time.time()
+        future = self.loop.create_task(
+            getattr(scenario, self.method_name)(**self.args))
+
+        def finish(future):
+            duration = time.time() - started_at
+            admin_clients.release()
+            clients.release()
+            if future.cancelled():
+                return _timeout_result(self.timeout)
+
+            error = []
+            scenario_output = {"errors": "", "data": {}}
+            try:
+                scenario_output = future.result() or scenario_output
+            except Exception as e:
+                error = utils.format_exc(e)
+                if logging.is_debug():
+                    LOG.exception(e)
+
+            status = "Error %s: %s" % tuple(error[0:2]) if error else "OK"
+            LOG.info("Task %(task)s | ITER: %(iteration)s END: %(status)s" %
+                     {"task": context["task"]["uuid"],
+                      "iteration": iteration, "status": status})
+
+            return {"duration": duration - scenario.idle_duration(),
+                    "timestamp": started_at,
+                    "idle_duration": scenario.idle_duration(),
+                    "error": error,
+                    "scenario_output": scenario_output,
+                    "atomic_actions": scenario.atomic_actions()}
+
+        return future, finish
+
+    def _done(self, scheduled_timestamp, finish, timer, future):
+        if timer:
+            timer.cancel()
+        self.running -= 1
+
+        try:
+            if finish:
+                result = finish(future)
+            elif future.cancelled():
+                result = _timeout_result(self.timeout)
+            else:
+                result = future.result()
+            if scheduled_timestamp is not None:
+                result["scheduled_timestamp"] = scheduled_timestamp
+            self.runner._send_result(result)
+        except Exception as e:
+            self._fail(e)
+
+        if self.waiting:
+            self._start(*self.waiting.popleft())
+        elif not self.rps and self.next_iteration < self.times:
+            self._start(self._next_iteration(), None)
+        self._stop_if_done()
+
+    def _fail(self, error):
+        # Exceptions raised by callbacks are only logged by the loop, so the
+        # first one is saved to be raised by the runner, and the load stops.
+        self.error = self.error or error
+        self.runner.abort()
+
+    def _stop_if_done(self):
+        if self.runner.aborted.is_set():
+            self.waiting.clear()
+            self.scheduling_done = True
+        if self.scheduling_done and not self.running and not self.waiting:
+            self.loop.stop()
+
+
+class AsyncioScenarioRunner(base.ScenarioRunner):
+    """Runs iterations of a scenario in an asyncio event loop.
+
+    Scenario methods that are coroutine functions (async def) run in the
+    event loop of the runner, so thousands of concurrent iterations don't
+    need thousands of threads. This is meant for I/O-bound scenarios that do
+    their I/O asynchronously; measure parts of them with the AtomicAction
+    context manager, the atomic_action_timer decorator can't measure
+    coroutines. Other scenarios run in a thread pool of the loop, one thread
+    per running iteration.
+
+    Without "rps" the runner works like the constant runner: "times"
+    iterations are run, "concurrency" at a time. With "rps" iterations are
+    started at the given rate like the rps runner does (the same "rps"
+    profiles and "arrival" types are supported), and "concurrency" limits
+    the number of running iterations. Iterations that are slower than
+    1 / rps seconds reduce the achieved rate if the limit is reached, so
+    with "rps" it defaults to "times" (like "max_concurrency" of the rps
+    runner), without "rps" it defaults to 1.
+
+    The runner requires Python 3.4 or newer.
+    """
+
+    __execution_type__ = consts.RunnerType.ASYNCIO
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "rps": rps_runner.RPSScenarioRunner.CONFIG_SCHEMA[
+                "properties"]["rps"],
+            "arrival": {
+                "enum": ["constant", "poisson"]
+            },
+            "timeout": {
+                "type": "number",
+                "minimum": 1
+            }
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+        """
+        if asyncio is None:
+            raise exceptions.InvalidConfigException(
+                "Runner %s requires Python 3.4 or newer"
+                % self.__execution_type__)
+
+        loop = asyncio.new_event_loop()
+        load = _Load(self, loop, cls, method_name, context, args)
+        executor = None
+        if not load.is_coroutine:
+            executor = futures.ThreadPoolExecutor(
+                min(load.concurrency, load.times))
+            loop.set_default_executor(executor)
+
+        self._log_debug_info(times=load.times, concurrency=load.concurrency,
+                             timeout=load.timeout, rps=load.rps,
+                             arrival=load.arrival,
+                             coroutine=load.is_coroutine)
+        try:
+            loop.call_soon(load.start)
+            loop.run_forever()
+        finally:
+            loop.close()
+            if executor:
+                executor.shutdown(wait=True)
+        if load.error:
+            raise load.error
@@ -17,14 +17,18 @@ import abc
 import collections
 import multiprocessing
 import random
-import time
+import threading
 
 import jsonschema
+from oslo_config import cfg
 import six
+from six import moves
 
+from rally.benchmark.processing import table
 from rally.benchmark.scenarios import base as scenario_base
 from rally.benchmark import types
 from rally.benchmark import utils
+from rally.common import discover
 from rally.common import log as logging
 from rally.common import utils as rutils
 from rally import consts
@@ -34,6 +38,29 @@ from rally import osclients
 
 LOG = logging.getLogger(__name__)
 
+RUNNER_BENCHMARK_OPTS = [
+    cfg.BoolOpt("strict_results_validation",
+                default=False,
+                help="Validate each iteration result with jsonschema. It is "
+                     "much slower than the default structural check of "
+                     "results and limits the number of iterations per "
+                     "second that rally is able to process.")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark",
+                               title="benchmark options")
+CONF.register_group(benchmark_group)
+CONF.register_opts(RUNNER_BENCHMARK_OPTS, group=benchmark_group)
+
+# Worker processes put this marker into the multiprocessing queue when they
+# are done, so the parent is able to block on the queue instead of polling it.
+WORKER_FINISHED = None
+
+# Max time (in seconds) to block on the results queue before checking whether
+# worker processes are still alive.
+QUEUE_GET_TIMEOUT = 1.0
+
 
 def format_result_on_timeout(exc, timeout):
     return {
@@ -66,10 +93,10 @@ def _run_scenario_once(args):
              {"task": context["task"]["uuid"], "iteration": iteration})
 
     context["iteration"] = iteration
-    scenario = cls(
-        context=context,
-        admin_clients=osclients.Clients(context["admin"]["endpoint"]),
-        clients=osclients.Clients(context["user"]["endpoint"]))
+    admin_clients = osclients.Clients(context["admin"]["endpoint"])
+    clients = osclients.Clients(context["user"]["endpoint"])
+    scenario = cls(context=context, admin_clients=admin_clients,
+                   clients=clients)
 
     error = []
     scenario_output = {"errors": "", "data": {}}
@@ -82,6 +109,10 @@ def _run_scenario_once(args):
         if logging.is_debug():
             LOG.exception(e)
     finally:
+        # Next iterations will reuse authenticated clients
+        admin_clients.release()
+        clients.release()
+
         status = "Error %s: %s" % tuple(error[0:2]) if error else "OK"
         LOG.info("Task %(task)s | ITER: %(iteration)s END: %(status)s" %
                  {"task": context["task"]["uuid"], "iteration": iteration,
@@ -123,6 +154,9 @@ class ScenarioRunnerResult(dict):
             "timestamp": {
                 "type": "number"
             },
+            "scheduled_timestamp": {
+                "type": "number"
+            },
             "idle_duration": {
                 "type": "number"
             },
@@ -159,7 +193,72 @@ class ScenarioRunnerResult(dict):
 
     def __init__(self, result_list):
         super(ScenarioRunnerResult, self).__init__(result_list)
-        jsonschema.validate(result_list, self.RESULT_SCHEMA)
+        self.validate(result_list)
+
+    @staticmethod
+    def _is_number(value):
+        return (isinstance(value, (float,) + six.integer_types) and
+                not isinstance(value, bool))
+
+    @classmethod
+    def _is_valid(cls, result):
+        """Check that result matches RESULT_SCHEMA without jsonschema.
+
+        This is the same check as RESULT_SCHEMA does, hardcoded to make it
+        cheap enough to be done for each iteration.
+        """
+        if not isinstance(result, dict):
+            return False
+        for key, value in six.iteritems(result):
+            if key in ("duration", "idle_duration", "timestamp",
+                       "scheduled_timestamp"):
+                if not cls._is_number(value):
+                    return False
+            elif key == "atomic_actions":
+                if not isinstance(value, dict):
+                    return False
+                for duration in six.itervalues(value):
+                    if duration is not None and not cls._is_number(duration):
+                        return False
+            elif key == "error":
+                if not isinstance(value, list):
+                    return False
+                for item in value:
+                    if not isinstance(item, six.string_types):
+                        return False
+            elif key == "scenario_output":
+                if not isinstance(value, dict):
+                    return False
+                for output_key, output in six.iteritems(value):
+                    if output_key == "data":
+                        if not isinstance(output, dict):
+                            return False
+                        for data in six.itervalues(output):
+                            if not cls._is_number(data):
+                                return False
+                    elif output_key == "errors":
+                        if not isinstance(output, six.string_types):
+                            return False
+                    else:
+                        return False
+            else:
+                return False
+        return True
+
+    @classmethod
+    def validate(cls, result):
+        """Validate result of iteration.
+
+        The structural check is used by default; jsonschema validation is
+        done only if it fails (to get a proper error) or if
+        strict_results_validation option is set.
+
+        :param result: dict with result of iteration
+        :raises jsonschema.ValidationError: if result is invalid
+        """
+        if CONF.benchmark.strict_results_validation or not cls._is_valid(
+                result):
+            jsonschema.validate(result, cls.RESULT_SCHEMA)
 
 
 class ScenarioRunner(object):
@@ -185,14 +284,18 @@ class ScenarioRunner(object):
         """
         self.task = task
         self.config = config
-        self.result_queue = collections.deque()
+        self.result_queue = table.IterationsTable()
         self.aborted = multiprocessing.Event()
+        self._results_cond = threading.Condition()
+        self._results_finished = False
 
     @staticmethod
     def _get_cls(runner_type):
-        for runner in rutils.itersubclasses(ScenarioRunner):
-            if runner_type == runner.__execution_type__:
-                return runner
+        runner = discover.get_plugin(
+            ScenarioRunner, runner_type,
+            key=lambda cls: getattr(cls, "__execution_type__", None))
+        if runner:
+            return runner
         raise exceptions.NoSuchRunner(type=runner_type)
 
     @staticmethod
@@ -211,6 +314,15 @@ class ScenarioRunner(object):
         runner = ScenarioRunner._get_cls(config.get("type",
                                                     consts.RunnerType.SERIAL))
         jsonschema.validate(config, runner.CONFIG_SCHEMA)
+        runner._validate_config(config)
+
+    @classmethod
+    def _validate_config(cls, config):
+        """Checks of runner's config that CONFIG_SCHEMA can't express.
+
+        :param config: runner's config that matches CONFIG_SCHEMA
+        :raises jsonschema.ValidationError: if config is invalid
+        """
 
     @abc.abstractmethod
     def _run_scenario(self, cls, method_name, context, args):
@@ -243,6 +355,17 @@ class ScenarioRunner(object):
         """Abort the execution of further benchmark scenario iterations."""
         self.aborted.set()
 
+    def summary(self):
+        """Return runner specific data to be stored with the results.
+
+        It is called after the load is finished, runners that calculate
+        something besides iteration results (e.g. max load the cloud handled)
+        should override it.
+
+        :returns: dict
+        """
+        return {}
+
     def _create_process_pool(self, processes_to_start, worker_process,
                              worker_args_gen):
         """Create a pool of processes with some defined target function.
@@ -265,19 +388,30 @@ class ScenarioRunner(object):
     def _join_processes(self, process_pool, result_queue):
         """Join the processes in the pool and send their results to the queue.
 
+        Blocks on the queue until every process has put WORKER_FINISHED
+        into it, so no CPU is spent while there are no results.
+
         :param process_pool: pool of processes to join
         :result_queue: multiprocessing.Queue that receives the results
         """
-        while process_pool:
-            while process_pool and not process_pool[0].is_alive():
-                process_pool.popleft().join()
+        workers_running = len(process_pool)
+        while workers_running:
+            try:
+                result = result_queue.get(timeout=QUEUE_GET_TIMEOUT)
+            except moves.queue.Empty:
+                # Process could be killed without sending WORKER_FINISHED,
+                # don't wait for it forever.
+                if not any(p.is_alive() for p in process_pool):
+                    break
+                continue
+
+            if result is WORKER_FINISHED:
+                workers_running -= 1
+            else:
+                self._send_result(result)
 
-            if result_queue.empty():
-                # sleep a bit to avoid 100% usage of CPU by this method
-                time.sleep(0.001)
-
-            while not result_queue.empty():
-                self._send_result(result_queue.get())
+        while process_pool:
+            process_pool.popleft().join()
         result_queue.close()
 
     def _send_result(self, result):
@@ -287,7 +421,37 @@ class ScenarioRunner(object):
                        ScenarioRunnerResult schema, otherwise
                        ValidationError is raised.
         """
-        self.result_queue.append(ScenarioRunnerResult(result))
+        ScenarioRunnerResult.validate(result)
+        self._put_results([result])
+
+    def _put_results(self, results):
+        """Send results that are validated already to consumer.
+
+        :param results: iterable of result dicts, e.g. got from
+                        get_results() of another runner
+        """
+        with self._results_cond:
+            self.result_queue.extend(results)
+            self._results_cond.notify()
+
+    def finish_results(self):
+        """Notify consumer that no more results will be sent."""
+        with self._results_cond:
+            self._results_finished = True
+            self._results_cond.notify()
+
+    def get_results(self):
+        """Block until results are available and return all of them.
+
+        :returns: IterationsTable with results or None if finish_results()
+                  was called and all results are consumed
+        """
+        with self._results_cond:
+            while not (self.result_queue or self._results_finished):
+                self._results_cond.wait()
+            results = self.result_queue
+            self.result_queue = table.IterationsTable()
+        return results or None
 
     def _log_debug_info(self, **info):
         """Log runner parameters for debugging.
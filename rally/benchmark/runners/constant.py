@@ -13,7 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
 import multiprocessing
 import threading
 import time
@@ -28,15 +27,44 @@ from rally import consts
 LOG = logging.getLogger(__name__)
 
 
+def _run_iterations(queue, iteration_gen, times, context, cls, method_name,
+                    args, aborted):
+    """Run scenario iterations one by one until there is nothing left to run.
+
+    This is the target of the long-lived threads of the worker process.
+    Iteration numbers are taken from iteration_gen, which is shared by all
+    threads of all worker processes, so the total number of iterations
+    doesn't exceed times.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param times: total number of scenario iterations to be run
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    """
+    while not aborted.is_set():
+        iteration = next(iteration_gen)
+        if iteration >= times:
+            break
+        scenario_context = base._get_scenario_context(context)
+        scenario_args = (iteration, cls, method_name, scenario_context, args)
+        base._worker_thread(queue, scenario_args)
+
+
 def _worker_process(queue, iteration_gen, timeout, concurrency, times, context,
                     cls, method_name, args, aborted):
     """Start the scenario within threads.
 
-    Spawn threads to support scenario execution for a fixed number of times.
-    This generates a constant load on the cloud under test by executing each
-    scenario iteration without pausing between iterations. Each thread runs
-    the scenario method once with passed scenario arguments and context.
-    After execution the result is appended to the queue.
+    Spawn a fixed pool of threads to support scenario execution for a fixed
+    number of times. This generates a constant load on the cloud under test
+    by executing each scenario iteration without pausing between iterations.
+    Each thread keeps running the scenario method with passed scenario
+    arguments and context until all iterations are started. After each
+    execution the result is appended to the queue.
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
@@ -51,52 +79,21 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times, context,
                     the flag is set
     """
 
-    pool = collections.deque()
-    alive_threads_in_pool = 0
-    finished_threads_in_pool = 0
-
     base._log_worker_info(times=times, concurrency=concurrency,
                           timeout=timeout, cls=cls, method_name=method_name,
                           args=args)
 
-    iteration = next(iteration_gen)
-    while iteration < times and not aborted.is_set():
-        scenario_context = base._get_scenario_context(context)
-        scenario_args = (iteration, cls, method_name, scenario_context, args)
-        worker_args = (queue, scenario_args)
-
-        thread = threading.Thread(target=base._worker_thread,
-                                  args=worker_args)
+    thread_args = (queue, iteration_gen, times, context, cls, method_name,
+                   args, aborted)
+    pool = [threading.Thread(target=_run_iterations, args=thread_args)
+            for i in range(concurrency)]
+    for thread in pool:
         thread.start()
-        pool.append((thread, time.time()))
-        alive_threads_in_pool += 1
-
-        while alive_threads_in_pool == concurrency:
-            prev_finished_threads_in_pool = finished_threads_in_pool
-            finished_threads_in_pool = 0
-            for t in pool:
-                if not t[0].isAlive():
-                    finished_threads_in_pool += 1
-
-            alive_threads_in_pool -= finished_threads_in_pool
-            alive_threads_in_pool += prev_finished_threads_in_pool
-
-            if alive_threads_in_pool < concurrency:
-                # NOTE(boris-42): cleanup pool array. This is required because
-                # in other case array length will be equal to times which
-                # is unlimited big
-                while pool and not pool[0][0].isAlive():
-                    pool.popleft()[0].join()
-                    finished_threads_in_pool -= 1
-                break
-
-            # we should wait to not create big noise with these checks
-            time.sleep(0.001)
-        iteration = next(iteration_gen)
 
     # Wait until all threads are done
-    while pool:
-        pool.popleft()[0].join()
+    for thread in pool:
+        thread.join()
+    queue.put(base.WORKER_FINISHED)
 
 
 class ConstantScenarioRunner(base.ScenarioRunner):
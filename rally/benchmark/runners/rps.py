@@ -21,26 +21,75 @@ import time
 
 from rally.benchmark.runners import base
 from rally.common import log as logging
-from rally.common import utils
 from rally import consts
 
 LOG = logging.getLogger(__name__)
 
+# time.monotonic() is not available in Python 2
+_monotonic = getattr(time, "monotonic", time.time)
 
-def _worker_process(queue, iteration_gen, timeout, rps, times,
-                    max_concurrent, context, cls, method_name,
-                    args, aborted):
+
+def _rps_at(rps, elapsed):
+    """Return requested rps at the given moment of the load.
+
+    :param rps: number of iterations per second or dict with step load
+                profile: {"start": ..., "end": ..., "step": ...,
+                "duration": ...}. The rate starts from "start" and is
+                changed by "step" towards "end" every "duration" seconds
+                until "end" is reached, so it is decreased if "start" is
+                greater than "end".
+    :param elapsed: seconds since the load was started
+    """
+    if not isinstance(rps, dict):
+        return float(rps)
+    change = rps.get("step", 1) * int(elapsed / rps["duration"])
+    if rps["start"] > rps["end"]:
+        return float(max(rps["start"] - change, rps["end"]))
+    return float(min(rps["start"] + change, rps["end"]))
+
+
+def _schedule(rps, arrival, times):
+    """Generate intended start times of iterations.
+
+    :param rps: rps number or step profile, see _rps_at()
+    :param arrival: "constant" for evenly spaced iterations or "poisson"
+                    for exponentially distributed intervals between them
+    :param times: total number of iterations
+    :returns: generator of offsets (in seconds) from the start of the load
+    """
+    offset = 0.0
+    for i in range(times):
+        yield offset
+        rate = _rps_at(rps, offset)
+        if arrival == "poisson":
+            offset += random.expovariate(rate)
+        else:
+            offset += 1.0 / rate
+
+
+def _worker_thread(queue, args, scheduled_timestamp, free_slots):
+    try:
+        result = base._run_scenario_once(args)
+        result["scheduled_timestamp"] = scheduled_timestamp
+        queue.put(result)
+    finally:
+        free_slots.release()
+
+
+def _worker_process(queue, tickets, max_concurrent, context, cls,
+                    method_name, args, aborted):
     """Start scenario within threads.
 
-    Spawn N threads per second. Each thread runs the scenario once, and appends
-    result to queue. A maximum of max_concurrent threads will be ran
-    concurrently.
+    Take iterations scheduled by the runner from the tickets queue and run
+    each one in its own thread. Each thread runs the scenario once, and
+    appends result to queue. A maximum of max_concurrent threads will be ran
+    concurrently; if there are no free slots, the next ticket is taken only
+    after some thread finishes, so the delay shows up as the difference
+    between "scheduled_timestamp" and "timestamp" of the iteration.
 
     :param queue: queue object to append results
-    :param iteration_gen: next iteration number generator
-    :param timeout: operation's timeout
-    :param rps: number of scenario iterations to be run per one second
-    :param times: total number of scenario iterations to be run
+    :param tickets: queue of (iteration, scheduled_timestamp) tuples, None
+                    means that there is nothing more to run
     :param max_concurrent: maximum worker concurrency
     :param context: scenario context object
     :param cls: scenario class
@@ -51,49 +100,35 @@ def _worker_process(queue, iteration_gen, timeout, rps, times,
     """
 
     pool = collections.deque()
-    start = time.time()
-    sleep = 1.0 / rps
+    free_slots = threading.Semaphore(max_concurrent)
 
-    base._log_worker_info(times=times, rps=rps, timeout=timeout,
-                          cls=cls, method_name=method_name, args=args)
+    base._log_worker_info(max_concurrent=max_concurrent, cls=cls,
+                          method_name=method_name, args=args)
 
-    # Injecting timeout to exclude situations, where start time and
-    # actual time are negligible close
+    while True:
+        free_slots.acquire()
+        ticket = tickets.get()
+        if ticket is None:
+            break
+        if aborted.is_set():
+            free_slots.release()
+            continue
 
-    randsleep_delay = random.randint(int(sleep / 2 * 100), int(sleep * 100))
-    time.sleep(randsleep_delay / 100.0)
-
-    i = 0
-    while i < times and not aborted.is_set():
+        iteration, scheduled_timestamp = ticket
         scenario_context = base._get_scenario_context(context)
-        scenario_args = (next(iteration_gen), cls, method_name,
-                         scenario_context, args)
-        worker_args = (queue, scenario_args)
-        thread = threading.Thread(target=base._worker_thread,
-                                  args=worker_args)
-        i += 1
+        scenario_args = (iteration, cls, method_name, scenario_context, args)
+        thread = threading.Thread(
+            target=_worker_thread,
+            args=(queue, scenario_args, scheduled_timestamp, free_slots))
         thread.start()
         pool.append(thread)
 
-        time_gap = time.time() - start
-        real_rps = i / time_gap if time_gap else "Infinity"
-
-        LOG.debug("Worker: %s rps: %s (requested rps: %s)" %
-                  (i, real_rps, rps))
-
-        # try to join latest thread(s) until it finished, or until time to
-        # start new thread (if we have concurrent slots available)
-        while i / (time.time() - start) > rps or len(pool) >= max_concurrent:
-            if pool:
-                pool[0].join(sleep)
-                if not pool[0].isAlive():
-                    pool.popleft()
-            else:
-                time.sleep(sleep)
+        while pool and not pool[0].is_alive():
+            pool.popleft().join()
 
     while pool:
-        thr = pool.popleft()
-        thr.join()
+        pool.popleft().join()
+    queue.put(base.WORKER_FINISHED)
 
 
 class RPSScenarioRunner(base.ScenarioRunner):
@@ -103,6 +138,15 @@ class RPSScenarioRunner(base.ScenarioRunner):
     frequency (runs per second) in a pool of processes. The scenario will be
     launched for a fixed number of times in total (specified in the config).
 
+    Start times of iterations are planned by a single scheduler in advance
+    (open-loop), so slow iterations do not slow down the arrival rate.
+    Iterations could be spaced evenly ("constant" arrival) or with random
+    exponentially distributed intervals ("poisson" arrival). Instead of a
+    fixed rps a step load profile could be specified, e.g.
+    {"start": 10, "end": 100, "step": 10, "duration": 30} increases rps by 10
+    every 30 seconds; small steps give a ramp. If "start" is greater than
+    "end", rps is decreased the same way.
+
     An example of a rps scenario is booting 1 VM per second. This
     execution type is thus very helpful in understanding the maximal load that
     a certain cloud can handle.
@@ -122,8 +166,30 @@ class RPSScenarioRunner(base.ScenarioRunner):
                 "minimum": 1
             },
             "rps": {
-                "type": "number",
-                "minimum": 1
+                "anyOf": [
+                    {
+                        "type": "number",
+                        "minimum": 1
+                    },
+                    {
+                        "type": "object",
+                        "properties": {
+                            "start": {"type": "number", "minimum": 1},
+                            "end": {"type": "number", "minimum": 1},
+                            "step": {"type": "number",
+                                     "minimum": 0.0,
+                                     "exclusiveMinimum": True},
+                            "duration": {"type": "number",
+                                         "minimum": 0.0,
+                                         "exclusiveMinimum": True}
+                        },
+                        "required": ["start", "end", "duration"],
+                        "additionalProperties": False
+                    }
+                ]
+            },
+            "arrival": {
+                "enum": ["constant", "poisson"]
             },
             "timeout": {
                 "type": "number",
@@ -136,6 +202,28 @@ class RPSScenarioRunner(base.ScenarioRunner):
         "additionalProperties": False
     }
 
+    def _schedule_iterations(self, tickets, processes):
+        """Put iterations to the tickets queue at their intended time.
+
+        :param tickets: multiprocessing.Queue read by worker processes
+        :param processes: number of worker processes to stop at the end
+        """
+        schedule = _schedule(self.config["rps"],
+                             self.config.get("arrival", "constant"),
+                             self.config["times"])
+        start = _monotonic()
+        start_timestamp = time.time()
+        for iteration, offset in enumerate(schedule):
+            if self.aborted.is_set():
+                break
+            delay = start + offset - _monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            tickets.put((iteration, start_timestamp + offset))
+
+        for i in range(processes):
+            tickets.put(None)
+
     def _run_scenario(self, cls, method_name, context, args):
         """Runs the specified benchmark scenario with given arguments.
 
@@ -155,52 +243,49 @@ class RPSScenarioRunner(base.ScenarioRunner):
         """
         times = self.config["times"]
         timeout = self.config.get("timeout", 0)  # 0 means no timeout
-        iteration_gen = utils.RAMInt()
+        max_concurrency = self.config.get("max_concurrency", times)
         cpu_count = multiprocessing.cpu_count()
-        processes_to_start = min(cpu_count, times,
-                                 self.config.get("max_concurrency", times))
-        rps_per_worker = float(self.config["rps"]) / processes_to_start
-        times_per_worker, times_overhead = divmod(times, processes_to_start)
+        processes_to_start = min(cpu_count, times, max_concurrency)
 
         # Determine concurrency per worker
         concurrency_per_worker, concurrency_overhead = divmod(
-                       self.config.get("max_concurrency", times),
-                       processes_to_start)
+            max_concurrency, processes_to_start)
 
         self._log_debug_info(times=times, timeout=timeout, cpu_count=cpu_count,
+                             rps=self.config["rps"],
+                             arrival=self.config.get("arrival", "constant"),
                              processes_to_start=processes_to_start,
-                             rps_per_worker=rps_per_worker,
-                             times_per_worker=times_per_worker,
-                             times_overhead=times_overhead,
                              concurrency_per_worker=concurrency_per_worker,
                              concurrency_overhead=concurrency_overhead)
 
         result_queue = multiprocessing.Queue()
+        tickets = multiprocessing.Queue()
 
-        def worker_args_gen(times_overhead, concurrency_overhead):
+        def worker_args_gen(concurrency_overhead):
             """Generate arguments for process worker.
 
-            Remainder of threads per process division is distributed to
+            Remainder of concurrency per process division is distributed to
             process workers equally - one thread per each process worker
-            until the remainder equals zero. The same logic is applied
-            to concurrency overhead.
-            :param times_overhead: remaining number of threads to be
-                                   distributed to workers
+            until the remainder equals zero.
+
             :param concurrency_overhead: remaining number of maximum
                                          concurrent threads to be distributed
                                          to workers
             """
             while True:
-                yield (result_queue, iteration_gen, timeout, rps_per_worker,
-                       times_per_worker + (times_overhead and 1),
+                yield (result_queue, tickets,
                        concurrency_per_worker + (concurrency_overhead and 1),
                        context, cls, method_name, args, self.aborted)
-                if times_overhead:
-                    times_overhead -= 1
                 if concurrency_overhead:
                     concurrency_overhead -= 1
 
         process_pool = self._create_process_pool(
             processes_to_start, _worker_process,
-            worker_args_gen(times_overhead, concurrency_overhead))
+            worker_args_gen(concurrency_overhead))
+
+        scheduler = threading.Thread(target=self._schedule_iterations,
+                                     args=(tickets, processes_to_start))
+        scheduler.start()
         self._join_processes(process_pool, result_queue)
+        scheduler.join()
+        tickets.close()
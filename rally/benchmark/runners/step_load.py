@@ -0,0 +1,202 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import jsonschema
+
+from rally.benchmark.runners import base
+from rally.benchmark.sla import base as sla_base
+from rally.common import log as logging
+from rally import consts
+
+
+LOG = logging.getLogger(__name__)
+
+
+class StepLoadScenarioRunner(base.ScenarioRunner):
+    """Increases load step by step until the cloud is saturated.
+
+    Each step runs the scenario for "step_duration" seconds with a fixed
+    concurrency (constant_for_duration runner) or a fixed rps (rps runner),
+    depending on the "load" option. The load level starts from "start" and is
+    increased by "step" up to "end".
+
+    Iterations of each step are checked with the SLA criteria from the "sla"
+    option of the runner (same format as the "sla" section of the
+    benchmark). As soon as they fail, the load is stopped, and the highest
+    load level that passed is reported as "max_passed_level" in the runner
+    summary of the results.
+    """
+
+    __execution_type__ = consts.RunnerType.STEP_LOAD
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "load": {
+                "enum": ["concurrency", "rps"]
+            },
+            "start": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "end": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "step": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "step_duration": {
+                "type": "number",
+                "minimum": 0.0,
+                "exclusiveMinimum": True
+            },
+            "max_concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "timeout": {
+                "type": "number",
+                "minimum": 1
+            },
+            "sla": {
+                "type": "object"
+            }
+        },
+        "required": ["type", "end", "step_duration", "sla"],
+        "additionalProperties": False
+    }
+
+    def __init__(self, task, config):
+        super(StepLoadScenarioRunner, self).__init__(task, config)
+        self.steps = []
+
+    @classmethod
+    def _validate_config(cls, config):
+        sla_base.SLA.validate(config["sla"])
+        if config.get("start", 1) > config["end"]:
+            raise jsonschema.ValidationError(
+                "start (%s) should not be greater than end (%s)"
+                % (config.get("start", 1), config["end"]))
+
+    def _levels(self):
+        level = self.config.get("start", 1)
+        while level <= self.config["end"]:
+            yield level
+            level += self.config.get("step", 1)
+
+    def _get_step_runner(self, level):
+        duration = self.config["step_duration"]
+        if self.config.get("load", "concurrency") == "rps":
+            config = {"type": consts.RunnerType.RPS,
+                      "rps": level,
+                      "times": max(1, int(level * duration))}
+            if "max_concurrency" in self.config:
+                config["max_concurrency"] = self.config["max_concurrency"]
+        else:
+            config = {"type": consts.RunnerType.CONSTANT_FOR_DURATION,
+                      "concurrency": level,
+                      "duration": duration}
+            if "timeout" in self.config:
+                config["timeout"] = self.config["timeout"]
+        return base.ScenarioRunner.get_runner(self.task, config)
+
+    def _run_step(self, level, cls, method_name, context, args):
+        """Run one step of the load and forward its results.
+
+        A step passes if it has iterations, all of them pass the SLA and
+        the step runner doesn't fail.
+
+        :returns: True if the step passed
+        """
+        runner = self._get_step_runner(level)
+        sla_checker = sla_base.SLAChecker({"sla": self.config["sla"]})
+        errors = []
+
+        def run():
+            try:
+                runner._run_scenario(cls, method_name, context, args)
+            except Exception as e:
+                LOG.exception(e)
+                errors.append(e)
+            finally:
+                runner.finish_results()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        iterations = 0
+        while True:
+            batch = runner.get_results()
+            if batch is None:
+                break
+            results = list(batch)
+            iterations += len(results)
+            for result in results:
+                if not sla_checker.add_iteration(result):
+                    runner.abort()
+            # The step runner has validated the results already
+            self._put_results(results)
+            if self.aborted.is_set():
+                runner.abort()
+        thread.join()
+
+        self.steps.append({
+            "level": level,
+            "iterations": iterations,
+            "success": bool(iterations and not errors and all(
+                sla["success"] for sla in sla_checker.results())),
+            "error": "%s: %s" % (type(errors[0]).__name__,
+                                 errors[0]) if errors else None,
+            "sla": sla_checker.results()
+        })
+        return self.steps[-1]["success"]
+
+    def _run_scenario(self, cls, method_name, context, args):
+        """Runs the specified benchmark scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Benchmark context that contains users, admin & other
+                        information, that was created before benchmark started.
+        :param args: Arguments to call the scenario method with
+        """
+        self.steps = []
+        self._log_debug_info(**self.config)
+
+        for level in self._levels():
+            if self.aborted.is_set():
+                break
+            LOG.info("Task %(task)s | Step load: level %(level)s" %
+                     {"task": self.task["uuid"], "level": level})
+            if not self._run_step(level, cls, method_name, context, args):
+                LOG.info("Task %(task)s | Step load: SLA failed on level "
+                         "%(level)s" % {"task": self.task["uuid"],
+                                        "level": level})
+                break
+
+    def summary(self):
+        passed = [step["level"] for step in self.steps if step["success"]]
+        return {
+            "load": self.config.get("load", "concurrency"),
+            "max_passed_level": passed[-1] if passed else None,
+            "steps": self.steps
+        }
@@ -14,6 +14,7 @@
 
 from rally.benchmark.scenarios import base
 from rally.benchmark import validation
+from rally import osclients
 
 
 class Authenticate(base.Scenario):
@@ -23,6 +24,17 @@ class Authenticate(base.Scenario):
     Nova etc.
     """
 
+    def clients(self, client_type):
+        """Returns a new client of the user, authenticated from scratch.
+
+        Client handles of the clients pool are not used, otherwise only the
+        first iteration of each worker would authenticate.
+
+        :param client_type: Client type ("nova"/"glance" etc.)
+        """
+        clients = osclients.Clients(self._clients.endpoint, pooled=False)
+        return getattr(clients, client_type)()
+
     @validation.required_openstack(users=True)
     @base.scenario()
     def keystone(self):
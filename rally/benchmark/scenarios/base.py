@@ -15,11 +15,12 @@
 
 import copy
 import functools
-import itertools
 import random
 import time
+import weakref
 
 from rally.common import costilius
+from rally.common import discover
 from rally.common import log as logging
 from rally.common import utils
 from rally import consts
@@ -28,6 +29,11 @@ from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
+# Scenario class -> names of its scenario methods. Scenario methods are marked
+# by the @scenario decorator when class is defined, so they are looked up only
+# once per class.
+_scenario_methods = weakref.WeakKeyDictionary()
+
 
 def scenario(context=None):
     """Make from plain python method benchmark.
@@ -71,9 +77,10 @@ class Scenario(object):
     @staticmethod
     def get_by_name(name):
         """Returns Scenario class by name."""
-        for scenario in utils.itersubclasses(Scenario):
-            if name == scenario.__name__:
-                return scenario
+        scenario = discover.get_plugin(Scenario, name,
+                                       key=lambda cls: cls.__name__)
+        if scenario:
+            return scenario
         raise exceptions.NoSuchScenario(name=name)
 
     @staticmethod
@@ -91,6 +98,7 @@ class Scenario(object):
             if Scenario.is_scenario(scenario_cls, scenario_name):
                 return getattr(scenario_cls, scenario_name)
         else:
+            discover.load_all()
             for scenario_cls in utils.itersubclasses(Scenario):
                 if Scenario.is_scenario(scenario_cls, name):
                     return getattr(scenario_cls, name)
@@ -106,16 +114,23 @@ class Scenario(object):
         :param scenario_cls: the base class for searching scenarios in
         :returns: List of strings
         """
+        discover.load_all()
         scenario_classes = (list(utils.itersubclasses(scenario_cls)) +
                             [scenario_cls])
-        benchmark_scenarios = [
-            ["%s.%s" % (scenario.__name__, func)
-             for func in dir(scenario) if Scenario.is_scenario(scenario, func)]
-            for scenario in scenario_classes
-        ]
-        benchmark_scenarios_flattened = list(itertools.chain.from_iterable(
-                                                        benchmark_scenarios))
-        return benchmark_scenarios_flattened
+        return ["%s.%s" % (scenario.__name__, method_name)
+                for scenario in scenario_classes
+                for method_name in Scenario._get_scenario_methods(scenario)]
+
+    @staticmethod
+    def _get_scenario_methods(cls):
+        """Return sorted names of scenario methods of the class."""
+        try:
+            return _scenario_methods[cls]
+        except KeyError:
+            methods = tuple(method_name for method_name in dir(cls)
+                            if Scenario.is_scenario(cls, method_name))
+            _scenario_methods[cls] = methods
+            return methods
 
     @staticmethod
     def _validate_helper(validators, clients, config, deployment):
@@ -133,7 +148,7 @@ class Scenario(object):
     @classmethod
     def validate(cls, name, config, admin=None, users=None, deployment=None):
         """Semantic check of benchmark arguments."""
-        validators = cls.meta(name, "validators", default=[])
+        validators = cls._get_meta(name, "validators", default=[])
 
         if not validators:
             return
@@ -162,11 +177,20 @@ class Scenario(object):
 
         :returns: Meta value bound to method attribute or default.
         """
+        return copy.deepcopy(Scenario._get_meta(cls, attr_name, method_name,
+                                                default))
+
+    @staticmethod
+    def _get_meta(cls, attr_name, method_name=None, default=None):
+        """Same as meta(), but returns the meta value itself, not a copy.
+
+        Use it only if the value is not going to be changed.
+        """
         if isinstance(cls, str):
             cls_name, method_name = cls.split(".", 1)
             cls = Scenario.get_by_name(cls_name)
         method = getattr(cls, method_name)
-        return copy.deepcopy(getattr(method, attr_name, default))
+        return getattr(method, attr_name, default)
 
     @staticmethod
     def is_scenario(cls, method_name):
@@ -180,7 +204,8 @@ class Scenario(object):
             getattr(cls, method_name)
         except Exception:
             return False
-        return Scenario.meta(cls, "is_scenario", method_name, default=False)
+        return Scenario._get_meta(cls, "is_scenario", method_name,
+                                  default=False)
 
     def clients(self, client_type):
         """Returns a python openstack client of the requested type.
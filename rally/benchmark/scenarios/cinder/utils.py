@@ -20,6 +20,8 @@ from oslo_config import cfg
 
 from rally.benchmark.scenarios import base
 from rally.benchmark import utils as bench_utils
+from rally.common import broker
+from rally import osclients
 
 
 CINDER_BENCHMARK_OPTS = [
@@ -91,6 +93,61 @@ class CinderScenario(base.Scenario):
         )
         return volume
 
+    @base.atomic_action_timer("cinder.create_volumes")
+    def _create_volumes(self, size, amount, workers=1, name_prefix=None,
+                        **kwargs):
+        """Create several volumes.
+
+        Volumes are created by `workers` concurrent requests, each worker
+        uses its own client, because clients are not thread safe. Returns
+        when all of them are in the "Available" state, statuses of all the
+        volumes are checked with one list request.
+
+        :param size: int be size of volumes in GB
+        :param amount: number of volumes to create
+        :param workers: number of concurrent create requests
+        :param name_prefix: prefix of random names of the volumes, used if
+                            display_name is not specified
+        :param kwargs: Other optional parameters to initialize the volumes
+        :returns: list of created volume objects
+        """
+        worker_clients = []
+
+        def create(cache, i):
+            if "cinder" not in cache:
+                clients = osclients.Clients(self._clients.endpoint)
+                # list.append() is atomic, so no lock is required here
+                worker_clients.append(clients)
+                cache["cinder"] = clients.cinder()
+            kw = dict(kwargs)
+            if "display_name" not in kw:
+                kw["display_name"] = self._generate_random_name(
+                    prefix=name_prefix)
+            return cache["cinder"].volumes.create(size, **kw)._info
+
+        try:
+            results, errors = broker.run_for_each(
+                create, range(amount), workers, with_cache=True)
+        finally:
+            for clients in worker_clients:
+                clients.release()
+        if errors:
+            raise errors[0][1]
+
+        # Clients of the workers are released, so the volumes are bound to
+        # the client of the scenario.
+        manager = self.clients("cinder").volumes
+        volumes = [manager.resource_class(manager, info, loaded=True)
+                   for i, info in results]
+        time.sleep(CONF.benchmark.cinder_volume_create_prepoll_delay)
+        return bench_utils.wait_for_all(
+            volumes,
+            is_ready=bench_utils.resource_is("available"),
+            update_resources=bench_utils.get_all_from_manager(),
+            timeout=CONF.benchmark.cinder_volume_create_timeout,
+            check_interval=CONF.benchmark.cinder_volume_create_poll_interval
+        )
+
     @base.atomic_action_timer("cinder.delete_volume")
     def _delete_volume(self, volume):
         """Delete the given volume.
@@ -351,7 +351,8 @@ class NovaScenario(base.Scenario):
         """Boot multiple servers.
 
         Returns when all the servers are actually booted and are in the
-        "Active" state.
+        "Active" state. Statuses of all the servers are checked with one
+        list request.
 
         :param name_prefix: The prefix to use while naming the created servers.
                             The rest of the server names will be '_No.'
@@ -371,18 +372,16 @@ class NovaScenario(base.Scenario):
         # NOTE(msdubov): Nova python client returns only one server even when
         #                min_count > 1, so we have to rediscover all the
         #                created servers manually.
-        servers = filter(lambda server: server.name.startswith(name_prefix),
-                         self.clients("nova").servers.list())
+        servers = [server for server in self.clients("nova").servers.list()
+                   if server.name.startswith(name_prefix)]
         time.sleep(CONF.benchmark.nova_server_boot_prepoll_delay)
-        servers = [bench_utils.wait_for(
-            server,
+        return bench_utils.wait_for_all(
+            servers,
             is_ready=bench_utils.resource_is("ACTIVE"),
-            update_resource=bench_utils.
-            get_from_manager(),
+            update_resources=bench_utils.get_all_from_manager(),
             timeout=CONF.benchmark.nova_server_boot_timeout,
             check_interval=CONF.benchmark.nova_server_boot_poll_interval
-        ) for server in servers]
-        return servers
+        )
 
     @base.atomic_action_timer("nova.associate_floating_ip")
     def _associate_floating_ip(self, server, address, fixed_address=None):
@@ -9,33 +9,62 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
-
-import requests
-
 from rally.benchmark.scenarios import base
-from rally.common.i18n import _
-from rally import exceptions
-
-
-class WrongStatusException(exceptions.RallyException):
-    msg_fmt = _("Requests scenario exception: '%(message)s'")
+from rally.benchmark.scenarios.requests import utils
 
 
-class Requests(base.Scenario):
+class Requests(utils.RequestScenario):
     """Benchmark scenarios for HTTP requests."""
 
     @base.scenario()
-    def check_response(self, url, response=None):
+    def check_response(self, url, response=None, keep_alive=False):
         """Standard way to benchmark web services.
 
-        This benchmark is used to GET a URL and check it with expected
-        Response.
+        This benchmark is used to send HEAD request to a URL and check it
+        with expected Response.
 
         :param url: URL to be fetched
         :param response: expected response code
+        :param keep_alive: reuse connections between iterations, by default
+                           each request opens a new connection
+        """
+        self._check_request(url, method="HEAD", status_code=response,
+                            keep_alive=keep_alive)
+
+    @base.scenario()
+    def check_request(self, url, method="GET", status_code=200,
+                      keep_alive=True, **kwargs):
+        """Send a HTTP request and check status code of the response.
+
+        Connections are kept alive between iterations of the same worker
+        unless keep_alive is False. Time of connecting, time to the first
+        byte and total time of the request are reported as atomic actions.
+
+        :param url: URL of the request
+        :param method: HTTP method, e.g. GET, POST or PUT
+        :param status_code: expected status code of the response
+        :param keep_alive: reuse connections between iterations
+        :param kwargs: optional arguments of the request: headers, data,
+                       json, params, timeout, allow_redirects, etc
+        """
+        self._check_request(url, method=method, status_code=status_code,
+                            keep_alive=keep_alive, **kwargs)
+
+    @base.scenario()
+    def check_random_request(self, requests, status_code=200,
+                             keep_alive=True):
+        """Send a HTTP request chosen randomly from the list of requests.
+
+        Each request is a dict with "url" and optional "method" (GET by
+        default), "weight" (1 by default, the chance to choose the request
+        is proportional to its weight), "status_code" (overrides the common
+        one) and other arguments of the request (headers, data, etc).
+
+        :param requests: list of requests to choose from
+        :param status_code: expected status code of the responses
+        :param keep_alive: reuse connections between iterations
         """
-        resp = requests.head(url)
-        if response and response != resp.status_code:
-            error = "Expected HTTP request code is `%s` actual `%s`" % (
-                    response, resp.status_code)
-            raise WrongStatusException(error)
+        request = dict(utils.choose_weighted(requests))
+        request.pop("weight", None)
+        request.setdefault("status_code", status_code)
+        self._check_request(keep_alive=keep_alive, **request)
@@ -0,0 +1,171 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import random
+import threading
+import time
+
+import requests
+from requests import adapters
+from requests.packages.urllib3 import connectionpool
+
+from rally.benchmark.scenarios import base
+from rally.common.i18n import _
+from rally import exceptions
+
+
+class WrongStatusException(exceptions.RallyException):
+    msg_fmt = _("Requests scenario exception: '%(message)s'")
+
+
+# Time spent on opening connections by the current thread
+_timings = threading.local()
+
+
+def _timed_pool_cls(pool_cls):
+    """Return subclass of urllib3 pool that measures connect() time."""
+    connection_cls = pool_cls.ConnectionCls
+
+    def connect(self):
+        started = time.time()
+        try:
+            connection_cls.connect(self)
+        finally:
+            _timings.connect = (getattr(_timings, "connect", 0.0) +
+                                time.time() - started)
+
+    timed_connection_cls = type(connection_cls.__name__, (connection_cls,),
+                                {"connect": connect})
+    return type(pool_cls.__name__, (pool_cls,),
+                {"ConnectionCls": timed_connection_cls})
+
+
+_POOL_CLASSES = {
+    "http": _timed_pool_cls(connectionpool.HTTPConnectionPool),
+    "https": _timed_pool_cls(connectionpool.HTTPSConnectionPool)
+}
+
+
+class _TimedHTTPAdapter(adapters.HTTPAdapter):
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(_TimedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _POOL_CLASSES
+
+
+def _new_session():
+    session = requests.Session()
+    session.mount("http://", _TimedHTTPAdapter())
+    session.mount("https://", _TimedHTTPAdapter())
+    return session
+
+
+class _SessionsPool(object):
+    """Idle sessions of the current process.
+
+    Each running iteration takes its own session (requests.Session is not
+    thread-safe), and returns it back when the request is done, so
+    connections are kept alive between iterations of the same worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._sessions = []
+
+    def acquire(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections of the parent process can't be shared
+                self._pid = os.getpid()
+                self._sessions = []
+            if self._sessions:
+                return self._sessions.pop()
+        return _new_session()
+
+    def release(self, session):
+        with self._lock:
+            if self._pid == os.getpid():
+                self._sessions.append(session)
+
+
+_sessions = _SessionsPool()
+
+
+def choose_weighted(items):
+    """Return random item, the chance is proportional to its "weight".
+
+    :param items: list of dicts, "weight" is 1 if not specified
+    """
+    point = random.uniform(0, sum(item.get("weight", 1) for item in items))
+    for item in items:
+        point -= item.get("weight", 1)
+        if point < 0:
+            return item
+    return items[-1]
+
+
+class RequestScenario(base.Scenario):
+    """Base class for Requests scenarios with basic atomic actions."""
+
+    def _check_request(self, url, method="GET", status_code=None,
+                       keep_alive=True, **kwargs):
+        """Send a HTTP request and check status code of the response.
+
+        Adds atomic actions: "requests.connect" is time spent on opening
+        connections (0 if a kept alive connection was used),
+        "requests.first_byte" is time until headers of the response are
+        received and "requests.total" is time until the whole response is
+        received, both include connect time.
+
+        :param url: URL of the request
+        :param method: HTTP method
+        :param status_code: expected status code of the response, not
+                            checked if None
+        :param keep_alive: reuse connections of the previous iterations of
+                           the worker, otherwise the connection is opened
+                           for this request only
+        :param kwargs: other arguments of requests.request(), e.g. headers,
+                       data, json, params or timeout
+        :returns: requests.Response
+        """
+        kwargs.setdefault("allow_redirects", method.upper() != "HEAD")
+        if keep_alive:
+            session = _sessions.acquire()
+        else:
+            session = _new_session()
+            kwargs["headers"] = dict(kwargs.get("headers") or {},
+                                     Connection="close")
+
+        _timings.connect = 0.0
+        started = time.time()
+        try:
+            resp = session.request(method, url, stream=True, **kwargs)
+            first_byte = time.time() - started
+            resp.content
+            total = time.time() - started
+        finally:
+            if keep_alive:
+                _sessions.release(session)
+            else:
+                session.close()
+
+        self._add_atomic_actions("requests.connect", _timings.connect)
+        self._add_atomic_actions("requests.first_byte", first_byte)
+        self._add_atomic_actions("requests.total", total)
+
+        if status_code and status_code != resp.status_code:
+            error = "Expected HTTP request code is `%s` actual `%s`" % (
+                status_code, resp.status_code)
+            raise WrongStatusException(error)
+        return resp
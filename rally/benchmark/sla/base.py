@@ -20,10 +20,13 @@ with contracted values such as maximum error rate or minimum response time.
 """
 
 import abc
+import math
 
 import jsonschema
 import six
 
+from rally.benchmark.processing import sketch
+from rally.common import discover
 from rally.common.i18n import _
 from rally.common import utils
 from rally import consts
@@ -63,6 +66,9 @@ class SLA(object):
 
     @staticmethod
     def validate(config):
+        # SLA classes may be not imported yet, because plugins are loaded
+        # lazily, see discover.get_plugin()
+        discover.load_all()
         properties = dict([(c.OPTION_NAME, c.CONFIG_SCHEMA)
                            for c in utils.itersubclasses(SLA)])
         schema = {
@@ -75,9 +81,11 @@ class SLA(object):
     @staticmethod
     def get_by_name(name):
         """Returns SLA by name or config option name."""
-        for sla in utils.itersubclasses(SLA):
-            if name == sla.__name__ or name == sla.OPTION_NAME:
-                return sla
+        sla = discover.get_plugin(
+            SLA, name, index_name="names",
+            key=lambda cls: [getattr(cls, "OPTION_NAME", None), cls.__name__])
+        if sla:
+            return sla
         raise exceptions.NoSuchSLA(name=name)
 
     @abc.abstractmethod
@@ -210,3 +218,163 @@ class MaxAverageDuration(SLA):
     def details(self):
         return (_("Maximum average duration of one iteration %.2fs <= %.2fs - "
                   "%s") % (self.avg, self.criterion_value, self.status()))
+
+
+class PercentileDuration(SLA):
+    """Maximum percentiles of iteration or atomic actions durations.
+
+    Each criterion checks the given percentile of total durations of
+    successful iterations, or of durations of the given atomic action.
+    Percentiles are estimated by sketch.QuantileSketch, so the memory does
+    not grow with the number of iterations.
+
+    Percentiles of a few samples are too noisy, so a criterion is not
+    checked (and passes) until there are min_iterations durations for it.
+    Estimation of a percentile is not cheap, so while iterations are added
+    it is re-estimated when the number of durations grows by 10%, but at
+    least every CHECK_INTERVAL durations; result() uses all of them.
+    """
+    OPTION_NAME = "max_percentile_duration"
+    CRITERION_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "percentile": {"type": "number", "minimum": 0.0,
+                           "maximum": 100.0},
+            "max": {"type": "number", "minimum": 0.0,
+                    "exclusiveMinimum": True},
+            "action": {"type": "string"},
+            "min_iterations": {"type": "integer", "minimum": 1}
+        },
+        "required": ["percentile", "max"],
+        "additionalProperties": False
+    }
+    CONFIG_SCHEMA = {
+        "$schema": consts.JSON_SCHEMA,
+        "anyOf": [
+            CRITERION_SCHEMA,
+            {"type": "array", "items": CRITERION_SCHEMA, "minItems": 1}
+        ]
+    }
+    DEFAULT_MIN_ITERATIONS = 10
+    CHECK_INTERVAL = 100
+
+    def __init__(self, criterion_value):
+        super(PercentileDuration, self).__init__(criterion_value)
+        if isinstance(criterion_value, dict):
+            criterion_value = [criterion_value]
+        self.criteria = [dict(c, sketch=sketch.QuantileSketch(),
+                              value=None, success=True, checked=0)
+                         for c in criterion_value]
+
+    def _check(self, criterion, interval=1):
+        """Estimate the percentile if interval durations were added."""
+        count = criterion["sketch"].count
+        if (count >= criterion.get("min_iterations",
+                                   self.DEFAULT_MIN_ITERATIONS) and
+                (criterion["value"] is None or
+                 count - criterion["checked"] >= interval)):
+            criterion["value"] = criterion["sketch"].quantile(
+                criterion["percentile"] / 100.0)
+            criterion["success"] = criterion["value"] <= criterion["max"]
+            criterion["checked"] = count
+
+    def add_iteration(self, iteration):
+        for criterion in self.criteria:
+            if "action" in criterion:
+                duration = iteration.get("atomic_actions", {}).get(
+                    criterion["action"])
+            elif not iteration.get("error"):
+                duration = iteration["duration"]
+            else:
+                duration = None
+            if duration is None:
+                continue
+
+            criterion["sketch"].add(duration)
+            self._check(criterion, min(self.CHECK_INTERVAL,
+                                       max(1, criterion["checked"] // 10)))
+        self.success = all(c["success"] for c in self.criteria)
+        return self.success
+
+    def result(self):
+        for criterion in self.criteria:
+            self._check(criterion)
+        self.success = all(c["success"] for c in self.criteria)
+        return super(PercentileDuration, self).result()
+
+    def details(self):
+        details = []
+        for c in self.criteria:
+            name = c.get("action", _("iteration"))
+            if c["value"] is None:
+                details.append(
+                    _("%(percentile)s percentile of %(name)s duration is "
+                      "not checked: %(count)d < %(min)d iterations") %
+                    {"percentile": c["percentile"], "name": name,
+                     "count": c["sketch"].count,
+                     "min": c.get("min_iterations",
+                                  self.DEFAULT_MIN_ITERATIONS)})
+            else:
+                details.append(
+                    _("%(percentile)s percentile of %(name)s duration "
+                      "%(value).2fs <= %(max).2fs") %
+                    {"percentile": c["percentile"], "name": name,
+                     "value": c["value"], "max": c["max"]})
+        return "%s - %s" % ("; ".join(details), self.status())
+
+
+class Outliers(SLA):
+    """Limit the number of outliers (iterations that take too much time).
+
+    The outliers are detected automatically using the computation of the mean
+    and standard deviation (std) of the data. They are updated incrementally
+    and an iteration is an outlier if its duration is greater than
+    mean + sigmas * std of the previous iterations. Nothing is checked until
+    there are min_iterations successful iterations.
+    """
+    OPTION_NAME = "outliers"
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "max": {"type": "integer", "minimum": 0},
+            "min_iterations": {"type": "integer", "minimum": 3},
+            "sigmas": {"type": "number", "minimum": 0.0,
+                       "exclusiveMinimum": True}
+        },
+        "additionalProperties": False
+    }
+
+    def __init__(self, criterion_value):
+        super(Outliers, self).__init__(criterion_value)
+        self.max_outliers = self.criterion_value.get("max", 0)
+        self.min_iterations = self.criterion_value.get("min_iterations", 3)
+        self.sigmas = self.criterion_value.get("sigmas", 3.0)
+        self.iterations = 0
+        self.outliers = 0
+        # Welford's algorithm of the mean and variance
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add_iteration(self, iteration):
+        if iteration.get("error"):
+            return self.success
+        duration = iteration["duration"]
+
+        if self.iterations >= self.min_iterations:
+            std = math.sqrt(self.m2 / (self.iterations - 1))
+            if duration > self.mean + self.sigmas * std:
+                self.outliers += 1
+                self.success = self.outliers <= self.max_outliers
+
+        self.iterations += 1
+        delta = duration - self.mean
+        self.mean += delta / self.iterations
+        self.m2 += delta * (duration - self.mean)
+        return self.success
+
+    def details(self):
+        return (_("Maximum number of outliers %(outliers)i <= %(max)i - "
+                  "%(status)s") % {"outliers": self.outliers,
+                                   "max": self.max_outliers,
+                                   "status": self.status()})
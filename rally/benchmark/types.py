@@ -49,8 +49,9 @@ def preprocess(cls, method_name, context, args):
                              and resource configuration
 
     """
-    preprocessors = base.Scenario.meta(cls, method_name=method_name,
-                                       attr_name="preprocessors", default={})
+    preprocessors = base.Scenario._get_meta(cls, method_name=method_name,
+                                            attr_name="preprocessors",
+                                            default={})
     clients = osclients.Clients(context["admin"]["endpoint"])
     processed_args = copy.deepcopy(args)
 
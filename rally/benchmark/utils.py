@@ -14,10 +14,14 @@
 #    under the License.
 
 import itertools
+import random
+import threading
 import time
 import traceback
+import weakref
 
 from novaclient import exceptions as nova_exc
+from oslo_config import cfg
 import six
 
 from rally.common.i18n import _
@@ -27,6 +31,39 @@ from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
+POLLING_OPTS = [
+    cfg.FloatOpt("poll_initial_interval",
+                 default=0.0,
+                 help="Interval in seconds before the second status check of "
+                      "a resource that is waited for. It is multiplied by "
+                      "poll_backoff_factor after each check, until it "
+                      "reaches the check interval of the action. 0 means "
+                      "that the check interval is used from the start"),
+    cfg.FloatOpt("poll_backoff_factor",
+                 default=2.0,
+                 help="Factor of growth of the intervals between status "
+                      "checks, see poll_initial_interval"),
+    cfg.FloatOpt("poll_jitter",
+                 default=0.0,
+                 help="Random deviation of the intervals between status "
+                      "checks, as a fraction of the interval (e.g. 0.1 for "
+                      "intervals up to 10 percent shorter or longer), so "
+                      "checks of concurrent iterations don't come in bursts"),
+    cfg.FloatOpt("poll_rate_limit",
+                 default=0.0,
+                 help="Max number of status checks per second made by one "
+                      "benchmark process to one service, 0 means no limit"),
+    cfg.BoolOpt("poll_batch_status",
+                default=False,
+                help="Check statuses of all the resources that are waited "
+                     "for in a process with one list request per client "
+                     "instead of one get request per resource")
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(POLLING_OPTS, group=benchmark_group)
+
 
 def get_status(resource):
     # workaround for heat resources - using stack_status instead of status
@@ -51,31 +88,145 @@ class resource_is(object):
         return str(self.desired_status)
 
 
+class _RateLimiter(object):
+    """Spreads calls evenly, so there are at most `rate` calls per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_call = 0
+
+    def wait(self):
+        with self._lock:
+            now = time.time()
+            call_at = max(now, self._next_call)
+            self._next_call = call_at + self.interval
+        if call_at > now:
+            time.sleep(call_at - now)
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _limit_rate(manager):
+    """Wait for a free slot of the service of manager, see poll_rate_limit."""
+    rate = CONF.benchmark.poll_rate_limit
+    if rate <= 0:
+        return
+    # Managers of one service live in one client package, e.g. novaclient
+    key = (type(manager).__module__.split(".")[0], rate)
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = _rate_limiters[key] = _RateLimiter(rate)
+    limiter.wait()
+
+
+class _StatusWatcher(object):
+    """Shares list() requests of a manager between status checks.
+
+    A status check uses the result of the list request that was started
+    after the check had been requested, so concurrent checks of resources
+    of one manager (i.e. of one user) are served by one request.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._lock = threading.Lock()
+        self._listed_at = None
+        self._resources = {}
+
+    def get(self, resource_id):
+        requested_at = time.time()
+        with self._lock:
+            if self._listed_at is None or self._listed_at < requested_at:
+                _limit_rate(self.manager)
+                listed_at = time.time()
+                self._resources = dict((r.id, r)
+                                       for r in self.manager.list())
+                self._listed_at = listed_at
+            res = self._resources.get(resource_id)
+        if res is None:
+            # The resource is deleted or the list is limited by the
+            # pagination of the service, so check it separately
+            _limit_rate(self.manager)
+            res = self.manager.get(resource_id)
+        return res
+
+
+_watchers = weakref.WeakKeyDictionary()
+_watchers_lock = threading.Lock()
+
+
+def _get_watcher(manager):
+    with _watchers_lock:
+        watcher = _watchers.get(manager)
+        if watcher is None:
+            watcher = _watchers[manager] = _StatusWatcher(manager)
+        return watcher
+
+
+def _check_status(res, error_statuses):
+    # catch abnormal status, such as "no valid host" for servers
+    status = get_status(res)
+
+    if status in ("DELETED", "DELETE_COMPLETE"):
+        raise exceptions.GetResourceNotFound(resource=res)
+    if status in error_statuses:
+        raise exceptions.GetResourceErrorStatus(resource=res,
+                                                status=status, fault="")
+    return res
+
+
 def get_from_manager(error_statuses=None):
-    error_statuses = error_statuses or ["ERROR"]
-    error_statuses = map(lambda str: str.upper(), error_statuses)
+    error_statuses = [status.upper()
+                      for status in error_statuses or ["ERROR"]]
 
     def _get_from_manager(resource):
         # catch client side errors
         try:
-            res = resource.manager.get(resource.id)
+            if CONF.benchmark.poll_batch_status:
+                res = _get_watcher(resource.manager).get(resource.id)
+            else:
+                _limit_rate(resource.manager)
+                res = resource.manager.get(resource.id)
         except Exception as e:
             if getattr(e, "code", 400) == 404:
                 raise exceptions.GetResourceNotFound(resource=resource)
             raise exceptions.GetResourceFailure(resource=resource, err=e)
 
-        # catch abnormal status, such as "no valid host" for servers
-        status = get_status(res)
+        return _check_status(res, error_statuses)
 
-        if status in ("DELETED", "DELETE_COMPLETE"):
-            raise exceptions.GetResourceNotFound(resource=res)
-        if status in error_statuses:
-            raise exceptions.GetResourceErrorStatus(resource=res,
-                                                    status=status, fault="")
+    return _get_from_manager
 
-        return res
 
-    return _get_from_manager
+def get_all_from_manager(error_statuses=None):
+    """Same as get_from_manager(), but updates a list of resources.
+
+    Resources are updated with one list() request of the manager of the
+    first resource, resources that are missing in the list (e.g. because of
+    pagination) are updated one by one.
+    """
+    error_statuses = [status.upper()
+                      for status in error_statuses or ["ERROR"]]
+    get_one = get_from_manager(error_statuses)
+
+    def _get_all_from_manager(resources):
+        if not resources:
+            return []
+        manager = resources[0].manager
+        try:
+            _limit_rate(manager)
+            listed = dict((res.id, res) for res in manager.list())
+        except Exception as e:
+            raise exceptions.GetResourceFailure(resource=resources[0], err=e)
+
+        return [_check_status(listed[res.id], error_statuses)
+                if res.id in listed else get_one(res)
+                for res in resources]
+
+    return _get_all_from_manager
 
 
 def manager_list_size(sizes):
@@ -84,6 +235,19 @@ def manager_list_size(sizes):
     return _list
 
 
+def _poll_intervals(check_interval):
+    """Yields intervals between status checks, see POLLING_OPTS."""
+    interval = CONF.benchmark.poll_initial_interval or check_interval
+    jitter = CONF.benchmark.poll_jitter
+    while True:
+        interval = min(interval, check_interval)
+        if jitter:
+            yield interval * random.uniform(1 - jitter, 1 + jitter)
+        else:
+            yield interval
+        interval *= CONF.benchmark.poll_backoff_factor
+
+
 def wait_for(resource, is_ready, update_resource=None, timeout=60,
              check_interval=1):
     """Waits for the given resource to come into the desired state.
@@ -99,19 +263,21 @@ def wait_for(resource, is_ready, update_resource=None, timeout=60,
     :param timeout: Timeout in seconds after which a TimeoutException will be
                     raised
     :param check_interval: Interval in seconds between the two consecutive
-                           readiness checks
+                           readiness checks, the first checks can be more
+                           frequent (see poll_initial_interval option)
 
     :returns: The "ready" resource object
     """
 
     start = time.time()
+    intervals = _poll_intervals(check_interval)
     while True:
         # NOTE(boden): mitigate 1st iteration waits by updating immediately
         if update_resource:
             resource = update_resource(resource)
         if is_ready(resource):
             break
-        time.sleep(check_interval)
+        time.sleep(next(intervals))
         if time.time() - start > timeout:
             raise exceptions.TimeoutException(
                 desired_status=str(is_ready),
@@ -123,6 +289,50 @@ def wait_for(resource, is_ready, update_resource=None, timeout=60,
     return resource
 
 
+def wait_for_all(resources, is_ready, update_resources, timeout=60,
+                 check_interval=1):
+    """Waits for all the given resources to come into the desired state.
+
+    Same as wait_for(), but all the resources that are not ready yet are
+    updated at once, so a single poll serves all of them.
+
+    :param resources: list of resources
+    :param is_ready: A predicate that should take the resource object and
+                     return True iff it is ready
+    :param update_resources: Function that should take a list of resources
+                             and return the list of 'updated' resources,
+                             e.g. get_all_from_manager()
+    :param timeout: Timeout in seconds after which a TimeoutException will be
+                    raised
+    :param check_interval: Interval in seconds between the two consecutive
+                           readiness checks
+
+    :returns: The list of "ready" resources in the original order
+    """
+    resources = list(resources)
+    pending = list(range(len(resources)))
+    start = time.time()
+    intervals = _poll_intervals(check_interval)
+    while pending:
+        updated = update_resources([resources[i] for i in pending])
+        for i, resource in zip(pending, updated):
+            resources[i] = resource
+        pending = [i for i in pending if not is_ready(resources[i])]
+        if not pending:
+            break
+        time.sleep(next(intervals))
+        if time.time() - start > timeout:
+            resource = resources[pending[0]]
+            raise exceptions.TimeoutException(
+                desired_status=str(is_ready),
+                resource_name=getattr(resource, "name", repr(resource)),
+                resource_type=resource.__class__.__name__,
+                resource_id=getattr(resource, "id", "<no id>"),
+                resource_status=get_status(resource))
+
+    return resources
+
+
 def wait_for_delete(resource, update_resource=None, timeout=60,
                     check_interval=1):
     """Wait for the full deletion of resource.
@@ -135,15 +345,17 @@ def wait_for_delete(resource, update_resource=None, timeout=60,
     :param timeout: Timeout in seconds after which a TimeoutException will be
                     raised
     :param check_interval: Interval in seconds between the two consecutive
-                           readiness checks
+                           readiness checks, the first checks can be more
+                           frequent (see poll_initial_interval option)
     """
     start = time.time()
+    intervals = _poll_intervals(check_interval)
     while True:
         try:
             resource = update_resource(resource)
         except exceptions.GetResourceNotFound:
             break
-        time.sleep(check_interval)
+        time.sleep(next(intervals))
         if time.time() - start > timeout:
             raise exceptions.TimeoutException(
                 desired_status="deleted",
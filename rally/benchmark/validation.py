@@ -15,8 +15,11 @@
 #    under the License.
 
 import functools
+import json
 import os
 import re
+import threading
+import weakref
 
 from glanceclient import exc as glance_exc
 from novaclient import exceptions as nova_exc
@@ -29,6 +32,58 @@ from rally import exceptions
 from rally.verification.tempest import tempest
 
 
+# Results of cloud lookups made by validators, per endpoint object of clients.
+# All the benchmarks of a task are validated with clients of the same
+# endpoints, so the same image, flavor, etc. is requested only once per task
+# validation, even by concurrent workers with clients of their own.
+_lookups = weakref.WeakKeyDictionary()
+_lookups_lock = threading.Lock()
+
+
+class _Lookup(object):
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+def _cached(clients, key, func):
+    """Call func() once per endpoint object of clients and key.
+
+    Exception raised by func() is cached as well as the result, so failed
+    lookups are not repeated either.
+
+    :param clients: osclients.Clients used by func()
+    :param key: tuple that identifies the lookup
+    :param func: function without arguments that does the lookup
+    """
+    endpoint = getattr(clients, "endpoint", None)
+    try:
+        with _lookups_lock:
+            lookup = _lookups.setdefault(endpoint, {}).setdefault(key,
+                                                                  _Lookup())
+    except TypeError:
+        # there is no endpoint or it doesn't support weak references
+        return func()
+
+    with lookup.lock:
+        if not lookup.done:
+            try:
+                lookup.result = func()
+            except Exception as e:
+                lookup.error = e
+            lookup.done = True
+    if lookup.error is not None:
+        raise lookup.error
+    return lookup.result
+
+
+def _resource_key(kind, resource_config):
+    return (kind, json.dumps(resource_config, sort_keys=True))
+
+
 class ValidationResult(object):
 
     def __init__(self, is_valid, msg=None):
@@ -172,10 +227,15 @@ def _get_validated_image(config, clients, param_name):
                 "min_disk": image_context.get("min_disk", 0)
             }
             return (ValidationResult(True), image)
-    try:
+
+    def get_image():
         image_id = types.ImageResourceType.transform(
             clients=clients, resource_config=image_args)
-        image = clients.glance().images.get(image=image_id).to_dict()
+        return clients.glance().images.get(image=image_id).to_dict()
+
+    try:
+        image = _cached(clients, _resource_key("image", image_args),
+                        get_image)
         return (ValidationResult(True), image)
     except (glance_exc.HTTPNotFound, exceptions.InvalidScenarioArgument):
         message = _("Image '%s' not found") % image_args
@@ -200,10 +260,15 @@ def _get_validated_flavor(config, clients, param_name):
     if not flavor_value:
         msg = "Parameter %s is not specified." % param_name
         return (ValidationResult(False, msg), None)
-    try:
+
+    def get_flavor():
         flavor_id = types.FlavorResourceType.transform(
             clients=clients, resource_config=flavor_value)
-        flavor = clients.nova().flavors.get(flavor=flavor_id)
+        return clients.nova().flavors.get(flavor=flavor_id)
+
+    try:
+        flavor = _cached(clients, _resource_key("flavor", flavor_value),
+                         get_flavor)
         return (ValidationResult(True), flavor)
     except (nova_exc.NotFound, exceptions.InvalidScenarioArgument):
         try:
@@ -280,8 +345,8 @@ def network_exists(config, clients, deployment, network_name):
 
     network = config.get("args", {}).get(network_name, "private")
 
-    networks = [net.label for net in
-                clients.nova().networks.list()]
+    networks = _cached(clients, ("networks",), lambda: [
+        net.label for net in clients.nova().networks.list()])
     if network not in networks:
         message = _("Network with name %(network)s not found. "
                     "Available networks: %(networks)s") % {
@@ -298,7 +363,8 @@ def external_network_exists(config, clients, deployment, network_name):
     if not ext_network:
         return ValidationResult(True)
 
-    networks = [net.name for net in clients.nova().floating_ip_pools.list()]
+    networks = _cached(clients, ("floating_ip_pools",), lambda: [
+        net.name for net in clients.nova().floating_ip_pools.list()])
 
     if networks and isinstance(networks[0], dict):
         networks = [n["name"] for n in networks]
@@ -384,7 +450,8 @@ def required_services(config, clients, deployment, *required_services):
 
     :param *required_services: list of services names
     """
-    available_services = clients.services().values()
+    available_services = _cached(clients, ("services",),
+                                 lambda: list(clients.services().values()))
     for service in required_services:
         if service not in consts.Service:
             return ValidationResult(False, _("Unknown service: %s") % service)
@@ -464,7 +531,9 @@ def volume_type_exists(config, clients, deployment, param_name):
     """
     val = config.get("args", {}).get(param_name)
     if val:
-        volume_types_list = clients.cinder().volume_types.list()
+        volume_types_list = _cached(
+            clients, ("volume_types",),
+            lambda: clients.cinder().volume_types.list())
         if len(volume_types_list) < 1:
             message = (_("Must have at least one volume type created "
                          "when specifying use of volume types."))
@@ -52,6 +52,7 @@ from __future__ import print_function
 from rally.benchmark.scenarios import base as scenario_base
 from rally.benchmark.sla import base as sla_base
 from rally.cmd import cliutils
+from rally.common import discover
 from rally.common import utils
 from rally import deploy
 from rally.deploy import serverprovider
@@ -245,6 +246,7 @@ class InfoCommands(object):
 
     def _get_descriptions(self, base_cls, subclass_filter=None):
         descriptions = []
+        discover.load_all()
         subclasses = utils.itersubclasses(base_cls)
         if subclass_filter:
             subclasses = filter(subclass_filter, subclasses)
@@ -265,6 +267,7 @@ class InfoCommands(object):
 
     def _find_substitution(self, query):
         max_distance = min(3, len(query) / 4)
+        discover.load_all()
         scenarios = scenario_base.Scenario.list_benchmark_scenarios()
         scenario_groups = list(set(s.split(".")[0] for s in scenarios))
         scenario_methods = list(set(s.split(".")[1] for s in scenarios))
@@ -27,10 +27,13 @@ from oslo_utils import uuidutils
 import yaml
 
 from rally import api
+from rally.benchmark.processing import downsampling
 from rally.benchmark.processing import plot
+from rally.benchmark.processing import sketch
 from rally.benchmark.processing import utils
 from rally.cmd import cliutils
 from rally.cmd import envutils
+from rally.common import costilius
 from rally.common import fileutils
 from rally.common.i18n import _
 from rally.common import log as logging
@@ -45,6 +48,43 @@ class FailedToLoadTask(exceptions.RallyException):
     msg_fmt = _("Failed to load task")
 
 
+def _dump_results(results, fp):
+    """Write results of a task to fp as JSON, iterations one by one.
+
+    The output is the same as of json.dump(results, fp, sort_keys=True,
+    indent=4, separators=(",", ": ")), but "result" of each item may be an
+    iterator (e.g. over iterations read from DB by chunks), so all the
+    iterations are never kept in memory at once.
+
+    :param results: non-empty list of dicts with results of benchmarks
+    :param fp: file-like object to write to
+    """
+    def dumps(obj, level):
+        # JSON strings can't contain line breaks, so every line of the dump
+        # may be indented
+        text = json.dumps(obj, sort_keys=True, indent=4,
+                          separators=(",", ": "))
+        return text.replace("\n", "\n" + " " * 4 * level)
+
+    fp.write("[")
+    for i, result in enumerate(results):
+        fp.write(",\n    {" if i else "\n    {")
+        for j, key in enumerate(sorted(result)):
+            fp.write(",\n        " if j else "\n        ")
+            fp.write("%s: " % json.dumps(key))
+            if key != "result":
+                fp.write(dumps(result[key], 2))
+                continue
+            fp.write("[")
+            count = 0
+            for count, iteration in enumerate(result[key], 1):
+                fp.write(",\n            " if count > 1 else "\n            ")
+                fp.write(dumps(iteration, 3))
+            fp.write("\n        ]" if count else "]")
+        fp.write("\n    }")
+    fp.write("\n]")
+
+
 class TaskCommands(object):
     """Task management.
 
@@ -183,9 +223,16 @@ class TaskCommands(object):
                    dest="abort_on_sla_failure",
                    help="Abort the execution of a benchmark scenario when"
                         "any SLA check for it fails")
+    @cliutils.args("--parallel", type=int, dest="parallel", default=1,
+                   help="Max number of independent benchmarks (or groups of "
+                        "benchmarks with the same \"group\" option) to be "
+                        "run at the same time. It doesn't limit the load: "
+                        "each benchmark runs its scenario with the "
+                        "concurrency of its own runner. Benchmarks are run "
+                        "one by one by default.")
     @envutils.with_default_deployment(cli_arg_name="deployment")
     def start(self, task, deployment=None, task_args=None, task_args_file=None,
-              tag=None, do_use=False, abort_on_sla_failure=False):
+              tag=None, do_use=False, abort_on_sla_failure=False, parallel=1):
         """Start benchmark task.
 
         :param task: a file with yaml/json task
@@ -201,6 +248,9 @@ class TaskCommands(object):
         :param abort_on_sla_failure: if True, the execution of a benchmark
                                      scenario will stop when any SLA check
                                      for it fails
+        :param parallel: max number of independent benchmarks to be run at
+                         the same time (not a limit of their total
+                         concurrency)
         """
         try:
             input_task = self._load_task(task, task_args, task_args_file)
@@ -216,7 +266,8 @@ class TaskCommands(object):
             print("To track task status use:\n")
             print("\trally task status\n\tor\n\trally task detailed\n")
             api.Task.start(deployment, input_task, task=task,
-                           abort_on_sla_failure=abort_on_sla_failure)
+                           abort_on_sla_failure=abort_on_sla_failure,
+                           parallel=parallel)
             self.detailed(task_id=task["uuid"])
             if do_use:
                 self.use(task["uuid"])
@@ -242,9 +293,9 @@ class TaskCommands(object):
         Returns current status of task
         """
 
-        task = db.task_get(task_id)
+        status = objects.Task.get_status(task_id)
         print(_("Task %(task_id)s: %(status)s")
-              % {"task_id": task_id, "status": task["status"]})
+              % {"task_id": task_id, "status": status})
 
     @cliutils.args("--uuid", type=str, dest="task_id",
                    help=("uuid of task, if --uuid is \"last\" results of most "
@@ -261,31 +312,24 @@ class TaskCommands(object):
         Prints detailed information of task.
         """
 
-        def _print_iterations_data(raw_data):
+        def _print_iterations_data(iterations, atomic_actions):
             headers = ["iteration", "full duration"]
             float_cols = ["full duration"]
-            atomic_actions = []
-            for row in raw_data:
-                # find first non-error result to get atomic actions names
-                if not row["error"] and "atomic_actions" in row:
-                    atomic_actions = row["atomic_actions"].keys()
-            for row in raw_data:
-                if row["atomic_actions"]:
-                    for (c, a) in enumerate(atomic_actions, 1):
-                        action = "%(no)i. %(action)s" % {"no": c, "action": a}
-                        headers.append(action)
-                        float_cols.append(action)
-                    break
+            if any(actions for duration, actions in iterations):
+                for (c, a) in enumerate(atomic_actions, 1):
+                    action = "%(no)i. %(action)s" % {"no": c, "action": a}
+                    headers.append(action)
+                    float_cols.append(action)
             table_rows = []
             formatters = dict(zip(float_cols,
                                   [cliutils.pretty_float_formatter(col, 3)
                                    for col in float_cols]))
-            for (c, r) in enumerate(raw_data, 1):
-                dlist = [c]
-                dlist.append(r["duration"])
-                if r["atomic_actions"]:
+            for (c, (duration, actions)) in enumerate(iterations, 1):
+                dlist = [c, duration]
+                if len(headers) > 2:
                     for action in atomic_actions:
-                        dlist.append(r["atomic_actions"].get(action) or 0)
+                        dlist.append(actions.get(action) or 0)
+                table_rows.append(rutils.Struct(**dict(zip(headers, dlist))))
             cliutils.print_list(table_rows,
                                 fields=headers,
                                 formatters=formatters)
@@ -325,7 +369,6 @@ class TaskCommands(object):
             print("args values:")
             pprint.pprint(key["kw"])
 
-            raw = result["data"]["raw"]
             table_cols = ["action", "min (sec)", "avg (sec)", "max (sec)",
                           "90 percentile", "95 percentile", "success",
                           "count"]
@@ -336,42 +379,68 @@ class TaskCommands(object):
                                    for col in float_cols]))
             table_rows = []
 
-            actions_data = utils.get_atomic_actions_data(raw)
-            for action in actions_data:
-                durations = actions_data[action]
-                if durations:
+            # Iterations are read from DB once, only what is printed is
+            # kept in memory
+            if result["data"].get("sketch"):
+                iterations_sketch = sketch.IterationsSketch.from_dict(
+                    result["data"]["sketch"])
+                add_to_sketch = None
+            else:
+                iterations_sketch = sketch.IterationsSketch()
+                add_to_sketch = iterations_sketch.add_iteration
+            # NOTE(hughsaunders): ssrs=scenario specific results
+            ssrs = costilius.OrderedDict()
+            scenario_errors = []
+            iterations_rows = []
+            atomic_actions = []
+            for iteration in objects.Task.iter_results_raw(result):
+                if add_to_sketch:
+                    add_to_sketch(iteration)
+                output = iteration["scenario_output"]
+                for key, value in (output.get("data") or {}).items():
+                    ssrs.setdefault(key, []).append(float(value))
+                if output.get("errors"):
+                    scenario_errors.append(output["errors"])
+                if iterations_data:
+                    iterations_rows.append((iteration["duration"],
+                                            iteration["atomic_actions"]))
+                    # atomic actions names of a non-error iteration
+                    if (not iteration["error"] and
+                            iteration.get("atomic_actions")):
+                        atomic_actions = list(iteration["atomic_actions"])
+
+            iterations = iterations_sketch.iterations
+            for action, durations in iterations_sketch.items():
+                if durations.count:
                     data = [action,
-                            min(durations),
-                            utils.mean(durations),
-                            max(durations),
-                            utils.percentile(durations, 0.90),
-                            utils.percentile(durations, 0.95),
-                            "%.1f%%" % (len(durations) * 100.0 / len(raw)),
-                            len(raw)]
+                            durations.min,
+                            durations.mean(),
+                            durations.max,
+                            durations.quantile(0.90),
+                            durations.quantile(0.95),
+                            "%.1f%%" % (durations.count * 100.0 / iterations),
+                            iterations]
                 else:
                     data = [action, None, None, None, None, None,
-                            "0.0%", len(raw)]
+                            "0.0%", iterations]
                 table_rows.append(rutils.Struct(**dict(zip(table_cols, data))))
 
             cliutils.print_list(table_rows, fields=table_cols,
                                 formatters=formatters)
 
             if iterations_data:
-                _print_iterations_data(raw)
+                _print_iterations_data(iterations_rows, atomic_actions)
 
             print(_("Load duration: %s") % result["data"]["load_duration"])
             print(_("Full duration: %s") % result["data"]["full_duration"])
 
-            # NOTE(hughsaunders): ssrs=scenario specific results
-            ssrs = []
-            for result in raw:
-                data = result["scenario_output"].get("data")
-                if data:
-                    ssrs.append(data)
+            runner_summary = result["data"].get("runner_summary", {})
+            if "max_passed_level" in runner_summary:
+                print(_("Max passed load level (%(load)s): %(level)s") %
+                      {"load": runner_summary["load"],
+                       "level": runner_summary["max_passed_level"]})
+
             if ssrs:
-                keys = set()
-                for ssr in ssrs:
-                    keys.update(ssr.keys())
                 headers = ["key", "max", "avg", "min",
                            "90 pecentile", "95 pecentile"]
                 float_cols = ["max", "avg", "min",
@@ -380,28 +449,18 @@ class TaskCommands(object):
                                   [cliutils.pretty_float_formatter(col, 3)
                                    for col in float_cols]))
                 table_rows = []
-                for key in keys:
-                    values = [float(ssr[key]) for ssr in ssrs if key in ssr]
-
-                    if values:
-                        row = [str(key),
-                               max(values),
-                               utils.mean(values),
-                               min(values),
-                               utils.percentile(values, 0.90),
-                               utils.percentile(values, 0.95)]
-                    else:
-                        row = [str(key)] + ["n/a"] * 5
+                for key, values in ssrs.items():
+                    min_value, avg, max_value, percentiles = (
+                        utils.describe(values, (0.90, 0.95)))
+                    row = [str(key), max_value, avg, min_value] + percentiles
                     table_rows.append(rutils.Struct(**dict(zip(headers, row))))
                 print("\nScenario Specific Results\n")
                 cliutils.print_list(table_rows,
                                     fields=headers,
                                     formatters=formatters)
 
-                for result in raw:
-                    errors = result["scenario_output"].get("errors")
-                    if errors:
-                        print(errors)
+                for errors in scenario_errors:
+                    print(errors)
 
         print()
         print("HINTS:")
@@ -422,14 +481,18 @@ class TaskCommands(object):
         :param task_id: Task uuid
         """
 
-        results = [{"key": x["key"], "result": x["data"]["raw"],
+        # Iterations are read from DB by chunks while JSON is written
+        results = [{"key": x["key"],
+                    "result": objects.Task.iter_results_raw(x),
                     "sla": x["data"]["sla"],
                     "load_duration": x["data"]["load_duration"],
-                    "full_duration": x["data"]["full_duration"]}
+                    "full_duration": x["data"]["full_duration"],
+                    "runner_summary": x["data"].get("runner_summary", {})}
                    for x in objects.Task.get(task_id).get_results()]
 
         if results:
-            print(json.dumps(results, sort_keys=True, indent=4))
+            _dump_results(results, sys.stdout)
+            print()
         else:
             print(_("The task %s can not be found") % task_id)
             return(1)
@@ -472,7 +535,7 @@ class TaskCommands(object):
         if not all_deployments:
             filters.setdefault("deployment", deployment)
 
-        task_list = [task.to_dict() for task in objects.Task.list(**filters)]
+        task_list = objects.Task.list_summary(**filters)
 
         for x in task_list:
             x["duration"] = x["updated_at"] - x["created_at"]
@@ -496,19 +559,37 @@ class TaskCommands(object):
                    help="Path to output file.")
     @cliutils.args("--open", dest="open_it", action="store_true",
                    help="Open it in browser.")
+    @cliutils.args("--points", type=int, dest="points",
+                   help="Max number of points of iteration charts, longer "
+                        "series are downsampled (default: %d)."
+                        % downsampling.DEFAULT_LIMIT)
+    @cliutils.args("--downsampling", dest="downsampling_method",
+                   choices=sorted(downsampling.METHODS),
+                   help="Method of downsampling: 'lttb' keeps the shape "
+                        "of series, 'minmax' keeps min and max of every "
+                        "bucket (default: lttb).")
     @cliutils.deprecated_args(
         "--uuid", dest="tasks", nargs="+",
         help="uuids of tasks or json files with task results")
     @envutils.default_from_global("tasks", envutils.ENV_TASK, "--uuid")
     @cliutils.suppress_warnings
-    def report(self, tasks=None, out=None, open_it=False):
+    def report(self, tasks=None, out=None, open_it=False,
+               points=downsampling.DEFAULT_LIMIT,
+               downsampling_method="lttb"):
         """Generate HTML report file for specified task.
 
         :param task_id: UUID, task identifier
         :param tasks: list, UUIDs od tasks or pathes files with tasks results
         :param out: str, output html file name
         :param open_it: bool, whether to open output file in web browser
+        :param points: int, max number of points of iteration charts
+        :param downsampling_method: str, method of downsampling of long
+                                    series
         """
+        if points < 3:
+            print(_("ERROR: At least 3 points are required, got %d")
+                  % points, file=sys.stderr)
+            return 1
 
         tasks = isinstance(tasks, list) and tasks or [tasks]
 
@@ -534,12 +615,15 @@ class TaskCommands(object):
                             return 1
 
             elif uuidutils.is_uuid_like(task_file_or_uuid):
+                # Iterations are read from DB by chunks while the report
+                # is prepared
                 tasks_results = map(
                     lambda x: {"key": x["key"],
                                "sla": x["data"]["sla"],
-                               "result": x["data"]["raw"],
+                               "result": objects.Task.iter_results_raw(x),
                                "load_duration": x["data"]["load_duration"],
-                               "full_duration": x["data"]["full_duration"]},
+                               "full_duration": x["data"]["full_duration"],
+                               "sketch": x["data"].get("sketch")},
                     objects.Task.get(task_file_or_uuid).get_results())
             else:
                 print(_("ERROR: Invalid UUID or file name passed: %s"
@@ -558,7 +642,8 @@ class TaskCommands(object):
 
         output_file = os.path.expanduser(out)
         with open(output_file, "w+") as f:
-            f.write(plot.plot(results))
+            f.write(plot.plot(results, points=points,
+                              downsampling_method=downsampling_method))
 
         if open_it:
             webbrowser.open_new_tab("file://" + os.path.realpath(out))
@@ -601,14 +686,14 @@ class TaskCommands(object):
         :param task_id: Task uuid.
         :returns: Number of failed criteria.
         """
-        results = objects.Task.get(task_id).get_results()
+        results = objects.Task.get(task_id).get_results_summary()
         failed_criteria = 0
         data = []
         STATUS_PASS = "PASS"
         STATUS_FAIL = "FAIL"
         for result in results:
             key = result["key"]
-            for sla in sorted(result["data"]["sla"],
+            for sla in sorted(result["summary"]["sla"],
                               key=lambda x: x["criterion"]):
                 success = sla.pop("success")
                 sla["status"] = success and STATUS_PASS or STATUS_FAIL
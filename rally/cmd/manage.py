@@ -22,6 +22,7 @@ import sys
 from rally import api
 from rally.cmd import cliutils
 from rally.cmd import envutils
+from rally.common.i18n import _
 from rally import db
 
 
@@ -33,6 +34,26 @@ class DBCommands(object):
         db.db_create()
         envutils.clear_env()
 
+    def upgrade(self):
+        """Add tables and columns of the current version to existing DB.
+
+        Results and other data stored by previous versions are kept.
+        """
+        added = db.db_upgrade()
+        if added:
+            print(_("Added: %s") % ", ".join(added))
+        else:
+            print(_("DB is up to date"))
+
+    def recompress(self):
+        """Compress stored task results as db_compression option says.
+
+        Results stored before compression was enabled (or with another
+        compression) are converted, Rally can be used meanwhile.
+        """
+        count = db.db_recompress()
+        print(_("%d values converted") % count)
+
 
 class TempestCommands(object):
     """Commands for Tempest management."""
@@ -14,6 +14,7 @@
 #    under the License.
 
 import collections
+import operator
 import threading
 import time
 
@@ -50,7 +51,10 @@ def _consumer(consume, queue, is_published):
                 if logging.is_debug():
                     LOG.exception(e)
         elif is_published.isSet():
-            break
+            # The queue could be filled after the check above, but it's not
+            # changed after is_published is set.
+            if not queue:
+                break
         else:
             time.sleep(0.1)
 
@@ -101,3 +105,46 @@ def run(publish, consume, consumers_count=1):
     _publisher(publish, queue, is_published)
     for consumer in consumers:
         consumer.join()
+
+
+def run_for_each(func, items, consumers_count=1, with_cache=False):
+    """Call func for each item using consumers_count concurrent threads.
+
+    Unlike run(), which only logs failed consume() calls, this collects
+    results and failures of all the calls, so the caller can decide what to
+    do with them.
+
+    :param func: Function that processes a single item
+    :param items: Iterable of items to process
+    :param consumers_count: Number of consumers
+    :param with_cache: Call func(cache, item) instead of func(item), where
+                       cache is a dict of the consumer thread (the same as
+                       in run()), e.g. to keep client handles that can't be
+                       used by several threads at once
+    :returns: tuple (results, errors), where results is a list of
+              (item, result) pairs of successful calls and errors is a list
+              of (item, exception) pairs of failed ones, both in the order
+              of items
+    """
+    items = list(items)
+    results = []
+    errors = []
+
+    def publish(queue):
+        for args in enumerate(items):
+            queue.append(args)
+
+    def consume(cache, args):
+        idx, item = args
+        try:
+            # list.append() is atomic, so no lock is required here
+            result = func(cache, item) if with_cache else func(item)
+            results.append((idx, item, result))
+        except Exception as e:
+            errors.append((idx, item, e))
+
+    run(publish, consume, min(consumers_count, len(items)) or 1)
+    results.sort(key=operator.itemgetter(0))
+    errors.sort(key=operator.itemgetter(0))
+    return ([(item, result) for idx, item, result in results],
+            [(item, e) for idx, item, e in errors])
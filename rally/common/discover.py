@@ -0,0 +1,191 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Lazy discovery of plugins.
+
+Modules of plugin packages are not imported until plugins are needed.
+Listing of plugins imports all of them, but search of a plugin by name uses
+the plugin index (name -> module and class), so only one module is imported.
+The index is saved to INDEX_FILE and rebuilt when any module of the plugin
+packages is changed.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from oslo_utils import importutils
+
+import rally
+from rally.common import log as logging
+from rally.common import utils
+
+
+LOG = logging.getLogger(__name__)
+
+PLUGIN_PACKAGES = [
+    "rally.benchmark.context",
+    "rally.benchmark.runners",
+    "rally.benchmark.scenarios",
+    "rally.benchmark.sla",
+    "rally.deploy.engines",
+    "rally.deploy.serverprovider.providers"
+]
+
+INDEX_FILE = os.path.expanduser("~/.rally/plugin_index.json")
+
+_lock = threading.RLock()
+_loaded = False
+_index = None
+
+
+def _package_path(package):
+    return os.path.join(os.path.dirname(rally.__file__), os.pardir,
+                        *package.split("."))
+
+
+def _is_plugin_module(module_name):
+    return any(module_name.startswith(package + ".")
+               for package in PLUGIN_PACKAGES)
+
+
+def _get_signature():
+    """Returns hash of paths, sizes and mtimes of plugin modules."""
+    sha = hashlib.sha1()
+    for package in PLUGIN_PACKAGES:
+        for root, dirs, files in os.walk(_package_path(package)):
+            dirs.sort()
+            for filename in sorted(files):
+                if not filename.endswith(".py"):
+                    continue
+                path = os.path.join(root, filename)
+                stat = os.stat(path)
+                sha.update(("%s %s %s;" % (path, stat.st_mtime,
+                                           stat.st_size)).encode("utf-8"))
+    return sha.hexdigest()
+
+
+def _subclasses(cls):
+    """Same as utils.itersubclasses(), used to build the index."""
+    seen = set()
+    stack = list(reversed(cls.__subclasses__()))
+    while stack:
+        sub = stack.pop()
+        if sub not in seen:
+            seen.add(sub)
+            yield sub
+            stack.extend(reversed(sub.__subclasses__()))
+
+
+def load_all():
+    """Import all modules of plugin packages."""
+    global _loaded
+    with _lock:
+        if not _loaded:
+            for package in PLUGIN_PACKAGES:
+                utils.import_modules_from_package(package)
+            _loaded = True
+
+
+def _get_index():
+    global _index
+    if _index is None:
+        signature = _get_signature()
+        if INDEX_FILE and os.path.exists(INDEX_FILE):
+            try:
+                with open(INDEX_FILE) as f:
+                    index = json.load(f)
+                if index.get("signature") == signature:
+                    _index = index
+            except (IOError, OSError, ValueError) as e:
+                LOG.debug("Failed to read plugin index %(path)s: %(e)s"
+                          % {"path": INDEX_FILE, "e": e})
+        if _index is None:
+            _index = {"signature": signature, "plugins": {}}
+    return _index
+
+
+def _save_index(index):
+    if not INDEX_FILE:
+        return
+    tmp_path = "%s.%d" % (INDEX_FILE, os.getpid())
+    try:
+        if not os.path.exists(os.path.dirname(INDEX_FILE)):
+            os.makedirs(os.path.dirname(INDEX_FILE))
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.rename(tmp_path, INDEX_FILE)
+    except (IOError, OSError) as e:
+        LOG.debug("Failed to save plugin index %(path)s: %(e)s"
+                  % {"path": INDEX_FILE, "e": e})
+
+
+def _names(key, cls):
+    names = key(cls)
+    if not isinstance(names, (list, tuple)):
+        names = [names]
+    return [name for name in names if name is not None]
+
+
+def _build_index(base, key):
+    load_all()
+    plugins = {}
+    for cls in _subclasses(base):
+        if _is_plugin_module(cls.__module__):
+            for name in _names(key, cls):
+                plugins.setdefault(name, [cls.__module__, cls.__name__])
+    return plugins
+
+
+def get_plugin(base, name, key, index_name="name"):
+    """Find subclass of base by name.
+
+    If the plugin index has name, only the module of the plugin is
+    imported, otherwise (e.g. plugins from directories of plugins) all the
+    plugins are loaded and checked one by one.
+
+    :param base: base class of plugins
+    :param name: name of the plugin
+    :param key: function that returns name of a plugin class, list of its
+                names or None
+    :param index_name: name of the index of the base built by key, bases
+                       searched by different keys should use different
+                       index names
+    :returns: plugin class or None if there is no such plugin
+    """
+    kind = "%s.%s:%s" % (base.__module__, base.__name__, index_name)
+    with _lock:
+        index = _get_index()
+        if kind not in index["plugins"]:
+            index["plugins"][kind] = _build_index(base, key)
+            _save_index(index)
+        entry = index["plugins"][kind].get(name)
+
+    if entry:
+        try:
+            cls = getattr(importutils.import_module(entry[0]), entry[1], None)
+        except ImportError:
+            cls = None
+        if (isinstance(cls, type) and issubclass(cls, base) and
+                name in _names(key, cls)):
+            return cls
+
+    load_all()
+    for cls in utils.itersubclasses(base):
+        if name in _names(key, cls):
+            return cls
+    return None
@@ -14,13 +14,18 @@
 
 import itertools
 
+from rally.benchmark.context import base as context_base
 from rally.benchmark.context import users
+from rally.benchmark import engine
+from rally.benchmark.runners import base as runners_base
 from rally.benchmark.scenarios.cinder import utils as cinder_utils
 from rally.benchmark.scenarios.glance import utils as glance_utils
 from rally.benchmark.scenarios.heat import utils as heat_utils
 from rally.benchmark.scenarios.nova import utils as nova_utils
 from rally.benchmark.scenarios.sahara import utils as sahara_utils
+from rally.benchmark import utils as bench_utils
 from rally.common import log
+from rally.db.sqlalchemy import types as db_types
 from rally import exceptions
 from rally import osclients
 from rally.verification.tempest import config as tempest_conf
@@ -31,13 +36,18 @@ def list_opts():
         ("DEFAULT",
          itertools.chain(log.DEBUG_OPTS,
                          exceptions.EXC_LOG_OPTS,
-                         osclients.OSCLIENTS_OPTS)),
+                         osclients.OSCLIENTS_OPTS,
+                         db_types.DB_OPTS)),
         ("benchmark",
          itertools.chain(cinder_utils.CINDER_BENCHMARK_OPTS,
                          glance_utils.GLANCE_BENCHMARK_OPTS,
                          heat_utils.HEAT_BENCHMARK_OPTS,
                          nova_utils.NOVA_BENCHMARK_OPTS,
-                         sahara_utils.SAHARA_TIMEOUT_OPTS)),
+                         sahara_utils.SAHARA_TIMEOUT_OPTS,
+                         runners_base.RUNNER_BENCHMARK_OPTS,
+                         context_base.CONTEXT_BENCHMARK_OPTS,
+                         engine.ENGINE_BENCHMARK_OPTS,
+                         bench_utils.POLLING_OPTS)),
         ("image",
          itertools.chain(tempest_conf.IMAGE_OPTS)),
         ("users_context", itertools.chain(users.USER_CONTEXT_OPTS))
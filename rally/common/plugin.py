@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from rally.common import discover
 from rally.common import utils
 from rally import exceptions
 
@@ -58,14 +59,16 @@ class Plugin(object):
 
     @classmethod
     def get(cls, name):
-        for _plugin in cls.get_all():
-            if _plugin.get_name() == name:
-                return _plugin
+        _plugin = discover.get_plugin(cls, name,
+                                      key=lambda plugin: plugin.get_name())
+        if _plugin:
+            return _plugin
 
         raise exceptions.NoSuchPlugin(name=name)
 
     @classmethod
     def get_all(cls):
+        discover.load_all()
         return list(utils.itersubclasses(cls))
 
     @classmethod
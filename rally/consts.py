@@ -87,6 +87,8 @@ class _RunnerType(utils.ImmutableMixin, utils.EnumMixin):
     CONSTANT = "constant"
     CONSTANT_FOR_DURATION = "constant_for_duration"
     RPS = "rps"
+    STEP_LOAD = "step_load"
+    ASYNCIO = "asyncio"
 
 
 class _Service(utils.ImmutableMixin, utils.EnumMixin):
@@ -70,6 +70,31 @@ def db_drop():
     IMPL.db_drop()
 
 
+def db_upgrade():
+    """Add tables and columns that are missing in DB of previous versions.
+
+    Stored data is kept, results stored before they were introduced are
+    read as before.
+
+    :returns: list of names of added tables and columns
+    """
+    return IMPL.db_upgrade()
+
+
+def db_recompress(batch_size=100):
+    """Convert stored big JSON values to the configured compression.
+
+    Data of task results, their chunks and verification results that is
+    compressed differently than the db_compression option says is
+    converted. Rows are converted in batches, each batch in its own
+    transaction, so Rally can be used meanwhile.
+
+    :param batch_size: int, number of rows converted in one transaction.
+    :returns: int, number of converted rows.
+    """
+    return IMPL.db_recompress(batch_size)
+
+
 def task_get(uuid):
     """Returns task by uuid.
 
@@ -80,6 +105,16 @@ def task_get(uuid):
     return IMPL.task_get(uuid)
 
 
+def task_get_status(uuid):
+    """Returns status of task by uuid, the rest of the task is not loaded.
+
+    :param uuid: UUID of the task.
+    :raises: :class:`rally.exceptions.TaskNotFound` if the task does not exist.
+    :returns: string with status of the task.
+    """
+    return IMPL.task_get_status(uuid)
+
+
 def task_get_detailed_last():
     """Returns the most recently created task."""
     return IMPL.task_get_detailed_last()
@@ -127,6 +162,23 @@ def task_list(status=None, deployment=None):
     return IMPL.task_list(status=status, deployment=deployment)
 
 
+def task_list_summary(status=None, deployment=None):
+    """Get a list of tasks without loading whole records.
+
+    Only the columns shown by task listing are fetched, together with names
+    of deployments.
+
+    :param status: Task status to filter the returned list on. If set to
+                   None, all the tasks will be returned.
+    :param deployment: deployment UUID or name to filter the returned list
+                       on. If set to None tasks from all deployments will be
+                       returned.
+    :returns: A list of dicts with uuid, status, tag, created_at,
+              updated_at, deployment_uuid and deployment_name of tasks.
+    """
+    return IMPL.task_list_summary(status=status, deployment=deployment)
+
+
 def task_delete(uuid, status=None):
     """Delete a task.
 
@@ -151,15 +203,60 @@ def task_result_get_all_by_uuid(task_uuid):
     return IMPL.task_result_get_all_by_uuid(task_uuid)
 
 
-def task_result_create(task_uuid, key, data):
+def task_result_create(task_uuid, key, data, summary=None):
     """Append result record to task.
 
     :param task_uuid: string with UUID of Task instance.
     :param key: key expected to update in task result.
     :param data: data expected to update in task result.
+    :param summary: small dict that summarizes data.
     :returns: TaskResult instance appended.
     """
-    return IMPL.task_result_create(task_uuid, key, data)
+    return IMPL.task_result_create(task_uuid, key, data, summary)
+
+
+def task_result_summary_get_all(task_uuid):
+    """Get summaries of task results without loading their data.
+
+    :param task_uuid: string with UUID of Task instance.
+    :returns: list of dicts with id, key and summary of task results
+              ordered by id, summary is None for results stored without it.
+    """
+    return IMPL.task_result_summary_get_all(task_uuid)
+
+
+def task_result_update(result_id, data, summary=None):
+    """Update data of task result.
+
+    :param result_id: int, id of TaskResult instance.
+    :param data: new data of task result.
+    :param summary: small dict that summarizes data.
+    :raises: :class:`rally.exceptions.NotFoundException` if the result
+             does not exist.
+    :returns: updated TaskResult instance.
+    """
+    return IMPL.task_result_update(result_id, data, summary)
+
+
+def task_result_chunk_create(result_id, position, data):
+    """Append chunk of iterations to task result.
+
+    :param result_id: int, id of TaskResult instance.
+    :param position: int, position of the chunk in the task result.
+    :param data: list of iterations.
+    :returns: TaskResultChunk instance appended.
+    """
+    return IMPL.task_result_chunk_create(result_id, position, data)
+
+
+def task_result_chunk_get_all(result_id):
+    """Get chunks of iterations of task result ordered by position.
+
+    :param result_id: int, id of TaskResult instance.
+    :returns: iterator over TaskResultChunk instances, chunks are fetched
+              from DB one by one.
+    """
+    return IMPL.task_result_chunk_get_all(result_id)
 
 
 def deployment_create(values):
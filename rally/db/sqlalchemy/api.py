@@ -25,6 +25,7 @@ from sqlalchemy.orm.exc import NoResultFound
 
 from rally.common.i18n import _
 from rally.db.sqlalchemy import models
+from rally.db.sqlalchemy import types
 from rally import exceptions
 
 
@@ -37,6 +38,9 @@ def _create_facade_lazily():
     global _FACADE
 
     if _FACADE is None:
+        # Fail before anything is run rather than on the first write of
+        # big values (e.g. results at the end of a task)
+        types.get_compression()
         _FACADE = db_session.EngineFacade.from_config(CONF)
 
     return _FACADE
@@ -70,6 +74,41 @@ class Connection(object):
     def db_drop(self):
         models.drop_db()
 
+    def db_upgrade(self):
+        return models.upgrade_db()
+
+    def db_recompress(self, batch_size=100):
+        compression = types.get_compression()
+        count = 0
+        for model in (models.TaskResult, models.TaskResultChunk,
+                      models.VerificationResult):
+            table = model.__table__
+            # Stored values are read and written as they are, without
+            # decoding of JSON
+            raw_data = sa.type_coerce(table.c.data, sa.Text)
+            last_id = None
+            while True:
+                session = get_session()
+                with session.begin():
+                    query = session.query(table.c.id, raw_data)
+                    if last_id is not None:
+                        query = query.filter(table.c.id > last_id)
+                    rows = query.order_by(table.c.id).limit(batch_size).all()
+                    for id_, value in rows:
+                        if types.get_value_compression(value) == compression:
+                            continue
+                        value = types.decompress(value)
+                        if compression:
+                            value = types.compress(value, compression)
+                        session.execute(
+                            table.update().where(table.c.id == id_).values(
+                                data=sa.type_coerce(value, sa.Text)))
+                        count += 1
+                if len(rows) < batch_size:
+                    break
+                last_id = rows[-1][0]
+        return count
+
     def model_query(self, model, session=None):
         """The helper method to create query.
 
@@ -103,6 +142,13 @@ class Connection(object):
     def task_get(self, uuid):
         return self._task_get(uuid)
 
+    def task_get_status(self, uuid):
+        status = (get_session().query(models.Task.status).
+                  filter_by(uuid=uuid).first())
+        if not status:
+            raise exceptions.TaskNotFound(uuid=uuid)
+        return status[0]
+
     def task_get_detailed(self, uuid):
         return (self.model_query(models.Task).
                 options(sa.orm.joinedload("results")).
@@ -141,6 +187,23 @@ class Connection(object):
             query = query.filter_by(**filters)
         return query.all()
 
+    def task_list_summary(self, status=None, deployment=None):
+        columns = [models.Task.uuid, models.Task.status, models.Task.tag,
+                   models.Task.created_at, models.Task.updated_at,
+                   models.Task.deployment_uuid,
+                   models.Deployment.name.label("deployment_name")]
+        query = (get_session().query(*columns).
+                 join(models.Deployment,
+                      models.Task.deployment_uuid == models.Deployment.uuid))
+
+        if status is not None:
+            query = query.filter(models.Task.status == status)
+        if deployment is not None:
+            query = query.filter(models.Task.deployment_uuid ==
+                                 self.deployment_get(deployment)["uuid"])
+        return [dict(zip([c.key for c in columns], row))
+                for row in query.all()]
+
     def task_delete(self, uuid, status=None):
         session = get_session()
         with session.begin():
@@ -149,6 +212,12 @@ class Connection(object):
             if status is not None:
                 query = base_query.filter_by(status=status)
 
+            results = (session.query(models.TaskResult.id).
+                       filter_by(task_uuid=uuid))
+            (self.model_query(models.TaskResultChunk).
+             filter(models.TaskResultChunk.task_result_id.in_(results)).
+             delete(synchronize_session=False))
+
             (self.model_query(models.TaskResult).filter_by(task_uuid=uuid).
              delete(synchronize_session=False))
 
@@ -162,9 +231,10 @@ class Connection(object):
                                                            actual=task.status)
                 raise exceptions.TaskNotFound(uuid=uuid)
 
-    def task_result_create(self, task_uuid, key, data):
+    def task_result_create(self, task_uuid, key, data, summary=None):
         result = models.TaskResult()
-        result.update({"task_uuid": task_uuid, "key": key, "data": data})
+        result.update({"task_uuid": task_uuid, "key": key, "data": data,
+                       "summary": summary})
         result.save()
         return result
 
@@ -172,6 +242,41 @@ class Connection(object):
         return (self.model_query(models.TaskResult).
                 filter_by(task_uuid=uuid).all())
 
+    def task_result_summary_get_all(self, task_uuid):
+        columns = [models.TaskResult.id, models.TaskResult.key,
+                   models.TaskResult.summary]
+        query = (get_session().query(*columns).
+                 filter_by(task_uuid=task_uuid).
+                 order_by(models.TaskResult.id))
+        return [dict(zip([c.key for c in columns], row))
+                for row in query.all()]
+
+    def task_result_update(self, result_id, data, summary=None):
+        session = get_session()
+        with session.begin():
+            result = (self.model_query(models.TaskResult, session=session).
+                      filter_by(id=result_id).first())
+            if not result:
+                raise exceptions.NotFoundException(
+                    "Can't find task result with id '%s'." % result_id)
+            result.update({"data": data, "summary": summary})
+        return result
+
+    def task_result_chunk_create(self, result_id, position, data):
+        chunk = models.TaskResultChunk()
+        chunk.update({"task_result_id": result_id, "position": position,
+                      "data": data})
+        chunk.save()
+        return chunk
+
+    def task_result_chunk_get_all(self, result_id):
+        query = (self.model_query(models.TaskResultChunk).
+                 filter_by(task_result_id=result_id).
+                 order_by(models.TaskResultChunk.position))
+        # Chunks are fetched one by one, so only one of them is in memory
+        for chunk in query.yield_per(1):
+            yield chunk
+
     def _deployment_get(self, deployment, session=None):
         stored_deployment = self.model_query(
             models.Deployment,
@@ -27,6 +27,7 @@ from sqlalchemy import types
 
 from rally import consts
 from rally.db.sqlalchemy import types as sa_types
+from rally import exceptions
 
 
 BASE = declarative_base()
@@ -171,7 +172,11 @@ class TaskResult(BASE, RallyBase):
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
 
     key = sa.Column(sa_types.MutableJSONEncodedDict, nullable=False)
-    data = sa.Column(sa_types.BigMutableJSONEncodedDict, nullable=False)
+    # Data is always replaced as a whole, so changes are not tracked
+    data = sa.Column(sa_types.BigJSONEncodedDict, nullable=False)
+    # Small summary of data (numbers of iterations and errors, durations,
+    # SLA results) for commands that don't need the whole data
+    summary = sa.Column(sa_types.MutableJSONEncodedDict, nullable=True)
 
     task_uuid = sa.Column(sa.String(36), sa.ForeignKey("tasks.uuid"))
     task = sa.orm.relationship(Task,
@@ -180,6 +185,24 @@ class TaskResult(BASE, RallyBase):
                                primaryjoin="TaskResult.task_uuid == Task.uuid")
 
 
+class TaskResultChunk(BASE, RallyBase):
+    """Represents a chunk of iterations of a task result.
+
+    Iterations are stored by chunks while the benchmark is running, so they
+    are not kept in memory and are not lost if the task crashes.
+    """
+    __tablename__ = "task_result_chunks"
+    __table_args__ = (
+        sa.Index("task_result_chunk_position", "task_result_id", "position"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    position = sa.Column(sa.Integer, nullable=False)
+    data = sa.Column(sa_types.BigJSONEncodedDict, nullable=False)
+
+    task_result_id = sa.Column(sa.Integer, sa.ForeignKey("task_results.id"))
+
+
 class Verification(BASE, RallyBase):
     """Represents a verifier result."""
 
@@ -236,6 +259,44 @@ def create_db():
     BASE.metadata.create_all(sa_api.get_engine())
 
 
+def upgrade_db():
+    """Add tables and columns that are missing in the existing DB.
+
+    There are no schema migrations, so DBs created by previous versions
+    get new tables (e.g. task_result_chunks) and new nullable columns
+    (e.g. summary of task_results) this way, stored data is kept.
+
+    :returns: list of names of added tables and "table.column" names of
+              added columns
+    """
+    from rally.db.sqlalchemy import api as sa_api
+
+    engine = sa_api.get_engine()
+    inspector = sa.inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added = [table.name for table in BASE.metadata.sorted_tables
+             if table.name not in existing_tables]
+    BASE.metadata.create_all(engine)
+
+    for table in BASE.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = set(column["name"] for column
+                               in inspector.get_columns(table.name))
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            if not column.nullable:
+                raise exceptions.RallyException(
+                    "Column %s.%s can't be added to existing rows, the DB "
+                    "should be recreated" % (table.name, column.name))
+            engine.execute("ALTER TABLE %s ADD COLUMN %s %s" % (
+                table.name, column.name,
+                column.type.compile(dialect=engine.dialect)))
+            added.append("%s.%s" % (table.name, column.name))
+    return added
+
+
 # TODO(boris-42): Remove it after oslo.db > 1.4.1 will be released.
 def drop_all_objects(engine):
     """Drop all database objects.
@@ -13,14 +13,111 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
 import json
+import sys
+import zlib
 
+from oslo_config import cfg
 from sqlalchemy.dialects import mysql as mysql_types
 from sqlalchemy.ext import mutable
 from sqlalchemy import types as sa_types
 
 from rally.common import costilius
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson as fast_json
+except ImportError:
+    try:
+        import ujson as fast_json
+    except ImportError:
+        fast_json = None
+
+
+DB_OPTS = [
+    cfg.StrOpt("db_compression", default="zlib",
+               help="Compression of big JSON values (e.g. task results) "
+                    "stored in DB: 'none', 'zlib' or 'zstd' (requires "
+                    "zstandard library). Values are read regardless of "
+                    "this option, 'rally-manage db recompress' converts "
+                    "stored values to it")
+]
+CONF = cfg.CONF
+CONF.register_opts(DB_OPTS)
+
+
+# Compressors of big JSON values: name -> (compress, decompress) functions
+# of bytes. Compressed values are stored as "<name>:<base64 of bytes>",
+# that never looks like JSON, so values stored without compression are
+# read as they are.
+COMPRESSORS = {
+    "zlib": (lambda data: zlib.compress(data, 1), zlib.decompress)
+}
+
+if zstandard is not None:
+    COMPRESSORS["zstd"] = (
+        lambda data: zstandard.ZstdCompressor().compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data))
+
+
+def get_compression():
+    """Return name of compressor of new values, None for no compression."""
+    name = CONF.db_compression
+    if name == "none":
+        return None
+    if name not in COMPRESSORS:
+        raise ValueError("Unknown or unavailable DB compression '%s'" % name)
+    return name
+
+
+def get_value_compression(value):
+    """Return name of compressor of stored value, None if not compressed."""
+    name, sep, data = value[:16].partition(":")
+    if sep and name in COMPRESSORS:
+        return name
+    return None
+
+
+def compress(value, name):
+    """Compress JSON string with compressor from COMPRESSORS."""
+    data = COMPRESSORS[name][0](value.encode("utf-8"))
+    return "%s:%s" % (name, base64.b64encode(data).decode("ascii"))
+
+
+def decompress(value):
+    """Decompress stored value if it is compressed, see compress()."""
+    name = get_value_compression(value)
+    if name is None:
+        return value
+    data = base64.b64decode(value[len(name) + 1:].encode("ascii"))
+    return COMPRESSORS[name][1](data).decode("utf-8")
+
+
+def json_dumps(value):
+    return json.dumps(value, sort_keys=False, separators=(",", ":"))
+
+
+if sys.version_info >= (3, 7):
+    # Dicts keep order of keys, so the faster decoders can be used: orjson
+    # or ujson if available, json without object_pairs_hook otherwise
+    def json_loads(value):
+        if fast_json is not None:
+            try:
+                return fast_json.loads(value)
+            except ValueError:
+                # e.g. NaN or big integers, that json module supports
+                pass
+        return json.loads(value)
+else:
+    def json_loads(value):
+        return costilius.json_loads(value,
+                                    object_pairs_hook=costilius.OrderedDict)
+
 
 class JSONEncodedDict(sa_types.TypeDecorator):
     """Represents an immutable structure as a json-encoded string."""
@@ -29,13 +126,12 @@ class JSONEncodedDict(sa_types.TypeDecorator):
 
     def process_bind_param(self, value, dialect):
         if value is not None:
-            value = json.dumps(value, sort_keys=False)
+            value = json_dumps(value)
         return value
 
     def process_result_value(self, value, dialect):
         if value is not None:
-            value = costilius.json_loads(
-                value, object_pairs_hook=costilius.OrderedDict)
+            value = json_loads(value)
         return value
 
 
@@ -46,6 +142,8 @@ class BigJSONEncodedDict(JSONEncodedDict):
        sqlite we are able to store more then 1GB. In some cases, like storing
        results of task 64kb is not enough. So this type uses for MySql
        LONGTEXT that allows us to store 4GiB.
+
+       Values are compressed as the db_compression option says.
     """
 
     def load_dialect_impl(self, dialect):
@@ -54,6 +152,19 @@ class BigJSONEncodedDict(JSONEncodedDict):
         else:
             return dialect.type_descriptor(sa_types.Text)
 
+    def process_bind_param(self, value, dialect):
+        if value is not None:
+            value = json_dumps(value)
+            compression = get_compression()
+            if compression:
+                value = compress(value, compression)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None:
+            value = json_loads(decompress(value))
+        return value
+
 
 class MutableDict(mutable.Mutable, dict):
     @classmethod
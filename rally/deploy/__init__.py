@@ -14,7 +14,5 @@
 #    under the License.
 
 from rally.deploy.engine import *  # noqa
-from rally.common import utils
 
-
-utils.import_modules_from_package("rally.deploy.engines")
+# Deploy engines are loaded on demand, see rally.common.discover
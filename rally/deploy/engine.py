@@ -18,6 +18,7 @@ import abc
 import jsonschema
 import six
 
+from rally.common import discover
 from rally.common.i18n import _
 from rally.common import log as logging
 from rally.common import utils
@@ -81,9 +82,10 @@ class EngineFactory(object):
     @staticmethod
     def get_by_name(name):
         """Return Engine class by name."""
-        for engine in utils.itersubclasses(EngineFactory):
-            if name == engine.__name__:
-                return engine
+        engine = discover.get_plugin(EngineFactory, name,
+                                     key=lambda cls: cls.__name__)
+        if engine:
+            return engine
         raise exceptions.NoSuchEngine(engine_name=name)
 
     @staticmethod
@@ -102,6 +104,7 @@ class EngineFactory(object):
     @staticmethod
     def get_available_engines():
         """Returns a list of names of available engines."""
+        discover.load_all()
         return [e.__name__ for e in utils.itersubclasses(EngineFactory)]
 
     @abc.abstractmethod
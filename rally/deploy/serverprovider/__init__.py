@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from rally.common import utils
 from rally.deploy.serverprovider.provider import *  # noqa
 
-
-utils.import_modules_from_package("rally.deploy.serverprovider.providers")
+# Server providers are loaded on demand, see rally.common.discover
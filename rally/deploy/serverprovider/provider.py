@@ -18,6 +18,7 @@ import abc
 import jsonschema
 import six
 
+from rally.common import discover
 from rally.common import sshutils
 from rally.common import utils
 from rally import exceptions
@@ -134,9 +135,10 @@ class ProviderFactory(object):
     @staticmethod
     def get_by_name(name):
         """Return Server Provider class by type."""
-        for provider in utils.itersubclasses(ProviderFactory):
-            if name == provider.__name__:
-                return provider
+        provider = discover.get_plugin(ProviderFactory, name,
+                                       key=lambda cls: cls.__name__)
+        if provider:
+            return provider
         raise exceptions.NoSuchVMProvider(vm_provider_name=name)
 
     @staticmethod
@@ -148,6 +150,7 @@ class ProviderFactory(object):
     @staticmethod
     def get_available_providers():
         """Returns list of names of available engines."""
+        discover.load_all()
         return [e.__name__ for e in utils.itersubclasses(ProviderFactory)]
 
     @abc.abstractmethod
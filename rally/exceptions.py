@@ -111,6 +111,12 @@ class InvalidBenchmarkConfig(InvalidTaskException):
                 "\nReason:\n %(reason)s")
 
 
+class InvalidBenchmarksConfig(InvalidTaskException):
+    msg_fmt = _("Input task is invalid!\n\n"
+                "%(count)s benchmarks have wrong configuration:\n"
+                "%(reasons)s")
+
+
 class NotFoundException(RallyException):
     msg_fmt = _("Not found.")
 
@@ -16,6 +16,8 @@
 import json
 import uuid
 
+from rally.benchmark.processing import sketch
+from rally.benchmark.processing import table
 from rally import consts
 from rally import db
 
@@ -97,6 +99,12 @@ TASK_RESULT_SCHEMA = {
         "full_duration": {
             "type": "number",
         },
+        "runner_summary": {
+            "type": "object",
+        },
+        "sketch": {
+            "type": ["object", "null"],
+        },
     },
     "required": ["key", "sla", "result", "load_duration",
                  "full_duration"],
@@ -104,6 +112,41 @@ TASK_RESULT_SCHEMA = {
 }
 
 
+def get_result_summary(data):
+    """Summarize data of task result.
+
+    The summary is stored with the result, so commands that show numbers of
+    iterations, durations or SLA results don't load the whole data.
+
+    :param data: data of task result
+    :returns: dict with numbers of iterations and errors, load and full
+              durations, SLA results and min/avg/max/90%/95% of durations
+              of successful iterations (None if there are no such ones)
+    """
+    if data.get("sketch") or "raw" in data:
+        iterations_sketch = sketch.get_iterations_sketch(data)
+    else:
+        # Iterations of a running benchmark are not counted yet
+        iterations_sketch = sketch.IterationsSketch()
+    total = iterations_sketch.total
+    sla = data.get("sla", [])
+
+    summary = {"iterations": iterations_sketch.iterations,
+               "errors": iterations_sketch.iterations - total.count,
+               "load_duration": data.get("load_duration"),
+               "full_duration": data.get("full_duration"),
+               "sla": sla,
+               "sla_success": all(criterion["success"] for criterion in sla),
+               "duration": None}
+    if total.count:
+        summary["duration"] = {"min": total.min,
+                               "avg": total.mean(),
+                               "max": total.max,
+                               "90%": total.quantile(0.90),
+                               "95%": total.quantile(0.95)}
+    return summary
+
+
 class Task(object):
     """Represents a task object."""
 
@@ -140,6 +183,18 @@ class Task(object):
     def list(status=None, deployment=None):
         return [Task(db_task) for db_task in db.task_list(status, deployment)]
 
+    @staticmethod
+    def list_summary(status=None, deployment=None):
+        """List tasks without loading whole records.
+
+        :returns: list of dicts, see db.task_list_summary()
+        """
+        return db.task_list_summary(status, deployment)
+
+    @staticmethod
+    def get_status(uuid):
+        return db.task_get_status(uuid)
+
     @staticmethod
     def delete_by_uuid(uuid, status=None):
         db.task_delete(uuid, status=status)
@@ -161,8 +216,52 @@ class Task(object):
     def get_results(self):
         return db.task_result_get_all_by_uuid(self.task["uuid"])
 
+    def get_results_summary(self):
+        """Return summaries of task results, see get_result_summary().
+
+        Data of results is loaded only for results stored before summaries
+        were introduced.
+
+        :returns: list of dicts with "id", "key" and "summary"
+        """
+        summaries = db.task_result_summary_get_all(self.task["uuid"])
+        if any(s["summary"] is None for s in summaries):
+            data = dict((result["id"], result["data"])
+                        for result in self.get_results())
+            for s in summaries:
+                if s["summary"] is None:
+                    s["summary"] = get_result_summary(data[s["id"]])
+        return summaries
+
     def append_results(self, key, value):
-        db.task_result_create(self.task["uuid"], key, value)
+        return db.task_result_create(self.task["uuid"], key, value,
+                                     get_result_summary(value))
+
+    @staticmethod
+    def update_results(result_id, value):
+        db.task_result_update(result_id, value, get_result_summary(value))
+
+    @staticmethod
+    def append_results_chunk(result_id, position, iterations):
+        db.task_result_chunk_create(result_id, position, iterations)
+
+    @staticmethod
+    def iter_results_raw(result):
+        """Iterate over iterations of task result.
+
+        Iterations of new results are stored separately by chunks (as
+        IterationsTable dicts) which are read from DB one by one, old results
+        have them in "raw" of data.
+
+        :param result: TaskResult instance
+        """
+        if "chunks" not in result["data"]:
+            for iteration in result["data"]["raw"]:
+                yield iteration
+            return
+        for chunk in db.task_result_chunk_get_all(result["id"]):
+            for iteration in table.IterationsTable.from_dict(chunk["data"]):
+                yield iteration
 
     def delete(self, status=None):
         db.task_delete(self.task["uuid"], status=status)
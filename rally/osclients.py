@@ -14,6 +14,7 @@
 #    under the License.
 
 import os
+import threading
 
 from ceilometerclient import client as ceilometer
 from cinderclient import client as cinder
@@ -47,7 +48,16 @@ OSCLIENTS_OPTS = [
     cfg.BoolOpt("https_insecure", default=False,
                 help="Use SSL for all OpenStack API interfaces"),
     cfg.StrOpt("https_cacert", default=None,
-               help="Path to CA server cetrificate for SSL")
+               help="Path to CA server cetrificate for SSL"),
+    cfg.BoolOpt("openstack_clients_cache", default=True,
+                help="Reuse authentication tokens and client handles (with "
+                     "their HTTP connections) of released Clients objects "
+                     "of the same endpoint"),
+    cfg.IntOpt("openstack_clients_cache_token_margin", default=900,
+               help="Cached client handles are dropped if their keystone "
+                    "token expires in less than this number of seconds. "
+                    "Most of clients can't re-authenticate, so it should "
+                    "be longer than iterations of scenarios")
 ]
 CONF.register_opts(OSCLIENTS_OPTS)
 
@@ -72,6 +82,81 @@ def cached(func):
     return wrapper
 
 
+class _ClientsPool(object):
+    """Per process pool of client handles of different endpoints.
+
+    Each Clients object takes handles of its endpoint out of the pool and
+    puts them back by release(), so handles are reused by sequential users
+    (e.g. iterations of scenario) without re-authentication and with HTTP
+    connections kept alive, but never used by two threads at once, because
+    clients are not thread safe. The pool is dropped in forked processes,
+    because they can't share HTTP connections with the parent one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._idle = {}
+        self.stats = {"hits": 0, "misses": 0, "auth_calls": 0}
+
+    @staticmethod
+    def _key(endpoint):
+        return tuple(sorted(endpoint.to_dict(include_permission=True).items()))
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle = {}
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def acquire(self, endpoint):
+        """Returns dict of client handles of endpoint (empty on miss)."""
+        with self._lock:
+            self._check_pid()
+            idle = self._idle.get(self._key(endpoint))
+            cache = idle.pop() if idle else {}
+
+            keystone = cache.get("keystone")
+            if keystone is not None and keystone.auth_ref.will_expire_soon(
+                    CONF.openstack_clients_cache_token_margin):
+                cache = {}
+            self.count("hits" if cache else "misses")
+            return cache
+
+    def release(self, endpoint, cache):
+        """Puts client handles of endpoint back to the pool."""
+        if not cache:
+            return
+        with self._lock:
+            self._check_pid()
+            self._idle.setdefault(self._key(endpoint), []).append(cache)
+
+    def count(self, name):
+        self.stats[name] += 1
+
+    def clear(self):
+        with self._lock:
+            self._idle = {}
+
+
+_pool = _ClientsPool()
+
+
+def get_cache_stats():
+    """Returns statistics of the clients pool of this process.
+
+    :returns: dict with numbers of "hits" and "misses" of the pool and
+              number of keystone authentications ("auth_calls")
+    """
+    with _pool._lock:
+        return dict(_pool.stats)
+
+
+def clear_cache():
+    """Drop all client handles of the clients pool of this process."""
+    _pool.clear()
+
+
 def create_keystone_client(args):
     discover = keystone_discover.Discover(**args)
     for version_data in discover.version_data():
@@ -87,9 +172,19 @@ def create_keystone_client(args):
 class Clients(object):
     """This class simplify and unify work with openstack python clients."""
 
-    def __init__(self, endpoint):
+    def __init__(self, endpoint, pooled=True):
+        """Create Clients of endpoint.
+
+        :param endpoint: objects.Endpoint
+        :param pooled: take client handles from the pool of this process and
+                       put them back by release() (if openstack_clients_cache
+                       option is set), otherwise clients are always created
+                       and authenticated from scratch
+        """
         self.endpoint = endpoint
-        self.cache = {}
+        self._pooled = (pooled and CONF.openstack_clients_cache and
+                        isinstance(endpoint, objects.Endpoint))
+        self.cache = _pool.acquire(endpoint) if self._pooled else {}
 
     @classmethod
     def create_from_env(cls):
@@ -106,6 +201,16 @@ class Clients(object):
         """Remove all cached client handles."""
         self.cache = {}
 
+    def release(self):
+        """Return cached client handles to the pool of this process.
+
+        Clients object should not be used after this call, otherwise its
+        handles could be used by two threads at once.
+        """
+        if self._pooled:
+            _pool.release(self.endpoint, self.cache)
+        self.cache = {}
+
     @cached
     def keystone(self):
         """Return keystone client."""
@@ -116,6 +221,8 @@ class Clients(object):
         kw = self.endpoint.to_dict()
         kw.update(new_kw)
         client = create_keystone_client(kw)
+        with _pool._lock:
+            _pool.count("auth_calls")
         if client.auth_ref is None:
             client.authenticate()
         return client
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+#
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro-benchmark of rally CLI startup time.
+
+Every snippet is run in a new python process (so nothing is imported yet)
+and the best time of several runs is printed together with the number of
+imported modules.
+
+Usage: python tests/ci/cli-startup-benchmark.py [runs]
+"""
+
+from __future__ import print_function
+
+import subprocess
+import sys
+
+
+SNIPPETS = [
+    ("import CLI", "import rally.cmd.main"),
+    ("find scenario",
+     "from rally.benchmark.scenarios import base;"
+     "base.Scenario.get_by_name('Dummy')"),
+    ("find context",
+     "from rally.benchmark.context import base;"
+     "base.Context.get_by_name('users')"),
+    ("list all plugins",
+     "from rally.common import discover; discover.load_all()")
+]
+
+TEMPLATE = """
+import sys, time
+started_at = time.time()
+%s
+print("%%f %%d" %% (time.time() - started_at, len(sys.modules)))
+"""
+
+
+def run(snippet, runs):
+    best = None
+    for i in range(runs):
+        output = subprocess.check_output([sys.executable, "-c",
+                                          TEMPLATE % snippet])
+        duration, modules = output.split()[-2:]
+        best = min(best or float(duration), float(duration))
+    return best, int(modules)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for title, snippet in SNIPPETS:
+        duration, modules = run(snippet, runs)
+        print("%s: %.3fs, %d modules" % (title, duration, modules))
+
+
+if __name__ == "__main__":
+    main()
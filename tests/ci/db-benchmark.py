@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+#
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro-benchmark of storage of task results in DB.
+
+A task result with the given number of synthetic iterations is stored in
+a temporary SQLite DB by chunks (as the benchmark engine stores results)
+with every available compression. Size of the DB file and the best time of
+loading of all the iterations of several runs are printed.
+
+Usage: python tests/ci/db-benchmark.py [iterations [runs]]
+"""
+
+from __future__ import print_function
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from oslo_config import cfg
+
+from rally.benchmark.processing import table
+from rally import db
+from rally.db.sqlalchemy import types
+from rally import objects
+
+
+CONF = cfg.CONF
+
+ACTIONS = ["nova.boot_server", "nova.list_servers", "nova.delete_server"]
+CHUNK_SIZE = 1000
+
+
+def make_iterations(iterations):
+    result = []
+    for i in range(iterations):
+        error = []
+        if random.random() < 0.05:
+            error = ["Exception", "Something went wrong", "Traceback"]
+        result.append({
+            "duration": random.uniform(1, 10),
+            "idle_duration": random.uniform(0, 1),
+            "timestamp": 1430000000 + i * 0.1,
+            "error": error,
+            "atomic_actions": dict((name, random.uniform(0, 3))
+                                   for name in ACTIONS),
+            "scenario_output": {"errors": "",
+                                "data": {"foo": random.random()}}
+        })
+    return result
+
+
+def store(iterations):
+    deployment = db.deployment_create({})
+    task = db.task_create({"deployment_uuid": deployment["uuid"]})
+    result = db.task_result_create(task["uuid"], {"name": "Foo.bar"},
+                                   {"chunks": 0})
+    for position, start in enumerate(range(0, len(iterations), CHUNK_SIZE)):
+        chunk = table.IterationsTable.from_results(
+            iterations[start:start + CHUNK_SIZE])
+        db.task_result_chunk_create(result["id"], position, chunk.to_dict())
+    db.task_result_update(result["id"], {"chunks": position + 1})
+    return task["uuid"]
+
+
+def load(task_uuid):
+    for result in db.task_result_get_all_by_uuid(task_uuid):
+        for iteration in objects.Task.iter_results_raw(result):
+            pass
+
+
+def main():
+    iterations = make_iterations(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for compression in ["none"] + sorted(types.COMPRESSORS):
+            path = os.path.join(tmp_dir, "%s.sqlite" % compression)
+            CONF.set_override("connection", "sqlite:///%s" % path,
+                              group="database")
+            CONF.set_override("db_compression", compression)
+            db.db_cleanup()
+            db.db_create()
+
+            started_at = time.time()
+            task_uuid = store(iterations)
+            store_time = time.time() - started_at
+
+            best = None
+            for i in range(runs):
+                started_at = time.time()
+                load(task_uuid)
+                duration = time.time() - started_at
+                best = min(best or duration, duration)
+
+            print("%s, %d iterations: DB size %.1f MiB, store %.3fs, "
+                  "load %.3fs" % (compression, len(iterations),
+                                  os.path.getsize(path) / 1024.0 / 1024,
+                                  store_time, best))
+    finally:
+        db.db_cleanup()
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+#
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro-benchmark of task report data preparation.
+
+Synthetic results with the given number of iterations (a few atomic
+actions, some errors and scenario output) are processed the same way as by
+`rally task report`, and the best time of several runs is printed.
+
+Usage: python tests/ci/report-benchmark.py [iterations [runs]]
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from rally.benchmark.processing import plot
+
+
+ACTIONS = ["nova.boot_server", "nova.list_servers", "nova.delete_server"]
+
+
+def make_result(iterations):
+    result = []
+    for i in range(iterations):
+        error = []
+        if random.random() < 0.05:
+            error = ["Exception", "Something went wrong", "Traceback"]
+        result.append({
+            "duration": random.uniform(1, 10),
+            "idle_duration": random.uniform(0, 1),
+            "timestamp": i,
+            "error": error,
+            "atomic_actions": dict((name, random.uniform(0, 3))
+                                   for name in ACTIONS),
+            "scenario_output": {"errors": "",
+                                "data": {"foo": random.random()}}
+        })
+    return {"key": {"name": "NovaServers.boot_and_list_server", "pos": 0,
+                    "kw": {"runner": {"type": "constant"}}},
+            "result": result,
+            "sla": [],
+            "load_duration": iterations,
+            "full_duration": iterations + 10}
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    results = [make_result(iterations)]
+    best = None
+    for i in range(runs):
+        started_at = time.time()
+        plot._process_results(results)
+        duration = time.time() - started_at
+        best = min(best or duration, duration)
+    print("%d iterations: %.3fs" % (iterations, best))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+#
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro-benchmark of delivery of iteration results to the controller.
+
+Runs Dummy.dummy with the constant runner at a high rate while another
+thread consumes results from the runner like the benchmark engine does.
+Prints CPU time used by the controller process (the runner joining worker
+processes and the consumer, but not the workers themselves) and latency
+of results: time since the end of an iteration in a worker until the
+consumer gets it, which is also the delay of SLA aborts.
+
+Usage:
+  python tests/ci/result-queue-benchmark.py [iterations [concurrency [sleep]]]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import threading
+import time
+
+import mock
+
+from rally.benchmark.processing import utils
+from rally.benchmark.runners import constant
+from rally.benchmark.scenarios.dummy import dummy
+from tests.unit import fakes
+
+
+def consume(runner, latencies):
+    while True:
+        batch = runner.get_results()
+        if batch is None:
+            break
+        received_at = time.time()
+        for result in batch:
+            latencies.append(received_at - result["timestamp"] -
+                             result["duration"])
+
+
+def cpu_time():
+    times = os.times()
+    return times[0] + times[1]
+
+
+def main():
+    times = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    sleep = float(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    runner = constant.ConstantScenarioRunner(
+        mock.MagicMock(), {"times": times, "concurrency": concurrency})
+    context = fakes.FakeUserContext({}).context
+    latencies = []
+    consumer = threading.Thread(target=consume, args=(runner, latencies))
+    consumer.start()
+
+    started_at, cpu_started_at = time.time(), cpu_time()
+    try:
+        runner._run_scenario(dummy.Dummy, "dummy", context, {"sleep": sleep})
+    finally:
+        runner.finish_results()
+        consumer.join()
+    duration = time.time() - started_at
+    cpu = cpu_time() - cpu_started_at
+
+    assert len(latencies) == times
+    print("%d iterations, concurrency %d, sleep %ss: %.2fs, "
+          "%.0f iterations/s" % (times, concurrency, sleep, duration,
+                                 times / duration))
+    print("Controller CPU: %.2fs (%.0f%% of one core)"
+          % (cpu, 100.0 * cpu / duration))
+    latencies.sort()
+    print("Result latency: median %.1fms, 95%%ile %.1fms, max %.1fms"
+          % tuple(1000 * value for value in (
+              utils.percentile(latencies, 0.5),
+              utils.percentile(latencies, 0.95),
+              latencies[-1])))
+
+
+if __name__ == "__main__":
+    main()
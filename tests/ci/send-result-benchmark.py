@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+#
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro-benchmark of results processing overhead of scenario runners.
+
+Runs Dummy.dummy with the serial runner (so iterations and _send_result()
+are done in the same process) with and without strict results validation
+and prints the number of iterations per second.
+
+Usage: python tests/ci/send-result-benchmark.py [iterations]
+"""
+
+from __future__ import print_function
+
+import sys
+
+import mock
+from oslo_config import cfg
+
+from rally.benchmark.runners import serial
+from rally.benchmark.scenarios.dummy import dummy
+from rally.common import utils
+from tests.unit import fakes
+
+
+def run(times, strict):
+    cfg.CONF.set_override("strict_results_validation", strict, "benchmark")
+    runner = serial.SerialScenarioRunner(mock.MagicMock(), {"times": times})
+    context = fakes.FakeUserContext({}).context
+    with utils.Timer() as timer:
+        runner._run_scenario(dummy.Dummy, "dummy", context, {"sleep": 0})
+    assert len(runner.result_queue) == times
+    return timer.duration()
+
+
+def main():
+    times = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    results = {}
+    for strict in (True, False):
+        results[strict] = run(times, strict)
+        print("strict_results_validation=%s: %d iterations in %.2fs, "
+              "%.0f iterations/s" % (strict, times, results[strict],
+                                     times / results[strict]))
+    print("Speedup: %.1fx" % (results[True] / results[False]))
+
+
+if __name__ == "__main__":
+    main()
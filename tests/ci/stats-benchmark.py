@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+#
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro-benchmark of statistics used by reports.
+
+Mean, percentiles, min/mean/max/percentiles at once and histogram counts
+of random samples are calculated by the pure Python and (if NumPy is
+installed) NumPy implementations, and the best time of several runs is
+printed.
+
+Usage: python tests/ci/stats-benchmark.py [samples [runs]]
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import time
+
+from rally.benchmark.processing.charts import histogram
+from rally.benchmark.processing import utils
+
+
+def best_time(func, runs):
+    best = None
+    for i in range(runs):
+        started_at = time.time()
+        func()
+        duration = time.time() - started_at
+        best = min(best or duration, duration)
+    return best
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    values = [random.uniform(0, 10) for i in range(samples)]
+    bins = histogram.calculate_number_of_bins_sqrt(values)
+
+    cases = [
+        ("mean", lambda: utils.mean(values)),
+        ("percentile", lambda: utils.percentile(list(values), 0.95)),
+        ("describe", lambda: utils.describe(values, (0.9, 0.95))),
+        ("histogram", lambda: histogram.Histogram(values, bins)),
+    ]
+    backends = [("python", None)]
+    if utils.numpy is not None:
+        backends.append(("numpy", utils.numpy))
+
+    for backend, numpy in backends:
+        utils.numpy = numpy
+        for name, func in cases:
+            print("%s %s, %d samples: %.3fs"
+                  % (backend, name, samples, best_time(func, runs)))
+
+
+if __name__ == "__main__":
+    main()
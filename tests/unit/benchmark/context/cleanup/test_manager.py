@@ -48,53 +48,135 @@ class SeekAndDestroyTestCase(test.TestCase):
 
     @mock.patch("%s.LOG" % BASE)
     def test__delete_single_resource(self, mock_log):
-        mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
-                                       _interval=0.01)
+        mock_resource = mock.MagicMock(_max_attempts=3)
         mock_resource.delete.side_effect = [Exception, Exception, True]
-        mock_resource.is_deleted.side_effect = [False, False, True]
 
-        manager.SeekAndDestroy(None, None, None)._delete_single_resource(
-            mock_resource)
+        self.assertTrue(manager.SeekAndDestroy(
+            None, None, None)._delete_single_resource(mock_resource))
 
         mock_resource.delete.assert_has_calls([mock.call()] * 3)
         self.assertEqual(mock_resource.delete.call_count, 3)
-        mock_resource.is_deleted.assert_has_calls([mock.call()] * 3)
-        self.assertEqual(mock_resource.is_deleted.call_count, 3)
+        self.assertFalse(mock_resource.is_deleted.called)
 
-        # NOTE(boris-42): No logs and no exceptions means no bugs!
+        # No logs and no exceptions means no bugs!
         self.assertEqual(0, mock_log.call_count)
 
     @mock.patch("%s.LOG" % BASE)
-    def test__delete_single_resource_timeout(self, mock_log):
+    def test__delete_single_resource_failed(self, mock_log):
+        mock_resource = mock.MagicMock(_max_attempts=2)
+        mock_resource.delete.side_effect = Exception
 
-        mock_resource = mock.MagicMock(_max_attempts=1, _timeout=0.02,
-                                       _interval=0.025)
+        self.assertFalse(manager.SeekAndDestroy(
+            None, None, None)._delete_single_resource(mock_resource))
 
-        mock_resource.delete.return_value = True
-        mock_resource.is_deleted.side_effect = [False, False, True]
+        self.assertEqual(mock_resource.delete.call_count, 2)
+        self.assertEqual(1, mock_log.warning.call_count)
 
-        manager.SeekAndDestroy(None, None, None)._delete_single_resource(
-            mock_resource)
+    def test__is_bulk_check_supported(self):
+        class FakeResource(base.ResourceManager):
+            pass
+
+        class FakeSyncResource(base.ResourceManager):
+            def is_deleted(self):
+                return True
+
+        self.assertTrue(manager.SeekAndDestroy(
+            FakeResource, None, None)._is_bulk_check_supported())
+        self.assertFalse(manager.SeekAndDestroy(
+            FakeSyncResource, None, None)._is_bulk_check_supported())
+
+    def _resource(self, **kw):
+        return mock.MagicMock(_max_attempts=2, _service="s", _resource="r",
+                              **kw)
+
+    @mock.patch("%s.SeekAndDestroy._is_bulk_check_supported" % BASE,
+                return_value=True)
+    def test__filter_not_deleted_bulk(self, mock_bulk):
+        raw = [mock.MagicMock(id=1, status="ACTIVE"),
+               mock.MagicMock(id=2, status="DELETED"),
+               mock.MagicMock(id=3, status="DELETING"),
+               mock.MagicMock(id=4, status="DELETE_COMPLETE")]
+        resources = [base.ResourceManager(resource=r) for r in raw]
+        failures = {}
+
+        with mock.patch.object(base.ResourceManager, "list",
+                               return_value=raw[1:]) as mock_list:
+            self.assertEqual([resources[2]], manager.SeekAndDestroy(
+                base.ResourceManager, None, None)._filter_not_deleted(
+                    resources, failures))
+        mock_list.assert_called_once_with()
+        self.assertEqual({}, failures)
 
-        mock_resource.delete.assert_called_once_with()
-        mock_resource.is_deleted.assert_called_once_with()
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.SeekAndDestroy._is_bulk_check_supported" % BASE,
+                return_value=True)
+    def test__filter_not_deleted_bulk_list_fails(self, mock_bulk, mock_log):
+        resources = [self._resource(), self._resource()]
+        resources[0].list.side_effect = Exception
+        failures = {}
+        seek_and_destroy = manager.SeekAndDestroy(
+            mock.MagicMock(__name__="Fake"), None, None)
+
+        for i in range(2):
+            self.assertEqual(resources, seek_and_destroy._filter_not_deleted(
+                resources, failures))
+        self.assertEqual([], seek_and_destroy._filter_not_deleted(
+            resources, failures))
+        self.assertEqual({resources[0]: 3, resources[1]: 3}, failures)
+        self.assertEqual(3, mock_log.exception.call_count)
 
-        self.assertEqual(1, mock_log.warning.call_count)
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.SeekAndDestroy._is_bulk_check_supported" % BASE,
+                return_value=False)
+    def test__filter_not_deleted_one_by_one(self, mock_bulk, mock_log):
+        resources = [self._resource(), self._resource(), self._resource()]
+        resources[0].is_deleted.return_value = True
+        resources[1].is_deleted.return_value = False
+        resources[2].is_deleted.side_effect = Exception
+        failures = {}
+
+        self.assertEqual(resources[1:], manager.SeekAndDestroy(
+            None, None, None)._filter_not_deleted(resources, failures))
+        self.assertEqual({resources[2]: 1}, failures)
+        self.assertEqual(1, mock_log.exception.call_count)
+
+    @mock.patch("%s.time.sleep" % BASE)
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.SeekAndDestroy._filter_not_deleted" % BASE)
+    def test__wait_for_deletion(self, mock_filter, mock_log, mock_sleep):
+        user_resources = [self._resource(), self._resource()]
+        admin_resources = [self._resource()]
+        not_deleted = {
+            user_resources[0]: [user_resources[1]],
+            user_resources[1]: [],
+            admin_resources[0]: []
+        }
+        mock_filter.side_effect = lambda resources, failures: (
+            not_deleted[resources[0]])
+        manager_cls = mock.MagicMock(_threads=2, _timeout=10, _interval=1)
+
+        deleted = {"user": user_resources, None: admin_resources}
+        manager.SeekAndDestroy(manager_cls, None, None)._wait_for_deletion(
+            deleted)
+
+        self.assertEqual(3, mock_filter.call_count)
+        # broker.run_for_each() sleeps too
+        self.assertEqual(1, mock_sleep.mock_calls.count(mock.call(1)))
+        self.assertFalse(mock_log.warning.called)
 
     @mock.patch("%s.LOG" % BASE)
-    def test__delete_single_resource_excpetion_in_is_deleted(self, mock_log):
-        mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
-                                       _interval=0)
-        mock_resource.delete.return_value = True
-        mock_resource.is_deleted.side_effect = [Exception] * 4
-        manager.SeekAndDestroy(None, None, None)._delete_single_resource(
-            mock_resource)
+    @mock.patch("%s.SeekAndDestroy._filter_not_deleted" % BASE)
+    def test__wait_for_deletion_timeout(self, mock_filter, mock_log):
+        resources = [self._resource(), self._resource()]
+        mock_filter.side_effect = lambda resources, failures: resources
+        manager_cls = mock.MagicMock(_threads=2, _timeout=0.3,
+                                     _interval=0.01)
 
-        mock_resource.delete.assert_called_once_with()
-        self.assertEqual(4, mock_resource.is_deleted.call_count)
+        manager.SeekAndDestroy(manager_cls, None, None)._wait_for_deletion(
+            {"user": resources, "other_user": [self._resource()]})
 
-        self.assertEqual(5, mock_log.warning.call_count)
-        self.assertEqual(4, mock_log.exception.call_count)
+        self.assertTrue(mock_filter.call_count >= 4)
+        self.assertEqual(3, mock_log.warning.call_count)
 
     def _manager(self, list_side_effect, **kw):
         mock_mgr = mock.MagicMock()
@@ -164,7 +246,10 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_get_client.assert_has_calls([
             mock.call(admin),
             mock.call(users[0]),
-            mock.call(users[1])
+            mock.call().release(),
+            mock.call(users[1]),
+            mock.call().release(),
+            mock.call().release()
         ])
         expected_queue = [(admin, users[0], x) for x in range(1, 4)]
         expected_queue += [(admin, users[1], x) for x in range(4, 6)]
@@ -202,7 +287,10 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_get_client.assert_has_calls([
             mock.call(None),
             mock.call(users[0]),
-            mock.call(users[2])
+            mock.call().release(),
+            mock.call(users[2]),
+            mock.call().release(),
+            mock.call().release()
         ])
         self.assertEqual(queue, [(None, users[0], x) for x in range(1, 4)])
 
@@ -211,7 +299,8 @@ class SeekAndDestroyTestCase(test.TestCase):
     def test__gen_consumer(self, mock_del_single_resource, mock_get_client):
         mock_mgr = mock.MagicMock(__name__="Test")
 
-        consumer = manager.SeekAndDestroy(mock_mgr, None, None)._gen_consumer()
+        seek_and_destroy = manager.SeekAndDestroy(mock_mgr, None, None)
+        consumer = seek_and_destroy._gen_consumer()
 
         admin = mock.MagicMock()
         user1 = {"id": "a", "tenant_id": "uuid1"}
@@ -230,6 +319,7 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_del_single_resource.assert_called_once_with(mock_mgr.return_value)
 
         mock_mgr.reset_mock()
+        mock_mgr.return_value = mock.MagicMock()
         mock_get_client.reset_mock()
         mock_del_single_resource.reset_mock()
 
@@ -246,14 +336,22 @@ class SeekAndDestroyTestCase(test.TestCase):
         ])
         mock_del_single_resource.assert_called_once_with(mock_mgr.return_value)
 
+        mock_del_single_resource.return_value = False
+        consumer(cache, (admin, user1, "res3"))
+        self.assertEqual({"a": [mock.ANY], None: [mock_mgr.return_value]},
+                         seek_and_destroy._deleted)
+
+    @mock.patch("%s.SeekAndDestroy._wait_for_deletion" % BASE)
     @mock.patch("%s.SeekAndDestroy._gen_consumer" % BASE)
     @mock.patch("%s.SeekAndDestroy._gen_publisher" % BASE)
     @mock.patch("%s.broker.run" % BASE)
-    def test_exterminate(self, mock_broker_run, mock_publisher, mock_consumer):
+    def test_exterminate(self, mock_broker_run, mock_publisher, mock_consumer,
+                         mock_wait_for_deletion):
 
         manager_cls = mock.MagicMock(_threads=5)
         manager.SeekAndDestroy(manager_cls, None, None).exterminate()
 
+        mock_wait_for_deletion.assert_called_once_with({})
         mock_publisher.assert_called_once_with()
         mock_consumer.assert_called_once_with()
         mock_broker_run.assert_called_once_with(mock_publisher.return_value,
@@ -336,3 +434,22 @@ class ResourceManagerTestCase(test.TestCase):
             mock.call(mock_find.return_value[1], "admin", ["user"]),
             mock.call().exterminate()
         ])
+
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_same_order(self, mock_find, mock_seek_and_destroy):
+        managers = [mock.MagicMock(_order=1), mock.MagicMock(_order=2),
+                    mock.MagicMock(_order=2), mock.MagicMock(_order=3)]
+        mock_find.return_value = managers
+        mock_seek_and_destroy.return_value.exterminate.side_effect = [
+            None, None, RuntimeError("failed"), None]
+
+        self.assertRaises(RuntimeError, manager.cleanup, names=["a"],
+                          admin="admin", users=["user"])
+
+        self.assertEqual(3, mock_seek_and_destroy.call_count)
+        mock_seek_and_destroy.assert_has_calls(
+            [mock.call(managers[1], "admin", ["user"]),
+             mock.call(managers[2], "admin", ["user"])], any_order=True)
+        self.assertEqual(managers[0],
+                         mock_seek_and_destroy.call_args_list[0][0][0])
@@ -55,7 +55,7 @@ class BaseContextTestCase(test.TestCase):
         self.assertRaises(jsonschema.ValidationError,
                           fakes.FakeContext.validate, {"nonexisting": 2})
 
-    @mock.patch("rally.benchmark.context.base.utils.itersubclasses")
+    @mock.patch("rally.common.discover.utils.itersubclasses")
     def test_get_by_name(self, mock_itersubclasses):
 
         @base.context(name="some_fake1", order=1)
@@ -71,7 +71,7 @@ class BaseContextTestCase(test.TestCase):
         self.assertEqual(SomeFake1, base.Context.get_by_name("some_fake1"))
         self.assertEqual(SomeFake2, base.Context.get_by_name("some_fake2"))
 
-    @mock.patch("rally.benchmark.context.base.utils.itersubclasses")
+    @mock.patch("rally.common.discover.utils.itersubclasses")
     def test_get_by_name_non_existing(self, mock_itersubclasses):
         mock_itersubclasses.return_value = []
         self.assertRaises(exceptions.NoSuchContext,
@@ -143,6 +143,48 @@ class BaseContextTestCase(test.TestCase):
         self.assertFalse(FakeOtherContext(ctx) == fakes.FakeContext(ctx))
         self.assertTrue(FakeOtherContext(ctx) == FakeOtherContext(ctx))
 
+    def test__get_workers(self):
+        ctx = fakes.FakeContext({"task": mock.MagicMock()})
+        self.assertEqual(20, ctx._get_workers())
+        ctx.config["resource_management_workers"] = 3
+        self.assertEqual(3, ctx._get_workers())
+
+    @mock.patch("rally.benchmark.context.base.broker.run_for_each")
+    def test__setup_for_each(self, mock_run_for_each):
+        mock_run_for_each.return_value = ([(1, "a"), (2, "b")], [])
+        ctx = fakes.FakeContext(
+            {"task": mock.MagicMock(),
+             "config": {"fake": {"resource_management_workers": 3}}})
+        stored = []
+        func = mock.MagicMock()
+        ctx._setup_for_each(func, iter([1, 2]),
+                            lambda *args: stored.append(args))
+        mock_run_for_each.assert_called_once_with(func, [1, 2], 3)
+        self.assertEqual([(1, "a"), (2, "b")], stored)
+
+    def test__setup_for_each_failed(self):
+        def func(item):
+            if item % 2:
+                raise ValueError(item)
+            return item * 10
+
+        ctx = fakes.FakeContext({"task": mock.MagicMock()})
+        stored = {}
+        e = self.assertRaises(exceptions.ContextSetupFailure,
+                              ctx._setup_for_each, func, range(5),
+                              stored.__setitem__)
+        self.assertIn("2 of 5 failed, first error: 1", str(e))
+        self.assertEqual({0: 0, 2: 20, 4: 40}, stored)
+
+    def test__cleanup_for_each(self):
+        func = mock.MagicMock(side_effect=[None, Exception, None])
+        ctx = fakes.FakeContext({"task": mock.MagicMock()})
+        ctx._cleanup_for_each(func, [1])
+        ctx._cleanup_for_each(func, [2, 3])
+        self.assertEqual(3, func.call_count)
+        func.assert_has_calls([mock.call(1), mock.call(2), mock.call(3)],
+                              any_order=True)
+
 
 class ContextManagerTestCase(test.TestCase):
 
@@ -33,18 +33,14 @@ class NetworkTestCase(test.TestCase):
     def test_START_CIDR_DFLT(self):
         netaddr.IPNetwork(network_context.Network.DEFAULT_CONFIG["start_cidr"])
 
-    @mock.patch("rally.osclients.Clients")
-    @mock.patch(NET + "wrap", return_value="foo_service")
-    def test__init__(self, mock_wrap, mock_clients):
+    def test__init__(self):
         context = network_context.Network(self.get_context())
-        self.assertEqual(context.net_wrapper, "foo_service")
         self.assertEqual(context.config["networks_per_tenant"], 1)
         self.assertEqual(context.config["start_cidr"],
                          network_context.Network.DEFAULT_CONFIG["start_cidr"])
 
         context = network_context.Network(
             self.get_context(start_cidr="foo_cidr", networks_per_tenant=42))
-        self.assertEqual(context.net_wrapper, "foo_service")
         self.assertEqual(context.config["networks_per_tenant"], 42)
         self.assertEqual(context.config["start_cidr"], "foo_cidr")
 
@@ -68,6 +64,11 @@ class NetworkTestCase(test.TestCase):
                 sorted(net_context.context["tenants"].items())):
             actual_networks.append(tenant_ctx["networks"])
         self.assertEqual(expected_networks, actual_networks)
+        self.assertEqual([mock.call("foo_admin")] * 4,
+                         mock_clients.call_args_list)
+        self.assertEqual(4, mock_clients.return_value.release.call_count)
+        mock_wrap.assert_called_with(mock_clients.return_value,
+                                     net_context.config)
 
     @mock.patch("rally.osclients.Clients")
     @mock.patch(NET + "wrap")
@@ -77,3 +78,14 @@ class NetworkTestCase(test.TestCase):
         mock_wrap().delete_network.assert_has_calls(
             [mock.call({"id": "foo_net"}), mock.call({"id": "bar_net"})],
             any_order=True)
+        self.assertEqual(2, mock_osclients.call_count)
+        self.assertEqual(2, mock_osclients.return_value.release.call_count)
+
+    @mock.patch("rally.osclients.Clients")
+    @mock.patch(NET + "wrap")
+    def test_cleanup_releases_clients_on_failure(self, mock_wrap,
+                                                 mock_osclients):
+        mock_wrap.return_value.delete_network.side_effect = RuntimeError
+        net_context = network_context.Network(self.get_context())
+        net_context.cleanup()
+        self.assertEqual(2, mock_osclients.return_value.release.call_count)
@@ -123,6 +123,31 @@ class SecGroupContextTestCase(test.TestCase):
         mock_network_wrap.assert_called_once_with(
             mock_osclients.return_value, {})
 
+    @mock.patch("rally.benchmark.context.secgroup.osclients.Clients")
+    @mock.patch("rally.benchmark.context.secgroup._prepare_open_secgroup")
+    @mock.patch("rally.benchmark.wrappers.network.wrap")
+    def test_secgroup_setup_once_per_tenant(
+            self, mock_network_wrap, mock_prepare_open_secgroup,
+            mock_osclients):
+        mock_network_wrap.return_value.supports_security_group.return_value = (
+            True, "")
+        mock_prepare_open_secgroup.side_effect = (
+            lambda endpoint, name: {"name": name, "id": endpoint})
+        users = [{"tenant_id": "uuid1", "endpoint": "endpoint1"},
+                 {"tenant_id": "uuid2", "endpoint": "endpoint2"},
+                 {"tenant_id": "uuid1", "endpoint": "endpoint3"}]
+        ctx = dict(self.ctx_without_secgroup, users=users)
+
+        secgroup.AllowSSH(ctx).setup()
+
+        self.assertEqual(2, mock_prepare_open_secgroup.call_count)
+        name = "%s_foo_task_id" % secgroup.SSH_GROUP_NAME
+        self.assertEqual(
+            [{"name": name, "id": "endpoint1"},
+             {"name": name, "id": "endpoint2"},
+             {"name": name, "id": "endpoint1"}],
+            [user["secgroup"] for user in users])
+
     @mock.patch("rally.benchmark.context.secgroup.osclients.Clients")
     @mock.patch("rally.benchmark.wrappers.network.wrap")
     def test_secgroup_setup_with_secgroup_unsupported(self,
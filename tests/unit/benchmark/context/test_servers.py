@@ -102,6 +102,7 @@ class ServerGeneratorTestCase(test.TestCase):
         }
 
         new_context = copy.deepcopy(real_context)
+        new_context["config"]["servers"]["servers_per_request"] = 1
         for id in new_context["tenants"]:
             new_context["tenants"][id].setdefault("servers", list())
             for i in range(servers_per_tenant):
@@ -110,6 +111,51 @@ class ServerGeneratorTestCase(test.TestCase):
         servers_ctx = servers.ServerGenerator(real_context)
         servers_ctx.setup()
         self.assertEqual(new_context, real_context)
+        self.assertEqual(
+            [mock.call(mock.ANY, mock_image_transform.return_value,
+                       mock_flavor_transform.return_value, 5,
+                       instances_amount=1)] * tenants_count,
+            mock_boot_servers.mock_calls)
+
+    @mock.patch("%s.nova.utils.NovaScenario._boot_servers" % SCN)
+    @mock.patch("%s.ImageResourceType.transform" % TYP,
+                return_value="image_id")
+    @mock.patch("%s.FlavorResourceType.transform" % TYP,
+                return_value="flavor_id")
+    @mock.patch("%s.servers.osclients" % CTX, return_value=fakes.FakeClients())
+    def test_setup_servers_per_request(self, mock_osclients,
+                                       mock_flavor_transform,
+                                       mock_image_transform,
+                                       mock_boot_servers):
+        mock_boot_servers.side_effect = [
+            [fakes.FakeServer(id="uuid%d" % i) for i in range(4)],
+            [fakes.FakeServer(id="uuid4")]]
+        context = {
+            "config": {
+                "servers": {
+                    "servers_per_tenant": 5,
+                    "servers_per_request": 2,
+                    "image": {"name": "image"},
+                    "flavor": {"name": "flavor"},
+                },
+            },
+            "task": mock.MagicMock(),
+            "users": [{"id": "user", "tenant_id": "tenant",
+                       "endpoint": "endpoint"}],
+            "tenants": {"tenant": {"name": "tenant"}}
+        }
+
+        servers.ServerGenerator(context).setup()
+
+        self.assertEqual(["uuid%d" % i for i in range(5)],
+                         context["tenants"]["tenant"]["servers"])
+        prefix = mock_boot_servers.call_args_list[0][0][0]
+        self.assertEqual(
+            [mock.call(prefix, "image_id", "flavor_id", 2,
+                       instances_amount=2),
+             mock.call(prefix + "_last", "image_id", "flavor_id", 1,
+                       instances_amount=1)],
+            mock_boot_servers.mock_calls)
 
     @mock.patch("%s.servers.osclients" % CTX)
     @mock.patch("%s.servers.resource_manager.cleanup" % CTX)
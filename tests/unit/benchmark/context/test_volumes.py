@@ -18,6 +18,7 @@ import copy
 import mock
 
 from rally.benchmark.context import volumes
+from rally import exceptions
 from tests.unit import fakes
 from tests.unit import test
 
@@ -46,10 +47,10 @@ class VolumeGeneratorTestCase(test.TestCase):
         inst = volumes.VolumeGenerator(context)
         self.assertEqual(inst.config, context["config"]["volumes"])
 
-    @mock.patch("%s.cinder.utils.CinderScenario._create_volume" % SCN,
-                return_value=fakes.FakeVolume(id="uuid"))
+    @mock.patch("%s.cinder.utils.CinderScenario._create_volumes" % SCN,
+                return_value=[fakes.FakeVolume(id="uuid")] * 5)
     @mock.patch("%s.volumes.osclients" % CTX)
-    def test_setup(self, mock_osclients, mock_volume_create):
+    def test_setup(self, mock_osclients, mock_volumes_create):
         fc = fakes.FakeClients()
         mock_osclients.Clients.return_value = fc
 
@@ -85,6 +86,7 @@ class VolumeGeneratorTestCase(test.TestCase):
         }
 
         new_context = copy.deepcopy(real_context)
+        new_context["config"]["volumes"]["parallel_requests"] = 1
         for id in tenants.keys():
             new_context["tenants"][id].setdefault("volumes", list())
             for i in range(volumes_per_tenant):
@@ -93,6 +95,28 @@ class VolumeGeneratorTestCase(test.TestCase):
         volumes_ctx = volumes.VolumeGenerator(real_context)
         volumes_ctx.setup()
         self.assertEqual(new_context, real_context)
+        self.assertEqual(tenants_count, mock_volumes_create.call_count)
+        mock_volumes_create.assert_called_with(
+            1, volumes_per_tenant, workers=1, name_prefix="ctx_rally_volume_")
+
+    @mock.patch("%s.cinder.utils.CinderScenario._create_volumes" % SCN,
+                side_effect=RuntimeError("foo"))
+    @mock.patch("%s.volumes.osclients" % CTX)
+    def test_setup_failed(self, mock_osclients, mock_volumes_create):
+        tenants = self._gen_tenants(2)
+        context = {
+            "config": {"volumes": {"size": 1}},
+            "task": mock.MagicMock(),
+            "users": [{"id": "user", "tenant_id": tenant_id,
+                       "endpoint": "endpoint"} for tenant_id in tenants],
+            "tenants": tenants
+        }
+
+        volumes_ctx = volumes.VolumeGenerator(context)
+        self.assertRaises(exceptions.ContextSetupFailure, volumes_ctx.setup)
+        self.assertEqual(2, mock_volumes_create.call_count)
+        self.assertEqual(
+            2, mock_osclients.Clients.return_value.release.call_count)
 
     @mock.patch("%s.volumes.osclients" % CTX)
     @mock.patch("%s.volumes.resource_manager.cleanup" % CTX)
@@ -0,0 +1,80 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import random
+
+from rally.benchmark.processing import downsampling
+from rally.common import costilius
+from tests.unit import test
+
+
+class DownsamplingTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DownsamplingTestCase, self).setUp()
+        random.seed(42)
+        self.values = [random.uniform(1, 2) for i in range(10000)]
+        self.values[1234] = 100
+
+    def test_select(self):
+        for method in downsampling.METHODS:
+            indexes = downsampling.select(self.values, 100, method)
+            self.assertLessEqual(len(indexes), 100)
+            self.assertGreaterEqual(len(indexes), 90)
+            self.assertEqual(sorted(set(indexes)), indexes)
+            self.assertIn(1234, indexes)
+
+    def test_select_lttb(self):
+        indexes = downsampling.select(self.values, 100)
+        self.assertEqual(100, len(indexes))
+        self.assertEqual(0, indexes[0])
+        self.assertEqual(9999, indexes[-1])
+
+        values = [1, 5, 2, 1, 1, 0, 1, 3, 1, 1]
+        self.assertEqual([0, 1, 3, 7, 9], downsampling.select(values, 5))
+
+    def test_select_minmax(self):
+        values = [1, 5, 2, 1, 1, 0, 1, 3, 1, 1]
+        self.assertEqual([0, 1, 5, 7],
+                         downsampling.select(values, 5, "minmax"))
+        self.assertEqual([0, 1, 2, 3, 5, 6, 7, 8],
+                         downsampling.select(values, 8, "minmax"))
+
+    def test_select_short_list(self):
+        for method in downsampling.METHODS:
+            self.assertEqual([0, 1, 2],
+                             downsampling.select([3, 1, 2], 3, method))
+            self.assertEqual([], downsampling.select([], 3, method))
+
+    def test_select_invalid(self):
+        self.assertRaises(ValueError, downsampling.select, self.values, 2)
+        self.assertRaises(ValueError, downsampling.select, self.values,
+                          100, "foo")
+
+    def test_downsample(self):
+        series = costilius.OrderedDict([
+            ("b", [1, 5, None, 1, 1, 0, 1, 3, 1, 1.234]),
+            ("a", [0, 0, 2, 0, 0, 0, 0, 0, 0, 0])])
+        self.assertEqual(
+            costilius.OrderedDict([
+                ("b", [(1, 1.0), (2, 5.0), (4, 1.0), (8, 3.0), (10, 1.23)]),
+                ("a", [(1, 0.0), (2, 0.0), (4, 0.0), (8, 0.0), (10, 0.0)])]),
+            downsampling.downsample(series, 5))
+
+    def test_downsample_short_series(self):
+        self.assertEqual(
+            {"a": [(1, 1.0), (2, 0.0), (3, 2.5)]},
+            downsampling.downsample({"a": [1, None, "2.5"]}, 3, "minmax"))
+        self.assertEqual({}, downsampling.downsample({}))
@@ -39,6 +39,7 @@ class PlotTestCase(test.TestCase):
         result = plot.plot(["abc"])
 
         self.assertEqual(result, "plot_html")
+        mock_proc_results.assert_called_once_with(["abc"], 1000, "lttb")
         mock_render.assert_called_once_with(
             data=json.dumps(task_data),
             source=json.dumps(task_source)
@@ -72,19 +73,30 @@ class PlotTestCase(test.TestCase):
                       "Success",
                       "Count"]
         atomic_durations = [["atomic_1"], ["atomic_2"]]
-        mock_prepare.side_effect = lambda i: {"errors": "errors_list",
-                                              "output": [],
-                                              "output_errors": [],
-                                              "sla": i["sla"],
-                                              "load_duration": 1234.5,
-                                              "full_duration": 6789.1}
+
+        def prepare_data(task_result, *args):
+            return {"errors": "errors_list",
+                    "iterations_sketch": "sketch",
+                    "output": [],
+                    "output_errors": [],
+                    "sla": task_result["sla"],
+                    "load_duration": 1234.5,
+                    "full_duration": 6789.1,
+                    "iterations_num": len(task_result["result"])}
+
+        mock_prepare.side_effect = prepare_data
         mock_main_duration.return_value = "main_duration"
         mock_get_atomic.return_value = atomic_durations
         mock_atomic.return_value = "main_atomic"
         mock_dumps.return_value = "JSON"
 
-        source, scenarios = plot._process_results(results)
+        source, scenarios = plot._process_results(results, 100, "minmax")
 
+        mock_prepare.assert_called_with(results[-1], 100, "minmax")
+        mock_get_atomic.assert_called_with("sketch", iterations)
+        prepared = mock_prepare.side_effect(results[-1])
+        mock_main_duration.assert_called_with(prepared)
+        mock_atomic.assert_called_with(prepared)
         source_dict = {"Class.method": [kw] * len(results)}
         mock_dumps.assert_called_with(source_dict, indent=2,
                                       sort_keys=True)
@@ -119,6 +131,16 @@ class PlotTestCase(test.TestCase):
                 "full_duration": 6789.1
             })
 
+    def test__histograms_unsorted_data(self):
+        data = [5.0, 1.0, 3.0, 2.0, 4.0, 1.5]
+        histograms = plot._histograms(list(data), "foo")
+        expected = plot._histograms(sorted(data), "foo")
+        self.assertEqual([h.y_axis for h in expected],
+                         [h.y_axis for h in histograms])
+        for histogram in histograms:
+            self.assertEqual(data, histogram.data)
+            self.assertEqual("foo", histogram.key)
+
     @testtools.skipIf(sys.version_info > (2, 9), "Problems with floating data")
     def test__process_main_time(self):
         result = {
@@ -150,8 +172,7 @@ class PlotTestCase(test.TestCase):
             "full_duration": 6789.1
         }
 
-        output = plot._process_main_duration(result,
-                                             plot._prepare_data(result))
+        output = plot._process_main_duration(plot._prepare_data(result))
 
         self.assertEqual({
             "pie": [
@@ -195,41 +216,15 @@ class PlotTestCase(test.TestCase):
 
     @testtools.skipIf(sys.version_info > (2, 9), "Problems with floating data")
     def test__process_atomic_time(self):
-        result = {
-            "result": [
-                {
-                    "error": [],
-                    "atomic_actions": {
-                        "action1": 1,
-                        "action2": 2
-                    },
-                    "scenario_output": {"errors": [], "data": {}}
-                },
-                {
-                    "error": ["some", "error", "occurred"],
-                    "atomic_actions": {
-                        "action1": 1,
-                        "action2": 2
-                    },
-                    "scenario_output": {"errors": [], "data": {}}
-                },
-                {
-                    "error": [],
-                    "atomic_actions": {
-                        "action1": 3,
-                        "action2": 4
-                    },
-                    "scenario_output": {"errors": [], "data": {}}
-                }
-            ]
-        }
-
         data = {
             "atomic_durations": {
                 "action1": [(1, 1.0), (2, 0.0), (3, 3.0)],
-                "action2": [(1, 2.0), (2, 0.0), (3, 4.0)]}}
+                "action2": [(1, 2.0), (2, 0.0), (3, 4.0)]},
+            "success_atomic_durations": {
+                "action1": [1, 3],
+                "action2": [2, 4]}}
 
-        output = plot._process_atomic(result, data)
+        output = plot._process_atomic(data)
 
         self.assertEqual({
             "histogram": [
@@ -304,10 +299,10 @@ class PlotTestCase(test.TestCase):
             ]
         }, output)
 
-    @mock.patch("rally.benchmark.processing.utils.compress")
-    def test__prepare_data(self, mock_compress):
+    @mock.patch(PLOT + "downsampling.downsample")
+    def test__prepare_data(self, mock_downsample):
 
-        mock_compress.side_effect = lambda i, **kv: i
+        mock_downsample.side_effect = lambda series, *args: series
         rows_num = 100
         load_duration = 1234.5
         full_duration = 6789.1
@@ -347,11 +342,18 @@ class PlotTestCase(test.TestCase):
                                             "key": "foo_key"})
         self.assertEqual(2, len(prepared_data["errors"]))
 
-        calls = [mock.call(values_atomic_a1),
-                 mock.call(values_atomic_a2),
-                 mock.call(values_duration),
-                 mock.call(values_idle)]
-        mock_compress.assert_has_calls(calls)
+        calls = [mock.call({"duration": values_duration,
+                            "idle_duration": values_idle}, 1000, "lttb"),
+                 mock.call({"a1": values_atomic_a1,
+                            "a2": values_atomic_a2}, 1000, "lttb"),
+                 mock.call({"out_key": ["out_value"] * rows_num},
+                           1000, "lttb")]
+        self.assertEqual(calls, mock_downsample.mock_calls)
+
+        iterations_sketch = prepared_data.pop("iterations_sketch")
+        self.assertEqual(rows_num, iterations_sketch.iterations)
+        self.assertEqual(rows_num - 2, iterations_sketch.total.count)
+        success = [i for i in range(rows_num) if i not in (42, 52)]
 
         expected_output = [{"key": "out_key",
                             "values": ["out_value"] * rows_num}]
@@ -362,6 +364,10 @@ class PlotTestCase(test.TestCase):
                                 "idle_duration": values_idle},
             "atomic_durations": {"a1": values_atomic_a1,
                                  "a2": values_atomic_a2},
+            "success_durations": [i * 3.1 for i in success],
+            "success_atomic_durations": {
+                "a1": [i + 0.1 for i in success],
+                "a2": [i + 0.8 for i in success]},
             "errors": [{"iteration": 42,
                         "message": "bar",
                         "traceback": "spam",
@@ -375,4 +381,71 @@ class PlotTestCase(test.TestCase):
             "load_duration": load_duration,
             "full_duration": full_duration,
             "sla": sla,
+            "iterations_num": rows_num,
         }, prepared_data)
+
+    def test__prepare_data_missing_values(self):
+        def row(error=None, **atomic_actions):
+            return {"duration": 1, "idle_duration": 0, "error": error or [],
+                    "atomic_actions": atomic_actions,
+                    "scenario_output": {"errors": "",
+                                        "data": dict(atomic_actions)}}
+
+        data = [row(a=1), row(b=2, a=None), row(error=["e", "m", "t"], c=3),
+                row(a=4)]
+        prepared_data = plot._prepare_data({"result": data,
+                                            "load_duration": 1,
+                                            "full_duration": 2,
+                                            "sla": []})
+
+        self.assertEqual(
+            {"a": [(1, 1.0), (2, 0.0), (3, 0.0), (4, 4.0)],
+             "b": [(1, 0.0), (2, 2.0), (3, 0.0), (4, 0.0)],
+             "c": [(1, 0.0), (2, 0.0), (3, 3.0), (4, 0.0)]},
+            prepared_data["atomic_durations"])
+        self.assertEqual({"a": [1, 0.0, 4], "b": [0, 2, 0]},
+                         prepared_data["success_atomic_durations"])
+        self.assertEqual(["a", "b", "c"],
+                         [o["key"] for o in prepared_data["output"]])
+        self.assertEqual([(1, 0.0), (2, 2.0), (3, 0.0), (4, 0.0)],
+                         prepared_data["output"][1]["values"])
+        self.assertEqual([1, 1, 1], prepared_data["success_durations"])
+        # iterations are not modified
+        self.assertEqual({"c": 3}, data[2]["atomic_actions"])
+        self.assertEqual(1, data[2]["duration"])
+
+    def test__prepare_data_iterator(self):
+        data = [{"duration": 1, "idle_duration": 0, "error": [],
+                 "atomic_actions": {}, "scenario_output": {"errors": "",
+                                                           "data": {}}}]
+        prepared_data = plot._prepare_data({"result": iter(data * 3),
+                                            "load_duration": 1,
+                                            "full_duration": 2,
+                                            "sla": []})
+        self.assertEqual(3, prepared_data["iterations_num"])
+        self.assertEqual([1, 1, 1], prepared_data["success_durations"])
+
+    @mock.patch(PLOT + "sketch.IterationsSketch")
+    def test__prepare_data_stored_sketch(self, mock_iterations_sketch):
+        prepared_data = plot._prepare_data({"result": [],
+                                            "sketch": {"foo": "bar"},
+                                            "load_duration": 1,
+                                            "full_duration": 2,
+                                            "sla": []})
+        mock_iterations_sketch.from_dict.assert_called_once_with(
+            {"foo": "bar"})
+        self.assertEqual(mock_iterations_sketch.from_dict.return_value,
+                         prepared_data["iterations_sketch"])
+
+    def test__get_atomic_action_durations(self):
+        iterations_sketch = mock.MagicMock()
+        action = mock.MagicMock(count=3, min=1, max=3)
+        action.mean.return_value = 2
+        action.quantile.side_effect = [2.8, 2.9]
+        iterations_sketch.items.return_value = [
+            ("action", action), ("total", mock.MagicMock(count=0))]
+
+        self.assertEqual(
+            [["action", 1, 2, 3, 2.8, 2.9, "75.0%", 4],
+             ["total", None, None, None, None, None, 0, 4]],
+            plot._get_atomic_action_durations(iterations_sketch, 4))
@@ -0,0 +1,130 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import random
+
+from rally.benchmark.processing import sketch
+from rally.benchmark.processing import utils
+from tests.unit import test
+
+
+class QuantileSketchTestCase(test.TestCase):
+
+    def _sketch(self, values, **kwargs):
+        quantile_sketch = sketch.QuantileSketch(**kwargs)
+        for value in values:
+            quantile_sketch.add(value)
+        return quantile_sketch
+
+    def test_empty(self):
+        quantile_sketch = sketch.QuantileSketch()
+        self.assertEqual(0, quantile_sketch.count)
+        self.assertIsNone(quantile_sketch.mean())
+        self.assertIsNone(quantile_sketch.quantile(0.5))
+
+    def test_exact(self):
+        values = list(range(1, 101))
+        random.shuffle(values)
+        quantile_sketch = self._sketch(values)
+
+        self.assertEqual(100, quantile_sketch.count)
+        self.assertEqual(1, quantile_sketch.min)
+        self.assertEqual(100, quantile_sketch.max)
+        self.assertEqual(50.5, quantile_sketch.mean())
+        self.assertEqual(10.9, quantile_sketch.quantile(0.1))
+        self.assertEqual(100, quantile_sketch.quantile(1))
+
+    def test_approximate(self):
+        values = [random.uniform(0.1, 100) for i in range(5000)]
+        quantile_sketch = self._sketch(values, accuracy=0.01, exact_limit=10)
+
+        self.assertEqual(5000, quantile_sketch.count)
+        self.assertEqual(min(values), quantile_sketch.min)
+        self.assertEqual(max(values), quantile_sketch.max)
+        self.assertLess(len(quantile_sketch.to_dict()["buckets"]), 500)
+        for percent in (0.5, 0.9, 0.95, 0.99, 0.999):
+            exact = utils.percentile(values, percent)
+            self.assertLess(abs(quantile_sketch.quantile(percent) - exact),
+                            exact * 0.02)
+
+    def test_zeros(self):
+        quantile_sketch = self._sketch([0, 0, 0, 1], exact_limit=1)
+        self.assertEqual(0, quantile_sketch.quantile(0.5))
+        self.assertEqual(1, quantile_sketch.quantile(1))
+
+    def test_merge(self):
+        values = [random.randint(1, 400) / 4.0 for i in range(300)]
+        for limit in (1000, 150, 10):
+            merged = self._sketch(values[:100], exact_limit=limit)
+            merged.merge(self._sketch(values[100:], exact_limit=limit))
+            expected = self._sketch(values, exact_limit=limit)
+
+            self.assertEqual(expected.to_dict(), merged.to_dict())
+
+    def test_to_dict_from_dict(self):
+        values = [random.uniform(0.1, 100) for i in range(50)]
+        for limit in (100, 10):
+            quantile_sketch = self._sketch(values, exact_limit=limit)
+            data = json.loads(json.dumps(quantile_sketch.to_dict()))
+            restored = sketch.QuantileSketch.from_dict(data)
+
+            self.assertEqual(quantile_sketch.to_dict(), restored.to_dict())
+            self.assertEqual(quantile_sketch.quantile(0.95),
+                             restored.quantile(0.95))
+
+
+class IterationsSketchTestCase(test.TestCase):
+
+    raw = [
+        {"duration": 1.0, "error": [],
+         "atomic_actions": {"a": 0.4, "b": 0.6}},
+        {"duration": 2.0, "error": ["Exception", "msg", "tb"],
+         "atomic_actions": {"a": 1.0, "b": None}},
+        {"duration": 3.0, "error": [],
+         "atomic_actions": {"a": 1.0, "b": 2.0}}
+    ]
+
+    def test_from_results(self):
+        iterations_sketch = sketch.IterationsSketch.from_results(self.raw)
+        # None durations of actions and durations of failed iterations
+        # are not counted
+        expected = {"a": [0.4, 1.0, 1.0], "b": [0.6, 2.0], "total": [1.0, 3.0]}
+
+        self.assertEqual(3, iterations_sketch.iterations)
+        self.assertEqual(["a", "b", "total"],
+                         sorted(name for name, s in iterations_sketch.items()))
+        self.assertEqual("total", iterations_sketch.items()[-1][0])
+        for name, quantile_sketch in iterations_sketch.items():
+            self.assertEqual(len(expected[name]), quantile_sketch.count)
+            self.assertEqual(max(expected[name]), quantile_sketch.max)
+            self.assertEqual(utils.percentile(expected[name], 0.9),
+                             quantile_sketch.quantile(0.9))
+
+    def test_merge(self):
+        merged = sketch.IterationsSketch.from_results(self.raw[:1])
+        merged.merge(sketch.IterationsSketch.from_results(self.raw[1:]))
+        expected = sketch.IterationsSketch.from_results(self.raw)
+
+        self.assertEqual(expected.to_dict(), merged.to_dict())
+
+    def test_get_iterations_sketch(self):
+        expected = sketch.IterationsSketch.from_results(self.raw).to_dict()
+        data = json.loads(json.dumps(expected))
+
+        self.assertEqual(expected, sketch.get_iterations_sketch(
+            {"raw": self.raw}).to_dict())
+        self.assertEqual(expected, sketch.get_iterations_sketch(
+            {"raw": [], "sketch": data}).to_dict())
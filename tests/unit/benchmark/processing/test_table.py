@@ -0,0 +1,80 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from rally.benchmark.processing import table
+from tests.unit import test
+
+
+def _iteration(duration, **kwargs):
+    iteration = {"duration": duration, "idle_duration": 0.0, "error": [],
+                 "scenario_output": {"data": {}, "errors": ""},
+                 "atomic_actions": {}}
+    iteration.update(kwargs)
+    return iteration
+
+
+class IterationsTableTestCase(test.TestCase):
+
+    def setUp(self):
+        super(IterationsTableTestCase, self).setUp()
+        self.iterations = [
+            _iteration(1.0, timestamp=10.0, atomic_actions={"a": 0.5}),
+            _iteration(2.0, timestamp=11.0, scheduled_timestamp=10.5,
+                       atomic_actions={"a": 0.7, "b": None},
+                       error=["Exception", "msg", "traceback"]),
+            _iteration(3.0, atomic_actions={"b": 1.5},
+                       scenario_output={"data": {"x": 1}, "errors": ""},
+                       error=["Exception", "msg", "traceback"]),
+            _iteration(4.0, idle_duration=1.0)
+        ]
+
+    def test_empty(self):
+        iterations_table = table.IterationsTable()
+        self.assertEqual(0, len(iterations_table))
+        self.assertFalse(iterations_table)
+        self.assertEqual([], list(iterations_table))
+
+    def test_append(self):
+        iterations_table = table.IterationsTable.from_results(self.iterations)
+        self.assertEqual(4, len(iterations_table))
+        self.assertEqual(self.iterations, list(iterations_table))
+        self.assertEqual(self.iterations[1], iterations_table[1])
+        self.assertEqual(self.iterations[3], iterations_table[-1])
+        self.assertEqual([1.0, 2.0, 3.0, 4.0],
+                         iterations_table.duration.tolist())
+        self.assertEqual(["a", "b"], list(iterations_table.atomic_actions))
+
+    def test_errors_interned(self):
+        iterations_table = table.IterationsTable.from_results(self.iterations)
+        self.assertEqual([("Exception", "msg", "traceback")],
+                         iterations_table.errors)
+        self.assertEqual([table.NO_ERROR, 0, 0, table.NO_ERROR],
+                         iterations_table.error.tolist())
+
+    def test_scenario_output_sparse(self):
+        iterations_table = table.IterationsTable.from_results(self.iterations)
+        self.assertEqual({2: {"data": {"x": 1}, "errors": ""}},
+                         iterations_table.scenario_output)
+
+    def test_to_dict_from_dict(self):
+        iterations_table = table.IterationsTable.from_results(self.iterations)
+        data = json.loads(json.dumps(iterations_table.to_dict()))
+        restored = table.IterationsTable.from_dict(data)
+        self.assertEqual(self.iterations, list(restored))
+
+        restored.append(self.iterations[1])
+        self.assertEqual(1, len(restored.errors))
@@ -13,6 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import random
+
+import mock
+import testtools
+
 from rally.benchmark.processing import utils
 from rally import exceptions
 from tests.unit import test
@@ -44,96 +49,70 @@ class MathTestCase(test.TestCase):
         self.assertRaises(exceptions.InvalidArgumentsException,
                           utils.mean, lst)
 
-    def _compare_items_lists(self, list1, list2):
-        """Items lists comparison, compatible with Python 2.6/2.7.
-
-        :param list1: items list [(a1, b1), (a2, b2) ...]
-        :param list2: items list [(a1, b1), (a2, b2) ...]
-        """
-        compare_float = lambda f1, f2: abs(f2 - f2) < 0.1
-        for a, b in zip(list1, list2):
-            a1, a2, b1, b2 = (a + b)
-            self.assertEqual(a1, b1)
-            if type(a2) is float:
-                # Float representation is defferent in Python 2.6/2.7,
-                # so we need to be sure that values are close to each other
-                self.assertTrue(compare_float(a2, b2))
-            else:
-                self.assertEqual(a2, b2)
-
-    def test_compress(self):
-        data64 = range(64)
-        data4 = [4, 2, 1, 3]
-        mixed = [2, "5", None, 0.5]
-        alt_normalize = str
-        alt_merge = lambda a, b: str(a) + str(b)
-        compress = lambda lst: [(k + 1, float(v)) for k, v in enumerate(lst)]
-
-        # Long list
-        self.assertEqual(utils.compress(data64), compress(data64))
-        self._compare_items_lists(
-            utils.compress(data64, limit=4),
-            [(17, 15.0), (33, 31.01), (49, 47.0), (64, 62.0)])
-        self.assertEqual(
-            utils.compress(data64, limit=4,
-                           normalize=alt_normalize, merge=alt_merge),
-            [(17, "012345678910111213141516"),
-             (33, "17181920212223242526272829303132"),
-             (49, "33343536373839404142434445464748"),
-             (64, "495051525354555657585960616263")])
-
-        # Short list
-        self.assertEqual(utils.compress(data4, limit=2),
-                         [(3, 2.0), (4, 3.0)])
-        self.assertEqual(utils.compress(data4, normalize=alt_normalize),
-                         [(1, "4"), (2, "2"), (3, "1"), (4, "3")])
-
-        # List with mixed data types
-        self.assertEqual(utils.compress(mixed),
-                         [(1, 2.0), (2, 5.0), (3, 0.0), (4, 0.5)])
-        self.assertEqual(utils.compress(mixed, normalize=str),
-                         [(1, "2"), (2, "5"), (3, "None"), (4, "0.5")])
-        self.assertRaises(TypeError, utils.compress, mixed, normalize=int)
-        self.assertEqual(
-            utils.compress(mixed, normalize=alt_normalize, merge=alt_merge),
-            [(1, "2"), (2, "5"), (3, "None"), (4, "0.5")])
-
-
-class AtomicActionsDataTestCase(test.TestCase):
-
-    def test_get_atomic_actions_data(self):
-        raw_data = [
-            {
-                "error": [],
-                "duration": 3,
-                "atomic_actions": {
-                    "action1": 1,
-                    "action2": 2
-                }
-            },
-            {
-                "error": ["some", "error", "occurred"],
-                "duration": 1.9,
-                "atomic_actions": {
-                    "action1": 0.5,
-                    "action2": 1.4
-                }
-            },
-            {
-                "error": [],
-                "duration": 8,
-                "atomic_actions": {
-                    "action1": 4,
-                    "action2": 4
-                }
-            }
-        ]
-
-        atomic_actions_data = {
-            "action1": [1, 0.5, 4],
-            "action2": [2, 1.4, 4],
-            "total": [3, 8]
-        }
-
-        output = utils.get_atomic_actions_data(raw_data)
-        self.assertEqual(output, atomic_actions_data)
+    @mock.patch("rally.benchmark.processing.utils.numpy", None)
+    def test_describe(self):
+        lst = list(range(100, 0, -1))
+        self.assertEqual((1, 50.5, 100, [10.9, 100]),
+                         utils.describe(lst, (0.1, 1)))
+        self.assertEqual(list(range(100, 0, -1)), lst)
+        self.assertEqual((3, 3.0, 3, []), utils.describe([3]))
+
+    def test_describe_empty_list(self):
+        self.assertRaises(exceptions.InvalidArgumentsException,
+                          utils.describe, [], (0.9,))
+
+    @mock.patch("rally.benchmark.processing.utils.numpy", None)
+    def test_bin_counts(self):
+        self.assertEqual([2, 2, 2],
+                         utils.bin_counts([0, 1, 1.5, 3, 2.5, 2, 4],
+                                          [1, 2, 3]))
+        self.assertEqual([0, 0], utils.bin_counts([], [1, 2]))
+
+
+@testtools.skipIf(utils.numpy is None, "NumPy is not available")
+class NumpyMathTestCase(test.TestCase):
+    """Results of NumPy implementations are the same as pure Python ones."""
+
+    def setUp(self):
+        super(NumpyMathTestCase, self).setUp()
+        random.seed(42)
+        self.values = [random.uniform(0, 10) for i in range(1500)]
+        self.values[7] = self.values[8]
+
+    def _both(self, func, *args):
+        with mock.patch("rally.benchmark.processing.utils.numpy", None):
+            expected = func(list(self.values), *args)
+        return func(list(self.values), *args), expected
+
+    def test_mean(self):
+        result, expected = self._both(utils.mean)
+        self.assertIsInstance(result, float)
+        self.assertAlmostEqual(expected, result, places=10)
+
+    def test_percentile(self):
+        for percent in 0, 0.1, 0.5, 0.9, 0.95, 1:
+            result, expected = self._both(utils.percentile, percent)
+            self.assertIsInstance(result, float)
+            self.assertAlmostEqual(expected, result, places=10)
+
+    def test_describe(self):
+        result, expected = self._both(utils.describe, (0.5, 0.9, 0.95))
+        self.assertEqual(expected[0], result[0])
+        self.assertAlmostEqual(expected[1], result[1], places=10)
+        self.assertEqual(expected[2], result[2])
+        for exp, res in zip(expected[3], result[3]):
+            self.assertAlmostEqual(exp, res, places=10)
+
+    def test_bin_counts(self):
+        edges = sorted([1, 2.5, 5, self.values[8], 9.5])
+        result, expected = self._both(utils.bin_counts, edges)
+        self.assertEqual(expected, result)
+        self.assertEqual([int] * 5, [type(count) for count in result])
+
+    @mock.patch("rally.benchmark.processing.utils.numpy")
+    def test_small_lists_without_numpy(self, mock_numpy):
+        self.assertEqual(2.0, utils.mean([1, 2, 3]))
+        self.assertEqual(2, utils.percentile([3, 2, 1], 0.5))
+        self.assertEqual((1, 2.0, 3, [2]), utils.describe([3, 1, 2], [0.5]))
+        self.assertEqual([1, 2], utils.bin_counts([1, 2, 3], [1, 3]))
+        self.assertFalse(mock_numpy.mock_calls)
@@ -0,0 +1,208 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+import testtools
+
+from rally.benchmark.runners import asynchronous
+from rally.benchmark.runners import base
+from rally.benchmark.scenarios import base as scenario_base
+from rally import consts
+from rally import exceptions
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.benchmark.runners."
+
+# Coroutine functions can't be defined in Python 2 syntax
+COROUTINE_SCENARIO = """
+class FakeCoroutineScenario(scenario_base.Scenario):
+
+    running = 0
+    max_running = 0
+
+    async def do_it(self, sleep=0.01, **kwargs):
+        cls = FakeCoroutineScenario
+        cls.running += 1
+        cls.max_running = max(cls.max_running, cls.running)
+        with scenario_base.AtomicAction(self, "sleep"):
+            await asyncio.sleep(sleep)
+        cls.running -= 1
+
+    async def something_went_wrong(self, **kwargs):
+        raise Exception("Something went wrong")
+"""
+
+
+def _coroutine_scenario():
+    namespace = {"scenario_base": scenario_base,
+                 "asyncio": asynchronous.asyncio}
+    exec(COROUTINE_SCENARIO, namespace)
+    return namespace["FakeCoroutineScenario"]
+
+
+@testtools.skipIf(asynchronous.asyncio is None, "asyncio is not available")
+class AsyncioScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AsyncioScenarioRunnerTestCase, self).setUp()
+        self.config = {"type": consts.RunnerType.ASYNCIO,
+                       "times": 10, "concurrency": 4}
+        self.context = fakes.FakeUserContext({"task":
+                                             {"uuid": "uuid"}}).context
+        self.context["admin"] = {"endpoint": mock.MagicMock()}
+        self.args = {"a": 1}
+        mock.patch(RUNNERS + "asynchronous.osclients.Clients",
+                   fakes.FakeClients).start()
+
+    def test_validate(self):
+        asynchronous.AsyncioScenarioRunner.validate(self.config)
+        self.config.update({"rps": {"start": 1, "end": 10, "duration": 5},
+                            "arrival": "poisson", "timeout": 10})
+        asynchronous.AsyncioScenarioRunner.validate(self.config)
+
+    def test_validate_failed(self):
+        self.config["concurrency"] = 0
+        self.assertRaises(jsonschema.ValidationError,
+                          asynchronous.AsyncioScenarioRunner.validate,
+                          self.config)
+
+    def test_get_runner(self):
+        runner = base.ScenarioRunner.get_runner(mock.MagicMock(),
+                                                self.config)
+        self.assertIsInstance(runner, asynchronous.AsyncioScenarioRunner)
+
+    def test__run_scenario_coroutine(self):
+        cls = _coroutine_scenario()
+        runner = asynchronous.AsyncioScenarioRunner(mock.MagicMock(),
+                                                    self.config)
+        runner._run_scenario(cls, "do_it", self.context, {"sleep": 0.01})
+
+        self.assertEqual(10, len(runner.result_queue))
+        self.assertEqual(4, cls.max_running)
+        for result in runner.result_queue:
+            self.assertIsNotNone(base.ScenarioRunnerResult(result))
+            self.assertEqual([], result["error"])
+            self.assertGreaterEqual(result["duration"], 0.01)
+            self.assertGreaterEqual(result["atomic_actions"]["sleep"], 0.01)
+            self.assertNotIn("scheduled_timestamp", result)
+
+    def test__run_scenario_coroutine_exception(self):
+        runner = asynchronous.AsyncioScenarioRunner(mock.MagicMock(),
+                                                    self.config)
+        runner._run_scenario(_coroutine_scenario(), "something_went_wrong",
+                             self.context, {})
+
+        self.assertEqual(10, len(runner.result_queue))
+        for result in runner.result_queue:
+            self.assertEqual(["Exception", "Something went wrong"],
+                             result["error"][:2])
+
+    def test__run_scenario_coroutine_timeout(self):
+        self.config.update({"times": 2, "timeout": 0.01})
+        runner = asynchronous.AsyncioScenarioRunner(mock.MagicMock(),
+                                                    self.config)
+        runner._run_scenario(_coroutine_scenario(), "do_it", self.context,
+                             {"sleep": 10})
+
+        self.assertEqual(2, len(runner.result_queue))
+        for result in runner.result_queue:
+            self.assertEqual("TimeoutError", result["error"][0])
+            self.assertEqual(0.01, result["duration"])
+
+    def test__run_scenario_coroutine_rps(self):
+        self.config.update({"rps": 100, "concurrency": 2})
+        cls = _coroutine_scenario()
+        runner = asynchronous.AsyncioScenarioRunner(mock.MagicMock(),
+                                                    self.config)
+        runner._run_scenario(cls, "do_it", self.context, {"sleep": 0.05})
+
+        self.assertEqual(10, len(runner.result_queue))
+        self.assertEqual(2, cls.max_running)
+        scheduled = [r["scheduled_timestamp"] for r in runner.result_queue]
+        self.assertAlmostEqual(0.09, max(scheduled) - min(scheduled),
+                               places=5)
+        for result in runner.result_queue:
+            # Iterations wait for free slots when concurrency is exceeded
+            self.assertGreaterEqual(
+                result["timestamp"] - result["scheduled_timestamp"], -0.01)
+
+    def test__run_scenario_coroutine_rps_default_concurrency(self):
+        self.config.update({"rps": 100})
+        del self.config["concurrency"]
+        cls = _coroutine_scenario()
+        runner = asynchronous.AsyncioScenarioRunner(mock.MagicMock(),
+                                                    self.config)
+        load = asynchronous._Load(runner, None, cls, "do_it", {}, {})
+        self.assertEqual(10, load.concurrency)
+
+        runner._run_scenario(cls, "do_it", self.context, {"sleep": 0.05})
+
+        self.assertEqual(10, len(runner.result_queue))
+        # 100 iterations per second that take 0.05s each run concurrently
+        self.assertGreater(cls.max_running, 2)
+
+    def test__run_scenario_sync(self):
+        runner = asynchronous.AsyncioScenarioRunner(mock.MagicMock(),
+                                                    self.config)
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual(10, len(runner.result_queue))
+        for result in runner.result_queue:
+            self.assertIsNotNone(base.ScenarioRunnerResult(result))
+
+    def test__run_scenario_sync_rps(self):
+        self.config.update({"rps": 200})
+        runner = asynchronous.AsyncioScenarioRunner(mock.MagicMock(),
+                                                    self.config)
+        runner._run_scenario(fakes.FakeScenario, "something_went_wrong",
+                             self.context, self.args)
+
+        self.assertEqual(10, len(runner.result_queue))
+        for result in runner.result_queue:
+            self.assertIn("scheduled_timestamp", result)
+            self.assertEqual("Exception", result["error"][0])
+
+    def test__run_scenario_aborted(self):
+        runner = asynchronous.AsyncioScenarioRunner(mock.MagicMock(),
+                                                    self.config)
+        runner.abort()
+        runner._run_scenario(_coroutine_scenario(), "do_it", self.context,
+                             {})
+        self.assertEqual(0, len(runner.result_queue))
+
+    @mock.patch(RUNNERS + "base.ScenarioRunner._send_result",
+                side_effect=jsonschema.ValidationError("invalid result"))
+    def test__run_scenario_send_result_failed(self, mock__send_result):
+        runner = asynchronous.AsyncioScenarioRunner(mock.MagicMock(),
+                                                    self.config)
+        self.assertRaises(jsonschema.ValidationError, runner._run_scenario,
+                          _coroutine_scenario(), "do_it", self.context, {})
+        self.assertTrue(runner.aborted.is_set())
+        self.assertEqual(4, mock__send_result.call_count)
+
+
+class AsyncioScenarioRunnerNoAsyncioTestCase(test.TestCase):
+
+    @mock.patch(RUNNERS + "asynchronous.asyncio", None)
+    def test__run_scenario(self):
+        runner = asynchronous.AsyncioScenarioRunner(
+            mock.MagicMock(), {"type": consts.RunnerType.ASYNCIO})
+        self.assertRaises(exceptions.InvalidConfigException,
+                          runner._run_scenario, fakes.FakeScenario, "do_it",
+                          {}, {})
@@ -18,6 +18,7 @@ import multiprocessing
 
 import jsonschema
 import mock
+from oslo_config import fixture as config_fixture
 
 from rally.benchmark.runners import base
 from rally.benchmark.runners import serial
@@ -81,15 +82,17 @@ class ScenarioHelpersTestCase(test.TestCase):
 
     @mock.patch(BASE + "osclients")
     def test_run_scenario_once_internal_logic(self, mock_clients):
-        mock_clients.Clients.return_value = "cl"
+        clients = mock_clients.Clients.return_value
 
         context = base._get_scenario_context(fakes.FakeUserContext({}).context)
         scenario_cls = mock.MagicMock()
         args = (2, scenario_cls, "test", context, {})
         base._run_scenario_once(args)
 
+        self.assertEqual(2, clients.release.call_count)
         expected_calls = [
-            mock.call(context=context, admin_clients="cl", clients="cl"),
+            mock.call(context=context, admin_clients=clients,
+                      clients=clients),
             mock.call().test(),
             mock.call().idle_duration(),
             mock.call().idle_duration(),
@@ -186,6 +189,47 @@ class ScenarioRunnerResultTestCase(test.TestCase):
         self.assertRaises(jsonschema.ValidationError,
                           base.ScenarioRunnerResult, config)
 
+    @mock.patch(BASE + "jsonschema.validate")
+    def test_validate_structural_check(self, mock_validate):
+        result = {"duration": 1, "idle_duration": 0.5, "timestamp": 12.0,
+                  "scheduled_timestamp": 11.5,
+                  "scenario_output": {"data": {"a": 1}, "errors": ""},
+                  "atomic_actions": {"a": 0.5, "b": None},
+                  "error": ["Exception", "msg", "traceback"]}
+        base.ScenarioRunnerResult.validate(result)
+        self.assertFalse(mock_validate.called)
+
+    @mock.patch(BASE + "jsonschema.validate")
+    def test_validate_strict(self, mock_validate):
+        self.useFixture(config_fixture.Config()).config(
+            strict_results_validation=True, group="benchmark")
+        result = {"duration": 1.0}
+        base.ScenarioRunnerResult.validate(result)
+        mock_validate.assert_called_once_with(
+            result, base.ScenarioRunnerResult.RESULT_SCHEMA)
+
+    def test_validate_invalid(self):
+        invalid = [
+            None,
+            {"duration": "1.0"},
+            {"duration": True},
+            {"timestamp": None},
+            {"atomic_actions": {"a": "1.0"}},
+            {"atomic_actions": []},
+            {"error": "msg"},
+            {"error": ["Exception", 42]},
+            {"scenario_output": {"data": {"a": "b"}}},
+            {"scenario_output": {"data": []}},
+            {"scenario_output": {"errors": None}},
+            {"scenario_output": {"foo": "bar"}},
+            {"scenario_output": []},
+            {"foo": "bar"}
+        ]
+        for result in invalid:
+            self.assertFalse(base.ScenarioRunnerResult._is_valid(result))
+            self.assertRaises(jsonschema.ValidationError,
+                              base.ScenarioRunnerResult.validate, result)
+
 
 class ScenarioRunnerTestCase(test.TestCase):
 
@@ -277,6 +321,12 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner.abort()
         self.assertTrue(runner.aborted.is_set())
 
+    def test_summary(self):
+        runner = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        self.assertEqual({}, runner.summary())
+
     def test__create_process_pool(self):
         runner = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -298,11 +348,12 @@ class ScenarioRunnerTestCase(test.TestCase):
 
     @mock.patch(BASE + "ScenarioRunner._send_result")
     def test__join_processes(self, mock_send_result):
-        process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
+        process = mock.MagicMock(is_alive=mock.MagicMock(return_value=True))
         processes = 10
         process_pool = collections.deque([process] * processes)
-        mock_result_queue = mock.MagicMock(
-                                    empty=mock.MagicMock(return_value=True))
+        mock_result_queue = mock.MagicMock()
+        mock_result_queue.get.side_effect = (
+            ["r1", "r2"] + [base.WORKER_FINISHED] * processes)
 
         runner = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -311,4 +362,41 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner._join_processes(process_pool, mock_result_queue)
 
         self.assertEqual(processes, process.join.call_count)
+        self.assertEqual([mock.call("r1"), mock.call("r2")],
+                         mock_send_result.mock_calls)
+        mock_result_queue.close.assert_called_once_with()
+
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_dead_workers(self, mock_send_result):
+        process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
+        process_pool = collections.deque([process] * 2)
+        mock_result_queue = mock.MagicMock()
+        mock_result_queue.get.side_effect = base.moves.queue.Empty
+
+        runner = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+
+        runner._join_processes(process_pool, mock_result_queue)
+
+        self.assertEqual(2, process.join.call_count)
+        self.assertFalse(mock_send_result.called)
         mock_result_queue.close.assert_called_once_with()
+
+    def test_get_results(self):
+        runner = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        results = [{"duration": 1.0, "idle_duration": 0,
+                    "scenario_output": {"data": {}, "errors": ""},
+                    "atomic_actions": {}, "error": []}] * 2
+
+        for result in results:
+            runner._send_result(result)
+        self.assertEqual(results, list(runner.get_results()))
+        self.assertEqual(0, len(runner.result_queue))
+
+        runner._send_result(results[0])
+        runner.finish_results()
+        self.assertEqual(results[:1], list(runner.get_results()))
+        self.assertIsNone(runner.get_results())
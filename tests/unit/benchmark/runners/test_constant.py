@@ -61,42 +61,57 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                                                  consts.RunnerType.CONSTANT})
         self.assertIsNotNone(runner)
 
-    @mock.patch(RUNNERS + "constant.time")
     @mock.patch(RUNNERS + "constant.threading.Thread")
-    @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
     @mock.patch(RUNNERS + "constant.base")
-    def test__worker_process(self, mock_base, mock_queue, mock_thread,
-                             mock_time):
+    def test__worker_process(self, mock_base, mock_thread):
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock()
+        fake_ram_int = iter(range(10))
+        context = {"users": [{"tenant_id": "t1", "endpoint": "e1",
+                              "id": "uuid1"}]}
 
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
+        constant._worker_process(mock_queue, fake_ram_int, 1, 3, 4,
+                                 context, "Dummy", "dummy", (), mock_event)
+
+        thread_args = (mock_queue, fake_ram_int, 4, context, "Dummy",
+                       "dummy", (), mock_event)
+        self.assertEqual(
+            [mock.call(target=constant._run_iterations, args=thread_args)] * 3,
+            mock_thread.call_args_list)
+        self.assertEqual(3, mock_thread.return_value.start.call_count)
+        self.assertEqual(3, mock_thread.return_value.join.call_count)
+        mock_queue.put.assert_called_once_with(mock_base.WORKER_FINISHED)
 
+    @mock.patch(RUNNERS + "constant.base")
+    def test__run_iterations(self, mock_base):
+        mock_queue = mock.MagicMock()
         mock_event = mock.MagicMock(
             is_set=mock.MagicMock(return_value=False))
-
         times = 4
-
         fake_ram_int = iter(range(10))
-
         context = {"users": [{"tenant_id": "t1", "endpoint": "e1",
                               "id": "uuid1"}]}
 
-        constant._worker_process(mock_queue, fake_ram_int, 1, 2, times,
-                                 context, "Dummy", "dummy", (), mock_event)
+        constant._run_iterations(mock_queue, fake_ram_int, times, context,
+                                 "Dummy", "dummy", (), mock_event)
 
-        self.assertEqual(times, mock_thread.call_count)
-        self.assertEqual(times, mock_thread_instance.start.call_count)
-        self.assertEqual(times, mock_thread_instance.join.call_count)
         self.assertEqual(times, mock_base._get_scenario_context.call_count)
+        scenario_context = mock_base._get_scenario_context.return_value
+        self.assertEqual(
+            [mock.call(mock_queue, (i, "Dummy", "dummy", scenario_context, ()))
+             for i in range(times)],
+            mock_base._worker_thread.mock_calls)
+        self.assertEqual(times + 1, next(fake_ram_int))
+
+    @mock.patch(RUNNERS + "constant.base")
+    def test__run_iterations_aborted(self, mock_base):
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(side_effect=[False, True]))
+
+        constant._run_iterations(mock.MagicMock(), iter(range(10)), 4, {},
+                                 "Dummy", "dummy", (), mock_event)
 
-        for i in range(times):
-            scenario_context = mock_base._get_scenario_context(context)
-            call = mock.call(args=(mock_queue,
-                                   (i, "Dummy", "dummy",
-                                    scenario_context, ())),
-                             target=mock_base._worker_thread)
-            self.assertIn(call, mock_thread.mock_calls)
+        self.assertEqual(1, mock_base._worker_thread.call_count)
 
     @mock.patch(RUNNERS + "constant.base._run_scenario_once")
     def test__worker_thread(self, mock_run_scenario_once):
@@ -59,71 +59,135 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                                                  consts.RunnerType.RPS})
         self.assertIsNotNone(runner)
 
-    @mock.patch(RUNNERS + "rps.LOG")
-    @mock.patch(RUNNERS + "rps.time")
-    @mock.patch(RUNNERS + "rps.threading.Thread")
-    @mock.patch(RUNNERS + "rps.multiprocessing.Queue")
-    @mock.patch(RUNNERS + "rps.base")
-    def test__worker_process(self, mock_base, mock_queue, mock_thread,
-                             mock_time, mock_log):
-
-        def time_side():
-            time_side.last += 0.03
-            time_side.count += 1
-            return time_side.last
-        time_side.last = 0
-        time_side.count = 0
+    def test_validate_step_profile(self):
+        config = {
+            "type": consts.RunnerType.RPS,
+            "times": 100,
+            "rps": {"start": 1, "end": 10, "step": 2, "duration": 5},
+            "arrival": "poisson"
+        }
+        rps.RPSScenarioRunner.validate(config)
 
-        mock_time.time = time_side
+    def test_validate_step_profile_failed(self):
+        config = {"type": consts.RunnerType.RPS, "times": 100,
+                  "rps": {"start": 1, "step": 2}}
+        self.assertRaises(jsonschema.ValidationError,
+                          rps.RPSScenarioRunner.validate, config)
 
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
+    def test__rps_at(self):
+        profile = {"start": 2, "end": 7, "step": 2, "duration": 10}
+        self.assertEqual(5.0, rps._rps_at(5, 100))
+        self.assertEqual(2.0, rps._rps_at(profile, 0))
+        self.assertEqual(2.0, rps._rps_at(profile, 9.9))
+        self.assertEqual(4.0, rps._rps_at(profile, 10))
+        self.assertEqual(7.0, rps._rps_at(profile, 1000))
+
+    def test__rps_at_descending(self):
+        profile = {"start": 7, "end": 2, "step": 2, "duration": 10}
+        self.assertEqual(7.0, rps._rps_at(profile, 0))
+        self.assertEqual(7.0, rps._rps_at(profile, 9.9))
+        self.assertEqual(5.0, rps._rps_at(profile, 10))
+        self.assertEqual(3.0, rps._rps_at(profile, 20))
+        self.assertEqual(2.0, rps._rps_at(profile, 30))
+        self.assertEqual(2.0, rps._rps_at(profile, 1000))
+        self.assertEqual(4.0, rps._rps_at({"start": 4, "end": 4,
+                                           "duration": 1}, 100))
+
+    def test__schedule_constant(self):
+        self.assertEqual([0.0, 0.25, 0.5, 0.75],
+                         list(rps._schedule(4, "constant", 4)))
+
+    def test__schedule_step(self):
+        profile = {"start": 1, "end": 2, "step": 1, "duration": 2}
+        self.assertEqual([0.0, 1.0, 2.0, 2.5, 3.0],
+                         list(rps._schedule(profile, "constant", 5)))
+
+    def test__schedule_step_descending(self):
+        profile = {"start": 2, "end": 1, "step": 1, "duration": 2}
+        self.assertEqual([0.0, 0.5, 1.0, 1.5, 2.0, 3.0],
+                         list(rps._schedule(profile, "constant", 6)))
+
+    def test_validate_step_profile_descending(self):
+        rps.RPSScenarioRunner.validate(
+            {"type": consts.RunnerType.RPS, "times": 100,
+             "rps": {"start": 10, "end": 1, "step": 2, "duration": 5}})
+
+    @mock.patch(RUNNERS + "rps.random.expovariate", return_value=0.1)
+    def test__schedule_poisson(self, mock_expovariate):
+        schedule = list(rps._schedule(20, "poisson", 3))
+        self.assertEqual(3, len(schedule))
+        self.assertAlmostEqual(0.2, schedule[-1])
+        mock_expovariate.assert_called_with(20.0)
 
+    @mock.patch(RUNNERS + "rps.threading.Thread")
+    @mock.patch(RUNNERS + "rps.base")
+    def test__worker_process(self, mock_base, mock_thread):
+        mock_thread.return_value.is_alive.return_value = False
+        mock_queue = mock.MagicMock()
+        tickets = mock.MagicMock()
+        tickets.get.side_effect = [(0, 10.0), (1, 10.5), None]
         mock_event = mock.MagicMock(
             is_set=mock.MagicMock(return_value=False))
+        context = {"users": [{"tenant_id": "t1", "endpoint": "e1",
+                              "id": "uuid1"}]}
 
-        times = 4
-        max_concurrent = 3
+        rps._worker_process(mock_queue, tickets, 3, context, "Dummy",
+                            "dummy", (), mock_event)
 
-        fake_ram_int = iter(range(10))
+        self.assertEqual(2, mock_thread.call_count)
+        self.assertEqual(2, mock_thread.return_value.start.call_count)
+        self.assertEqual(2, mock_thread.return_value.join.call_count)
+        scenario_context = mock_base._get_scenario_context.return_value
+        for i, scheduled in ((0, 10.0), (1, 10.5)):
+            self.assertEqual(
+                (mock_queue, (i, "Dummy", "dummy", scenario_context, ()),
+                 scheduled),
+                mock_thread.call_args_list[i][1]["args"][:3])
+        mock_queue.put.assert_called_once_with(mock_base.WORKER_FINISHED)
 
-        context = {"users": [{"tenant_id": "t1", "endpoint": "e1",
-                              "id": "uuid1"}]}
+    @mock.patch(RUNNERS + "rps.threading.Thread")
+    @mock.patch(RUNNERS + "rps.base")
+    def test__worker_process_aborted(self, mock_base, mock_thread):
+        tickets = mock.MagicMock()
+        tickets.get.side_effect = [(0, 10.0), (1, 10.5), None]
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=True))
+
+        rps._worker_process(mock.MagicMock(), tickets, 1, {}, "Dummy",
+                            "dummy", (), mock_event)
 
-        rps._worker_process(mock_queue, fake_ram_int, 1, 10, times,
-                            max_concurrent, context, "Dummy", "dummy",
-                            (), mock_event)
-
-        self.assertEqual(times, mock_log.debug.call_count)
-        self.assertEqual(times, mock_thread.call_count)
-        self.assertEqual(times, mock_thread_instance.start.call_count)
-        self.assertEqual(times, mock_thread_instance.join.call_count)
-        self.assertEqual(times - 1, mock_time.sleep.call_count)
-        self.assertEqual(times, mock_thread_instance.isAlive.call_count)
-        self.assertEqual(times * 4 - 1, mock_time.time.count)
-        self.assertEqual(times, mock_base._get_scenario_context.call_count)
-
-        for i in range(times):
-            scenario_context = mock_base._get_scenario_context(context)
-            call = mock.call(args=(mock_queue,
-                                   (i, "Dummy", "dummy",
-                                    scenario_context, ())),
-                             target=mock_base._worker_thread)
-            self.assertIn(call, mock_thread.mock_calls)
+        self.assertFalse(mock_thread.called)
 
     @mock.patch(RUNNERS + "rps.base._run_scenario_once")
     def test__worker_thread(self, mock_run_scenario_once):
+        mock_run_scenario_once.return_value = {"duration": 1}
         mock_queue = mock.MagicMock()
+        free_slots = mock.MagicMock()
 
-        args = ("some_args",)
+        rps._worker_thread(mock_queue, ("some_args",), 10.5, free_slots)
 
-        base._worker_thread(mock_queue, args)
+        mock_run_scenario_once.assert_called_once_with(("some_args",))
+        mock_queue.put.assert_called_once_with(
+            {"duration": 1, "scheduled_timestamp": 10.5})
+        free_slots.release.assert_called_once_with()
 
-        self.assertEqual(1, mock_queue.put.call_count)
-
-        expected_calls = [mock.call(("some_args",))]
-        self.assertEqual(expected_calls, mock_run_scenario_once.mock_calls)
+    @mock.patch(RUNNERS + "rps.time")
+    @mock.patch(RUNNERS + "rps._monotonic")
+    def test__schedule_iterations(self, mock_monotonic, mock_time):
+        mock_monotonic.side_effect = [100.0, 100.0, 100.1, 100.6]
+        mock_time.time.return_value = 1000.0
+        tickets = mock.MagicMock()
+        runner = rps.RPSScenarioRunner(self.task, {"times": 3, "rps": 2})
+
+        runner._schedule_iterations(tickets, 2)
+
+        self.assertEqual([mock.call((0, 1000.0)), mock.call((1, 1000.5)),
+                          mock.call((2, 1001.0)), mock.call(None),
+                          mock.call(None)],
+                         tickets.put.mock_calls)
+        self.assertEqual([mock.call(0.4), mock.call(0.4)],
+                         [mock.call(round(c[1][0], 2))
+                          for c in mock_time.sleep.mock_calls])
 
     @mock.patch(RUNNERS + "rps.time.sleep")
     def test__run_scenario(self, mock_sleep):
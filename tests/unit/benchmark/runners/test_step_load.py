@@ -0,0 +1,182 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+
+from rally.benchmark.runners import base
+from rally.benchmark.runners import constant
+from rally.benchmark.runners import rps
+from rally.benchmark.runners import step_load
+from rally import consts
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.benchmark.runners."
+
+
+class StepLoadScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(StepLoadScenarioRunnerTestCase, self).setUp()
+        self.config = {"type": consts.RunnerType.STEP_LOAD,
+                       "start": 1, "step": 2, "end": 5,
+                       "step_duration": 0.1,
+                       "sla": {"failure_rate": {"max": 0}}}
+        self.context = fakes.FakeUserContext({"task":
+                                             {"uuid": "uuid"}}).context
+        self.task = mock.MagicMock()
+
+    def test_validate(self):
+        step_load.StepLoadScenarioRunner.validate(self.config)
+
+    def test_validate_failed(self):
+        self.config.pop("sla")
+        self.assertRaises(jsonschema.ValidationError,
+                          step_load.StepLoadScenarioRunner.validate,
+                          self.config)
+
+    def test_validate_invalid_sla(self):
+        self.config["sla"] = {"failure_rte": {"max": 0}}
+        self.assertRaises(jsonschema.ValidationError,
+                          base.ScenarioRunner.validate, self.config)
+
+    def test_validate_start_greater_than_end(self):
+        self.config["start"] = 10
+        self.assertRaises(jsonschema.ValidationError,
+                          base.ScenarioRunner.validate, self.config)
+
+    def test__levels(self):
+        runner = step_load.StepLoadScenarioRunner(self.task, self.config)
+        self.assertEqual([1, 3, 5], list(runner._levels()))
+
+    def test__get_step_runner(self):
+        self.config["timeout"] = 10
+        runner = step_load.StepLoadScenarioRunner(self.task, self.config)
+        step_runner = runner._get_step_runner(3)
+        self.assertIsInstance(step_runner,
+                              constant.ConstantForDurationScenarioRunner)
+        self.assertEqual({"type": consts.RunnerType.CONSTANT_FOR_DURATION,
+                          "concurrency": 3, "duration": 0.1, "timeout": 10},
+                         step_runner.config)
+
+    def test__get_step_runner_rps(self):
+        self.config.update({"load": "rps", "max_concurrency": 4})
+        runner = step_load.StepLoadScenarioRunner(self.task, self.config)
+        step_runner = runner._get_step_runner(30)
+        self.assertIsInstance(step_runner, rps.RPSScenarioRunner)
+        self.assertEqual({"type": consts.RunnerType.RPS, "rps": 30,
+                          "times": 3, "max_concurrency": 4},
+                         step_runner.config)
+
+    @mock.patch(RUNNERS + "step_load.StepLoadScenarioRunner"
+                "._get_step_runner")
+    def test__run_step(self, mock_get_step_runner):
+        step_runner = mock_get_step_runner.return_value
+        ok = {"duration": 1.0, "idle_duration": 0, "error": [],
+              "scenario_output": {"data": {}, "errors": ""},
+              "atomic_actions": {}}
+        failed = dict(ok, error=["Exception", "msg", "tb"])
+        step_runner.get_results.side_effect = [[ok], [failed], None]
+        runner = step_load.StepLoadScenarioRunner(self.task, self.config)
+
+        self.assertFalse(runner._run_step(3, "cls", "method", {}, {}))
+
+        step_runner._run_scenario.assert_called_once_with("cls", "method",
+                                                          {}, {})
+        step_runner.finish_results.assert_called_once_with()
+        step_runner.abort.assert_called_once_with()
+        self.assertEqual([ok, failed], list(runner.result_queue))
+        self.assertEqual(1, len(runner.steps))
+        self.assertEqual({"level": 3, "iterations": 2, "success": False,
+                          "error": None},
+                         dict((k, v) for k, v in runner.steps[0].items()
+                              if k != "sla"))
+
+    @mock.patch(RUNNERS + "step_load.StepLoadScenarioRunner"
+                "._get_step_runner")
+    def test__run_step_failed(self, mock_get_step_runner):
+        step_runner = mock_get_step_runner.return_value
+        step_runner._run_scenario.side_effect = ValueError("foo")
+        step_runner.get_results.side_effect = [None]
+        runner = step_load.StepLoadScenarioRunner(self.task, self.config)
+
+        self.assertFalse(runner._run_step(3, "cls", "method", {}, {}))
+
+        step_runner.finish_results.assert_called_once_with()
+        self.assertEqual({"level": 3, "iterations": 0, "success": False,
+                          "error": "ValueError: foo"},
+                         dict((k, v) for k, v in runner.steps[0].items()
+                              if k != "sla"))
+
+    @mock.patch(RUNNERS + "step_load.StepLoadScenarioRunner"
+                "._get_step_runner")
+    def test__run_step_no_iterations(self, mock_get_step_runner):
+        step_runner = mock_get_step_runner.return_value
+        step_runner.get_results.side_effect = [[], None]
+        runner = step_load.StepLoadScenarioRunner(self.task, self.config)
+
+        self.assertFalse(runner._run_step(3, "cls", "method", {}, {}))
+        self.assertEqual(0, runner.steps[0]["iterations"])
+
+    @mock.patch(RUNNERS + "step_load.StepLoadScenarioRunner._run_step")
+    def test__run_scenario(self, mock_run_step):
+        runner = step_load.StepLoadScenarioRunner(self.task, self.config)
+
+        def run_step(level, *args):
+            runner.steps.append({"level": level, "success": level < 3})
+            return level < 3
+
+        mock_run_step.side_effect = run_step
+
+        runner._run_scenario("cls", "method", self.context, {})
+
+        self.assertEqual(
+            [mock.call(1, "cls", "method", self.context, {}),
+             mock.call(3, "cls", "method", self.context, {})],
+            mock_run_step.mock_calls)
+        self.assertEqual({"load": "concurrency", "max_passed_level": 1,
+                          "steps": runner.steps}, runner.summary())
+
+    def test__run_scenario_dummy(self):
+        runner = step_load.StepLoadScenarioRunner(self.task, self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context, {})
+
+        self.assertEqual([1, 3, 5], [s["level"] for s in runner.steps])
+        self.assertEqual(5, runner.summary()["max_passed_level"])
+        self.assertEqual(sum(s["iterations"] for s in runner.steps),
+                         len(runner.result_queue))
+        for result in runner.result_queue:
+            self.assertIsNotNone(base.ScenarioRunnerResult(result))
+
+    @mock.patch(RUNNERS + "base.ScenarioRunnerResult.validate")
+    def test__run_scenario_validates_results_once(self, mock_validate):
+        runner = step_load.StepLoadScenarioRunner(self.task, self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context, {})
+
+        self.assertEqual(len(runner.result_queue), mock_validate.call_count)
+
+    def test__run_scenario_aborted(self):
+        runner = step_load.StepLoadScenarioRunner(self.task, self.config)
+
+        runner.abort()
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context, {})
+
+        self.assertEqual([], runner.steps)
+        self.assertEqual({"load": "concurrency", "max_passed_level": None,
+                          "steps": []}, runner.summary())
@@ -16,19 +16,41 @@
 import mock
 
 from rally.benchmark.scenarios.authenticate import authenticate
-from tests.unit import fakes
+from rally import objects
+from rally import osclients
 from tests.unit import test
 
 
-class AuthenticateTestCase(test.TestCase):
+AUTHENTICATE = "rally.benchmark.scenarios.authenticate.authenticate"
+
 
-    @mock.patch("rally.osclients")
-    def test_keystone(self, mock_osclients):
-        fc = fakes.FakeClients()
-        mock_osclients.Clients.return_value = fc
+class AuthenticateTestCase(test.TestCase):
 
-        scenario = authenticate.Authenticate(admin_clients=mock_osclients,
-                                             clients=mock_osclients)
+    @mock.patch(AUTHENTICATE + ".osclients.Clients")
+    def test_keystone(self, mock_clients):
+        clients = mock.MagicMock()
+        scenario = authenticate.Authenticate(admin_clients=mock.MagicMock(),
+                                             clients=clients)
 
         scenario.keystone()
-        self.assertEqual(scenario._clients.keystone.call_count, 1)
+        mock_clients.assert_called_once_with(clients.endpoint, pooled=False)
+        mock_clients.return_value.keystone.assert_called_once_with()
+
+    @mock.patch("rally.osclients.create_keystone_client")
+    def test_keystone_authenticates_each_iteration(
+            self, mock_create_keystone_client):
+        osclients.clear_cache()
+        self.addCleanup(osclients.clear_cache)
+        keystone = mock_create_keystone_client.return_value
+        keystone.auth_ref.will_expire_soon.return_value = False
+        endpoint = objects.Endpoint("http://auth_url", "user", "pass",
+                                    "tenant")
+
+        for i in range(2):
+            # Like the runners do for each iteration
+            clients = osclients.Clients(endpoint)
+            scenario = authenticate.Authenticate(clients=clients)
+            scenario.keystone()
+            clients.release()
+
+        self.assertEqual(2, mock_create_keystone_client.call_count)
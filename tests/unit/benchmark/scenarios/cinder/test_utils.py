@@ -77,6 +77,59 @@ class CinderScenarioTestCase(test.TestCase):
         self._test_atomic_action_timer(self.scenario.atomic_actions(),
                                        "cinder.create_volume")
 
+    @mock.patch(CINDER_UTILS + ".osclients.Clients")
+    @mock.patch(CINDER_UTILS + ".CinderScenario.clients")
+    def test__create_volumes(self, mock_clients, mock_osclients):
+        CONF = cfg.CONF
+        self.scenario._clients = mock.Mock(endpoint="foo_endpoint")
+        mock_create = mock_osclients.return_value.cinder().volumes.create
+        mock_create.side_effect = [mock.Mock(_info={"id": i})
+                                   for i in range(3)]
+        manager = mock_clients("cinder").volumes
+        manager.resource_class.side_effect = (
+            lambda manager, info, loaded: dict(info, loaded=loaded))
+        mock_wait_for_all = self.useFixture(mockpatch.Patch(
+            CINDER_UTILS + ".bench_utils.wait_for_all")).mock
+        get_all_fm = self.useFixture(mockpatch.Patch(
+            BM_UTILS + ".get_all_from_manager")).mock
+
+        return_volumes = self.scenario._create_volumes(
+            1, 3, workers=2, name_prefix="foo_", volume_type="bar")
+
+        self.assertEqual(3, mock_create.call_count)
+        for call in mock_create.call_args_list:
+            self.assertEqual((1,), call[0])
+            self.assertEqual("bar", call[1]["volume_type"])
+            self.assertTrue(call[1]["display_name"].startswith("foo_"))
+        self.assertEqual(3, len(set(call[1]["display_name"]
+                                    for call in mock_create.call_args_list)))
+        self.assertIn(mock_osclients.call_count, (1, 2))
+        mock_osclients.assert_called_with("foo_endpoint")
+        self.assertEqual(mock_osclients.call_count,
+                         mock_osclients.return_value.release.call_count)
+        mock_wait_for_all.assert_called_once_with(
+            [{"id": i, "loaded": True} for i in range(3)],
+            is_ready=self.res_is.mock(),
+            update_resources=get_all_fm(),
+            timeout=CONF.benchmark.cinder_volume_create_timeout,
+            check_interval=CONF.benchmark.cinder_volume_create_poll_interval
+        )
+        self.assertEqual(mock_wait_for_all.return_value, return_volumes)
+        self._test_atomic_action_timer(self.scenario.atomic_actions(),
+                                       "cinder.create_volumes")
+
+    @mock.patch(CINDER_UTILS + ".osclients.Clients")
+    @mock.patch(CINDER_UTILS + ".CinderScenario.clients")
+    def test__create_volumes_fails(self, mock_clients, mock_osclients):
+        self.scenario._clients = mock.Mock(endpoint="foo_endpoint")
+        mock_osclients.return_value.cinder().volumes.create.side_effect = [
+            mock.Mock(), RuntimeError("foo")]
+        mock_wait_for_all = self.useFixture(mockpatch.Patch(
+            CINDER_UTILS + ".bench_utils.wait_for_all")).mock
+        self.assertRaises(RuntimeError, self.scenario._create_volumes, 1, 2)
+        self.assertFalse(mock_wait_for_all.called)
+        mock_osclients.return_value.release.assert_called_once_with()
+
     def test__delete_volume(self):
         cinder = mock.Mock()
         self.scenario._delete_volume(cinder)
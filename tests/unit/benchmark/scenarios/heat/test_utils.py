@@ -164,6 +164,8 @@ class HeatScenarioNegativeTestCase(test.TestCase):
         mock_bench.heat_stack_create_prepoll_delay = 2
         mock_bench.heat_stack_create_timeout = 1
         mock_bench.benchmark.heat_stack_create_poll_interval = 1
+        mock_bench.poll_batch_status = False
+        mock_bench.poll_rate_limit = 0
 
         mock_clients("heat").stacks.create.return_value = {
             "stack": {"id": "test_id"}
@@ -187,6 +189,8 @@ class HeatScenarioNegativeTestCase(test.TestCase):
         mock_bench.heat_stack_update_prepoll_delay = 2
         mock_bench.heat_stack_update_timeout = 1
         mock_bench.benchmark.heat_stack_update_poll_interval = 1
+        mock_bench.poll_batch_status = False
+        mock_bench.poll_rate_limit = 0
 
         stack = mock.Mock()
         resource = mock.Mock()
@@ -408,22 +408,17 @@ class NovaScenarioTestCase(test.TestCase):
         mock_clients("nova").servers.list.return_value = [self.server,
                                                           self.server1]
         nova_scenario = utils.NovaScenario()
-        nova_scenario._boot_servers("prefix", "image", "flavor", 2)
-        expected = [
-            mock.call(
-                self.server, is_ready=self.res_is.mock(),
-                update_resource=self.gfm(),
-                check_interval=CONF.benchmark.nova_server_boot_poll_interval,
-                timeout=CONF.benchmark.nova_server_boot_timeout
-            ),
-            mock.call(
-                self.server1, is_ready=self.res_is.mock(),
-                update_resource=self.gfm(),
-                check_interval=CONF.benchmark.nova_server_boot_poll_interval,
-                timeout=CONF.benchmark.nova_server_boot_timeout
-            )
-        ]
-        self.assertEqual(expected, self.wait_for.mock.mock_calls)
+        mock_wait_for_all = self.useFixture(mockpatch.Patch(
+            NOVA_UTILS + ".bench_utils.wait_for_all")).mock
+        get_all_fm = self.useFixture(mockpatch.Patch(
+            BM_UTILS + ".get_all_from_manager")).mock
+        servers = nova_scenario._boot_servers("prefix", "image", "flavor", 2)
+        self.assertEqual(mock_wait_for_all.return_value, servers)
+        mock_wait_for_all.assert_called_once_with(
+            [self.server, self.server1], is_ready=self.res_is.mock(),
+            update_resources=get_all_fm(),
+            check_interval=CONF.benchmark.nova_server_boot_poll_interval,
+            timeout=CONF.benchmark.nova_server_boot_timeout)
         self.res_is.mock.assert_has_calls([mock.call("ACTIVE")])
         self._test_atomic_action_timer(nova_scenario.atomic_actions(),
                                        "nova.boot_servers")
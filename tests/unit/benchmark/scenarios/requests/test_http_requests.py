@@ -10,7 +10,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-
 import mock
 
 from rally.benchmark.scenarios.requests import http_requests
@@ -21,11 +20,38 @@ SCN = "rally.benchmark.scenarios"
 
 class RequestsTestCase(test.TestCase):
 
-    @mock.patch("%s.requests.http_requests.requests" % SCN)
-    def test_check_response(self, mock_requests):
-        mock_requests.head(mock.MagicMock()).status_code = 200
+    @mock.patch("%s.requests.utils.RequestScenario._check_request" % SCN)
+    def test_check_response(self, mock__check_request):
+        Requests = http_requests.Requests()
+        Requests.check_response(url="sample_url", response=302)
+        mock__check_request.assert_called_once_with(
+            "sample_url", method="HEAD", status_code=302, keep_alive=False)
+
+    @mock.patch("%s.requests.utils.RequestScenario._check_request" % SCN)
+    def test_check_request(self, mock__check_request):
         Requests = http_requests.Requests()
+        Requests.check_request(url="sample_url", method="POST",
+                               status_code=201, data="foo")
+        mock__check_request.assert_called_once_with(
+            "sample_url", method="POST", status_code=201, keep_alive=True,
+            data="foo")
+
+    @mock.patch("%s.requests.utils.choose_weighted" % SCN)
+    @mock.patch("%s.requests.utils.RequestScenario._check_request" % SCN)
+    def test_check_random_request(self, mock__check_request,
+                                  mock_choose_weighted):
+        requests = [{"url": "a", "weight": 2}, {"url": "b", "method": "PUT",
+                                                "status_code": 204}]
+        mock_choose_weighted.return_value = requests[0]
+        Requests = http_requests.Requests()
+
+        Requests.check_random_request(requests, keep_alive=False)
+        mock__check_request.assert_called_once_with(
+            url="a", status_code=200, keep_alive=False)
+        self.assertEqual({"url": "a", "weight": 2}, requests[0])
 
-        self.assertRaises(http_requests.WrongStatusException,
-                          Requests.check_response, url="sample_url",
-                          response=302)
+        mock_choose_weighted.return_value = requests[1]
+        Requests.check_random_request(requests)
+        mock__check_request.assert_called_with(
+            url="b", method="PUT", status_code=204, keep_alive=True)
+        mock_choose_weighted.assert_called_with(requests)
@@ -0,0 +1,133 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from rally.benchmark.scenarios.requests import utils
+from tests.unit import test
+
+UTILS = "rally.benchmark.scenarios.requests.utils."
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class RequestsUtilsTestCase(test.TestCase):
+
+    @mock.patch(UTILS + "random.uniform")
+    def test_choose_weighted(self, mock_uniform):
+        items = [{"url": "a", "weight": 3}, {"url": "b"}, {"url": "c"}]
+        for point, expected in ((0, "a"), (2.9, "a"), (3, "b"),
+                                (4.5, "c"), (5, "c")):
+            mock_uniform.return_value = point
+            self.assertEqual(expected, utils.choose_weighted(items)["url"])
+        mock_uniform.assert_called_with(0, 5)
+
+    @mock.patch(UTILS + "os.getpid", return_value=1)
+    def test__sessions_pool(self, mock_getpid):
+        pool = utils._SessionsPool()
+        session = pool.acquire()
+        pool.release(session)
+        self.assertIs(session, pool.acquire())
+        pool.release(session)
+
+        # sessions of the parent process are not used after fork
+        mock_getpid.return_value = 2
+        self.assertIsNot(session, pool.acquire())
+
+    def test__check_request_timings(self):
+        server = _Server(("127.0.0.1", 0), _Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = "http://127.0.0.1:%d/" % server.server_address[1]
+        mock.patch(UTILS + "_sessions", utils._SessionsPool()).start()
+
+        scenario = utils.RequestScenario()
+        self.assertEqual(b"ok", scenario._check_request(url).content)
+        first = dict(scenario.atomic_actions())
+        self.assertEqual(["requests.connect", "requests.first_byte",
+                          "requests.total"], sorted(first))
+        self.assertGreater(first["requests.connect"], 0)
+        self.assertGreaterEqual(first["requests.total"],
+                                first["requests.first_byte"])
+        self.assertGreaterEqual(first["requests.first_byte"],
+                                first["requests.connect"])
+
+        # the connection is kept alive
+        scenario._check_request(url)
+        self.assertEqual(0, scenario.atomic_actions()["requests.connect"])
+
+        scenario._check_request(url, keep_alive=False)
+        self.assertGreater(scenario.atomic_actions()["requests.connect"], 0)
+
+    @mock.patch(UTILS + "_sessions")
+    def test__check_request(self, mock__sessions):
+        session = mock__sessions.acquire.return_value
+        session.request.return_value.status_code = 201
+        scenario = utils.RequestScenario()
+
+        resp = scenario._check_request("http://foo", method="POST",
+                                       status_code=201, data="bar")
+
+        self.assertEqual(session.request.return_value, resp)
+        session.request.assert_called_once_with(
+            "POST", "http://foo", stream=True, data="bar",
+            allow_redirects=True)
+        mock__sessions.release.assert_called_once_with(session)
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "requests.total")
+
+    @mock.patch(UTILS + "_new_session")
+    def test__check_request_no_keep_alive(self, mock__new_session):
+        session = mock__new_session.return_value
+        session.request.return_value.status_code = 200
+        scenario = utils.RequestScenario()
+
+        scenario._check_request("http://foo", method="HEAD", keep_alive=False,
+                                headers={"X-Foo": "foo"})
+
+        session.request.assert_called_once_with(
+            "HEAD", "http://foo", stream=True, allow_redirects=False,
+            headers={"X-Foo": "foo", "Connection": "close"})
+        session.close.assert_called_once_with()
+
+    @mock.patch(UTILS + "_sessions")
+    def test__check_request_wrong_status(self, mock__sessions):
+        session = mock__sessions.acquire.return_value
+        session.request.return_value.status_code = 500
+        scenario = utils.RequestScenario()
+
+        self.assertRaises(utils.WrongStatusException,
+                          scenario._check_request, "http://foo",
+                          status_code=200)
+        mock__sessions.release.assert_called_once_with(session)
@@ -16,99 +16,58 @@
 import mock
 
 from rally.benchmark.scenarios.authenticate import authenticate
-from rally.benchmark.scenarios import base
-from tests.unit import fakes
 from tests.unit import test
 
 
-class AuthenticateTestCase(test.TestCase):
+AUTHENTICATE = "rally.benchmark.scenarios.authenticate.authenticate"
+
 
-    @mock.patch("rally.osclients")
-    def test_keystone(self, mock_osclients):
-        fc = fakes.FakeClients()
-        mock_osclients.Clients.return_value = fc
+@mock.patch(AUTHENTICATE + ".osclients.Clients")
+class AuthenticateTestCase(test.TestCase):
 
-        scenario = authenticate.Authenticate(admin_clients=mock_osclients,
-                                             clients=mock_osclients)
+    def _get_client(self, mock_clients, name):
+        clients = mock.MagicMock()
+        scenario = authenticate.Authenticate(admin_clients=mock.MagicMock(),
+                                             clients=clients)
+        client = getattr(mock_clients.return_value, name).return_value
+        return scenario, clients, client
 
+    def test_keystone(self, mock_clients):
+        scenario, clients, keystone = self._get_client(mock_clients,
+                                                       "keystone")
         scenario.keystone()
-        self.assertEqual(scenario._clients.keystone.call_count, 1)
+        mock_clients.assert_called_once_with(clients.endpoint, pooled=False)
+        mock_clients.return_value.keystone.assert_called_once_with()
+        self.assertFalse(clients.keystone.called)
 
-    @mock.patch("rally.osclients")
-    @mock.patch("rally.osclients")
-    def test_validate_glance(self, mock_admin_clients, mock_users_clients):
-        images_list = [mock.Mock(), mock.Mock()]
-        fc = fakes.FakeClients()
-        mock_admin_clients.Clients.return_value = fc
-        mock_users_clients.Clients.return_value = fc
-        scenario = authenticate.Authenticate(admin_clients=mock_admin_clients,
-                                             clients=mock_users_clients)
-        scenario._clients.glance.images.list = mock.MagicMock(
-                                                return_value=images_list)
-        image_name = "__intentionally_non_existent_image___"
-        with base.AtomicAction(scenario, "authenticate.validate_glance"):
-            scenario.validate_glance(5)
-        scenario._clients.glance().images.list.assert_called_with(
-                name=image_name)
-        self.assertEqual(scenario._clients.glance().images.list.call_count, 5)
+    def test_validate_glance(self, mock_clients):
+        scenario, clients, glance = self._get_client(mock_clients, "glance")
+        glance.images.list.return_value = [mock.Mock(), mock.Mock()]
+        scenario.validate_glance(5)
+        mock_clients.assert_called_once_with(clients.endpoint, pooled=False)
+        glance.images.list.assert_called_with(
+            name="__intentionally_non_existent_image___")
+        self.assertEqual(5, glance.images.list.call_count)
 
-    @mock.patch("rally.osclients")
-    @mock.patch("rally.osclients")
-    def test_validate_nova(self, mock_admin_clients, mock_users_clients):
-        flavors_list = [mock.Mock(), mock.Mock()]
-        fc = fakes.FakeClients()
-        mock_admin_clients.clients.return_value = fc
-        mock_users_clients.clients.return_value = fc
-        scenario = authenticate.Authenticate(admin_clients=mock_admin_clients,
-                                             clients=mock_users_clients)
-        scenario._clients.nova.flavors.list = mock.MagicMock(
-                                                return_value=flavors_list)
-        with base.AtomicAction(scenario, "authenticate.validate_nova"):
-            scenario.validate_nova(5)
-        self.assertEqual(scenario._clients.nova().flavors.list.call_count, 5)
+    def test_validate_nova(self, mock_clients):
+        scenario, clients, nova = self._get_client(mock_clients, "nova")
+        scenario.validate_nova(5)
+        self.assertEqual(5, nova.flavors.list.call_count)
 
-    @mock.patch("rally.osclients")
-    @mock.patch("rally.osclients")
-    def test_validate_cinder(self, mock_admin_clients, mock_users_clients):
-        volume_types_list = [mock.Mock(), mock.Mock()]
-        fc = fakes.FakeClients()
-        mock_admin_clients.clients.return_value = fc
-        mock_users_clients.clients.return_value = fc
-        scenario = authenticate.Authenticate(admin_clients=mock_admin_clients,
-                                             clients=mock_users_clients)
-        scenario._clients.cinder.volume_types.list = mock.MagicMock(
-                                                return_value=volume_types_list)
-        with base.AtomicAction(scenario, "authenticate.validate_cinder"):
-            scenario.validate_cinder(5)
-        self.assertEqual(scenario._clients.cinder().volume_types.
-                         list.call_count, 5)
+    def test_validate_cinder(self, mock_clients):
+        scenario, clients, cinder = self._get_client(mock_clients, "cinder")
+        scenario.validate_cinder(5)
+        self.assertEqual(5, cinder.volume_types.list.call_count)
 
-    @mock.patch("rally.osclients")
-    @mock.patch("rally.osclients")
-    def test_validate_neutron(self, mock_admin_clients, mock_users_clients):
-        fc = fakes.FakeClients()
-        mock_admin_clients.clients.return_value = fc
-        mock_users_clients.clients.return_value = fc
-        scenario = authenticate.Authenticate(admin_clients=mock_admin_clients,
-                                             clients=mock_users_clients)
-        scenario._clients.neutron.get_auth_info = mock.MagicMock()
-        with base.AtomicAction(scenario, "authenticate.validate_neutron"):
-            scenario.validate_neutron(5)
-        self.assertEqual(scenario._clients.neutron().get_auth_info.call_count,
-                         5)
+    def test_validate_neutron(self, mock_clients):
+        scenario, clients, neutron = self._get_client(mock_clients,
+                                                      "neutron")
+        scenario.validate_neutron(5)
+        self.assertEqual(5, neutron.get_auth_info.call_count)
 
-    @mock.patch("rally.osclients")
-    @mock.patch("rally.osclients")
-    def test_validate_heat(self, mock_admin_clients, mock_users_clients):
-        stacks_list = [mock.Mock(), mock.Mock()]
-        fc = fakes.FakeClients()
-        mock_admin_clients.clients.return_value = fc
-        mock_users_clients.clients.return_value = fc
-        scenario = authenticate.Authenticate(admin_clients=mock_admin_clients,
-                                             clients=mock_users_clients)
-        scenario._clients.heat.stacks.list = mock.MagicMock(
-                                                return_value=stacks_list)
-        with base.AtomicAction(scenario, "authenticate.validate_heat"):
-            scenario.validate_heat(5)
-        scenario._clients.heat().stacks.list.assert_called_with(limit=0)
-        self.assertEqual(scenario._clients.heat().stacks.list.call_count, 5)
+    def test_validate_heat(self, mock_clients):
+        scenario, clients, heat = self._get_client(mock_clients, "heat")
+        heat.stacks.list.return_value = [mock.Mock(), mock.Mock()]
+        scenario.validate_heat(5)
+        heat.stacks.list.assert_called_with(limit=0)
+        self.assertEqual(5, heat.stacks.list.call_count)
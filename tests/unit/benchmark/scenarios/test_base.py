@@ -28,6 +28,23 @@ from tests.unit import fakes
 from tests.unit import test
 
 
+# Scenario classes defined in tests are listed by list_benchmark_scenarios()
+# until they are garbage collected, so scenarios used by tests are defined
+# here to be always found by Scenario.get_by_name().
+class FakeListScenario(fakes.FakeScenario):
+
+    @base.scenario()
+    def do_b(self):
+        pass
+
+    @base.scenario(context={"users": {}})
+    def do_a(self):
+        pass
+
+    def not_scenario(self):
+        pass
+
+
 class ScenarioTestCase(test.TestCase):
 
     def test_get_by_name(self):
@@ -201,6 +218,14 @@ class ScenarioTestCase(test.TestCase):
                                        default=empty_list),
                          empty_list)
 
+    def test_meta_returns_copy(self):
+        context = base.Scenario.meta(FakeListScenario, "context", "do_a")
+        context["foo"] = "bar"
+        self.assertEqual({"users": {}}, FakeListScenario.do_a.context)
+        self.assertIs(FakeListScenario.do_a.context,
+                      base.Scenario._get_meta(FakeListScenario, "context",
+                                              "do_a"))
+
     def test_is_scenario_success(self):
         scenario = dummy.Dummy()
         self.assertTrue(base.Scenario.is_scenario(scenario, "dummy"))
@@ -266,6 +291,23 @@ class ScenarioTestCase(test.TestCase):
         self.assertEqual(clients.nova(), scenario.admin_clients("nova"))
         self.assertEqual(clients.glance(), scenario.admin_clients("glance"))
 
+    def test_list_benchmark_scenarios(self):
+        self.assertEqual(["FakeListScenario.do_a", "FakeListScenario.do_b"],
+                         FakeListScenario.list_benchmark_scenarios())
+
+    @mock.patch("rally.benchmark.scenarios.base.Scenario.is_scenario",
+                wraps=base.Scenario.is_scenario)
+    def test__get_scenario_methods_cached(self, mock_is_scenario):
+        base._scenario_methods.pop(FakeListScenario, None)
+
+        methods = base.Scenario._get_scenario_methods(FakeListScenario)
+        self.assertEqual(("do_a", "do_b"), methods)
+        self.assertTrue(mock_is_scenario.called)
+        calls_count = mock_is_scenario.call_count
+        self.assertIs(methods,
+                      base.Scenario._get_scenario_methods(FakeListScenario))
+        self.assertEqual(calls_count, mock_is_scenario.call_count)
+
     def test_scenario_context_are_valid(self):
         scenarios = base.Scenario.list_benchmark_scenarios()
 
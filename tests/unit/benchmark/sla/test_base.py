@@ -15,6 +15,7 @@
 
 
 import jsonschema
+import mock
 
 from rally.benchmark.sla import base
 from tests.unit import test
@@ -66,6 +67,11 @@ class BaseSLATestCase(test.TestCase):
         cnf = {"test_criterion": 42}
         base.SLA.validate(cnf)
 
+    @mock.patch("rally.benchmark.sla.base.discover.load_all")
+    def test_validate_loads_plugins(self, mock_load_all):
+        base.SLA.validate({"test_criterion": 42})
+        mock_load_all.assert_called_once_with()
+
     def test_validate_invalid_name(self):
         self.assertRaises(jsonschema.ValidationError,
                           base.SLA.validate, {"nonexistent": 42})
@@ -228,3 +234,129 @@ class MaxAverageDurationTestCase(test.TestCase):
         self.assertTrue(sla.add_iteration({"duration": 5.0}))   # avg = 3.667
         self.assertFalse(sla.add_iteration({"duration": 7.0}))  # avg = 4.5
         self.assertTrue(sla.add_iteration({"duration": 1.0}))   # avg = 3.8
+
+
+class PercentileDurationTestCase(test.TestCase):
+    def test_config_schema(self):
+        base.PercentileDuration.validate(
+            {"max_percentile_duration": {"percentile": 95, "max": 10}})
+        base.PercentileDuration.validate(
+            {"max_percentile_duration": [
+                {"percentile": 95, "max": 10},
+                {"percentile": 99, "max": 30, "action": "nova.boot_server",
+                 "min_iterations": 100}]})
+        for properties in ({"percentile": 95},
+                           {"percentile": 101, "max": 10},
+                           {"percentile": 95, "max": 0},
+                           {"percentile": 95, "max": 10, "foo": "bar"},
+                           []):
+            self.assertRaises(jsonschema.ValidationError,
+                              base.PercentileDuration.validate,
+                              {"max_percentile_duration": properties})
+
+    def test_result(self):
+        sla1 = base.PercentileDuration({"percentile": 90, "max": 42,
+                                        "min_iterations": 1})
+        sla2 = base.PercentileDuration({"percentile": 90, "max": 3.62,
+                                        "min_iterations": 1})
+        for sla in [sla1, sla2]:
+            sla.add_iteration({"duration": 3.14})
+            sla.add_iteration({"duration": 6.28})
+        self.assertTrue(sla1.result()["success"])
+        self.assertFalse(sla2.result()["success"])
+        self.assertEqual("Passed", sla1.status())
+        self.assertEqual("Failed", sla2.status())
+
+    def test_result_no_iterations(self):
+        sla = base.PercentileDuration({"percentile": 95, "max": 10})
+        self.assertTrue(sla.result()["success"])
+        self.assertIn("not checked", sla.result()["detail"])
+
+    def test_add_iteration_min_iterations(self):
+        sla = base.PercentileDuration({"percentile": 50, "max": 1.0,
+                                       "min_iterations": 3})
+        self.assertTrue(sla.add_iteration({"duration": 5.0}))
+        self.assertTrue(sla.add_iteration({"duration": 5.0}))
+        self.assertFalse(sla.add_iteration({"duration": 0.5}))
+        self.assertFalse(sla.add_iteration({"duration": 0.5}))
+        self.assertTrue(sla.add_iteration({"duration": 0.5}))
+
+    @mock.patch("rally.benchmark.sla.base.sketch.QuantileSketch.quantile",
+                return_value=0.5)
+    def test_add_iteration_checks_periodically(self, mock_quantile):
+        sla = base.PercentileDuration({"percentile": 50, "max": 1.0})
+        for i in range(1000):
+            self.assertTrue(sla.add_iteration({"duration": 0.5}))
+        # On 10, 11, ..., 20, 22, ..., 94, 103, 113, ..., 972 durations
+        self.assertEqual(54, mock_quantile.call_count)
+
+        self.assertTrue(sla.result()["success"])
+        self.assertEqual(55, mock_quantile.call_count)
+        self.assertTrue(sla.result()["success"])
+        self.assertEqual(55, mock_quantile.call_count)
+
+        mock_quantile.return_value = 2.0
+        self.assertTrue(sla.add_iteration({"duration": 2.0}))
+        self.assertFalse(sla.result()["success"])
+        self.assertEqual(56, mock_quantile.call_count)
+
+    def test_add_iteration_errors(self):
+        sla = base.PercentileDuration({"percentile": 100, "max": 1.0,
+                                       "min_iterations": 1})
+        self.assertTrue(sla.add_iteration({"duration": 5.0,
+                                           "error": ["E", "msg", "tb"]}))
+        self.assertFalse(sla.add_iteration({"duration": 5.0, "error": []}))
+
+    def test_add_iteration_action(self):
+        sla = base.PercentileDuration([
+            {"percentile": 99, "max": 2.0, "action": "a",
+             "min_iterations": 1},
+            {"percentile": 99, "max": 10.0, "min_iterations": 1}])
+        self.assertTrue(sla.add_iteration(
+            {"duration": 5.0, "atomic_actions": {"a": 1.0, "b": 4.0}}))
+        self.assertTrue(sla.add_iteration(
+            {"duration": 5.0, "atomic_actions": {"a": None}}))
+        self.assertTrue(sla.add_iteration({"duration": 5.0}))
+        self.assertFalse(sla.add_iteration(
+            {"duration": 5.0, "atomic_actions": {"a": 3.0}}))
+        self.assertIn("a duration", sla.result()["detail"])
+
+
+class OutliersTestCase(test.TestCase):
+    def test_config_schema(self):
+        base.Outliers.validate({"outliers": {"max": 0, "sigmas": 2.5,
+                                             "min_iterations": 10}})
+        for properties in ({"max": -1}, {"sigmas": 0},
+                           {"min_iterations": 2}, {"foo": 1}):
+            self.assertRaises(jsonschema.ValidationError,
+                              base.Outliers.validate,
+                              {"outliers": properties})
+
+    def test_result(self):
+        sla1 = base.Outliers({"max": 1})
+        sla2 = base.Outliers({})
+        for sla in [sla1, sla2]:
+            for duration in [1.0, 1.1, 0.9, 1.0, 10.0]:
+                sla.add_iteration({"duration": duration})
+        self.assertTrue(sla1.result()["success"])
+        self.assertFalse(sla2.result()["success"])
+        self.assertEqual("Passed", sla1.status())
+        self.assertEqual("Failed", sla2.status())
+        self.assertEqual(1, sla2.outliers)
+
+    def test_result_no_iterations(self):
+        sla = base.Outliers({})
+        self.assertTrue(sla.result()["success"])
+
+    def test_add_iteration(self):
+        sla = base.Outliers({"min_iterations": 3})
+        # Not enough iterations to detect outliers yet
+        self.assertTrue(sla.add_iteration({"duration": 1.0}))
+        self.assertTrue(sla.add_iteration({"duration": 2.0}))
+        self.assertTrue(sla.add_iteration({"duration": 100.0}))
+        self.assertTrue(sla.add_iteration({"duration": 50.0}))
+        # Failed iterations are ignored
+        self.assertTrue(sla.add_iteration({"duration": 1000.0,
+                                           "error": ["E", "msg", "tb"]}))
+        self.assertFalse(sla.add_iteration({"duration": 1000.0}))
+        self.assertEqual(1, sla.outliers)
@@ -17,17 +17,31 @@
 
 import collections
 import copy
+import threading
+import time
 
 import jsonschema
 import mock
+from oslo_config import fixture as config_fixture
 
 from rally.benchmark import engine
+from rally.benchmark.processing import sketch
+from rally.benchmark.processing import table
+from rally.common import costilius
 from rally import consts
 from rally import exceptions
 from tests.unit import fakes
 from tests.unit import test
 
 
+class PerSecondSeriesTestCase(test.TestCase):
+
+    def test__per_second_series(self):
+        self.assertEqual([], engine._per_second_series({}))
+        self.assertEqual([[0, 2], [1, 0], [2, 5]],
+                         engine._per_second_series({10: 2, 12: 5}))
+
+
 class BenchmarkEngineTestCase(test.TestCase):
 
     def test_init(self):
@@ -178,6 +192,17 @@ class BenchmarkEngineTestCase(test.TestCase):
                           eng._validate_config_semantic_helper, "a", "u", "n",
                           "p", mock.MagicMock(), {})
 
+    @mock.patch("rally.benchmark.engine.osclients.Clients")
+    def test__check_cloud(self, mock_osclients):
+        mock_osclients.return_value.verified_keystone.side_effect = (
+            exceptions.InvalidEndpointsException)
+        eng = engine.BenchmarkEngine(mock.MagicMock(), mock.MagicMock())
+        eng.admin = "admin"
+        self.assertRaises(exceptions.InvalidEndpointsException,
+                          eng._check_cloud)
+        mock_osclients.assert_called_once_with("admin")
+        mock_osclients.return_value.release.assert_called_once_with()
+
     @mock.patch("rally.benchmark.engine.osclients.Clients")
     @mock.patch("rally.benchmark.engine.users_ctx")
     @mock.patch("rally.benchmark.engine.BenchmarkEngine"
@@ -188,7 +213,8 @@ class BenchmarkEngineTestCase(test.TestCase):
                                        mock_helper, mock_userctx,
                                        mock_osclients):
         mock_userctx.UserGenerator = fakes.FakeUserContext
-        mock_osclients.return_value = mock.MagicMock()
+        self.useFixture(config_fixture.Config()).config(
+            semantic_validation_workers=1, group="benchmark")
         config = {
             "a": [mock.MagicMock(), mock.MagicMock()],
             "b": [mock.MagicMock()]
@@ -203,9 +229,10 @@ class BenchmarkEngineTestCase(test.TestCase):
 
         expected_calls = [
             mock.call("admin"),
-            mock.call(fakes.FakeUserContext.user["endpoint"])
+            mock.call(fakes.FakeUserContext.user["endpoint"], pooled=False)
         ]
         mock_osclients.assert_has_calls(expected_calls)
+        self.assertEqual(3, mock_osclients.return_value.release.call_count)
 
         mock_deployment_get.assert_called_once_with(fake_task["uuid"])
 
@@ -218,6 +245,85 @@ class BenchmarkEngineTestCase(test.TestCase):
         ]
         mock_helper.assert_has_calls(expected_calls, any_order=True)
 
+    @mock.patch("rally.benchmark.engine.osclients.Clients")
+    @mock.patch("rally.benchmark.engine.users_ctx")
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine"
+                "._validate_config_semantic_helper")
+    @mock.patch("rally.benchmark.engine.objects.Deployment.get")
+    def test__validate_config_semantic_clients_per_worker(
+            self, mock_deployment_get, mock_helper, mock_userctx,
+            mock_osclients):
+        mock_userctx.UserGenerator = fakes.FakeUserContext
+        mock_osclients.side_effect = lambda *args, **kw: mock.MagicMock()
+        used_clients = collections.defaultdict(set)
+
+        def helper(admin, user, *args):
+            used_clients[threading.current_thread()].add((admin, user))
+            time.sleep(0.01)
+
+        mock_helper.side_effect = helper
+        self.useFixture(config_fixture.Config()).config(
+            semantic_validation_workers=3, group="benchmark")
+        config = {"a": [{}] * 10}
+        eng = engine.BenchmarkEngine(config, mock.MagicMock())
+
+        eng._validate_config_semantic(config)
+
+        self.assertEqual(10, mock_helper.call_count)
+        all_clients = set()
+        for clients in used_clients.values():
+            self.assertEqual(1, len(clients))
+            admin, user = clients.pop()
+            self.assertNotIn(admin, all_clients)
+            all_clients.update([admin, user])
+            admin.release.assert_called_once_with()
+            user.release.assert_called_once_with()
+
+    @mock.patch("rally.benchmark.engine.osclients.Clients")
+    @mock.patch("rally.benchmark.engine.users_ctx")
+    @mock.patch("rally.benchmark.engine.base_scenario.Scenario.validate")
+    @mock.patch("rally.benchmark.engine.objects.Deployment.get")
+    def test__validate_config_semantic_reports_all_failures(
+            self, mock_deployment_get, mock_validate, mock_userctx,
+            mock_osclients):
+        mock_userctx.UserGenerator = fakes.FakeUserContext
+
+        def validate(name, kwargs, **kw):
+            if kwargs.get("args") == "bad":
+                raise exceptions.InvalidScenarioArgument("bad args")
+
+        mock_validate.side_effect = validate
+        config = {
+            "a": [{"args": "bad"}, {"args": "good"}],
+            "b": [{"args": "bad"}]
+        }
+        eng = engine.BenchmarkEngine(config, mock.MagicMock())
+
+        e = self.assertRaises(exceptions.InvalidBenchmarksConfig,
+                              eng._validate_config_semantic, config)
+        self.assertEqual(2, e.kwargs["count"])
+        self.assertIn("a[0]: Invalid scenario argument: 'bad args'",
+                      e.kwargs["reasons"])
+        self.assertIn("b[0]: Invalid scenario argument: 'bad args'",
+                      e.kwargs["reasons"])
+        self.assertEqual(3, mock_validate.call_count)
+
+    @mock.patch("rally.benchmark.engine.osclients.Clients")
+    @mock.patch("rally.benchmark.engine.users_ctx")
+    @mock.patch("rally.benchmark.engine.base_scenario.Scenario.validate")
+    @mock.patch("rally.benchmark.engine.objects.Deployment.get")
+    def test__validate_config_semantic_one_failure(
+            self, mock_deployment_get, mock_validate, mock_userctx,
+            mock_osclients):
+        mock_userctx.UserGenerator = fakes.FakeUserContext
+        mock_validate.side_effect = [
+            None, exceptions.InvalidScenarioArgument("bad args")]
+        config = {"a": [{}, {}]}
+        eng = engine.BenchmarkEngine(config, mock.MagicMock())
+
+        self.assertRaises(exceptions.InvalidBenchmarkConfig,
+                          eng._validate_config_semantic, config)
+
     @mock.patch("rally.benchmark.engine.BenchmarkEngine.consume_results")
     @mock.patch("rally.benchmark.engine.base_ctx.ContextManager.cleanup")
     @mock.patch("rally.benchmark.engine.base_ctx.ContextManager.setup")
@@ -278,6 +384,95 @@ class BenchmarkEngineTestCase(test.TestCase):
         eng = engine.BenchmarkEngine(config, task)
         eng.run()
 
+    def test__get_benchmark_groups(self):
+        config = costilius.OrderedDict([
+            ("a.benchmark", [{"group": "g1"}, {}, {"group": "g2"}]),
+            ("b.benchmark", [{"group": "g1"}, {"args": {"a": 1}}])
+        ])
+        eng = engine.BenchmarkEngine(config, mock.MagicMock())
+        self.assertEqual(
+            [[{"name": "a.benchmark", "pos": 0, "kw": {"group": "g1"}},
+              {"name": "b.benchmark", "pos": 0, "kw": {"group": "g1"}}],
+             [{"name": "a.benchmark", "pos": 1, "kw": {}}],
+             [{"name": "a.benchmark", "pos": 2, "kw": {"group": "g2"}}],
+             [{"name": "b.benchmark", "pos": 1, "kw": {"args": {"a": 1}}}]],
+            eng._get_benchmark_groups())
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._run_benchmark")
+    def test_run_parallel(self, mock_run_benchmark):
+        config = {
+            "a.benchmark": [{"group": "g1"}, {}],
+            "b.benchmark": [{"group": "g1"}, {}]
+        }
+        task = mock.MagicMock()
+        started = []
+        all_started = threading.Event()
+
+        def run_benchmark(key):
+            started.append(key)
+            # Independent groups have to be run at the same time
+            if len(started) == 3:
+                all_started.set()
+            all_started.wait(5)
+            return True
+
+        mock_run_benchmark.side_effect = run_benchmark
+        eng = engine.BenchmarkEngine(config, task, parallel=3)
+        eng.run()
+
+        self.assertTrue(all_started.is_set())
+        self.assertEqual(4, len(started))
+        group = [(k["name"], k["pos"]) for k in started
+                 if k["kw"].get("group") == "g1"]
+        self.assertEqual(2, len(group))
+        task.update_status.assert_has_calls([
+            mock.call(consts.TaskStatus.RUNNING),
+            mock.call(consts.TaskStatus.FINISHED)
+        ])
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._run_benchmark")
+    def test__run_group_abort(self, mock_run_benchmark):
+        mock_run_benchmark.side_effect = [True, False, True]
+        keys = [{"name": "a", "pos": i, "kw": {"group": "g"}}
+                for i in range(3)]
+        eng = engine.BenchmarkEngine({}, mock.MagicMock(),
+                                     abort_on_sla_failure=True)
+        eng._run_group(keys)
+        self.assertEqual([mock.call(keys[0]), mock.call(keys[1])],
+                         mock_run_benchmark.mock_calls)
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._run_benchmark")
+    def test__run_group_no_abort(self, mock_run_benchmark):
+        mock_run_benchmark.return_value = False
+        keys = [{"name": "a", "pos": i, "kw": {"group": "g"}}
+                for i in range(3)]
+        eng = engine.BenchmarkEngine({}, mock.MagicMock())
+        eng._run_group(keys)
+        self.assertEqual([mock.call(key) for key in keys],
+                         mock_run_benchmark.mock_calls)
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine.consume_results")
+    @mock.patch("rally.benchmark.engine.base_ctx.ContextManager")
+    @mock.patch("rally.benchmark.engine.base_scenario.Scenario")
+    @mock.patch("rally.benchmark.engine.base_runner.ScenarioRunner")
+    def test__run_benchmark(self, mock_runner, mock_scenario, mock_ctx,
+                            mock_consume):
+        runner = mock_runner.get_runner.return_value
+        runner.run.return_value = 42
+        runner.aborted.is_set.return_value = False
+        key = {"name": "a.benchmark", "pos": 0, "kw": {"args": {"a": 1}}}
+        task = mock.MagicMock()
+        eng = engine.BenchmarkEngine({}, task)
+
+        self.assertTrue(eng._run_benchmark(key))
+
+        runner.run.assert_called_once_with("a.benchmark", mock.ANY,
+                                           {"a": 1})
+        runner.finish_results.assert_called_once_with()
+        mock_consume.assert_called_once_with(key, task, runner, mock.ANY)
+        durations = mock_consume.call_args[0][3]
+        self.assertEqual(42, durations["load_duration"])
+
     @mock.patch("rally.benchmark.engine.base_scenario.Scenario.meta")
     def test__prepare_context(self, mock_meta):
         default_context = {"a": 1, "b": 2}
@@ -313,17 +508,60 @@ class BenchmarkEngineTestCase(test.TestCase):
             "a.benchmark": [{"context": {"context_a": {"a": 1}}}],
         }
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1, 2])
-        is_done = mock.MagicMock()
-        is_done.isSet.side_effect = [False, False, True]
+        results = [{"timestamp": 1.5, "duration": 1.0, "idle_duration": 0,
+                    "error": [], "atomic_actions": {"a": 0.5},
+                    "scenario_output": {"data": {}, "errors": ""}},
+                   {"timestamp": 3.1, "duration": 2.0, "idle_duration": 0,
+                    "error": [], "atomic_actions": {"a": 0.7},
+                    "scenario_output": {"data": {}, "errors": ""}}]
+        runner.get_results.side_effect = [results[:1], results[1:], None]
         eng = engine.BenchmarkEngine(config, task)
-        eng.duration = 123
-        eng.full_duration = 456
-        eng.consume_results(key, task, is_done, runner)
+        eng.consume_results(key, task, runner, {"load_duration": 123,
+                                                "full_duration": 456})
         mock_sla.assert_called_once_with({"fake": 2})
-        expected_iteration_calls = [mock.call(1), mock.call(2)]
+        expected_iteration_calls = [mock.call(r) for r in results]
         self.assertEqual(expected_iteration_calls,
                          mock_sla_instance.add_iteration.mock_calls)
+        task.append_results.assert_called_once_with(
+            key, {"chunks": 0, "sla": [], "load_duration": 0,
+                  "full_duration": 0})
+        result_id = task.append_results.return_value["id"]
+        task.append_results_chunk.assert_called_once_with(
+            result_id, 0,
+            table.IterationsTable.from_results(results).to_dict())
+        task.update_results.assert_called_once_with(
+            result_id, {"chunks": 1, "load_duration": 123,
+                        "full_duration": 456,
+                        "achieved_rps": [[0, 1], [1, 0], [2, 1]],
+                        "runner_summary": runner.summary.return_value,
+                        "sketch": sketch.IterationsSketch.from_results(
+                            results).to_dict(),
+                        "sla": mock_sla_instance.results.return_value})
+
+    @mock.patch("rally.benchmark.engine.RESULTS_CHUNK_SIZE", 2)
+    @mock.patch("rally.benchmark.engine.RESULTS_FLUSH_INTERVAL", 0)
+    @mock.patch("rally.benchmark.sla.base.SLAChecker")
+    def test_consume_results_chunks(self, mock_sla):
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        runner = mock.MagicMock()
+        results = [{"duration": float(i), "idle_duration": 0, "error": [],
+                    "atomic_actions": {},
+                    "scenario_output": {"data": {}, "errors": ""}}
+                   for i in range(6)]
+        runner.get_results.side_effect = [results[:3], results[3:4],
+                                          results[4:], None]
+        eng = engine.BenchmarkEngine({}, task)
+        eng.consume_results(key, task, runner, {"load_duration": 123,
+                                                "full_duration": 456})
+        result_id = task.append_results.return_value["id"]
+        chunks = [results[:2], results[2:3], results[3:4], results[4:]]
+        self.assertEqual(
+            [mock.call(result_id, i,
+                       table.IterationsTable.from_results(chunk).to_dict())
+             for i, chunk in enumerate(chunks)],
+            task.append_results_chunk.mock_calls)
+        self.assertEqual(4, task.update_results.call_args[0][1]["chunks"])
 
     @mock.patch("rally.benchmark.sla.base.SLAChecker")
     def test_consume_results_sla_failure_abort(self, mock_sla):
@@ -337,13 +575,13 @@ class BenchmarkEngineTestCase(test.TestCase):
             "a.benchmark": [{"context": {"context_a": {"a": 1}}}],
         }
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1, 2, 3, 4])
-        is_done = mock.MagicMock()
-        is_done.isSet.side_effect = [False, False, False, False, True]
+        result = {"duration": 1.0, "idle_duration": 0, "error": [],
+                  "atomic_actions": {},
+                  "scenario_output": {"data": {}, "errors": ""}}
+        runner.get_results.side_effect = [[result] * 2, [result] * 2, None]
         eng = engine.BenchmarkEngine(config, task, abort_on_sla_failure=True)
-        eng.duration = 123
-        eng.full_duration = 456
-        eng.consume_results(key, task, is_done, runner)
+        eng.consume_results(key, task, runner, {"load_duration": 123,
+                                                "full_duration": 456})
         mock_sla.assert_called_once_with({"fake": 2})
         self.assertTrue(runner.abort.called)
 
@@ -359,12 +597,12 @@ class BenchmarkEngineTestCase(test.TestCase):
             "a.benchmark": [{"context": {"context_a": {"a": 1}}}],
         }
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1, 2, 3, 4])
-        is_done = mock.MagicMock()
-        is_done.isSet.side_effect = [False, False, False, False, True]
+        result = {"duration": 1.0, "idle_duration": 0, "error": [],
+                  "atomic_actions": {},
+                  "scenario_output": {"data": {}, "errors": ""}}
+        runner.get_results.side_effect = [[result] * 2, [result] * 2, None]
         eng = engine.BenchmarkEngine(config, task, abort_on_sla_failure=False)
-        eng.duration = 123
-        eng.full_duration = 456
-        eng.consume_results(key, task, is_done, runner)
+        eng.consume_results(key, task, runner, {"load_duration": 123,
+                                                "full_duration": 456})
         mock_sla.assert_called_once_with({"fake": 2})
         self.assertEqual(0, runner.abort.call_count)
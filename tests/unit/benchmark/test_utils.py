@@ -16,6 +16,7 @@
 import datetime
 
 import mock
+from oslo_config import fixture as config_fixture
 
 from rally.benchmark import utils
 from rally import exceptions
@@ -135,6 +136,131 @@ class BenchmarkUtilsTestCase(test.TestCase):
         self.assertRaises(exceptions.GetResourceFailure,
                           get_from_manager, resource)
 
+    def test_get_all_from_manager(self):
+        manager = mock.MagicMock()
+        resources = [fakes.FakeResource(manager=manager, id=str(i))
+                     for i in range(3)]
+        updated = [fakes.FakeResource(manager=manager, id=str(i))
+                   for i in range(2)]
+        manager.list.return_value = updated
+        manager.get.return_value = fakes.FakeResource(id="2")
+
+        get_all_from_manager = utils.get_all_from_manager()
+        self.assertEqual(updated + [manager.get.return_value],
+                         get_all_from_manager(resources))
+        manager.list.assert_called_once_with()
+        manager.get.assert_called_once_with("2")
+        self.assertEqual([], get_all_from_manager([]))
+
+    def test_get_all_from_manager_in_error_state(self):
+        manager = mock.MagicMock()
+        resource = fakes.FakeResource(manager=manager)
+        manager.list.return_value = [
+            fakes.FakeResource(id=resource.id, status="ERROR")]
+        self.assertRaises(exceptions.GetResourceErrorStatus,
+                          utils.get_all_from_manager(), [resource])
+
+    def test_get_all_from_manager_list_failed(self):
+        manager = mock.MagicMock()
+        manager.list.side_effect = Exception()
+        self.assertRaises(exceptions.GetResourceFailure,
+                          utils.get_all_from_manager(),
+                          [fakes.FakeResource(manager=manager)])
+
+    @mock.patch("rally.benchmark.utils._limit_rate")
+    def test_get_from_manager_rate_limited(self, mock__limit_rate):
+        get_from_manager = utils.get_from_manager()
+        manager = fakes.FakeManager()
+        resource = fakes.FakeResource(manager=manager)
+        manager._cache(resource)
+        self.assertEqual(resource, get_from_manager(resource))
+        mock__limit_rate.assert_called_once_with(manager)
+
+    def test_get_from_manager_batch_status(self):
+        class NotFoundException(Exception):
+            code = 404
+
+        self.useFixture(config_fixture.Config()).config(
+            poll_batch_status=True, group="benchmark")
+        get_from_manager = utils.get_from_manager()
+        manager = fakes.FakeManager()
+        manager.list = mock.MagicMock(side_effect=manager.list)
+        resources = [fakes.FakeResource(manager=manager) for i in range(3)]
+        for resource in resources:
+            manager._cache(resource)
+        manager.get = mock.MagicMock(side_effect=NotFoundException)
+
+        self.assertEqual(resources[0], get_from_manager(resources[0]))
+        self.assertEqual(1, manager.list.call_count)
+        self.assertFalse(manager.get.called)
+
+        manager.resources_order.remove(resources[1].id)
+        self.assertRaises(exceptions.GetResourceNotFound,
+                          get_from_manager, resources[1])
+        self.assertEqual(2, manager.list.call_count)
+        manager.get.assert_called_once_with(resources[1].id)
+
+    @mock.patch("rally.benchmark.utils.time")
+    def test__status_watcher_shares_list(self, mock_time):
+        mock_time.time.side_effect = [1, 2, 3, 4, 5]
+        manager = mock.MagicMock()
+        resource = mock.MagicMock(id="foo")
+        manager.list.return_value = [resource]
+        watcher = utils._StatusWatcher(manager)
+
+        # the list was started (at 2) after the first check was requested
+        self.assertEqual(resource, watcher.get("foo"))
+        # the second check (requested at 3) needs a new list
+        self.assertEqual(resource, watcher.get("foo"))
+        self.assertEqual(2, manager.list.call_count)
+
+        watcher._listed_at = 10
+        self.assertEqual(resource, watcher.get("foo"))
+        self.assertEqual(2, manager.list.call_count)
+        self.assertFalse(manager.get.called)
+
+    def test__get_watcher(self):
+        manager = mock.MagicMock()
+        watcher = utils._get_watcher(manager)
+        self.assertIsInstance(watcher, utils._StatusWatcher)
+        self.assertIs(watcher, utils._get_watcher(manager))
+        self.assertIsNot(watcher, utils._get_watcher(mock.MagicMock()))
+
+    @mock.patch("rally.benchmark.utils._rate_limiters", {})
+    @mock.patch("rally.benchmark.utils.time")
+    def test__limit_rate(self, mock_time):
+        self.useFixture(config_fixture.Config()).config(
+            poll_rate_limit=4, group="benchmark")
+        mock_time.time.return_value = 10
+        manager = fakes.FakeManager()
+        for i in range(3):
+            utils._limit_rate(manager)
+        self.assertEqual([mock.call(0.25), mock.call(0.5)],
+                         mock_time.sleep.mock_calls)
+        self.assertEqual([("tests", 4)], list(utils._rate_limiters))
+
+    @mock.patch("rally.benchmark.utils.time")
+    def test__limit_rate_disabled(self, mock_time):
+        utils._limit_rate(fakes.FakeManager())
+        self.assertFalse(mock_time.time.called)
+
+    def test__poll_intervals(self):
+        intervals = utils._poll_intervals(3)
+        self.assertEqual([3, 3, 3], [next(intervals) for i in range(3)])
+
+        self.useFixture(config_fixture.Config()).config(
+            poll_initial_interval=0.5, group="benchmark")
+        intervals = utils._poll_intervals(3)
+        self.assertEqual([0.5, 1, 2, 3, 3],
+                         [next(intervals) for i in range(5)])
+
+    @mock.patch("rally.benchmark.utils.random.uniform", return_value=1.1)
+    def test__poll_intervals_jitter(self, mock_uniform):
+        self.useFixture(config_fixture.Config()).config(
+            poll_jitter=0.1, group="benchmark")
+        self.assertAlmostEqual(3.3, next(utils._poll_intervals(3)))
+        mock_uniform.assert_called_once_with(0.9, 1.1)
+
     def test_check_service_status(self):
         class service():
             def __init__(self, name):
@@ -224,3 +350,57 @@ class WaitForTestCase(test.TestCase):
 
         self.assertIn("FakeResource", str(exc))
         self.assertIn("fake_new_status", str(exc))
+
+    @mock.patch("rally.benchmark.utils._poll_intervals",
+                return_value=iter([0.1, 0.2]))
+    @mock.patch("rally.benchmark.utils.time")
+    def test_wait_for_poll_intervals(self, mock_time, mock__poll_intervals):
+        mock_time.time.return_value = 0
+        is_ready = mock.MagicMock(side_effect=[False, False, True])
+        utils.wait_for(self.resource, is_ready, check_interval=3)
+        mock__poll_intervals.assert_called_once_with(3)
+        self.assertEqual([mock.call(0.1), mock.call(0.2)],
+                         mock_time.sleep.mock_calls)
+
+    @mock.patch("rally.benchmark.utils.time")
+    def test_wait_for_all(self, mock_time):
+        mock_time.time.return_value = 0
+        resources = [fakes.FakeResource(status="BUILD") for i in range(3)]
+        statuses = iter([["ACTIVE", "BUILD", "BUILD"],
+                         ["BUILD", "ACTIVE"],
+                         ["ACTIVE"]])
+        update_calls = []
+
+        def update_resources(resources):
+            update_calls.append(list(resources))
+            return [fakes.FakeResource(id=res.id, status=status)
+                    for res, status in zip(resources, next(statuses))]
+
+        ready = utils.wait_for_all(resources, utils.resource_is("ACTIVE"),
+                                   update_resources, check_interval=3)
+
+        self.assertEqual([res.id for res in resources],
+                         [res.id for res in ready])
+        self.assertEqual(["ACTIVE"] * 3, [res.status for res in ready])
+        self.assertEqual([3, 2, 1], [len(call) for call in update_calls])
+        self.assertEqual(resources[1].id, update_calls[2][0].id)
+        self.assertEqual([mock.call(3), mock.call(3)],
+                         mock_time.sleep.mock_calls)
+
+    def test_wait_for_all_empty(self):
+        update_resources = mock.MagicMock()
+        self.assertEqual([], utils.wait_for_all([], mock.MagicMock(),
+                                                update_resources))
+        self.assertFalse(update_resources.called)
+
+    @mock.patch("rally.benchmark.utils.time")
+    def test_wait_for_all_timeout(self, mock_time):
+        mock_time.time.side_effect = [0, 1, 2]
+        resources = [fakes.FakeResource(status="ACTIVE"),
+                     fakes.FakeResource(name="foo", status="BUILD")]
+        exc = self.assertRaises(
+            exceptions.TimeoutException, utils.wait_for_all,
+            resources, utils.resource_is("ACTIVE"), lambda res: res,
+            timeout=1)
+        self.assertEqual("foo", exc.kwargs["resource_name"])
+        self.assertEqual("BUILD", exc.kwargs["resource_status"])
@@ -62,6 +62,41 @@ class ValidationUtilsTestCase(test.TestCase):
         validator, = self._get_scenario_validators(func_failure, scenario)
         self.assertFalse(validator(None, None, None).is_valid)
 
+    def test__cached(self):
+        clients = mock.MagicMock()
+        func = mock.MagicMock(return_value="foo")
+        for i in range(3):
+            self.assertEqual("foo", validation._cached(clients, ("a",), func))
+        func.assert_called_once_with()
+
+        self.assertEqual("foo", validation._cached(clients, ("b",), func))
+        self.assertEqual("foo",
+                         validation._cached(mock.MagicMock(), ("a",), func))
+        self.assertEqual(3, func.call_count)
+
+    def test__cached_same_endpoint(self):
+        endpoint = mock.MagicMock()
+        func = mock.MagicMock(return_value="foo")
+        for i in range(3):
+            clients = mock.MagicMock(endpoint=endpoint)
+            self.assertEqual("foo", validation._cached(clients, ("a",), func))
+        func.assert_called_once_with()
+
+    def test__cached_error(self):
+        clients = mock.MagicMock()
+        func = mock.MagicMock(side_effect=exceptions.InvalidScenarioArgument)
+        for i in range(2):
+            self.assertRaises(exceptions.InvalidScenarioArgument,
+                              validation._cached, clients, ("a",), func)
+        func.assert_called_once_with()
+
+    def test__cached_no_weakref(self):
+        func = mock.MagicMock(return_value="foo")
+        for i in range(2):
+            self.assertEqual("foo", validation._cached(
+                mock.MagicMock(endpoint="endpoint"), ("a",), func))
+        self.assertEqual(2, func.call_count)
+
 
 class ValidatorsTestCase(test.TestCase):
 
@@ -487,10 +522,21 @@ class ValidatorsTestCase(test.TestCase):
         result = validator({}, clients, None)
         self.assertTrue(result.is_valid, result.msg)
 
+        clients = mock.MagicMock()
         clients.services().values.return_value = [consts.Service.KEYSTONE]
         result = validator({}, clients, None)
         self.assertFalse(result.is_valid, result.msg)
 
+    def test_required_service_cached(self):
+        validator = self._unwrap_validator(validation.required_services,
+                                           consts.Service.NOVA)
+        clients = mock.MagicMock()
+        clients.services.return_value = {"compute": consts.Service.NOVA}
+        for i in range(3):
+            result = validator({}, clients, None)
+            self.assertTrue(result.is_valid, result.msg)
+        clients.services.assert_called_once_with()
+
     def test_required_service_wrong_service(self):
         validator = self._unwrap_validator(validation.required_services,
                                            consts.Service.KEYSTONE,
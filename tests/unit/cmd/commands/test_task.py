@@ -15,17 +15,24 @@
 
 import copy
 import datetime as date
+import json
 import os.path
 
 import mock
+import six
 
 from rally.cmd.commands import task
 from rally import consts
 from rally import exceptions
-from tests.unit import fakes
 from tests.unit import test
 
 
+def _consume(results):
+    """Read iterations of task results passed to the report."""
+    return [dict(result, result=list(result["result"]))
+            for result in results]
+
+
 class TaskCommandsTestCase(test.TestCase):
 
     def setUp(self):
@@ -114,7 +121,8 @@ class TaskCommandsTestCase(test.TestCase):
         self.task.start(task_path, deployment_id)
         mock_api.assert_called_once_with(deployment_id, {"some": "json"},
                                          task=mock_create_task.return_value,
-                                         abort_on_sla_failure=False)
+                                         abort_on_sla_failure=False,
+                                         parallel=1)
         mock_load.assert_called_once_with(task_path, None, None)
 
     @mock.patch("rally.cmd.commands.task.TaskCommands._load_task",
@@ -144,7 +152,8 @@ class TaskCommandsTestCase(test.TestCase):
         mock_api.Task.create.assert_called_once_with("deployment", "tag")
         mock_api.Task.start.assert_called_once_with(
             "deployment", mock_load.return_value,
-            task=mock_api.Task.create.return_value, abort_on_sla_failure=False)
+            task=mock_api.Task.create.return_value, abort_on_sla_failure=False,
+            parallel=1)
 
     @mock.patch("rally.cmd.commands.task.api")
     def test_abort(self, mock_api):
@@ -159,13 +168,12 @@ class TaskCommandsTestCase(test.TestCase):
         self.assertRaises(exceptions.InvalidArgumentsException,
                           self.task.abort, None)
 
-    def test_status(self):
+    @mock.patch("rally.cmd.commands.task.objects.Task.get_status",
+                return_value="status")
+    def test_status(self, mock_get_status):
         test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
-        value = {"task_id": "task", "status": "status"}
-        with mock.patch("rally.cmd.commands.task.db") as mock_db:
-            mock_db.task_get = mock.MagicMock(return_value=value)
-            self.task.status(test_uuid)
-            mock_db.task_get.assert_called_once_with(test_uuid)
+        self.task.status(test_uuid)
+        mock_get_status.assert_called_once_with(test_uuid)
 
     @mock.patch("rally.cmd.commands.task.envutils.get_global")
     def test_status_no_task_id(self, mock_default):
@@ -245,7 +253,13 @@ class TaskCommandsTestCase(test.TestCase):
         self.task.detailed(test_uuid)
         mock_db.task_get_detailed.assert_called_once_with(test_uuid)
 
-        self.task.detailed(test_uuid, iterations_data=True)
+        with mock.patch("rally.cmd.commands.task.objects.Task."
+                        "iter_results_raw",
+                        side_effect=lambda result: iter(
+                            result["data"]["raw"])) as mock_iter:
+            self.task.detailed(test_uuid, iterations_data=True)
+        # iterations are read once
+        mock_iter.assert_called_once_with(value["results"][0])
 
     @mock.patch("rally.cmd.commands.task.db")
     @mock.patch("rally.cmd.commands.task.logging")
@@ -278,31 +292,58 @@ class TaskCommandsTestCase(test.TestCase):
         self.task.detailed(test_uuid)
         mock_db.task_get_detailed.assert_called_once_with(test_uuid)
 
-    @mock.patch("json.dumps")
+    @mock.patch("rally.cmd.commands.task.sys.stdout",
+                new_callable=six.StringIO)
     @mock.patch("rally.cmd.commands.task.objects.Task.get")
-    def test_results(self, mock_get, mock_json):
+    def test_results(self, mock_get, mock_stdout):
         task_id = "foo_task_id"
         data = [
-            {"key": "foo_key", "data": {"raw": "foo_raw", "sla": [],
+            {"key": "foo_key", "data": {"raw": ["foo_raw", {"a": [1]}],
+                                        "sla": [],
+                                        "load_duration": "lo_duration",
+                                        "full_duration": "fu_duration"}},
+            {"key": "bar_key", "data": {"raw": [], "sla": [],
                                         "load_duration": "lo_duration",
                                         "full_duration": "fu_duration"}}
         ]
-        result = map(lambda x: {"key": x["key"],
-                                "result": x["data"]["raw"],
-                                "load_duration": x["data"]["load_duration"],
-                                "full_duration": x["data"]["full_duration"],
-                                "sla": x["data"]["sla"]}, data)
+        result = [{"key": x["key"],
+                   "result": x["data"]["raw"],
+                   "load_duration": x["data"]["load_duration"],
+                   "full_duration": x["data"]["full_duration"],
+                   "runner_summary": {},
+                   "sla": x["data"]["sla"]} for x in data]
         mock_results = mock.Mock(return_value=data)
         mock_get.return_value = mock.Mock(get_results=mock_results)
 
         self.task.results(task_id)
-        self.assertEqual(1, mock_json.call_count)
-        self.assertEqual(1, len(mock_json.call_args[0]))
-        self.assertSequenceEqual(result, mock_json.call_args[0][0])
-        self.assertEqual({"sort_keys": True, "indent": 4},
-                         mock_json.call_args[1])
+        self.assertEqual(json.dumps(result, sort_keys=True, indent=4,
+                                    separators=(",", ": ")) + "\n",
+                         mock_stdout.getvalue())
         mock_get.assert_called_once_with(task_id)
 
+    def test__dump_results(self):
+        results = [
+            {"key": {"name": "Foo.bar", "pos": 0,
+                     "kw": {"args": {"a": [1, 2]}, "runner": {}}},
+             "result": [{"duration": 1.5, "error": [],
+                         "atomic_actions": {"b": 0.5, "a": None}},
+                        {"duration": 2, "atomic_actions": {},
+                         "error": ["E", "msg", "Traceback\n  \"line\""]}],
+             "sla": [{"criterion": "max", "success": True}],
+             "load_duration": 3.5, "full_duration": 5,
+             "runner_summary": {}},
+            {"key": {"name": "Foo.baz"}, "result": [], "sla": [],
+             "load_duration": 0, "full_duration": 1,
+             "runner_summary": {"foo": u"\u2603"}}
+        ]
+        fp = six.StringIO()
+        task._dump_results(
+            [dict(r, result=iter(r["result"])) for r in results], fp)
+
+        self.assertEqual(json.dumps(results, sort_keys=True, indent=4,
+                                    separators=(",", ": ")),
+                         fp.getvalue())
+
     @mock.patch("rally.cmd.commands.task.objects.Task.get")
     def test_invalid_results(self, mock_get):
         task_id = "foo_task_id"
@@ -328,11 +369,11 @@ class TaskCommandsTestCase(test.TestCase):
         task_id = "eb290c30-38d8-4c8f-bbcc-fc8f74b004ae"
         data = [
             {"key": {"name": "test", "pos": 0},
-             "data": {"raw": "foo_raw", "sla": "foo_sla",
+             "data": {"raw": ["foo_raw"], "sla": "foo_sla",
                       "load_duration": 0.1,
                       "full_duration": 1.2}},
             {"key": {"name": "test", "pos": 0},
-             "data": {"raw": "bar_raw", "sla": "bar_sla",
+             "data": {"raw": ["bar_raw"], "sla": "bar_sla",
                       "load_duration": 2.1,
                       "full_duration": 2.2}}]
 
@@ -340,7 +381,8 @@ class TaskCommandsTestCase(test.TestCase):
                     "result": x["data"]["raw"],
                     "sla": x["data"]["sla"],
                     "load_duration": x["data"]["load_duration"],
-                    "full_duration": x["data"]["full_duration"]}
+                    "full_duration": x["data"]["full_duration"],
+                    "sketch": None}
                    for x in data]
         mock_results = mock.Mock(return_value=data)
         mock_get.return_value = mock.Mock(get_results=mock_results)
@@ -351,15 +393,21 @@ class TaskCommandsTestCase(test.TestCase):
                 m.reset_mock()
         self.task.report(tasks=task_id, out="/tmp/%s.html" % task_id)
         mock_open.assert_called_once_with("/tmp/%s.html" % task_id, "w+")
-        mock_plot.plot.assert_called_once_with(results)
+        mock_plot.plot.assert_called_once_with(
+            mock.ANY, points=1000, downsampling_method="lttb")
+        self.assertEqual(results, _consume(mock_plot.plot.call_args[0][0]))
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
         mock_get.assert_called_once_with(task_id)
 
         reset_mocks()
-        self.task.report(task_id, out="spam.html", open_it=True)
+        self.task.report(task_id, out="spam.html", open_it=True, points=100,
+                         downsampling_method="minmax")
         mock_web.open_new_tab.assert_called_once_with(
             "file://realpath_spam.html")
+        mock_plot.plot.assert_called_once_with(
+            mock.ANY, points=100, downsampling_method="minmax")
+        self.assertEqual(results, _consume(mock_plot.plot.call_args[0][0]))
 
     @mock.patch("rally.cmd.commands.task.jsonschema.validate",
                 return_value=None)
@@ -376,11 +424,11 @@ class TaskCommandsTestCase(test.TestCase):
                  "eb290c30-38d8-4c8f-bbcc-fc8f74b004af"]
         data = [
             {"key": {"name": "test", "pos": 0},
-             "data": {"raw": "foo_raw", "sla": "foo_sla",
+             "data": {"raw": ["foo_raw"], "sla": "foo_sla",
                       "load_duration": 0.1,
                       "full_duration": 1.2}},
             {"key": {"name": "test", "pos": 0},
-             "data": {"raw": "bar_raw", "sla": "bar_sla",
+             "data": {"raw": ["bar_raw"], "sla": "bar_sla",
                       "load_duration": 2.1,
                       "full_duration": 2.2}}]
 
@@ -391,7 +439,8 @@ class TaskCommandsTestCase(test.TestCase):
                                "result": x["data"]["raw"],
                                "sla": x["data"]["sla"],
                                "load_duration": x["data"]["load_duration"],
-                               "full_duration": x["data"]["full_duration"]},
+                               "full_duration": x["data"]["full_duration"],
+                               "sketch": None},
                     data))
 
         mock_results = mock.Mock(return_value=data)
@@ -403,7 +452,9 @@ class TaskCommandsTestCase(test.TestCase):
                 m.reset_mock()
         self.task.report(tasks=tasks, out="/tmp/1_test.html")
         mock_open.assert_called_once_with("/tmp/1_test.html", "w+")
-        mock_plot.plot.assert_called_once_with(results)
+        mock_plot.plot.assert_called_once_with(
+            mock.ANY, points=1000, downsampling_method="lttb")
+        self.assertEqual(results, _consume(mock_plot.plot.call_args[0][0]))
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
         expected_get_calls = [mock.call(task) for task in tasks]
@@ -450,7 +501,8 @@ class TaskCommandsTestCase(test.TestCase):
         expected_open_calls = [mock.call(task_file, "r"),
                                mock.call("/tmp/1_test.html", "w+")]
         mock_open.assert_has_calls(expected_open_calls, any_order=True)
-        mock_plot.plot.assert_called_once_with(results)
+        mock_plot.plot.assert_called_once_with(
+            results, points=1000, downsampling_method="lttb")
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
 
@@ -480,16 +532,23 @@ class TaskCommandsTestCase(test.TestCase):
                                out="/tmp/tmp.hsml")
         self.assertEqual(ret, 1)
 
+    @mock.patch("rally.cmd.commands.task.plot")
+    def test_report_too_few_points(self, mock_plot):
+        self.assertEqual(1, self.task.report(tasks="/tmp/task.json",
+                                             out="/tmp/tmp.html", points=2))
+        self.assertFalse(mock_plot.plot.called)
+
     @mock.patch("rally.cmd.commands.task.cliutils.print_list")
     @mock.patch("rally.cmd.commands.task.envutils.get_global",
                 return_value="123456789")
-    @mock.patch("rally.cmd.commands.task.objects.Task.list",
-                return_value=[fakes.FakeTask(uuid="a",
-                                             created_at=date.datetime.now(),
-                                             updated_at=date.datetime.now(),
-                                             status="c",
-                                             tag="d",
-                                             deployment_name="some_name")])
+    @mock.patch("rally.cmd.commands.task.objects.Task.list_summary",
+                return_value=[{"uuid": "a",
+                               "created_at": date.datetime(2015, 1, 1),
+                               "updated_at": date.datetime(2015, 1, 2),
+                               "status": "c",
+                               "tag": "d",
+                               "deployment_uuid": "e",
+                               "deployment_name": "some_name"}])
     def test_list(self, mock_objects_list, mock_default, mock_print_list):
 
         self.task.list(status="running")
@@ -503,12 +562,15 @@ class TaskCommandsTestCase(test.TestCase):
         mock_print_list.assert_called_once_with(
             mock_objects_list.return_value, headers,
             sortby_index=headers.index("created_at"))
+        self.assertEqual(date.timedelta(days=1),
+                         mock_objects_list.return_value[0]["duration"])
 
     def test_list_wrong_status(self):
         self.assertEqual(1, self.task.list(deployment="fake",
                                            status="wrong non existing status"))
 
-    @mock.patch("rally.cmd.commands.task.objects.Task.list", return_value=[])
+    @mock.patch("rally.cmd.commands.task.objects.Task.list_summary",
+                return_value=[])
     def test_list_no_results(self, mock_list):
         self.assertIsNone(
             self.task.list(deployment="fake", all_deployments=True))
@@ -549,21 +611,23 @@ class TaskCommandsTestCase(test.TestCase):
         data = [{"key": {"name": "fake_name",
                          "pos": "fake_pos",
                          "kw": "fake_kw"},
-                 "data": {"scenario_duration": 42.0,
-                          "raw": [],
-                          "sla": [{"benchmark": "KeystoneBasic.create_user",
-                                   "criterion": "max_seconds_per_iteration",
-                                   "pos": 0,
-                                   "success": False,
-                                   "detail": "Max foo, actually bar"}]}}]
-
-        mock_task_get().get_results.return_value = copy.deepcopy(data)
+                 "summary": {
+                     "iterations": 0,
+                     "sla": [{"benchmark": "KeystoneBasic.create_user",
+                              "criterion": "max_seconds_per_iteration",
+                              "pos": 0,
+                              "success": False,
+                              "detail": "Max foo, actually bar"}]}}]
+
+        mock_task_get().get_results_summary.return_value = copy.deepcopy(
+            data)
         result = self.task.sla_check(task_id="fake_task_id")
         self.assertEqual(1, result)
         mock_task_get.assert_called_with("fake_task_id")
+        self.assertFalse(mock_task_get().get_results.called)
 
-        data[0]["data"]["sla"][0]["success"] = True
-        mock_task_get().get_results.return_value = data
+        data[0]["summary"]["sla"][0]["success"] = True
+        mock_task_get().get_results_summary.return_value = data
 
         result = self.task.sla_check(task_id="fake_task_id", tojson=True)
         self.assertEqual(0, result)
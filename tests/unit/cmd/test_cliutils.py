@@ -144,12 +144,12 @@ class CliUtilsTestCase(test.TestCase):
         ret = cliutils.run(["rally", "show", "keypairs"], self.categories)
         self.assertEqual(ret, 1)
 
-    @mock.patch("rally.db.task_get",
+    @mock.patch("rally.db.task_get_status",
                 side_effect=exceptions.TaskNotFound(FAKE_TASK_UUID))
-    def test_run_task_not_found(self, mock_task_get):
+    def test_run_task_not_found(self, mock_task_get_status):
         ret = cliutils.run(["rally", "task", "status", "%s" % FAKE_TASK_UUID],
                            self.categories)
-        self.assertTrue(mock_task_get.called)
+        self.assertTrue(mock_task_get_status.called)
         self.assertEqual(ret, 1)
 
     @mock.patch("rally.cmd.cliutils.validate_args",
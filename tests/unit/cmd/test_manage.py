@@ -43,6 +43,20 @@ class DBCommandsTestCase(test.TestCase):
         calls = [mock.call.db_drop(), mock.call.db_create()]
         self.assertEqual(calls, mock_db.mock_calls)
 
+    @mock.patch("rally.cmd.manage.db")
+    def test_upgrade(self, mock_db):
+        mock_db.db_upgrade.return_value = ["foo", "bar.baz"]
+        self.db_commands.upgrade()
+        mock_db.db_upgrade.return_value = []
+        self.db_commands.upgrade()
+        self.assertEqual([mock.call.db_upgrade()] * 2, mock_db.mock_calls)
+
+    @mock.patch("rally.cmd.manage.db")
+    def test_recompress(self, mock_db):
+        mock_db.db_recompress.return_value = 3
+        self.db_commands.recompress()
+        mock_db.db_recompress.assert_called_once_with()
+
 
 class TempestCommandsTestCase(test.TestCase):
 
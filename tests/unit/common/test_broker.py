@@ -14,6 +14,7 @@
 #    under the License.
 
 import collections
+import threading
 
 import mock
 
@@ -47,6 +48,24 @@ class BrokerTestCase(test.TestCase):
         self.assertEqual(3, mock_consume.call_count)
         self.assertEqual(0, len(queue))
 
+    def test__consumer_published_after_queue_check(self):
+        queue = collections.deque()
+        published = []
+
+        def is_set():
+            # publisher fills the queue between the checks of consumer
+            if not published:
+                queue.extend([1, 2])
+                published.append(True)
+            return True
+
+        mock_consume = mock.MagicMock()
+        mock_is_published = mock.MagicMock()
+        mock_is_published.isSet = mock.MagicMock(side_effect=is_set)
+        broker._consumer(mock_consume, queue, mock_is_published)
+        self.assertEqual([mock.call({}, 1), mock.call({}, 2)],
+                         mock_consume.mock_calls)
+
     def test__consumer_cache(self):
         cache_keys_history = []
 
@@ -83,3 +102,38 @@ class BrokerTestCase(test.TestCase):
         consumer_count = 2
         broker.run(publish, consume, consumer_count)
         self.assertEqual(set([1, 2, 3]), consumed)
+
+    def test_run_for_each(self):
+        def func(item):
+            if item == 3:
+                raise ValueError()
+            return item * 2
+
+        results, errors = broker.run_for_each(func, range(6), 3)
+        self.assertEqual([(0, 0), (1, 2), (2, 4), (4, 8), (5, 10)], results)
+        self.assertEqual(1, len(errors))
+        self.assertEqual(3, errors[0][0])
+        self.assertIsInstance(errors[0][1], ValueError)
+
+    def test_run_for_each_with_cache(self):
+        caches = []
+
+        def func(cache, item):
+            if not cache:
+                caches.append(cache)
+                cache["thread"] = threading.current_thread()
+            self.assertEqual(threading.current_thread(), cache["thread"])
+            return item
+
+        results, errors = broker.run_for_each(func, range(10), 3,
+                                              with_cache=True)
+        self.assertEqual([(i, i) for i in range(10)], results)
+        self.assertEqual([], errors)
+        self.assertTrue(1 <= len(caches) <= 3)
+        self.assertEqual(len(caches),
+                         len(set(cache["thread"] for cache in caches)))
+
+    def test_run_for_each_empty(self):
+        func = mock.MagicMock()
+        self.assertEqual(([], []), broker.run_for_each(func, [], 10))
+        self.assertFalse(func.called)
@@ -0,0 +1,144 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import shutil
+import tempfile
+
+import mock
+
+from rally.benchmark.scenarios import base as scenario_base
+from rally.benchmark.scenarios.dummy import dummy
+from rally.benchmark.sla import base as sla_base
+from rally.common import discover
+from tests.unit import test
+
+
+def _name(cls):
+    return cls.__name__
+
+
+class DiscoverTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DiscoverTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.index_file = os.path.join(self.tmp_dir, "rally",
+                                       "plugin_index.json")
+        mock.patch("rally.common.discover.INDEX_FILE",
+                   self.index_file).start()
+        mock.patch("rally.common.discover._index", None).start()
+
+    def test_get_plugin_builds_index(self):
+        cls = discover.get_plugin(scenario_base.Scenario, "Dummy", _name)
+        self.assertEqual(dummy.Dummy, cls)
+
+        with open(self.index_file) as f:
+            index = json.load(f)
+        self.assertEqual(discover._get_signature(), index["signature"])
+        self.assertEqual(
+            ["rally.benchmark.scenarios.dummy.dummy", "Dummy"],
+            index["plugins"]["rally.benchmark.scenarios.base.Scenario:name"][
+                "Dummy"])
+
+    @mock.patch("rally.common.discover._build_index")
+    def test_get_plugin_uses_saved_index(self, mock__build_index):
+        index = {"signature": discover._get_signature(),
+                 "plugins": {"rally.benchmark.scenarios.base.Scenario:name": {
+                     "Dummy": ["rally.benchmark.scenarios.dummy.dummy",
+                               "Dummy"]}}}
+        os.makedirs(os.path.dirname(self.index_file))
+        with open(self.index_file, "w") as f:
+            json.dump(index, f)
+
+        cls = discover.get_plugin(scenario_base.Scenario, "Dummy", _name)
+        self.assertEqual(dummy.Dummy, cls)
+        self.assertFalse(mock__build_index.called)
+
+    @mock.patch("rally.common.discover._build_index", return_value={})
+    def test_get_plugin_stale_index(self, mock__build_index):
+        index = {"signature": "stale", "plugins": {
+            "rally.benchmark.scenarios.base.Scenario:name": {}}}
+        os.makedirs(os.path.dirname(self.index_file))
+        with open(self.index_file, "w") as f:
+            json.dump(index, f)
+
+        discover.get_plugin(scenario_base.Scenario, "Dummy", _name)
+        mock__build_index.assert_called_once_with(scenario_base.Scenario,
+                                                  _name)
+
+    @mock.patch("rally.common.discover._build_index")
+    def test_get_plugin_wrong_index_entry(self, mock__build_index):
+        mock__build_index.return_value = {
+            "Dummy": ["rally.benchmark.scenarios.dummy.dummy", "Missing"]}
+        cls = discover.get_plugin(scenario_base.Scenario, "Dummy", _name)
+        self.assertEqual(dummy.Dummy, cls)
+
+    def test_get_plugin_several_names(self):
+        def key(cls):
+            return [cls.__name__, cls.__name__.lower()]
+
+        for name in ("Dummy", "dummy"):
+            self.assertEqual(
+                dummy.Dummy,
+                discover.get_plugin(scenario_base.Scenario, name, key,
+                                    index_name="names"))
+        self.assertIsNone(
+            discover.get_plugin(scenario_base.Scenario, "dummy", _name))
+
+    def test_get_plugin_indexes_of_different_keys(self):
+        discover.get_plugin(scenario_base.Scenario, "Dummy", _name)
+        discover.get_plugin(scenario_base.Scenario, "dummy",
+                            lambda cls: cls.__name__.lower(),
+                            index_name="lower")
+        plugins = discover._get_index()["plugins"]
+        self.assertIn("Dummy",
+                      plugins["rally.benchmark.scenarios.base.Scenario:name"])
+        self.assertIn("dummy",
+                      plugins["rally.benchmark.scenarios.base.Scenario:lower"])
+
+    def test_get_sla_without_loading_all(self):
+        # Builds the index
+        sla_base.SLA.get_by_name("failure_rate")
+
+        with mock.patch("rally.common.discover.load_all") as mock_load_all:
+            self.assertEqual(sla_base.FailureRate,
+                             sla_base.SLA.get_by_name("failure_rate"))
+            self.assertEqual(sla_base.FailureRate,
+                             sla_base.SLA.get_by_name("FailureRate"))
+            self.assertEqual(
+                sla_base.IterationTime,
+                sla_base.SLA.get_by_name("max_seconds_per_iteration"))
+            self.assertFalse(mock_load_all.called)
+
+    def test_get_plugin_not_indexed(self):
+        class NotIndexedScenario(scenario_base.Scenario):
+            pass
+
+        cls = discover.get_plugin(scenario_base.Scenario,
+                                  "NotIndexedScenario", _name)
+        self.assertEqual(NotIndexedScenario, cls)
+
+    def test_get_plugin_not_found(self):
+        self.assertIsNone(discover.get_plugin(scenario_base.Scenario,
+                                              "NoSuchScenario", _name))
+
+    def test_save_index_failed(self):
+        with open(os.path.join(self.tmp_dir, "rally"), "w"):
+            pass
+        discover._save_index({"signature": "foo", "plugins": {}})
+        self.assertFalse(os.path.exists(self.index_file))
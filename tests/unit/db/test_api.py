@@ -15,10 +15,14 @@
 
 """Tests for db.api layer."""
 
+from oslo_config import fixture as config_fixture
 from six import moves
+import sqlalchemy as sa
 
 from rally import consts
 from rally import db
+from rally.db.sqlalchemy import api as sa_api
+from rally.db.sqlalchemy import models
 from rally import exceptions
 from tests.unit import test
 
@@ -41,6 +45,15 @@ class TasksTestCase(test.DBTestCase):
         self.assertRaises(exceptions.TaskNotFound,
                           db.task_get, "f885f435-f6ca-4f3e-9b3e-aeb6837080f2")
 
+    def test_task_get_status(self):
+        task = self._create_task({"status": consts.TaskStatus.FINISHED})
+        self.assertEqual(consts.TaskStatus.FINISHED,
+                         db.task_get_status(task["uuid"]))
+
+    def test_task_get_status_not_found(self):
+        self.assertRaises(exceptions.TaskNotFound, db.task_get_status,
+                          "f885f435-f6ca-4f3e-9b3e-aeb6837080f2")
+
     def test_task_create(self):
         task = self._create_task()
         db_task = self._get_task(task["uuid"])
@@ -103,6 +116,40 @@ class TasksTestCase(test.DBTestCase):
         self.assertEqual(task_init, get_uuids(INIT))
         self.assertEqual(sorted(task_finished), get_uuids(FINISHED))
 
+    def test_task_list_summary(self):
+        deploy = db.deployment_create({"name": "other"})
+        task1 = self._create_task({"tag": "foo"})
+        task2 = self._create_task({"status": consts.TaskStatus.FINISHED,
+                                   "deployment_uuid": deploy["uuid"]})
+
+        tasks = db.task_list_summary()
+        tasks.sort(key=lambda t: t["uuid"] == task2["uuid"])
+        self.assertEqual(
+            [{"uuid": task1["uuid"], "status": consts.TaskStatus.INIT,
+              "tag": "foo", "created_at": task1["created_at"],
+              "updated_at": task1["updated_at"],
+              "deployment_uuid": self.deploy["uuid"],
+              "deployment_name": None},
+             {"uuid": task2["uuid"], "status": consts.TaskStatus.FINISHED,
+              "tag": "", "created_at": task2["created_at"],
+              "updated_at": task2["updated_at"],
+              "deployment_uuid": deploy["uuid"],
+              "deployment_name": "other"}],
+            tasks)
+
+        self.assertEqual(
+            [task2["uuid"]],
+            [t["uuid"] for t in db.task_list_summary(
+                status=consts.TaskStatus.FINISHED)])
+        self.assertEqual(
+            [task2["uuid"]],
+            [t["uuid"] for t in db.task_list_summary(deployment="other")])
+        self.assertEqual([], db.task_list_summary(
+            status=consts.TaskStatus.FINISHED,
+            deployment=self.deploy["uuid"]))
+        self.assertRaises(exceptions.DeploymentNotFound,
+                          db.task_list_summary, deployment="non-existing")
+
     def test_task_delete(self):
         task1, task2 = self._create_task()["uuid"], self._create_task()["uuid"]
         db.task_delete(task1)
@@ -125,6 +172,13 @@ class TasksTestCase(test.DBTestCase):
         res = db.task_result_get_all_by_uuid(task_id)
         self.assertEqual(len(res), 0)
 
+    def test_task_delete_with_result_chunks(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {}, {"chunks": 1})
+        db.task_result_chunk_create(result["id"], 0, [{"a": 1}])
+        db.task_delete(task_id)
+        self.assertEqual([], list(db.task_result_chunk_get_all(result["id"])))
+
     def test_task_delete_by_uuid_and_status(self):
         values = {
             "status": consts.TaskStatus.FINISHED,
@@ -163,6 +217,47 @@ class TasksTestCase(test.DBTestCase):
             self.assertEqual(res[0]["key"], data)
             self.assertEqual(res[0]["data"], data)
 
+    def test_task_result_update(self):
+        task_id = self._create_task()["uuid"]
+        result = db.task_result_create(task_id, {"name": "atata"},
+                                       {"chunks": 0})
+        db.task_result_update(result["id"], {"chunks": 2, "sla": []})
+        res = db.task_result_get_all_by_uuid(task_id)
+        self.assertEqual(1, len(res))
+        self.assertEqual({"chunks": 2, "sla": []}, res[0]["data"])
+
+    def test_task_result_summary_get_all(self):
+        task_id = self._create_task()["uuid"]
+        result1 = db.task_result_create(task_id, {"name": "a"},
+                                        {"raw": [1, 2]}, {"iterations": 2})
+        result2 = db.task_result_create(task_id, {"name": "b"}, {})
+        db.task_result_create(self._create_task()["uuid"], {}, {})
+        db.task_result_update(result2["id"], {"chunks": 1},
+                              {"iterations": 3})
+
+        self.assertEqual(
+            [{"id": result1["id"], "key": {"name": "a"},
+              "summary": {"iterations": 2}},
+             {"id": result2["id"], "key": {"name": "b"},
+              "summary": {"iterations": 3}}],
+            db.task_result_summary_get_all(task_id))
+
+    def test_task_result_update_not_found(self):
+        self.assertRaises(exceptions.NotFoundException,
+                          db.task_result_update, 42, {})
+
+    def test_task_result_chunk_get_all(self):
+        task_id = self._create_task()["uuid"]
+        result1 = db.task_result_create(task_id, {}, {"chunks": 2})
+        result2 = db.task_result_create(task_id, {}, {"chunks": 1})
+        db.task_result_chunk_create(result1["id"], 1, [{"a": 2}])
+        db.task_result_chunk_create(result2["id"], 0, [{"b": 1}])
+        db.task_result_chunk_create(result1["id"], 0, [{"a": 1}])
+
+        chunks = list(db.task_result_chunk_get_all(result1["id"]))
+        self.assertEqual([[{"a": 1}], [{"a": 2}]],
+                         [chunk["data"] for chunk in chunks])
+
     def test_task_get_detailed(self):
         task1 = self._create_task()
         key = {"name": "atata"}
@@ -188,6 +283,88 @@ class TasksTestCase(test.DBTestCase):
         self.assertEqual(results[0]["data"], data)
 
 
+class UpgradeTestCase(test.DBTestCase):
+
+    def _create_legacy_tables(self):
+        engine = sa_api.get_engine()
+        engine.execute("DROP TABLE task_result_chunks")
+        engine.execute("DROP TABLE task_results")
+        columns = [sa.Column(c.name, c.type, primary_key=c.primary_key,
+                             nullable=c.nullable)
+                   for c in models.TaskResult.__table__.columns
+                   if c.name != "summary"]
+        sa.Table("task_results", sa.MetaData(), *columns).create(engine)
+
+    def test_db_upgrade(self):
+        self._create_legacy_tables()
+        deploy = db.deployment_create({})
+        task_id = db.task_create({"deployment_uuid": deploy["uuid"]})["uuid"]
+        sa_api.get_engine().execute(
+            "INSERT INTO task_results (id, key, data, task_uuid) "
+            "VALUES (1, '{\"name\": \"old\"}', '{\"raw\": []}', '%s')"
+            % task_id)
+
+        self.assertEqual(["task_result_chunks", "task_results.summary"],
+                         db.db_upgrade())
+
+        result = db.task_result_create(task_id, {"name": "foo"}, {"a": 1},
+                                       {"iterations": 1})
+        db.task_result_chunk_create(result["id"], 0, {"b": 2})
+        self.assertEqual([{"id": 1, "key": {"name": "old"}, "summary": None},
+                          {"id": result["id"], "key": {"name": "foo"},
+                           "summary": {"iterations": 1}}],
+                         db.task_result_summary_get_all(task_id))
+        self.assertEqual([], db.db_upgrade())
+
+    def test_db_upgrade_up_to_date(self):
+        self.assertEqual([], db.db_upgrade())
+
+
+class RecompressTestCase(test.DBTestCase):
+
+    def setUp(self):
+        super(RecompressTestCase, self).setUp()
+        self.conf = self.useFixture(config_fixture.Config())
+        deploy = db.deployment_create({})
+        self.task_id = db.task_create({"deployment_uuid":
+                                       deploy["uuid"]})["uuid"]
+
+    def _get_stored(self, model):
+        table = model.__table__
+        return [row[0] for row in sa_api.get_session().query(
+            sa.type_coerce(table.c.data, sa.Text)).order_by(table.c.id)]
+
+    def test_engine_init_with_invalid_compression(self):
+        self.conf.config(db_compression="foo")
+        db.db_cleanup()
+        self.assertRaises(ValueError, sa_api.get_engine)
+
+    def test_db_recompress(self):
+        self.conf.config(db_compression="none")
+        results = [db.task_result_create(self.task_id, {"i": i}, {"i": i})
+                   for i in range(3)]
+        db.task_result_chunk_create(results[0]["id"], 0, {"foo": "bar"})
+        self.assertEqual(["{\"i\":0}", "{\"i\":1}", "{\"i\":2}"],
+                         self._get_stored(models.TaskResult))
+
+        self.conf.config(db_compression="zlib")
+        db.task_result_create(self.task_id, {"i": 3}, {"i": 3})
+        self.assertEqual(4, db.db_recompress(batch_size=2))
+        stored = self._get_stored(models.TaskResult)
+        self.assertEqual(4, len(stored))
+        for value in stored + self._get_stored(models.TaskResultChunk):
+            self.assertTrue(value.startswith("zlib:"))
+        self.assertEqual(
+            [{"i": i} for i in range(4)],
+            [r["data"] for r in db.task_result_get_all_by_uuid(self.task_id)])
+        self.assertEqual(0, db.db_recompress())
+
+        self.conf.config(db_compression="none")
+        self.assertEqual(5, db.db_recompress())
+        self.assertEqual(["{\"i\":%d}" % i for i in range(4)],
+                         self._get_stored(models.TaskResult))
+
+
 class DeploymentTestCase(test.DBTestCase):
     def test_deployment_create(self):
         deploy = db.deployment_create({"config": {"opt": "val"}})
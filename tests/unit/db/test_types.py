@@ -0,0 +1,108 @@
+# Copyright 2015: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for custom sqlalchemy types"""
+
+import sys
+
+import mock
+from oslo_config import fixture as config_fixture
+import testtools
+
+from rally.common import costilius
+from rally.db.sqlalchemy import types
+from tests.unit import test
+
+
+class CompressionTestCase(test.TestCase):
+
+    def test_get_compression(self):
+        conf = self.useFixture(config_fixture.Config())
+        self.assertEqual("zlib", types.get_compression())
+        conf.config(db_compression="none")
+        self.assertIsNone(types.get_compression())
+        conf.config(db_compression="foo")
+        self.assertRaises(ValueError, types.get_compression)
+
+    @mock.patch.dict("rally.db.sqlalchemy.types.COMPRESSORS", clear=True)
+    def test_get_compression_unavailable(self):
+        self.useFixture(config_fixture.Config()).config(
+            db_compression="zstd")
+        self.assertRaises(ValueError, types.get_compression)
+
+    def test_compress(self):
+        value = "{\"foo\":[%s]}" % ",".join(["1.5"] * 1000)
+        compressed = types.compress(value, "zlib")
+        self.assertTrue(compressed.startswith("zlib:"))
+        self.assertLess(len(compressed), len(value) / 10)
+        self.assertEqual("zlib", types.get_value_compression(compressed))
+        self.assertEqual(value, types.decompress(compressed))
+
+    def test_decompress_not_compressed(self):
+        for value in "{\"zlib:\": 1}", "[]", "\"foo:bar\"", "foo:bar":
+            self.assertIsNone(types.get_value_compression(value))
+            self.assertEqual(value, types.decompress(value))
+
+
+class BigJSONEncodedDictTestCase(test.TestCase):
+
+    def setUp(self):
+        super(BigJSONEncodedDictTestCase, self).setUp()
+        self.conf = self.useFixture(config_fixture.Config())
+        self.value = costilius.OrderedDict([("b", [1, 2.5, None]),
+                                            ("a", {"c": u"\u044f"})])
+
+    def _round_trip(self, value):
+        json_type = types.BigJSONEncodedDict()
+        stored = json_type.process_bind_param(value, None)
+        return stored, json_type.process_result_value(stored, None)
+
+    def test_compressed(self):
+        stored, loaded = self._round_trip(self.value)
+        self.assertTrue(stored.startswith("zlib:"))
+        self.assertEqual(self.value, loaded)
+        self.assertEqual(["b", "a"], list(loaded))
+
+    def test_not_compressed(self):
+        self.conf.config(db_compression="none")
+        stored, loaded = self._round_trip(self.value)
+        self.assertEqual(types.json_dumps(self.value), stored)
+        self.assertEqual(self.value, loaded)
+        self.assertEqual(["b", "a"], list(loaded))
+
+    def test_none(self):
+        self.assertEqual((None, None), self._round_trip(None))
+
+
+@testtools.skipIf(sys.version_info < (3, 7),
+                  "fast JSON decoders are used on Python >= 3.7 only")
+class JSONLoadsTestCase(test.TestCase):
+
+    @mock.patch("rally.db.sqlalchemy.types.fast_json")
+    def test_json_loads_fast(self, mock_fast_json):
+        self.assertEqual(mock_fast_json.loads.return_value,
+                         types.json_loads("{\"a\":1}"))
+        mock_fast_json.loads.assert_called_once_with("{\"a\":1}")
+
+    @mock.patch("rally.db.sqlalchemy.types.fast_json")
+    def test_json_loads_fast_unsupported(self, mock_fast_json):
+        mock_fast_json.loads.side_effect = ValueError
+        self.assertEqual({"a": [float("inf")]},
+                         types.json_loads("{\"a\":[Infinity]}"))
+
+    @mock.patch("rally.db.sqlalchemy.types.fast_json", None)
+    def test_json_loads(self):
+        self.assertEqual({"a": [1, 2.5]},
+                         types.json_loads("{\"a\":[1,2.5]}"))
@@ -1335,6 +1335,9 @@ class FakeClients(object):
     def verified_keystone(self):
         return self.keystone()
 
+    def release(self):
+        pass
+
     def nova(self):
         if not self._nova:
             self._nova = FakeNovaClient()
@@ -1423,6 +1426,10 @@ class FakeRunner(object):
         "required": ["type", "a"]
     }
 
+    @classmethod
+    def _validate_config(cls, config):
+        pass
+
 
 class FakeScenario(base.Scenario):
 
@@ -19,6 +19,8 @@ import json
 
 import mock
 
+from rally.benchmark.processing import sketch
+from rally.benchmark.processing import table
 from rally import consts
 from rally import objects
 from tests.unit import test
@@ -105,6 +107,19 @@ class TaskTestCase(test.TestCase):
         self.assertEqual(mock_db_task_list.return_value["uuis"],
                          tasks[0]["uuid"])
 
+    @mock.patch("rally.objects.task.db.task_list_summary",
+                return_value=[{"uuid": "a"}])
+    def test_list_summary(self, mock_task_list_summary):
+        self.assertEqual([{"uuid": "a"}],
+                         objects.Task.list_summary(status="somestatus"))
+        mock_task_list_summary.assert_called_once_with("somestatus", None)
+
+    @mock.patch("rally.objects.task.db.task_get_status",
+                return_value="status")
+    def test_get_status(self, mock_task_get_status):
+        self.assertEqual("status", objects.Task.get_status("uuid"))
+        mock_task_get_status.assert_called_once_with("uuid")
+
     @mock.patch("rally.objects.deploy.db.task_update")
     @mock.patch("rally.objects.task.db.task_create")
     def test_update(self, mock_create, mock_update):
@@ -144,12 +159,82 @@ class TaskTestCase(test.TestCase):
         mock_get.assert_called_once_with(self.task["uuid"])
         self.assertEqual(results, "foo_results")
 
+    @mock.patch("rally.objects.task.db.task_result_summary_get_all")
+    @mock.patch("rally.objects.task.db.task_result_get_all_by_uuid")
+    def test_get_results_summary(self, mock_get_all, mock_summary_get_all):
+        mock_summary_get_all.return_value = [
+            {"id": 1, "key": "key1", "summary": {"iterations": 1}}]
+        task = objects.Task(task=self.task)
+        self.assertEqual(mock_summary_get_all.return_value,
+                         task.get_results_summary())
+        mock_summary_get_all.assert_called_once_with(self.task["uuid"])
+        self.assertFalse(mock_get_all.called)
+
+    @mock.patch("rally.objects.task.get_result_summary",
+                side_effect=lambda data: {"summary_of": data})
+    @mock.patch("rally.objects.task.db.task_result_summary_get_all")
+    @mock.patch("rally.objects.task.db.task_result_get_all_by_uuid")
+    def test_get_results_summary_not_stored(self, mock_get_all,
+                                            mock_summary_get_all,
+                                            mock_get_result_summary):
+        mock_summary_get_all.return_value = [
+            {"id": 1, "key": "key1", "summary": {"iterations": 1}},
+            {"id": 2, "key": "key2", "summary": None}]
+        mock_get_all.return_value = [{"id": 1, "data": "data1"},
+                                     {"id": 2, "data": "data2"}]
+        task = objects.Task(task=self.task)
+        self.assertEqual(
+            [{"id": 1, "key": "key1", "summary": {"iterations": 1}},
+             {"id": 2, "key": "key2", "summary": {"summary_of": "data2"}}],
+            task.get_results_summary())
+        mock_get_result_summary.assert_called_once_with("data2")
+
+    @mock.patch("rally.objects.task.get_result_summary",
+                return_value="summary")
     @mock.patch("rally.objects.task.db.task_result_create")
-    def test_append_results(self, mock_append_results):
+    def test_append_results(self, mock_append_results,
+                            mock_get_result_summary):
         task = objects.Task(task=self.task)
         task.append_results("opt", "val")
         mock_append_results.assert_called_once_with(self.task["uuid"],
-                                                    "opt", "val")
+                                                    "opt", "val", "summary")
+        mock_get_result_summary.assert_called_once_with("val")
+
+    @mock.patch("rally.objects.task.get_result_summary",
+                return_value="summary")
+    @mock.patch("rally.objects.task.db.task_result_update")
+    def test_update_results(self, mock_update_results,
+                            mock_get_result_summary):
+        objects.Task.update_results(42, "val")
+        mock_update_results.assert_called_once_with(42, "val", "summary")
+        mock_get_result_summary.assert_called_once_with("val")
+
+    @mock.patch("rally.objects.task.db.task_result_chunk_create")
+    def test_append_results_chunk(self, mock_chunk_create):
+        objects.Task.append_results_chunk(42, 1, ["iteration"])
+        mock_chunk_create.assert_called_once_with(42, 1, ["iteration"])
+
+    @mock.patch("rally.objects.task.db.task_result_chunk_get_all")
+    def test_iter_results_raw(self, mock_chunk_get_all):
+        iterations = [{"duration": float(i), "idle_duration": 0, "error": [],
+                       "scenario_output": {"data": {}, "errors": ""},
+                       "atomic_actions": {}} for i in range(3)]
+        mock_chunk_get_all.return_value = iter([
+            {"data": table.IterationsTable.from_results(
+                iterations[:2]).to_dict()},
+            {"data": table.IterationsTable.from_results(
+                iterations[2:]).to_dict()}])
+        result = {"id": 42, "data": {"chunks": 2}}
+        self.assertEqual(iterations,
+                         list(objects.Task.iter_results_raw(result)))
+        mock_chunk_get_all.assert_called_once_with(42)
+
+    @mock.patch("rally.objects.task.db.task_result_chunk_get_all")
+    def test_iter_results_raw_not_chunked(self, mock_chunk_get_all):
+        result = {"id": 42, "data": {"raw": [1, 2, 3]}}
+        self.assertEqual([1, 2, 3],
+                         list(objects.Task.iter_results_raw(result)))
+        self.assertFalse(mock_chunk_get_all.called)
 
     @mock.patch("rally.objects.task.db.task_update")
     def test_set_failed(self, mock_update):
@@ -160,3 +245,45 @@ class TaskTestCase(test.TestCase):
             self.task["uuid"],
             {"status": consts.TaskStatus.FAILED, "verification_log": "\"\""},
         )
+
+
+class GetResultSummaryTestCase(test.TestCase):
+
+    def setUp(self):
+        super(GetResultSummaryTestCase, self).setUp()
+        self.raw = [{"duration": float(i), "idle_duration": 0,
+                     "error": ["Error"] if i == 2 else [],
+                     "scenario_output": {"data": {}, "errors": ""},
+                     "atomic_actions": {}} for i in range(1, 5)]
+        self.sla = [{"criterion": "foo", "success": True, "detail": "ok"},
+                    {"criterion": "bar", "success": False, "detail": "no"}]
+
+    def test_get_result_summary(self):
+        data = {"chunks": 1, "load_duration": 5, "full_duration": 6,
+                "sla": self.sla,
+                "sketch": sketch.IterationsSketch.from_results(
+                    self.raw).to_dict()}
+        self.assertEqual(
+            {"iterations": 4, "errors": 1, "load_duration": 5,
+             "full_duration": 6, "sla": self.sla, "sla_success": False,
+             "duration": {"min": 1.0, "avg": 8.0 / 3, "max": 4.0,
+                          "90%": 3.8, "95%": 3.9}},
+            objects.task.get_result_summary(data))
+
+    def test_get_result_summary_raw(self):
+        data = {"raw": self.raw, "load_duration": 5, "full_duration": 6,
+                "sla": self.sla[:1]}
+        summary = objects.task.get_result_summary(data)
+        self.assertEqual(4, summary["iterations"])
+        self.assertEqual(1, summary["errors"])
+        self.assertTrue(summary["sla_success"])
+        self.assertEqual(4.0, summary["duration"]["max"])
+
+    def test_get_result_summary_running(self):
+        data = {"chunks": 0, "sla": [], "load_duration": 0,
+                "full_duration": 0}
+        self.assertEqual(
+            {"iterations": 0, "errors": 0, "load_duration": 0,
+             "full_duration": 0, "sla": [], "sla_success": True,
+             "duration": None},
+            objects.task.get_result_summary(data))
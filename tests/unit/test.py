@@ -39,6 +39,8 @@ class TestCase(base.BaseTestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.addCleanup(mock.patch.stopall)
+        # Don't save the plugin index to the home directory
+        mock.patch("rally.common.discover.INDEX_FILE", None).start()
 
     def _test_atomic_action_timer(self, atomic_actions, name):
         action_duration = atomic_actions.get(name)
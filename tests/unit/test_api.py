@@ -116,7 +116,7 @@ class TaskAPITestCase(test.TestCase):
         mock_engine.assert_has_calls([
             mock.call("config", mock_task.return_value,
                       admin=mock_deployment_get.return_value["admin"],
-                      users=[], abort_on_sla_failure=False),
+                      users=[], abort_on_sla_failure=False, parallel=1),
             mock.call().validate(),
             mock.call().run()
         ])
@@ -15,6 +15,7 @@
 
 from rally.benchmark.scenarios import base
 from rally.benchmark.sla import base as sla_base
+from rally.common import discover
 from rally.common import utils
 from rally import deploy
 from rally.deploy import serverprovider
@@ -23,6 +24,10 @@ from tests.unit import test
 
 class DocstringsTestCase(test.TestCase):
 
+    def setUp(self):
+        super(DocstringsTestCase, self).setUp()
+        discover.load_all()
+
     def _assert_class_has_docstrings(self, obj, long_description=True):
         if not obj.__module__.startswith("rally."):
             return
@@ -73,6 +73,90 @@ class OSClientsTestCase(test.TestCase):
         self.mock_create_keystone_client.assert_called_once_with(kwargs)
         self.assertEqual(self.fake_keystone, self.clients.cache["keystone"])
 
+    def test_release(self):
+        osclients.clear_cache()
+        self.addCleanup(osclients.clear_cache)
+        stats = osclients.get_cache_stats()
+        self.fake_keystone.auth_ref = mock.MagicMock()
+        self.fake_keystone.auth_ref.will_expire_soon.return_value = False
+
+        clients = osclients.Clients(self.endpoint)
+        keystone = clients.keystone()
+        clients.release()
+        self.assertEqual({}, clients.cache)
+
+        endpoint = objects.Endpoint("http://auth_url", "use", "pass",
+                                    "tenant")
+        clients = osclients.Clients(endpoint)
+        other_clients = osclients.Clients(endpoint)
+        self.assertEqual({"keystone": keystone}, clients.cache)
+        self.assertEqual({}, other_clients.cache)
+        self.assertEqual(keystone, clients.keystone())
+        self.mock_create_keystone_client.assert_called_once_with(mock.ANY)
+        self.fake_keystone.auth_ref.will_expire_soon.assert_called_once_with(
+            cfg.CONF.openstack_clients_cache_token_margin)
+
+        new_stats = osclients.get_cache_stats()
+        self.assertEqual(1, new_stats["hits"] - stats["hits"])
+        self.assertEqual(2, new_stats["misses"] - stats["misses"])
+        self.assertEqual(1, new_stats["auth_calls"] - stats["auth_calls"])
+
+    def test_release_token_expires(self):
+        osclients.clear_cache()
+        self.addCleanup(osclients.clear_cache)
+        self.fake_keystone.auth_ref = mock.MagicMock()
+        self.fake_keystone.auth_ref.will_expire_soon.return_value = True
+
+        clients = osclients.Clients(self.endpoint)
+        clients.keystone()
+        clients.release()
+        self.assertEqual({}, osclients.Clients(self.endpoint).cache)
+
+    def test_release_token_expires_during_iteration(self):
+        osclients.clear_cache()
+        self.addCleanup(osclients.clear_cache)
+        self.fake_keystone.auth_ref = mock.MagicMock()
+        # Token expires in 5 minutes, iterations may take longer
+        self.fake_keystone.auth_ref.will_expire_soon.side_effect = (
+            lambda stale_duration: stale_duration >= 300)
+
+        clients = osclients.Clients(self.endpoint)
+        clients.keystone()
+        clients.release()
+        self.assertEqual({}, osclients.Clients(self.endpoint).cache)
+
+        cfg.CONF.set_override("openstack_clients_cache_token_margin", 60)
+        self.addCleanup(cfg.CONF.clear_override,
+                        "openstack_clients_cache_token_margin")
+        clients = osclients.Clients(self.endpoint)
+        clients.keystone()
+        clients.release()
+        self.assertEqual(["keystone"],
+                         list(osclients.Clients(self.endpoint).cache))
+
+    @mock.patch("rally.osclients.os.getpid", return_value=42)
+    def test_release_forked(self, mock_getpid):
+        osclients.clear_cache()
+        self.addCleanup(osclients.clear_cache)
+        self.fake_keystone.auth_ref = mock.MagicMock()
+        self.fake_keystone.auth_ref.will_expire_soon.return_value = False
+
+        clients = osclients.Clients(self.endpoint)
+        clients.keystone()
+        clients.release()
+        mock_getpid.return_value = 43
+        self.assertEqual({}, osclients.Clients(self.endpoint).cache)
+
+    def test_release_cache_disabled(self):
+        cfg.CONF.set_override("openstack_clients_cache", False)
+        self.addCleanup(cfg.CONF.clear_override, "openstack_clients_cache")
+        self.addCleanup(osclients.clear_cache)
+
+        clients = osclients.Clients(self.endpoint)
+        clients.keystone()
+        clients.release()
+        self.assertEqual({}, osclients.Clients(self.endpoint).cache)
+
     @mock.patch("rally.osclients.Clients.keystone")
     def test_verified_keystone_user_not_admin(self, mock_keystone):
         mock_keystone.return_value = fakes.FakeKeystoneClient()